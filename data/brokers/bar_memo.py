@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Per-Bar Result Memo - RBOTzilla UNI
+LRU cache of analysis results keyed by (symbol, granularity,
+last-closed-bar time, config hash).
+
+- The scanner, AutonomousController candidates, manual trades and the
+  trade manager asking about the same symbol within one bar share a single
+  SmartLogicFilter / regime detector / wolf pack computation
+- Entries expire as soon as a newer bar closes for their (symbol,
+  granularity): on a lookup with a later bar time, or on a candle cache
+  merge that closes one (connectors register on_candles)
+- Only inputs that end on a closed bar are memoized; a still-forming bar
+  changes with every tick
+- LRU-bounded with per-kind hit/miss counters in stats()
+- Cached results are shared between callers and must be treated as read-only
+PIN: 841921
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set, Tuple, Union
+
+import numpy as np
+
+BarTime = Union[int, str]  # epoch ns, or the raw value when it is not a timestamp
+SeriesKey = Tuple[str, str]  # (symbol, granularity)
+MemoKey = Tuple[str, str, str, BarTime, str]  # (kind, symbol, granularity, bar time, config hash)
+
+_PLAIN = (bool, int, float, str, list, tuple, dict, type(None))
+
+
+def bar_time_ns(value: Any) -> Optional[BarTime]:
+    """
+    Normalize a bar timestamp (RFC3339 string, datetime, pandas Timestamp,
+    epoch seconds as number or string, or epoch ns) to int epoch ns;
+    other strings pass through
+    """
+    if value is None:
+        return None
+    if hasattr(value, "value") and hasattr(value, "tz_localize"):  # pandas Timestamp
+        return int(value.value)
+    if isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+        value = int(value)
+        return value if abs(value) >= 10 ** 15 else value * 10 ** 9
+    if isinstance(value, (float, np.floating)):
+        return int(value * 1e9)
+    if isinstance(value, str):
+        try:
+            return int(float(value) * 1e9)  # OANDA UNIX datetime format
+        except ValueError:
+            pass
+        try:
+            return int(np.datetime64(value[:-1] if value.endswith("Z") else value, "ns").astype(np.int64))
+        except ValueError:
+            return value
+    if hasattr(value, "timestamp"):  # datetime
+        return int(value.timestamp() * 1e9)
+    return None
+
+
+def closed_bar_time(data: Any = None, bar_time: Any = None) -> Optional[BarTime]:
+    """
+    Time of the last closed bar an input ends on: an explicit bar_time or
+    a CandleFrame whose last bar is complete. None when it cannot be known.
+    """
+    if bar_time is not None:
+        return bar_time_ns(bar_time)
+    if data is None:
+        return None
+    complete = getattr(data, "complete", None)
+    times = getattr(data, "time", None)
+    if complete is not None and times is not None and len(times):
+        return int(times[-1]) if complete[-1] else None
+    return None
+
+
+def settings(obj: Any) -> Dict[str, Any]:
+    """Public plain-valued attributes of a filter/strategy (its tunable config)"""
+    return {name: value for name, value in vars(obj).items()
+            if not name.startswith("_") and isinstance(value, _PLAIN)}
+
+
+def config_hash(*parts: Any) -> str:
+    """Stable short hash of JSON-able config parts"""
+    blob = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.blake2b(blob.encode(), digest_size=8).hexdigest()
+
+
+class BarMemo:
+    """
+    Results memoized until the next bar closes.
+
+    kind names the computation ("smart_logic", "regime", "bullish_wolf", ...)
+    so one memo serves every consumer.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[MemoKey, Any]" = OrderedDict()
+        self._by_series: Dict[SeriesKey, Set[MemoKey]] = {}
+        self._latest: Dict[SeriesKey, BarTime] = {}
+        self._lock = threading.Lock()
+
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _newer(bar_time: BarTime, latest: Optional[BarTime]) -> bool:
+        if latest is None:
+            return True
+        if type(bar_time) is not type(latest):
+            return bar_time != latest
+        return bar_time > latest
+
+    def _drop(self, key: MemoKey):
+        self._entries.pop(key, None)
+        keys = self._by_series.get((key[1], key[2]))
+        if keys is not None:
+            keys.discard(key)
+
+    def _advance(self, series: SeriesKey, bar_time: BarTime) -> int:
+        """Make bar_time the current bar of a series, expiring older entries (lock held)"""
+        if not self._newer(bar_time, self._latest.get(series)):
+            return 0
+        self._latest[series] = bar_time
+        stale = [key for key in self._by_series.get(series, ()) if key[3] != bar_time]
+        for key in stale:
+            self._drop(key)
+        self.expirations += len(stale)
+        return len(stale)
+
+    def advance(self, symbol: str, granularity: str, bar_time: Any) -> int:
+        """Record that a bar closed; returns how many entries expired"""
+        bar_time = bar_time_ns(bar_time)
+        if bar_time is None:
+            return 0
+        with self._lock:
+            return self._advance((symbol, granularity), bar_time)
+
+    def on_candles(self, instrument: str, granularity: str, candles: Any, full: bool):
+        """CandleCache listener: the newest complete candle in a merge closes the bar"""
+        for candle in reversed(candles):
+            if candle.get("complete", True):
+                self.advance(instrument, granularity, candle.get("time"))
+                return
+
+    def lookup(self, kind: str, symbol: str, granularity: str, bar_time: BarTime, config: str) -> Any:
+        """Memoized result or None; a later bar_time than any seen expires the older entries"""
+        key = (kind, symbol, granularity, bar_time, config)
+        with self._lock:
+            self._advance((symbol, granularity), bar_time)
+            value = self._entries.get(key)
+            if value is None:
+                self.misses[kind] = self.misses.get(kind, 0) + 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits[kind] = self.hits.get(kind, 0) + 1
+            return value
+
+    def store(self, kind: str, symbol: str, granularity: str, bar_time: BarTime, config: str, value: Any):
+        """Keep a result for the current bar (results for an already-superseded bar are not kept)"""
+        series = (symbol, granularity)
+        key = (kind, symbol, granularity, bar_time, config)
+        with self._lock:
+            self._advance(series, bar_time)
+            if self._latest.get(series) != bar_time:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._by_series.setdefault(series, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def get_or_compute(self, kind: str, symbol: str, granularity: str, bar_time: Any, config: str,
+                       compute: Callable[[], Any]) -> Any:
+        """Memoized result for this bar, computing and storing it on a miss"""
+        bar_time = bar_time_ns(bar_time)
+        value = self.lookup(kind, symbol, granularity, bar_time, config)
+        if value is None:
+            value = compute()
+            self.store(kind, symbol, granularity, bar_time, config, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_series.clear()
+            self._latest.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses = sum(self.hits.values()), sum(self.misses.values())
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "by_kind": {kind: {"hits": self.hits.get(kind, 0), "misses": self.misses.get(kind, 0)}
+                            for kind in sorted(set(self.hits) | set(self.misses))},
+            }
+
+
+_shared_memo: Optional[BarMemo] = None
+_shared_lock = threading.Lock()
+
+
+def get_bar_memo() -> BarMemo:
+    """Process-wide memo shared by every filter, detector and strategy instance"""
+    global _shared_memo
+    with _shared_lock:
+        if _shared_memo is None:
+            _shared_memo = BarMemo()
+        return _shared_memo
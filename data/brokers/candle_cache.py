@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Incremental Candle Cache - RBOTzilla UNI
+Per-(instrument, granularity) ring buffer of OANDA candles.
+
+- First read downloads the full window
+- Later reads fetch only bars after the last *completed* candle and
+  replace the still-forming bar
+- Reads within min_refresh_s of the last refresh are served from memory,
+  so back-to-back consumers (regime detector + strategy) share one fetch
+- read_frame() decodes a window into a CandleFrame once per refresh
+- Listeners see each merged batch, so streaming indicator state
+  (brokers/indicator_state.py) advances by the new bars only; they run
+  after the series lock is released (readers never wait on them), in
+  merge order, and one failing listener does not stop the others
+PIN: 841921
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Any, Tuple, Callable, Deque
+
+try:
+    from .candle_frame import CandleFrame, decode_candles
+except ImportError:
+    from candle_frame import CandleFrame, decode_candles
+
+logger = logging.getLogger(__name__)
+
+CandleKey = Tuple[str, str]  # (instrument, granularity)
+
+
+class _Series:
+    """Ring buffer for one (instrument, granularity)"""
+
+    def __init__(self, capacity: int):
+        self.candles: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self.refreshed_at = 0.0
+        self.lock = threading.RLock()
+        self.notify_lock = threading.RLock()  # Keeps listener batches in merge order
+        self.version = 0  # Bumped on every merge; keys the decoded-frame memo
+        self.frames: Dict[int, Tuple[int, CandleFrame]] = {}  # count -> (version, frame)
+
+    @property
+    def last_complete_time(self) -> Optional[str]:
+        for candle in reversed(self.candles):
+            if candle.get("complete", True):
+                return candle.get("time")
+        return None
+
+    def complete_count(self) -> int:
+        return sum(1 for c in self.candles if c.get("complete", True))
+
+
+class CandleCache:
+    """
+    Incremental candle store shared by everything reading through a connector.
+
+    Sync callers use get(); async callers drive plan()/merge()/read() around
+    their own awaitable fetch.
+    """
+
+    def __init__(self, capacity: int = 500, min_refresh_s: float = 1.0):
+        """
+        Args:
+            capacity: Max candles kept per (instrument, granularity)
+            min_refresh_s: Reads within this window of a refresh skip the network
+        """
+        self.capacity = capacity
+        self.min_refresh_s = min_refresh_s
+        self._series: Dict[CandleKey, _Series] = {}
+        self._lock = threading.Lock()
+        self.listeners: List[Callable[[str, str, List[Dict[str, Any]], bool], None]] = []
+
+        self.full_fetches = 0
+        self.incremental_fetches = 0
+        self.memory_hits = 0
+        self.frame_decodes = 0
+        self.listener_errors = 0
+
+    def add_listener(self, listener: Callable[[str, str, List[Dict[str, Any]], bool], None]):
+        """Call listener(instrument, granularity, candles, full) after every merge"""
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def _series_for(self, key: CandleKey) -> _Series:
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = _Series(self.capacity)
+                self._series[key] = series
+            return series
+
+    def plan(self, instrument: str, granularity: str, count: int) -> Optional[Dict[str, Any]]:
+        """
+        Decide what to fetch for a read of `count` bars.
+
+        Returns:
+            Request params for the candles endpoint (full window or incremental
+            'from' the last completed bar), or None if memory is fresh enough
+        """
+        series = self._series_for((instrument, granularity))
+        last_complete = series.last_complete_time
+        if last_complete is None or series.complete_count() < min(count, self.capacity) - 1:
+            return {"count": max(count, 1), "granularity": granularity, "price": "M"}
+        if time.monotonic() - series.refreshed_at < self.min_refresh_s:
+            return None
+        return {"from": last_complete, "includeFirst": "false", "granularity": granularity, "price": "M"}
+
+    def merge(self, instrument: str, granularity: str, candles: List[Dict[str, Any]], full: bool):
+        """Apply a fetch result: replace the window (full) or append after the last completed bar"""
+        series = self._series_for((instrument, granularity))
+        with series.lock:
+            candles = self._apply(series, candles, full)
+            series.notify_lock.acquire()
+        self._notify(series, instrument, granularity, candles, full)
+
+    def _apply(self, series: _Series, candles: List[Dict[str, Any]], full: bool) -> List[Dict[str, Any]]:
+        """Merge into the ring buffer (series lock held); returns the batch listeners see"""
+        if full:
+            series.candles.clear()
+            self.full_fetches += 1
+        else:
+            self.incremental_fetches += 1
+            # Drop the still-forming bar(s); the fetch returns their replacement
+            while series.candles and not series.candles[-1].get("complete", True):
+                series.candles.pop()
+            last_time = series.candles[-1].get("time") if series.candles else None
+            candles = [c for c in candles if last_time is None or c.get("time", "") > last_time]
+        series.candles.extend(candles)
+        series.refreshed_at = time.monotonic()
+        series.version += 1
+        series.frames.clear()
+        return candles
+
+    def _notify(self, series: _Series, instrument: str, granularity: str, candles: List[Dict[str, Any]],
+                full: bool):
+        """Call every listener with a merged batch; releases the series notify lock taken by the merge"""
+        try:
+            for listener in self.listeners:
+                try:
+                    listener(instrument, granularity, candles, full)
+                except Exception:
+                    self.listener_errors += 1
+                    logger.exception(f"Candle listener {getattr(listener, '__qualname__', listener)} "
+                                     f"failed for {instrument} {granularity}")
+        finally:
+            series.notify_lock.release()
+
+    def read(self, instrument: str, granularity: str, count: int) -> List[Dict[str, Any]]:
+        """Last `count` cached candles (oldest first)"""
+        series = self._series_for((instrument, granularity))
+        with series.lock:
+            if count >= len(series.candles):
+                return list(series.candles)
+            return list(series.candles)[-count:]
+
+    def read_frame(self, instrument: str, granularity: str, count: int) -> CandleFrame:
+        """Last `count` cached candles as a CandleFrame, decoded once per refresh"""
+        series = self._series_for((instrument, granularity))
+        with series.lock:
+            memo = series.frames.get(count)
+            if memo is not None and memo[0] == series.version:
+                return memo[1]
+            frame = decode_candles(self.read(instrument, granularity, count))
+            series.frames[count] = (series.version, frame)
+            self.frame_decodes += 1
+            return frame
+
+    def get(self, instrument: str, granularity: str, count: int,
+            fetch: Callable[[Dict[str, Any]], Optional[List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """
+        Read through the cache with a synchronous fetch(params) -> candles|None.
+
+        A failed incremental fetch (None) serves the cached window unchanged.
+        """
+        series = self._series_for((instrument, granularity))
+        merged = None
+        with series.lock:
+            params = self.plan(instrument, granularity, count)
+            if params is None:
+                self.memory_hits += 1
+            else:
+                candles = fetch(params)
+                if candles is None:
+                    if "count" in params:
+                        return []
+                else:
+                    full = "count" in params
+                    merged = (self._apply(series, candles, full), full)
+                    series.notify_lock.acquire()
+            window = self.read(instrument, granularity, count)
+        if merged is not None:
+            self._notify(series, instrument, granularity, *merged)
+        return window
+
+    def invalidate(self, instrument: Optional[str] = None, granularity: Optional[str] = None):
+        """Drop cached series (all, one instrument, or one instrument/granularity)"""
+        with self._lock:
+            for key in list(self._series):
+                if (instrument is None or key[0] == instrument) and (granularity is None or key[1] == granularity):
+                    del self._series[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "series": len(self._series),
+            "full_fetches": self.full_fetches,
+            "incremental_fetches": self.incremental_fetches,
+            "memory_hits": self.memory_hits,
+            "frame_decodes": self.frame_decodes,
+            "listener_errors": self.listener_errors,
+        }
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Columnar Candle Frame - RBOTzilla UNI
+Decode a broker candle payload once into contiguous NumPy columns.
+
+- OANDA v20 candles ({'mid': {'o': '1.08', ...}, 'volume': 12, 'complete': true})
+- Flat OHLCV dicts (Coinbase, IBKR: {'open': ..., 'close': ..., 'volume': ...})
+- time as int64 epoch nanoseconds, open/high/low/close/volume as float64
+- Columns are read-only so one decoded frame can be shared by the regime
+  detector, SmartLogicFilter and every wolf pack without defensive copies
+PIN: 841921
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Sequence
+
+import numpy as np
+
+PRICE_COMPONENTS = ("mid", "bid", "ask")
+COLUMNS = ("time", "open", "high", "low", "close", "volume")
+
+
+@dataclass
+class CandleFrame:
+    """Contiguous OHLCV columns for one instrument (oldest bar first)"""
+    time: np.ndarray      # int64 epoch ns
+    open: np.ndarray      # float64
+    high: np.ndarray      # float64
+    low: np.ndarray       # float64
+    close: np.ndarray     # float64
+    volume: np.ndarray    # float64 (tick count on OANDA, base size on crypto)
+    complete: np.ndarray  # bool; False only for a still-forming bar
+    _series: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def __contains__(self, name: str) -> bool:
+        return name in COLUMNS
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name not in COLUMNS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return getattr(self, name) if name in COLUMNS else default
+
+    @property
+    def last_close(self) -> Optional[float]:
+        return float(self.close[-1]) if len(self.close) else None
+
+    def tail(self, count: int) -> "CandleFrame":
+        """Last `count` bars as a frame of views (no copy)"""
+        start = max(0, len(self) - count)
+        return CandleFrame(*(getattr(self, name)[start:] for name in COLUMNS),
+                           complete=self.complete[start:])
+
+    def completed(self) -> "CandleFrame":
+        """Frame without a trailing still-forming bar"""
+        if len(self) and not self.complete[-1]:
+            return self.tail(len(self) - 1)
+        return self
+
+    def as_series(self) -> Dict[str, Any]:
+        """
+        Zero-copy pandas views of the columns for pandas-based strategies.
+
+        Built at most once per frame and shared by every caller.
+        """
+        if self._series is None:
+            import pandas as pd
+            index = pd.to_datetime(self.time, unit="ns", utc=True)
+            self._series = {
+                name: pd.Series(getattr(self, name), index=index, name=name, copy=False)
+                for name in COLUMNS[1:]
+            }
+        return self._series
+
+
+def _empty_frame() -> CandleFrame:
+    empty = np.empty(0, dtype=np.float64)
+    return CandleFrame(np.empty(0, dtype=np.int64), empty, empty, empty, empty, empty,
+                       np.empty(0, dtype=bool))
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+def _parse_times(times: Sequence[Any]) -> np.ndarray:
+    """RFC3339 strings, epoch seconds (int/str) or datetimes -> int64 epoch ns"""
+    if not times:
+        return np.empty(0, dtype=np.int64)
+    first = times[0]
+    try:
+        if isinstance(first, str):
+            try:
+                seconds = np.array(times, dtype=np.float64)
+            except ValueError:
+                # np.datetime64 rejects the trailing 'Z' OANDA uses for UTC
+                stripped = [t[:-1] if t.endswith("Z") else t for t in times]
+                return np.array(stripped, dtype="datetime64[ns]").astype(np.int64)
+            return (seconds * 1e9).astype(np.int64)
+        if isinstance(first, datetime):
+            return np.array(
+                [int((t if t.tzinfo else t.replace(tzinfo=timezone.utc)).timestamp() * 1e9) for t in times],
+                dtype=np.int64,
+            )
+        if isinstance(first, (int, float, np.integer, np.floating)):
+            return (np.asarray(times, dtype=np.float64) * 1e9).astype(np.int64)
+        return np.array(times, dtype="datetime64[ns]").astype(np.int64)
+    except (ValueError, TypeError, AttributeError):
+        # Time is metadata for the strategies; never fail a decode on it
+        return np.zeros(len(times), dtype=np.int64)
+
+
+def _price_block(candle: Dict[str, Any]) -> Dict[str, Any]:
+    for component in PRICE_COMPONENTS:
+        block = candle.get(component)
+        if block:
+            return block
+    return candle
+
+
+def decode_candles(candles: Any) -> CandleFrame:
+    """
+    Decode a candle payload into a CandleFrame.
+
+    Accepts a CandleFrame (returned unchanged), a list of OANDA v20 candles
+    (mid, else bid, else ask prices) or a list of flat OHLCV dicts.
+    """
+    if isinstance(candles, CandleFrame):
+        return candles
+    if not candles:
+        return _empty_frame()
+
+    if any(component in candles[0] for component in PRICE_COMPONENTS):
+        blocks = [_price_block(c) for c in candles]
+        ohlc = [(b["o"], b["h"], b["l"], b["c"]) for b in blocks]
+    else:
+        ohlc = [(c["open"], c["high"], c["low"], c["close"]) for c in candles]
+
+    # One (4, n) allocation; each row is a contiguous column
+    prices = np.ascontiguousarray(np.array(ohlc, dtype=np.float64).T)
+    volume = np.array([c.get("volume", 0) or 0 for c in candles], dtype=np.float64)
+    complete = np.array([bool(c.get("complete", True)) for c in candles], dtype=bool)
+    times = _parse_times([c.get("time", c.get("start")) for c in candles])
+
+    return CandleFrame(
+        time=_readonly(times),
+        open=_readonly(prices[0]),
+        high=_readonly(prices[1]),
+        low=_readonly(prices[2]),
+        close=_readonly(prices[3]),
+        volume=_readonly(volume),
+        complete=_readonly(complete),
+    )
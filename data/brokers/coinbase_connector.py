@@ -14,6 +14,7 @@ import base64
 import logging
 import requests
 import threading
+from collections import deque
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
@@ -21,6 +22,23 @@ from datetime import datetime, timezone
 import websocket
 from urllib.parse import urljoin
 
+# Per-endpoint latency histograms shared by every connector
+try:
+    from .latency_recorder import get_latency_recorder
+except ImportError:
+    from latency_recorder import get_latency_recorder
+
+# Shared per-host request budget and GET coalescing
+try:
+    from .rate_limiter import (RateLimit, RateLimitExceeded, SingleFlight, default_priority,
+                               get_rate_limiter, request_key)
+except ImportError:
+    from rate_limiter import (RateLimit, RateLimitExceeded, SingleFlight, default_priority,
+                              get_rate_limiter, request_key)
+
+# Identical in-flight GETs from any connector instance share one response
+_single_flight = SingleFlight()
+
 # Charter compliance imports
 try:
     from ..foundation.rick_charter import validate_pin
@@ -109,6 +127,9 @@ class CoinbaseConnector:
     Supports dynamic mode switching via .upgrade_toggle
     """
     
+    # Stay well under Coinbase's per-key REST limit; orders keep a reserve
+    RATE_LIMIT = RateLimit(rate_per_s=10, burst=15)
+    
     def __init__(self, pin: int = None, environment: str = None):
         """
         Initialize Coinbase connector
@@ -151,8 +172,10 @@ class CoinbaseConnector:
         else:  # sandbox
             self.api_base = "https://api-public.sandbox.pro.coinbase.com"
         
-        # Performance tracking
-        self.request_times = []
+        # Performance tracking (recent window + per-endpoint histograms)
+        self.request_times = deque(maxlen=100)
+        self.latency = get_latency_recorder()
+        self.rate_limiter = get_rate_limiter(self.api_base, self.RATE_LIMIT)
         self._lock = threading.Lock()
         
         # Charter compliance
@@ -594,7 +617,7 @@ class CoinbaseConnector:
         Returns:
             Dict with API response
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         url = urljoin(self.api_base, endpoint)
         body = json.dumps(data) if data else ""
         
@@ -602,25 +625,18 @@ class CoinbaseConnector:
         
         try:
             if method.upper() == "GET":
-                response = requests.get(url, headers=headers, timeout=self.default_timeout)
-            elif method.upper() == "POST":
-                response = requests.post(url, headers=headers, data=body, timeout=self.default_timeout)
-            elif method.upper() == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=self.default_timeout)
+                key = request_key("GET", url, credentials=self.api_key)
+                response = _single_flight.do(key, lambda: self._send(method, url, headers, body))
             else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+                response = self._send(method, url, headers, body)
             
-            # Track request latency
-            latency_ms = (time.time() - start_time) * 1000
-            with self._lock:
-                self.request_times.append(latency_ms)
-                if len(self.request_times) > 100:
-                    self.request_times = self.request_times[-100:]
+            latency_ms = (time.perf_counter() - start_time) * 1000
             
             # Check response
             response.raise_for_status()
             
             result = response.json() if response.content else {}
+            self._track_latency(method, endpoint, latency_ms)
             
             # Log performance for LIVE environment
             if self.environment == "live":
@@ -636,8 +652,19 @@ class CoinbaseConnector:
                 "status_code": response.status_code
             }
             
+        except RateLimitExceeded as e:
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            self.logger.warning(f"Coinbase request shed ({self.environment}): {method} {endpoint} - {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "latency_ms": latency_ms,
+                "status_code": 429
+            }
+            
         except requests.exceptions.Timeout:
-            latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            self._track_latency(method, endpoint, latency_ms, timeout=True)
             self.logger.error(f"Coinbase API TIMEOUT ({self.environment}): {latency_ms:.1f}ms for {method} {endpoint}")
             return {
                 "success": False,
@@ -647,7 +674,7 @@ class CoinbaseConnector:
             }
             
         except requests.exceptions.HTTPError as e:
-            latency_ms = (time.time() - start_time) * 1000
+            self._track_latency(method, endpoint, latency_ms, error=True)
             error_msg = f"HTTP {response.status_code}: {response.text}"
             self.logger.error(f"Coinbase API ERROR ({self.environment}): {error_msg}")
             return {
@@ -658,7 +685,8 @@ class CoinbaseConnector:
             }
             
         except Exception as e:
-            latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            self._track_latency(method, endpoint, latency_ms, error=True)
             self.logger.error(f"Coinbase API EXCEPTION ({self.environment}): {str(e)}")
             return {
                 "success": False,
@@ -701,10 +729,28 @@ class CoinbaseConnector:
                 "broker": "Coinbase"
             }
     
+    def _send(self, method: str, url: str, headers: Dict[str, str], body: str) -> requests.Response:
+        """One HTTP call, admitted by the shared rate limiter (orders ahead of reads)"""
+        self.rate_limiter.acquire(priority=default_priority(method))
+        if method.upper() == "GET":
+            return requests.get(url, headers=headers, timeout=self.default_timeout)
+        elif method.upper() == "POST":
+            return requests.post(url, headers=headers, data=body, timeout=self.default_timeout)
+        elif method.upper() == "DELETE":
+            return requests.delete(url, headers=headers, timeout=self.default_timeout)
+        raise ValueError(f"Unsupported HTTP method: {method}")
+    
+    def _track_latency(self, method: str, endpoint: str, latency_ms: float,
+                       error: bool = False, timeout: bool = False):
+        """Record one request in the recent window and the per-endpoint histogram"""
+        with self._lock:
+            self.request_times.append(latency_ms)
+        self.latency.record("Coinbase", method, endpoint, latency_ms, error=error, timeout=timeout)
+    
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get connector performance statistics"""
         with self._lock:
-            request_times = self.request_times.copy()
+            request_times = list(self.request_times)
         
         if not request_times:
             return {
@@ -713,7 +759,9 @@ class CoinbaseConnector:
                 "max_latency_ms": 0,
                 "charter_compliance_rate": 0,
                 "environment": self.environment,
-                "api_configured": bool(self.api_key and self.api_key != "your_sandbox_api_key")
+                "api_configured": bool(self.api_key and self.api_key != "your_sandbox_api_key"),
+                "latency": self.latency.broker_summary("Coinbase"),
+                "endpoints": self.latency.snapshot("Coinbase")
             }
         
         avg_latency = sum(request_times) / len(request_times)
@@ -727,7 +775,11 @@ class CoinbaseConnector:
             "max_latency_ms": round(max_latency, 1),
             "charter_compliance_rate": round(compliance_rate, 3),
             "environment": self.environment,
-            "api_configured": bool(self.api_key and self.api_key != "your_sandbox_api_key")
+            "api_configured": bool(self.api_key and self.api_key != "your_sandbox_api_key"),
+            "latency": self.latency.broker_summary("Coinbase"),
+            "endpoints": self.latency.snapshot("Coinbase"),
+            "rate_limiter": self.rate_limiter.stats(),
+            "coalescing": _single_flight.stats()
         }
 
 # Convenience functions
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Rolling Correlation Engine - RBOTzilla UNI
+Return correlations across every traded instrument, updated per closed bar.
+
+- Registered as a CandleCache listener for the base granularity: each
+  newly closed bar adds one return; nothing is recomputed over the window
+- Keeps running sums and cross-products of the last `window` bar times;
+  a new bar costs O(n^2) for n instruments (the row leaving the window),
+  each return O(n), and a return arriving late for a bar still in the
+  window (another instrument's fetch landing first) is patched into its row
+- Sums are rebuilt exactly from the window every `window` bars so
+  rounding never accumulates
+- In-memory reads: matrix(), correlation(), correlations_of(), partners()
+  and concentration() (eigenvalue share of the largest factor); an
+  instrument is included once it has min_periods returns in the window
+  (default 80% of it, so metals/index CFDs with a daily break and thin
+  crosses with tick-less bars still qualify; a bar it has no return for
+  counts as a zero return)
+PIN: 841921
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .candle_frame import decode_candles
+except ImportError:
+    from candle_frame import decode_candles
+
+
+class CorrelationEngine:
+    """Rolling return covariance for a growing universe of instruments"""
+
+    def __init__(self, window: int = 200, min_periods: Optional[int] = None, granularity: str = "M15",
+                 capacity: int = 64):
+        self.window = window
+        self.min_periods = min_periods if min_periods is not None else int(window * 0.8)
+        self.granularity = granularity
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._last: Dict[str, Tuple[int, float]] = {}  # symbol -> (bar time ns, close)
+
+        # Window rows: one slot per bar time, returns of every instrument (0 where missing)
+        self._returns = np.zeros((window, capacity))
+        self._filled = np.zeros((window, capacity), dtype=bool)
+        self._slot_time = np.full(window, np.iinfo(np.int64).max, dtype=np.int64)
+        self._slots: Dict[int, int] = {}  # bar time -> slot
+        self._newest: Optional[int] = None
+        self._sums = np.zeros(capacity)
+        self._products = np.zeros((capacity, capacity))
+        self._counts = np.zeros(capacity, dtype=np.int64)
+        self._since_rebuild = 0
+
+        self.version = 0
+        self._cache: Dict[str, Any] = {}
+        self.bars = 0
+        self.returns_applied = 0
+        self.late_returns = 0
+        self.rebuilds = 0
+
+    # --- updates -------------------------------------------------------------------------
+
+    def _column(self, symbol: str) -> int:
+        column = self._index.get(symbol)
+        if column is not None:
+            return column
+        column = len(self._symbols)
+        if column == self._returns.shape[1]:
+            grow = column
+            self._returns = np.pad(self._returns, ((0, 0), (0, grow)))
+            self._filled = np.pad(self._filled, ((0, 0), (0, grow)))
+            self._sums = np.pad(self._sums, (0, grow))
+            self._products = np.pad(self._products, ((0, grow), (0, grow)))
+            self._counts = np.pad(self._counts, (0, grow))
+        self._index[symbol] = column
+        self._symbols.append(symbol)
+        return column
+
+    def _evict(self, slot: int):
+        row = self._returns[slot]
+        self._sums -= row
+        self._products -= np.outer(row, row)
+        self._counts -= self._filled[slot]
+        del self._slots[int(self._slot_time[slot])]
+        row[:] = 0.0
+        self._filled[slot] = False
+        self._slot_time[slot] = np.iinfo(np.int64).max
+        self._since_rebuild += 1
+        if self._since_rebuild >= self.window:
+            self._rebuild()
+
+    def _rebuild(self):
+        self._sums = self._returns.sum(axis=0)
+        self._products = self._returns.T @ self._returns
+        self._since_rebuild = 0
+        self.rebuilds += 1
+
+    def _slot_for(self, bar_time: int) -> Optional[int]:
+        """Window slot of a bar time, opening one (evicting the oldest) if needed; None if too old"""
+        slot = self._slots.get(bar_time)
+        if slot is not None:
+            return slot
+        if len(self._slots) == self.window:
+            oldest = int(np.argmin(self._slot_time))
+            if bar_time < self._slot_time[oldest]:
+                return None
+            self._evict(oldest)
+            slot = oldest
+        else:
+            slot = int(np.argmax(self._slot_time == np.iinfo(np.int64).max))
+        self._slot_time[slot] = bar_time
+        self._slots[bar_time] = slot
+        self.bars += 1
+        return slot
+
+    def _apply(self, symbol: str, bar_time: int, value: float):
+        """Add one return to its bar's row: O(n) update of the sums and cross-products"""
+        if self._newest is not None and bar_time < self._newest:
+            self.late_returns += 1
+        else:
+            self._newest = bar_time
+        slot = self._slot_for(bar_time)
+        if slot is None:
+            return
+        column = self._column(symbol)
+        row = self._returns[slot]
+        previous = row[column]
+        delta = value - previous
+        if delta:
+            # (r + d e_c)(r + d e_c)^T - r r^T = d (e_c r^T + r e_c^T) + d^2 e_c e_c^T
+            self._products[column, :] += delta * row
+            self._products[:, column] += delta * row
+            self._products[column, column] += delta * delta
+            self._sums[column] += delta
+            row[column] = value
+        if not self._filled[slot, column]:
+            self._filled[slot, column] = True
+            self._counts[column] += 1
+        self.returns_applied += 1
+
+    def update(self, symbol: str, bar_time: int, close: float) -> bool:
+        """Apply one closed bar (bar time in epoch ns); False when it is not newer than the last"""
+        with self._lock:
+            last = self._last.get(symbol)
+            if last is not None and bar_time <= last[0]:
+                return False
+            self._last[symbol] = (bar_time, close)
+            if last is not None and last[1] > 0:
+                self._apply(symbol, bar_time, close / last[1] - 1.0)
+                self.version += 1
+            else:
+                self._column(symbol)
+            return True
+
+    def on_candles(self, instrument: str, granularity: str, candles: List[Dict[str, Any]], full: bool = False):
+        """CandleCache listener: the merge's newly closed bars of the base granularity"""
+        if granularity != self.granularity:
+            return
+        closed = [c for c in candles if c.get("complete", True)]
+        if not closed:
+            return
+        frame = decode_candles(closed)
+        for i in range(len(frame)):
+            self.update(instrument, int(frame.time[i]), float(frame.close[i]))
+
+    # --- reads ---------------------------------------------------------------------------
+
+    def _snapshot(self) -> Tuple[List[str], np.ndarray]:
+        """(ready symbols, correlation matrix), cached until the next update"""
+        with self._lock:
+            cached = self._cache.get("matrix")
+            if cached is not None and cached[0] == self.version:
+                return cached[1], cached[2]
+            n = len(self._symbols)
+            rows = max(len(self._slots), 2)
+            sums, products = self._sums[:n], self._products[:n, :n]
+            covariance = (products - np.outer(sums, sums) / rows) / (rows - 1)
+            ready = [i for i in range(n) if self._counts[i] >= self.min_periods and covariance[i, i] > 0]
+            covariance = covariance[np.ix_(ready, ready)]
+            scale = np.sqrt(np.diag(covariance))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                matrix = np.clip(covariance / np.outer(scale, scale), -1.0, 1.0)
+            np.fill_diagonal(matrix, 1.0)
+            matrix.flags.writeable = False
+            symbols = [self._symbols[i] for i in ready]
+            self._cache = {"matrix": (self.version, symbols, matrix)}
+            return symbols, matrix
+
+    def matrix(self) -> Tuple[List[str], np.ndarray]:
+        """(symbols, correlation matrix) over every instrument with enough returns (read-only)"""
+        return self._snapshot()
+
+    def correlation(self, a: str, b: str) -> Optional[float]:
+        """Current correlation of two instruments, None until both are ready"""
+        symbols, matrix = self._snapshot()
+        if a not in symbols or b not in symbols:
+            return None
+        return float(matrix[symbols.index(a), symbols.index(b)])
+
+    def correlations_of(self, symbol: str) -> Dict[str, float]:
+        """{other instrument: correlation} for one instrument ({} until it is ready)"""
+        symbols, matrix = self._snapshot()
+        if symbol not in symbols:
+            return {}
+        row = matrix[symbols.index(symbol)]
+        return {other: float(rho) for other, rho in zip(symbols, row) if other != symbol}
+
+    def partners(self, symbol: str, top: int = 3) -> Dict[str, List[Tuple[str, float]]]:
+        """Most correlated and most anti-correlated instruments, strongest first"""
+        ranked = sorted(self.correlations_of(symbol).items(), key=lambda item: item[1])
+        return {
+            "correlated": [item for item in reversed(ranked[-top:]) if item[1] > 0],
+            "anti_correlated": [item for item in ranked[:top] if item[1] < 0],
+        }
+
+    def concentration(self) -> Dict[str, Any]:
+        """
+        Eigen-concentration of the correlation matrix: the largest
+        eigenvalue's share of the total (1/n when independent, 1 when one
+        factor drives everything) and the effective number of independent bets
+        """
+        symbols, matrix = self._snapshot()
+        with self._lock:
+            cached = self._cache.get("concentration")
+            if cached is not None and cached[0] is matrix:
+                return cached[1]
+        if len(symbols) < 2:
+            result = {"instruments": len(symbols), "top_eigen_share": 1.0 if symbols else 0.0,
+                      "effective_bets": float(len(symbols))}
+        else:
+            eigenvalues = np.clip(np.linalg.eigvalsh(matrix), 0.0, None)
+            total = eigenvalues.sum()
+            result = {"instruments": len(symbols), "top_eigen_share": float(eigenvalues[-1] / total),
+                      "effective_bets": float(total * total / (eigenvalues * eigenvalues).sum())}
+        with self._lock:
+            self._cache["concentration"] = (matrix, result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            n = len(self._symbols)
+            return {
+                "instruments": n,
+                "ready": int(np.sum(self._counts[:n] >= self.min_periods)),
+                "window": self.window,
+                "bars": self.bars,
+                "returns_applied": self.returns_applied,
+                "late_returns": self.late_returns,
+                "rebuilds": self.rebuilds,
+            }
+
+
+_shared_engine: Optional[CorrelationEngine] = None
+_shared_lock = threading.Lock()
+
+
+def get_correlation_engine() -> CorrelationEngine:
+    """Process-wide engine fed by every connector's candle cache"""
+    global _shared_engine
+    with _shared_lock:
+        if _shared_engine is None:
+            _shared_engine = CorrelationEngine()
+        return _shared_engine
+
+
+def running_correlation_engine() -> Optional[CorrelationEngine]:
+    """The process-wide engine if a connector has started one, for gates that have no connector handle"""
+    return _shared_engine
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Per-Bar Feature Store - RBOTzilla UNI
+Market features computed once per closed bar and served to every consumer.
+
+- Return volatility, regression trend strength and volume profile for an
+  (instrument, granularity, bar time), keyed also by the number of bars in
+  the window, so the regime detector, QuantHedgeRules,
+  DynamicLeverageCalculator and SmartLogicFilter asking about the same
+  window within a bar share one computation
+- Volatility is stored un-annualized; each consumer applies its own scale
+- Feature kernels work along the last axis, so batch callers get the same
+  definitions for a (rows x bars) array
+- Backed by a BarMemo: LRU-bounded, expired when the next bar closes
+  (connectors register on_candles), hit rates per feature in stats()
+- Inputs must end on the closed bar they are keyed by; without a symbol
+  or bar time the feature is computed and not cached
+PIN: 841921
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+try:
+    from . import indicators
+    from .bar_memo import BarMemo, bar_time_ns
+except ImportError:
+    import indicators
+    from bar_memo import BarMemo, bar_time_ns
+
+
+def return_volatility(prices: Any) -> Any:
+    """Population std of simple returns along the last axis (0 with fewer than 2 prices)"""
+    x = indicators.as_array(prices)
+    if x.shape[-1] < 2:
+        return np.zeros(x.shape[:-1]) if x.ndim > 1 else 0.0
+    returns = np.diff(x, axis=-1) / x[..., :-1]
+    return np.std(returns, axis=-1)
+
+
+def trend_strength(prices: Any) -> Any:
+    """Closed-form least-squares slope over mean price along the last axis (0 with fewer than 2 prices)"""
+    x = indicators.as_array(prices)
+    if x.shape[-1] < 2:
+        return np.zeros(x.shape[:-1]) if x.ndim > 1 else 0.0
+    position = np.arange(x.shape[-1]) - (x.shape[-1] - 1) / 2
+    mean = x.mean(axis=-1)
+    slope = (x - mean[..., None]) @ position / (position @ position)
+    return slope / mean
+
+
+def volume_profile(volume: Any) -> Dict[str, Any]:
+    """
+    Volume statistics along the last axis: latest bar, whole-window mean,
+    mean of the last 5 bars, of the 5 before them and of the last 20
+    """
+    v = indicators.as_array(volume)
+    return {
+        "last": v[..., -1].copy(),
+        "mean": v.mean(axis=-1),
+        "recent_mean": v[..., -5:].mean(axis=-1),
+        "previous_mean": v[..., -10:-5].mean(axis=-1),
+        "baseline_mean": v[..., -20:].mean(axis=-1),
+    }
+
+
+FEATURES: Dict[str, Callable[[Any], Any]] = {
+    "volatility": return_volatility,
+    "trend_strength": trend_strength,
+    "volume_profile": volume_profile,
+}
+
+
+class FeatureStore:
+    """
+    Features memoized per (instrument, granularity, closed bar, window length).
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self._memo = BarMemo(max_entries=max_entries)
+        self._lock = threading.Lock()
+        self.uncached = 0
+
+    def get(self, feature: str, values: Any, symbol: Optional[str] = None, granularity: str = "M15",
+            bar_time: Any = None, window: Optional[int] = None) -> Any:
+        """
+        Feature over the last `window` values (all when None) of a series
+        ending on bar_time
+        """
+        values = indicators.as_array(values)
+        if window is not None:
+            values = values[-window:]
+        bar_time = bar_time_ns(bar_time)
+        if not symbol or bar_time is None or not len(values):
+            with self._lock:
+                self.uncached += 1
+            return FEATURES[feature](values)
+        return self._memo.get_or_compute(feature, symbol, granularity, bar_time, str(len(values)),
+                                         lambda: FEATURES[feature](values))
+
+    def volatility(self, prices: Any, symbol: Optional[str] = None, granularity: str = "M15",
+                   bar_time: Any = None, window: Optional[int] = None) -> float:
+        """Un-annualized std of simple returns"""
+        return float(self.get("volatility", prices, symbol, granularity, bar_time, window))
+
+    def trend_strength(self, prices: Any, symbol: Optional[str] = None, granularity: str = "M15",
+                       bar_time: Any = None, window: Optional[int] = None) -> float:
+        """Regression slope per bar as a fraction of the mean price"""
+        return float(self.get("trend_strength", prices, symbol, granularity, bar_time, window))
+
+    def volume_profile(self, volume: Any, symbol: Optional[str] = None, granularity: str = "M15",
+                       bar_time: Any = None, window: Optional[int] = None) -> Dict[str, Any]:
+        """volume_profile() statistics"""
+        return self.get("volume_profile", volume, symbol, granularity, bar_time, window)
+
+    def on_candles(self, instrument: str, granularity: str, candles: Any, full: bool):
+        """CandleCache listener: a newly closed bar expires the previous bar's features"""
+        self._memo.on_candles(instrument, granularity, candles, full)
+
+    def clear(self):
+        self._memo.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._memo.stats()
+        with self._lock:
+            stats["uncached"] = self.uncached
+        return stats
+
+
+_shared_store: Optional[FeatureStore] = None
+_shared_lock = threading.Lock()
+
+
+def get_feature_store() -> FeatureStore:
+    """Process-wide store shared by the regime, hedge, leverage and filter modules"""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = FeatureStore()
+        return _shared_store
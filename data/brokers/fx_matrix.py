@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+FX Conversion Matrix - RBOTzilla UNI
+Currency -> USD rates kept current from the latest quotes, so notional,
+margin-estimate and P&L conversions are in-memory lookups.
+
+- Fed by every QuoteBoard update (pricing stream and REST refreshes)
+- Direct rates from XXX_USD / USD_XXX mids; other currencies triangulate
+  through the majors (e.g. SEK via EUR_SEK and EUR_USD)
+- Triangulated rates are cached until a quote on one of their legs (or
+  on the currency itself) changes; a newly quoted instrument, which may
+  open a better path, drops the whole cache
+- Rates older than max_age_s are not served (callers fall back to their
+  own lookup or refuse the check)
+PIN: 841921
+"""
+
+import time
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+# Preferred triangulation legs, most liquid first
+MAJORS = ("EUR", "JPY", "GBP", "CHF", "AUD", "CAD", "NZD")
+
+DEFAULT_MAX_AGE_S = 300.0
+
+
+def split_instrument(instrument: str) -> Tuple[str, str]:
+    """'EUR_GBP' (or 'EUR/GBP') -> ('EUR', 'GBP')"""
+    base, quote = instrument.replace("/", "_").split("_", 1)
+    return base, quote
+
+
+class FxMatrix:
+    """Thread-safe currency -> USD rate table"""
+
+    def __init__(self, max_age_s: float = DEFAULT_MAX_AGE_S):
+        self.max_age_s = max_age_s
+        self._mids: Dict[str, Tuple[float, float]] = {}         # instrument -> (mid, monotonic time)
+        self._pairs_by_ccy: Dict[str, set] = {}                  # currency -> instruments quoting it
+        # ccy -> (rate, oldest leg time, leg instruments)
+        self._derived: Dict[str, Tuple[Optional[float], float, Tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+        self.updates = 0
+        self.lookups = 0
+        self.misses = 0
+        self.derived_hits = 0
+
+    # --- feed -----------------------------------------------------------------------------
+    def update(self, instrument: str, mid: float, at: Optional[float] = None):
+        """Record the latest mid for an instrument"""
+        if not mid or mid <= 0:
+            return
+        base, quote = split_instrument(instrument)
+        with self._lock:
+            if instrument not in self._mids:
+                self._pairs_by_ccy.setdefault(base, set()).add(instrument)
+                self._pairs_by_ccy.setdefault(quote, set()).add(instrument)
+                self._derived.clear()
+            else:
+                stale = [ccy for ccy, (rate, _, legs) in self._derived.items()
+                         if rate is None or ccy in (base, quote) or instrument in legs]
+                for ccy in stale:
+                    del self._derived[ccy]
+            self._mids[instrument] = (float(mid), at if at is not None else time.monotonic())
+            self.updates += 1
+
+    def on_quote(self, quote: Any):
+        """QuoteBoard listener: takes a Quote (instrument, mid, received_at)"""
+        if quote.instrument and quote.mid:
+            self.update(quote.instrument, quote.mid, quote.received_at)
+
+    # --- lookups --------------------------------------------------------------------------
+    def _fresh(self, instrument: str, now: float) -> Optional[Tuple[float, float]]:
+        entry = self._mids.get(instrument)
+        if entry is None or now - entry[1] > self.max_age_s:
+            return None
+        return entry
+
+    def _direct(self, ccy: str, now: float) -> Optional[Tuple[float, float]]:
+        """(USD rate, quote time) from a USD pair"""
+        entry = self._fresh(f"{ccy}_USD", now)
+        if entry:
+            return entry
+        entry = self._fresh(f"USD_{ccy}", now)
+        return (1.0 / entry[0], entry[1]) if entry else None
+
+    def _direct_instrument(self, ccy: str, now: float) -> str:
+        return f"{ccy}_USD" if self._fresh(f"{ccy}_USD", now) else f"USD_{ccy}"
+
+    def _triangulate(self, ccy: str, now: float) -> Tuple[Optional[float], float, Tuple[str, ...]]:
+        """(USD rate via a major or any quoted leg, oldest quote time used, instruments used)"""
+        candidates = self._pairs_by_ccy.get(ccy, ())
+        legs = [c for c in MAJORS if c != ccy] + sorted(
+            {c for inst in candidates for c in split_instrument(inst)} - set(MAJORS) - {ccy, "USD"})
+        for leg in legs:
+            leg_entry = self._direct(leg, now)
+            if not leg_entry:
+                continue
+            leg_rate, leg_time = leg_entry
+            direct = self._direct_instrument(leg, now)
+            entry = self._fresh(f"{ccy}_{leg}", now)
+            if entry:
+                return entry[0] * leg_rate, min(entry[1], leg_time), (f"{ccy}_{leg}", direct)
+            entry = self._fresh(f"{leg}_{ccy}", now)
+            if entry:
+                return leg_rate / entry[0], min(entry[1], leg_time), (f"{leg}_{ccy}", direct)
+        return None, now, ()
+
+    def usd_rate(self, ccy: str) -> Optional[float]:
+        """USD value of one unit of ccy, or None if no fresh quote path exists"""
+        if ccy == "USD":
+            return 1.0
+        now = time.monotonic()
+        with self._lock:
+            self.lookups += 1
+            direct = self._direct(ccy, now)
+            if direct is not None:
+                return direct[0]
+            cached = self._derived.get(ccy)
+            if cached is None or now - cached[1] > self.max_age_s:
+                cached = self._derived[ccy] = self._triangulate(ccy, now)
+            else:
+                self.derived_hits += 1
+            rate = cached[0]
+            if rate is None:
+                self.misses += 1
+            return rate
+
+    def rate(self, from_ccy: str, to_ccy: str) -> Optional[float]:
+        """Units of to_ccy per unit of from_ccy"""
+        from_usd, to_usd = self.usd_rate(from_ccy), self.usd_rate(to_ccy)
+        if from_usd is None or not to_usd:
+            return None
+        return from_usd / to_usd
+
+    def convert(self, amount: float, from_ccy: str, to_ccy: str = "USD") -> Optional[float]:
+        rate = self.rate(from_ccy, to_ccy)
+        return amount * rate if rate is not None else None
+
+    def usd_notional(self, instrument: str, units: float, price: Optional[float] = None) -> Optional[float]:
+        """
+        USD value of |units| of the instrument's base currency.
+
+        For XXX_USD the caller's price is used when given (it is the
+        execution price); everything else is converted through the matrix.
+        """
+        base, quote = split_instrument(instrument)
+        if base == "USD":
+            return abs(units)
+        if quote == "USD" and price:
+            return abs(units) * price
+        rate = self.usd_rate(base)
+        return abs(units) * rate if rate is not None else None
+
+    def margin_estimate(self, instrument: str, units: float, margin_rate: float = 0.02,
+                        price: Optional[float] = None) -> Optional[float]:
+        """USD margin for a position (notional x margin rate)"""
+        notional = self.usd_notional(instrument, units, price)
+        return notional * margin_rate if notional is not None else None
+
+    def pnl_usd(self, instrument: str, units: float, entry_price: float, exit_price: float) -> Optional[float]:
+        """Signed P&L in USD; units negative for shorts (P&L accrues in the quote currency)"""
+        rate = self.usd_rate(split_instrument(instrument)[1])
+        if rate is None:
+            return None
+        return units * (exit_price - entry_price) * rate
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "instruments": len(self._mids),
+                "currencies": len(self._pairs_by_ccy),
+                "updates": self.updates,
+                "lookups": self.lookups,
+                "misses": self.misses,
+                "derived_hits": self.derived_hits,
+            }
+
+
+_shared_matrix: Optional[FxMatrix] = None
+_shared_lock = threading.Lock()
+
+
+def get_fx_matrix() -> FxMatrix:
+    """Process-wide matrix fed by every connector's quote board"""
+    global _shared_matrix
+    with _shared_lock:
+        if _shared_matrix is None:
+            _shared_matrix = FxMatrix()
+        return _shared_matrix
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Higher-Timeframe Resampler - RBOTzilla UNI
+H1/H4/D candles built incrementally from the cached base (M15) bars.
+
+- Registered as a CandleCache listener: each newly closed base bar updates
+  only the HTF bar it falls in; the HTF bar closes with the last base bar
+  of its period (or when a later period starts, across gaps and weekends)
+- Every closed HTF bar advances a streaming IndicatorState, so the HTF
+  trend (and RSI/MACD/ATR...) is an O(1) read for any instrument
+- Periods are aligned to UTC (D starts at 00:00 UTC); seed() warms a
+  series from natively fetched HTF candles, since a 200-bar H4 trend
+  needs far more history than one base window holds. The connectors
+  request them with WARMUP_PARAMS (OANDA aligns H4/D to 17:00 New York
+  by default); native bars off the UTC grid are rejected, never mixed in
+PIN: 841921
+"""
+
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .candle_frame import decode_candles
+    from .indicator_state import IndicatorState
+except ImportError:
+    from candle_frame import decode_candles
+    from indicator_state import IndicatorState
+
+GRANULARITY_SECONDS = {
+    "M1": 60, "M5": 300, "M15": 900, "M30": 1800,
+    "H1": 3600, "H4": 14400, "D": 86400,
+}
+
+DEFAULT_TARGETS = ("H1", "H4", "D")
+
+# Native candle request options matching the UTC buckets built here
+WARMUP_PARAMS = {"price": "M", "alignmentTimezone": "UTC", "dailyAlignment": 0}
+
+logger = logging.getLogger(__name__)
+
+
+def _iso(seconds: int) -> str:
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class HtfSeries:
+    """One higher-timeframe candle series for an instrument"""
+
+    def __init__(self, granularity: str, history: int = 500, trend_period: int = 200):
+        self.granularity = granularity
+        self.seconds = GRANULARITY_SECONDS[granularity]
+        self.candles: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.forming: Optional[Dict[str, float]] = None
+        self.state = IndicatorState({"trend_period": trend_period})
+        self.last_closed_start: Optional[int] = None
+        self.rejected = 0
+
+    def update(self, start_s: int, base_seconds: int, open_: float, high: float, low: float,
+               close: float, volume: float) -> int:
+        """Apply one closed base bar starting at start_s; returns how many HTF bars closed"""
+        bucket = start_s - start_s % self.seconds
+        if self.last_closed_start is not None and bucket <= self.last_closed_start:
+            return 0  # already covered by a closed (or seeded) HTF bar
+        closed = 0
+        if self.forming is not None and self.forming["start"] != bucket:
+            # The previous period never saw its last base bar (gap, weekend)
+            self._close()
+            closed += 1
+        bar = self.forming
+        if bar is None:
+            self.forming = {"start": bucket, "open": open_, "high": high, "low": low,
+                            "close": close, "volume": volume}
+        else:
+            bar["high"] = max(bar["high"], high)
+            bar["low"] = min(bar["low"], low)
+            bar["close"] = close
+            bar["volume"] += volume
+        if start_s + base_seconds >= bucket + self.seconds:
+            self._close()
+            closed += 1
+        return closed
+
+    def _close(self):
+        bar, self.forming = self.forming, None
+        self._append({"time": _iso(bar["start"]), "volume": bar["volume"], "complete": True,
+                      "mid": {"o": bar["open"], "h": bar["high"], "l": bar["low"], "c": bar["close"]}},
+                     bar["start"])
+
+    def _append(self, candle: Dict[str, Any], start: int):
+        mid = candle["mid"]
+        self.candles.append(candle)
+        self.state.update(candle["time"], mid["h"], mid["l"], mid["c"], candle["volume"])
+        self.last_closed_start = start
+
+    def seed(self, candles: Any) -> int:
+        """
+        Load history from native HTF candles. Complete native bars replace
+        the built bars of the same periods (the first built one may cover
+        only part of its period); built bars after the last native one are
+        kept. Bars not starting on this series' UTC grid are rejected. The
+        indicator state is replayed over the joined series.
+        """
+        frame = decode_candles(candles)
+        native: Dict[int, Dict[str, Any]] = {}
+        misaligned = 0
+        for i in range(len(frame)):
+            start = int(frame.time[i] // 10 ** 9)
+            if not frame.complete[i]:
+                continue
+            if start % self.seconds:
+                misaligned += 1
+                continue
+            native[start] = {"time": _iso(start), "volume": float(frame.volume[i]), "complete": True,
+                             "mid": {"o": float(frame.open[i]), "h": float(frame.high[i]),
+                                     "l": float(frame.low[i]), "c": float(frame.close[i])}}
+        if misaligned:
+            self.rejected += misaligned
+            logger.warning(f"{self.granularity} seed: {misaligned} bars off the UTC grid rejected "
+                           f"(request them with {WARMUP_PARAMS})")
+        if not native:
+            return 0
+        last_native = max(native)
+        built = list(self.candles)
+        built_starts = [int(t // 10 ** 9) for t in decode_candles(built).time]
+        joined = [(native[start], start) for start in sorted(native)]
+        joined.extend((candle, start) for candle, start in zip(built, built_starts) if start > last_native)
+        if self.forming is not None and self.forming["start"] <= last_native:
+            self.forming = None
+        self.candles.clear()
+        self.state.reset()
+        for candle, start in joined:
+            self._append(candle, start)
+        return len(native)
+
+    def read(self, count: Optional[int] = None, include_forming: bool = False) -> List[Dict[str, Any]]:
+        """Last `count` HTF candles (oldest first), optionally ending with the forming one"""
+        candles = list(self.candles)
+        if include_forming and self.forming is not None:
+            bar = self.forming
+            candles.append({"time": _iso(bar["start"]), "volume": bar["volume"], "complete": False,
+                            "mid": {"o": bar["open"], "h": bar["high"], "l": bar["low"], "c": bar["close"]}})
+        return candles if count is None else candles[-count:]
+
+
+class HtfResampler:
+    """
+    HTF series per (instrument, granularity), fed with closed base bars.
+
+    Register on_candles as a CandleCache listener; merges of any other
+    granularity are ignored.
+    """
+
+    def __init__(self, base: str = "M15", targets: Sequence[str] = DEFAULT_TARGETS, history: int = 500,
+                 trend_period: int = 200):
+        self.base = base
+        self.base_seconds = GRANULARITY_SECONDS[base]
+        self.targets = tuple(t for t in targets if GRANULARITY_SECONDS[t] > self.base_seconds)
+        self.history = history
+        self.trend_period = trend_period
+        self._series: Dict[Tuple[str, str], HtfSeries] = {}
+        self._last_base: Dict[str, int] = {}
+        self._warmed: set = set()
+        self._lock = threading.Lock()
+        self.base_bars = 0
+        self.htf_bars = 0
+
+    def _series_for(self, instrument: str, granularity: str) -> HtfSeries:
+        key = (instrument, granularity)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = HtfSeries(granularity, self.history, self.trend_period)
+        return series
+
+    def on_candles(self, instrument: str, granularity: str, candles: List[Dict[str, Any]], full: bool = False):
+        """Apply the newly closed base bars of a merge to every target series"""
+        if granularity != self.base:
+            return
+        closed = [c for c in candles if c.get("complete", True)]
+        if not closed:
+            return
+        frame = decode_candles(closed)
+        with self._lock:
+            last = self._last_base.get(instrument)
+            series = [self._series_for(instrument, target) for target in self.targets]
+            for i in range(len(frame)):
+                start = int(frame.time[i] // 10 ** 9)
+                if last is not None and start <= last:
+                    continue
+                bar = (float(frame.open[i]), float(frame.high[i]), float(frame.low[i]),
+                       float(frame.close[i]), float(frame.volume[i]))
+                for target in series:
+                    self.htf_bars += target.update(start, self.base_seconds, *bar)
+                last = start
+                self.base_bars += 1
+            self._last_base[instrument] = last
+
+    def seed(self, instrument: str, granularity: str, candles: Any) -> int:
+        """Warm an HTF series from natively fetched candles of that granularity"""
+        with self._lock:
+            return self._series_for(instrument, granularity).seed(candles)
+
+    def warmup_requests(self, instrument: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        (granularity, candles params) to seed an instrument's series with;
+        empty once claimed, so each instrument is fetched once per process
+        """
+        with self._lock:
+            if instrument in self._warmed:
+                return []
+            self._warmed.add(instrument)
+        return [(target, dict(WARMUP_PARAMS, count=self.history, granularity=target)) for target in self.targets]
+
+    def warmup_failed(self, instrument: str):
+        """Release a warm-up claim after a failed fetch so the next read retries it"""
+        with self._lock:
+            self._warmed.discard(instrument)
+
+    def candles(self, instrument: str, granularity: str, count: Optional[int] = None,
+                include_forming: bool = False) -> List[Dict[str, Any]]:
+        """HTF candles (OANDA mid format, oldest first)"""
+        with self._lock:
+            series = self._series.get((instrument, granularity))
+            return series.read(count, include_forming) if series is not None else []
+
+    def state(self, instrument: str, granularity: str) -> Optional[IndicatorState]:
+        """Streaming indicators over the closed HTF bars (trend_ema for the HTF trend)"""
+        series = self._series.get((instrument, granularity))
+        return series.state if series is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "series": len(self._series),
+                "base_bars": self.base_bars,
+                "htf_bars": self.htf_bars,
+                "warmed": len(self._warmed),
+                "seed_rejected": sum(s.rejected for s in self._series.values()),
+                "trend_ready": sum(1 for s in self._series.values() if s.state.bars >= self.trend_period),
+            }
+
+
+_shared_resampler: Optional[HtfResampler] = None
+_shared_lock = threading.Lock()
+
+
+def get_htf_resampler() -> HtfResampler:
+    """Process-wide resampler fed by every connector's candle cache"""
+    global _shared_resampler
+    with _shared_lock:
+        if _shared_resampler is None:
+            _shared_resampler = HtfResampler()
+        return _shared_resampler
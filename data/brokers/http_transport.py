@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP Transport - RBOTzilla UNI
+Shared keep-alive sessions for broker REST connectors.
+
+- One pooled requests.Session per API base URL, shared by every connector
+  instance in the process (engines, order router, position police)
+- Configurable connection pool size
+- Idempotency-aware retry: only GET/HEAD/OPTIONS are retried, with jittered
+  exponential backoff; order placement (POST/PUT) is never replayed
+- Per-endpoint retry policies (candles, pricing, ...)
+- Warm-connection reuse accounting from the urllib3 pools
+- Optional shared rate limiter (priority admission) and single-flight
+  coalescing of identical in-flight GETs
+PIN: 841921
+"""
+
+import random
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Any, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from .rate_limiter import RateLimiter, SingleFlight, default_priority, request_key
+except ImportError:
+    from rate_limiter import RateLimiter, SingleFlight, default_priority, request_key
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+DEFAULT_POOL_SIZE = 10
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry/backoff settings for one class of endpoint"""
+    max_retries: int = 2
+    backoff_base_s: float = 0.1
+    backoff_cap_s: float = 1.0
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt (1-based)"""
+        ceiling = min(self.backoff_cap_s, self.backoff_base_s * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+NO_RETRY = RetryPolicy(max_retries=0)
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+class PooledTransport:
+    """
+    Keep-alive HTTP transport for a single API base URL.
+
+    Wraps a requests.Session mounted with a sized HTTPAdapter so TCP+TLS
+    handshakes are paid once per pooled connection instead of once per call.
+    """
+
+    def __init__(self, base_url: str, pool_size: int = DEFAULT_POOL_SIZE,
+                 retry_policies: Optional[Dict[str, RetryPolicy]] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
+        """
+        Args:
+            base_url: API base URL (e.g. "https://api-fxpractice.oanda.com")
+            pool_size: Max keep-alive connections held for this host
+            retry_policies: Endpoint-class name -> RetryPolicy overrides
+            rate_limiter: Shared request budget for this host (None = unlimited)
+        """
+        self.base_url = base_url
+        self.pool_size = pool_size
+        self.retry_policies: Dict[str, RetryPolicy] = dict(retry_policies or {})
+        self.rate_limiter = rate_limiter
+        self.single_flight = SingleFlight()
+
+        self.session = requests.Session()
+        # urllib3-level retries stay off: retry decisions are made here so
+        # non-idempotent requests are never replayed.
+        self._adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                                    max_retries=0, pool_block=False)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+        self._lock = threading.Lock()
+        self.total_requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    def set_retry_policy(self, endpoint_class: str, policy: RetryPolicy):
+        """Register or replace the retry policy for an endpoint class"""
+        with self._lock:
+            self.retry_policies[endpoint_class] = policy
+
+    def _policy_for(self, method: str, endpoint_class: Optional[str]) -> RetryPolicy:
+        if method.upper() not in IDEMPOTENT_METHODS:
+            return NO_RETRY
+        if endpoint_class and endpoint_class in self.retry_policies:
+            return self.retry_policies[endpoint_class]
+        return DEFAULT_RETRY_POLICY
+
+    def request(self, method: str, url: str, endpoint_class: Optional[str] = None,
+                priority: Optional[int] = None, coalesce: bool = True,
+                **kwargs: Any) -> requests.Response:
+        """
+        Issue a request over the pooled session.
+
+        Idempotent methods are retried on connection errors, timeouts and
+        429/5xx responses. The final response (or exception) is returned to
+        the caller unchanged, so existing raise_for_status() handling works.
+        A GET identical to one already in flight (URL, params, Authorization)
+        waits for and returns that request's response.
+
+        Args:
+            method: HTTP method
+            url: Absolute request URL
+            endpoint_class: Optional key selecting a per-endpoint RetryPolicy
+                and rate-limit bucket
+            priority: Rate-limit priority (default: orders > account > scans)
+            coalesce: Share identical in-flight GETs (default True)
+            **kwargs: Passed through to requests.Session.request
+
+        Raises:
+            RateLimitExceeded: the rate limiter shed the request
+        """
+        method = method.upper()
+        if priority is None:
+            priority = default_priority(method, endpoint_class)
+        if method == "GET" and coalesce:
+            headers = kwargs.get("headers") or {}
+            key = request_key(method, url, kwargs.get("params"), headers.get("Authorization"))
+            if key is not None:
+                return self.single_flight.do(
+                    key, lambda: self._send(method, url, endpoint_class, priority, **kwargs)
+                )
+        return self._send(method, url, endpoint_class, priority, **kwargs)
+
+    def _send(self, method: str, url: str, endpoint_class: Optional[str], priority: int,
+              **kwargs: Any) -> requests.Response:
+        policy = self._policy_for(method, endpoint_class)
+        attempt = 0
+
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint_class, priority)
+            with self._lock:
+                self.total_requests += 1
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= policy.max_retries:
+                    with self._lock:
+                        self.failures += 1
+                    raise
+                attempt += 1
+                delay = policy.backoff(attempt)
+                logger.warning(f"Transport retry {attempt}/{policy.max_retries} for {method} {url} "
+                               f"after {type(e).__name__}, backing off {delay * 1000:.0f}ms")
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= policy.max_retries:
+                    return response
+                attempt += 1
+                delay = self._retry_after(response) or policy.backoff(attempt)
+                logger.warning(f"Transport retry {attempt}/{policy.max_retries} for {method} {url} "
+                               f"after HTTP {response.status_code}, backing off {delay * 1000:.0f}ms")
+                response.close()
+
+            with self._lock:
+                self.retries += 1
+            time.sleep(delay)
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """Honor a numeric Retry-After header (seconds), capped at 5s"""
+        value = response.headers.get("Retry-After")
+        try:
+            return min(float(value), 5.0) if value is not None else None
+        except ValueError:
+            return None
+
+    def _pool_counters(self) -> Tuple[int, int]:
+        """Sum (requests, new connections) across this session's urllib3 pools"""
+        pool_requests = 0
+        new_connections = 0
+        pools = self._adapter.poolmanager.pools
+        with pools.lock:
+            for key in list(pools.keys()):
+                pool = pools._container.get(key)
+                if pool is None:
+                    continue
+                pool_requests += pool.num_requests
+                new_connections += pool.num_connections
+        return pool_requests, new_connections
+
+    def stats(self) -> Dict[str, Any]:
+        """Transport statistics including how many requests reused a warm connection"""
+        pool_requests, new_connections = self._pool_counters()
+        reused = max(0, pool_requests - new_connections)
+        with self._lock:
+            return {
+                "base_url": self.base_url,
+                "pool_size": self.pool_size,
+                "total_requests": self.total_requests,
+                "new_connections": new_connections,
+                "warm_reuses": reused,
+                "warm_reuse_rate": round(reused / pool_requests, 3) if pool_requests else 0.0,
+                "retries": self.retries,
+                "failures": self.failures,
+                "coalesced": self.single_flight.shared,
+                "rate_limiter": self.rate_limiter.stats() if self.rate_limiter else None,
+            }
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+
+_shared_transports: Dict[str, PooledTransport] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_transport(base_url: str, pool_size: int = DEFAULT_POOL_SIZE,
+                         retry_policies: Optional[Dict[str, RetryPolicy]] = None,
+                         rate_limiter: Optional[RateLimiter] = None) -> PooledTransport:
+    """
+    Return the process-wide transport for base_url, creating it on first use.
+
+    Every connector pointed at the same API host shares one warm pool, so
+    short-lived connectors (e.g. one per manual order) still reuse connections.
+    The pool size of the first caller wins; later retry policies are merged in
+    and a rate limiter is attached if the transport has none yet.
+    """
+    with _shared_lock:
+        transport = _shared_transports.get(base_url)
+        if transport is None:
+            transport = PooledTransport(base_url, pool_size=pool_size, retry_policies=retry_policies,
+                                        rate_limiter=rate_limiter)
+            _shared_transports[base_url] = transport
+            logger.info(f"Pooled transport created for {base_url} (pool_size={pool_size})")
+        else:
+            for endpoint_class, policy in (retry_policies or {}).items():
+                transport.set_retry_policy(endpoint_class, policy)
+            if transport.rate_limiter is None and rate_limiter is not None:
+                transport.rate_limiter = rate_limiter
+        return transport
+
+
+def close_shared_transports():
+    """Close and forget every shared transport (shutdown/test helper)"""
+    with _shared_lock:
+        for transport in _shared_transports.values():
+            transport.close()
+        _shared_transports.clear()
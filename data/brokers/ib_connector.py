@@ -10,7 +10,9 @@ import os
 import sys
 import time
 import logging
+import math
 import threading
+from collections import deque
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
@@ -33,6 +35,12 @@ except ImportError:
     IB_INSYNC_AVAILABLE = False
     logging.warning("⚠️ ib_insync not installed. Run: pip install ib_insync")
 
+# Per-endpoint latency histograms shared by every connector
+try:
+    from .latency_recorder import get_latency_recorder
+except ImportError:
+    from latency_recorder import get_latency_recorder
+
 # Charter compliance imports
 try:
     from ..foundation.rick_charter import validate_pin
@@ -84,7 +92,8 @@ class IBConnector:
     - Order management (Market, Limit, Stop)
     - Position tracking
     - Account monitoring
-    - Fresh data guarantee (no caching)
+    - Fresh data guarantee (snapshot mode) or streaming quote board
+      (persistent subscriptions, read from the live ticker table)
     
     Requirements:
     - IB Gateway or TWS running
@@ -92,13 +101,15 @@ class IBConnector:
     - ib_insync library: pip install ib_insync
     """
     
-    def __init__(self, pin: int = None, environment: str = None):
+    def __init__(self, pin: int = None, environment: str = None, streaming: bool = None):
         """
         Initialize IB Gateway connector
         
         Args:
             pin: Charter PIN (841921)
             environment: 'paper' or 'live' (if None, reads from env)
+            streaming: Keep persistent market-data subscriptions and serve
+                prices from the ticker table (if None, reads IB_STREAMING_QUOTES)
         """
         if not IB_INSYNC_AVAILABLE:
             raise ImportError(
@@ -122,11 +133,22 @@ class IBConnector:
         # Connection lock for thread safety
         self._connection_lock = threading.Lock()
         
-        # Market data subscriptions
+        # Market data subscriptions (symbol -> live Ticker, updated in place by ib_insync)
         self._subscriptions: Dict[str, Any] = {}
         
+        # Qualified contracts per symbol (qualifyContracts is a Gateway round trip)
+        self._contracts: Dict[str, "Contract"] = {}
+        
+        if streaming is None:
+            streaming = os.getenv("IB_STREAMING_QUOTES", "false").lower() == "true"
+        self.streaming = streaming
+        
+        # Longest wait for the first tick of a new subscription / snapshot
+        self.quote_timeout = float(os.getenv("IB_QUOTE_TIMEOUT_S", "5"))
+        
         # Performance tracking
-        self.request_times = []
+        self.request_times = deque(maxlen=100)
+        self.latency = get_latency_recorder()
         
         # Connect to IB Gateway
         self._connect()
@@ -203,6 +225,7 @@ class IBConnector:
     def disconnect(self):
         """Disconnect from IB Gateway"""
         if self.connected:
+            self.unsubscribe_quotes()
             self.ib.disconnect()
             self.connected = False
             self.logger.info("🔌 IB Gateway disconnected")
@@ -212,11 +235,144 @@ class IBConnector:
         if not self.connected or not self.ib.isConnected():
             self.logger.warning("⚠️ IB connection lost, reconnecting...")
             self._connect()
+            
+            # Subscriptions die with the socket; restore the quote board
+            symbols = list(self._subscriptions)
+            self._subscriptions.clear()
+            if symbols:
+                self.subscribe_quotes(symbols)
+    
+    def subscribe_quotes(self, symbols: List[str]) -> Dict[str, bool]:
+        """
+        Open persistent streaming subscriptions for symbols
+        
+        Each ticker is then kept current by ib_insync; reads cost no
+        round trip. Waits (up to quote_timeout, once for the whole batch)
+        for the first bid/ask of new subscriptions.
+        
+        Returns:
+            {symbol: True if a two-sided quote is available}
+        """
+        self._ensure_connected()
+        
+        new_tickers = []
+        for symbol in symbols:
+            key = self._symbol_key(symbol)
+            if key in self._subscriptions:
+                continue
+            try:
+                contract = self._get_contract(key)
+                ticker = self.ib.reqMktData(contract, '', False, False)
+                self._subscriptions[key] = ticker
+                new_tickers.append(ticker)
+            except Exception as e:
+                self.logger.error(f"❌ Subscription failed for {symbol}: {e}")
+        
+        deadline = time.perf_counter() + self.quote_timeout
+        while any(not self._has_quote(t) for t in new_tickers) and time.perf_counter() < deadline:
+            self.ib.sleep(0.05)
+        
+        if new_tickers:
+            self.logger.info(f"📡 Streaming quotes: {len(self._subscriptions)} symbols")
+            log_narration(
+                "IB_QUOTES_SUBSCRIBED",
+                {"symbols": sorted(self._subscriptions), "new": len(new_tickers)}
+            )
+        
+        return {
+            self._symbol_key(symbol): self._has_quote(self._subscriptions.get(self._symbol_key(symbol)))
+            for symbol in symbols
+        }
+    
+    def unsubscribe_quotes(self, symbols: List[str] = None):
+        """Cancel streaming subscriptions (all if symbols is None)"""
+        keys = list(self._subscriptions) if symbols is None else [self._symbol_key(s) for s in symbols]
+        for key in keys:
+            ticker = self._subscriptions.pop(key, None)
+            if ticker is None:
+                continue
+            try:
+                self.ib.cancelMktData(ticker.contract)
+            except Exception as e:
+                self.logger.debug(f"cancelMktData failed for {key}: {e}")
+    
+    def get_bid_ask_many(self, symbols: List[str]) -> Dict[str, Dict[str, float]]:
+        """
+        Bid/ask for several symbols with one event-loop pump
+        
+        Streaming mode reads the ticker table (subscribing any symbol not yet
+        on the board); snapshot mode falls back to get_current_bid_ask per symbol.
+        """
+        if not self.streaming:
+            return {symbol: self.get_current_bid_ask(symbol) for symbol in symbols}
+        
+        start_time = time.perf_counter()
+        self._ensure_connected()
+        
+        missing = [s for s in symbols if self._symbol_key(s) not in self._subscriptions]
+        if missing:
+            self.subscribe_quotes(missing)
+        else:
+            # Drain pending ticks so every ticker reflects the latest update
+            self.ib.sleep(0)
+        
+        result = {
+            symbol: self._quote_from_ticker(symbol, self._subscriptions.get(self._symbol_key(symbol)))
+            for symbol in symbols
+        }
+        self._track_latency("reqMktData/stream", (time.perf_counter() - start_time) * 1000)
+        return result
+    
+    @staticmethod
+    def _symbol_key(symbol: str) -> str:
+        return symbol.upper().replace('_', '.')
+    
+    @staticmethod
+    def _tick_value(value: Any) -> float:
+        """Ticker field as float; ib_insync marks missing values as nan (older: -1)"""
+        if value is None:
+            return 0.0
+        value = float(value)
+        if math.isnan(value) or value == -1:
+            return 0.0
+        return value
+    
+    def _has_quote(self, ticker: Any) -> bool:
+        return bool(
+            ticker is not None
+            and self._tick_value(ticker.bid) > 0
+            and self._tick_value(ticker.ask) > 0
+        )
+    
+    def _quote_from_ticker(self, symbol: str, ticker: Any) -> Dict[str, float]:
+        if not self._has_quote(ticker):
+            return {
+                'bid': 0.0,
+                'ask': 0.0,
+                'last': 0.0,
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'symbol': symbol,
+                'error': 'No market data available'
+            }
+        tick_time = getattr(ticker, 'time', None)
+        return {
+            'bid': self._tick_value(ticker.bid),
+            'ask': self._tick_value(ticker.ask),
+            'last': self._tick_value(ticker.last),
+            'timestamp': (tick_time or datetime.now(timezone.utc)).isoformat(),
+            'symbol': symbol
+        }
+    
+    def _track_latency(self, operation: str, elapsed_ms: float, error: bool = False, timeout: bool = False):
+        self.request_times.append(elapsed_ms)
+        self.latency.record("IBKR", "API", operation, elapsed_ms, error=error, timeout=timeout)
     
     def get_current_bid_ask(self, symbol: str) -> Dict[str, float]:
         """
         Get FRESH bid/ask prices for symbol
-        NEVER uses cached data - always fresh API call
+        
+        Snapshot mode requests a one-off snapshot per call. Streaming mode
+        reads the live ticker table (kept current by the subscription).
         
         Args:
             symbol: Trading symbol (e.g., 'EUR.USD', 'BTC', 'AAPL')
@@ -230,24 +386,26 @@ class IBConnector:
                 'symbol': str
             }
         """
-        start_time = time.time()
+        if self.streaming:
+            return self.get_bid_ask_many([symbol])[symbol]
+        
+        start_time = time.perf_counter()
         self._ensure_connected()
         
         try:
-            # Create contract based on symbol
-            contract = self._create_contract(symbol)
+            # Qualified contract (cached per symbol)
+            contract = self._get_contract(symbol)
             
             # Request fresh market data (snapshot)
             ticker = self.ib.reqMktData(contract, snapshot=True)
             
             # Wait for data (with timeout)
-            timeout = 5
-            elapsed = 0
-            while (ticker.bid == -1 or ticker.ask == -1) and elapsed < timeout:
+            deadline = time.perf_counter() + self.quote_timeout
+            while not self._has_quote(ticker) and time.perf_counter() < deadline:
                 self.ib.sleep(0.1)
-                elapsed += 0.1
             
-            if ticker.bid == -1 or ticker.ask == -1:
+            if not self._has_quote(ticker):
+                self._track_latency("reqMktData/snapshot", (time.perf_counter() - start_time) * 1000, timeout=True)
                 self.logger.warning(f"⚠️ No market data for {symbol}")
                 return {
                     'bid': 0.0,
@@ -259,18 +417,16 @@ class IBConnector:
                 }
             
             result = {
-                'bid': float(ticker.bid) if ticker.bid != -1 else 0.0,
-                'ask': float(ticker.ask) if ticker.ask != -1 else 0.0,
-                'last': float(ticker.last) if ticker.last != -1 else 0.0,
+                'bid': self._tick_value(ticker.bid),
+                'ask': self._tick_value(ticker.ask),
+                'last': self._tick_value(ticker.last),
                 'timestamp': datetime.now(timezone.utc).isoformat(),
                 'symbol': symbol
             }
             
             # Track performance
-            elapsed_ms = (time.time() - start_time) * 1000
-            self.request_times.append(elapsed_ms)
-            if len(self.request_times) > 100:
-                self.request_times.pop(0)
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            self._track_latency("reqMktData/snapshot", elapsed_ms)
             
             self.logger.debug(
                 f"📊 {symbol}: BID={result['bid']:.5f} ASK={result['ask']:.5f} "
@@ -290,7 +446,30 @@ class IBConnector:
                 'error': str(e)
             }
     
-    def _create_contract(self, symbol: str) -> Contract:
+    def _get_contract(self, symbol: str) -> "Contract":
+        """
+        Qualified contract for symbol, built and qualified once per symbol
+        
+        Falls back to the unqualified contract (not cached) when the Gateway
+        cannot qualify it, so a transient failure is retried next time.
+        """
+        key = self._symbol_key(symbol)
+        contract = self._contracts.get(key)
+        if contract is not None:
+            return contract
+        
+        contract = self._create_contract(key)
+        try:
+            qualified = self.ib.qualifyContracts(contract)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not qualify {key}: {e}")
+            return contract
+        if qualified:
+            self._contracts[key] = qualified[0]
+            return qualified[0]
+        return contract
+    
+    def _create_contract(self, symbol: str) -> "Contract":
         """
         Create IB contract object from symbol using correct IB formats
         
@@ -347,8 +526,8 @@ class IBConnector:
         self._ensure_connected()
         
         try:
-            # Create contract
-            contract = self._create_contract(symbol)
+            # Qualified contract (cached per symbol)
+            contract = self._get_contract(symbol)
             
             # Create market order
             action = 'BUY' if direction.lower() == 'buy' else 'SELL'
@@ -412,7 +591,7 @@ class IBConnector:
         parent_order_id: int = None
     ):
         """Place stop loss and take profit orders"""
-        contract = self._create_contract(symbol)
+        contract = self._get_contract(symbol)
         
         # Opposite action for closing
         close_action = 'SELL' if direction.lower() == 'buy' else 'BUY'
@@ -517,6 +696,20 @@ class IBConnector:
             return 0.0
         return sum(self.request_times) / len(self.request_times)
     
+    def get_performance_stats(self) -> Dict[str, Any]:
+        """Get connector performance statistics"""
+        return {
+            "total_requests": len(self.request_times),
+            "avg_latency_ms": round(self.get_average_latency(), 1),
+            "max_latency_ms": round(max(self.request_times), 1) if self.request_times else 0,
+            "environment": self.environment,
+            "streaming": self.streaming,
+            "subscriptions": len(self._subscriptions),
+            "qualified_contracts": len(self._contracts),
+            "latency": self.latency.broker_summary("IBKR"),
+            "endpoints": self.latency.snapshot("IBKR")
+        }
+    
     def __del__(self):
         """Cleanup on deletion"""
         if hasattr(self, 'connected') and self.connected:
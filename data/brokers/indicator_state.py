@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Streaming Indicator State - RBOTzilla UNI
+O(1)-per-bar RSI, EMA, MACD, ATR, SMA and Bollinger kept per
+(instrument, granularity) and fed by the candle cache.
+
+- Each closed candle updates every indicator in constant time; nothing is
+  recomputed over the 120-200 bar window
+- Values match the brokers/indicators.py kernels (rolling windows exactly,
+  EMAs from the first bar the state has seen rather than from the start
+  of whatever window a caller happens to hold)
+- A short history of each output is kept so strategies can read current
+  and previous values (crossovers, ATR trend) without recomputing
+- snapshot()/restore() round-trip through JSON so state survives restarts
+PIN: 841921
+"""
+
+import json
+import math
+import os
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .candle_frame import decode_candles
+except ImportError:
+    from candle_frame import decode_candles
+
+# Periods used by the wolf packs and the HTF trend filter
+DEFAULT_CONFIG = {
+    "rsi_period": 14,
+    "rsi_smoothing": "sma",     # "sma" (wolf pack definition) or "wilder"
+    "macd_fast": 12,
+    "macd_slow": 26,
+    "macd_signal": 9,
+    "bb_period": 20,
+    "bb_std": 2.0,
+    "atr_period": 14,
+    "sma_periods": (20, 50),
+    "volume_period": 20,
+    "trend_period": 200,        # alpha-EMA seeded with the first close (multi_timeframe)
+}
+
+DEFAULT_HISTORY = 32
+
+
+class Ema:
+    """
+    Exponential moving average.
+
+    adjust=True reproduces pandas ewm(span).mean() weighting; adjust=False is
+    the alpha recursion seeded with the first value.
+    """
+
+    def __init__(self, span: int, adjust: bool = True):
+        self.span = span
+        self.adjust = adjust
+        self.decay = 1.0 - 2.0 / (span + 1.0)
+        self.num = 0.0
+        self.den = 0.0
+        self.value: Optional[float] = None
+
+    def update(self, x: float) -> float:
+        if self.adjust:
+            self.num = x + self.decay * self.num
+            self.den = 1.0 + self.decay * self.den
+            self.value = self.num / self.den
+        elif self.value is None:
+            self.value = x
+        else:
+            self.value = (1.0 - self.decay) * x + self.decay * self.value
+        return self.value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"span": self.span, "adjust": self.adjust, "num": self.num, "den": self.den, "value": self.value}
+
+    @classmethod
+    def restore(cls, data: Dict[str, Any]) -> "Ema":
+        ema = cls(data["span"], data["adjust"])
+        ema.num, ema.den, ema.value = data["num"], data["den"], data["value"]
+        return ema
+
+
+class RollingWindow:
+    """
+    Rolling mean and sample standard deviation over the last `window` values.
+
+    Running sums are kept around an anchor near the data and rebuilt exactly
+    from the window every `window` updates, so rounding never accumulates.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: Deque[float] = deque(maxlen=window)
+        self.anchor = 0.0
+        self.total = 0.0
+        self.squares = 0.0
+        self.since_rebuild = 0
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.window
+
+    def _rebuild(self):
+        self.anchor = self.values[-1] if self.values else 0.0
+        centred = [v - self.anchor for v in self.values]
+        self.total = math.fsum(centred)
+        self.squares = math.fsum(c * c for c in centred)
+        self.since_rebuild = 0
+
+    def update(self, x: float):
+        if self.full:
+            old = self.values[0] - self.anchor
+            self.total -= old
+            self.squares -= old * old
+        self.values.append(x)
+        self.since_rebuild += 1
+        if self.since_rebuild >= self.window:
+            self._rebuild()
+        else:
+            centred = x - self.anchor
+            self.total += centred
+            self.squares += centred * centred
+
+    @property
+    def mean(self) -> Optional[float]:
+        if not self.full:
+            return None
+        return self.anchor + self.total / self.window
+
+    def std(self, ddof: int = 1) -> Optional[float]:
+        if not self.full or self.window <= ddof:
+            return None
+        variance = (self.squares - self.total * self.total / self.window) / (self.window - ddof)
+        return math.sqrt(max(variance, 0.0))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"window": self.window, "values": list(self.values)}
+
+    @classmethod
+    def restore(cls, data: Dict[str, Any]) -> "RollingWindow":
+        rolling = cls(data["window"])
+        rolling.values.extend(data["values"])
+        rolling._rebuild()
+        return rolling
+
+
+class Rsi:
+    """RSI from rolling-mean ("sma", as the wolf packs compute it) or Wilder-smoothed gains/losses"""
+
+    def __init__(self, period: int = 14, smoothing: str = "sma"):
+        self.period = period
+        self.smoothing = smoothing
+        self.gains = RollingWindow(period)
+        self.losses = RollingWindow(period)
+        self.avg_gain: Optional[float] = None
+        self.avg_loss: Optional[float] = None
+        self.prev: Optional[float] = None
+        self.value: Optional[float] = None
+
+    def update(self, close: float) -> Optional[float]:
+        # The first bar has no change; it counts as a flat bar (pandas diff -> 0 gain/loss)
+        change = 0.0 if self.prev is None else close - self.prev
+        self.prev = close
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        if self.smoothing == "wilder" and self.avg_gain is not None:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+        else:
+            self.gains.update(gain)
+            self.losses.update(loss)
+            self.avg_gain, self.avg_loss = self.gains.mean, self.losses.mean
+        if self.avg_gain is None:
+            return None
+        if self.avg_loss == 0:
+            self.value = 100.0 if self.avg_gain > 0 else math.nan
+        else:
+            self.value = 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+        return self.value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"period": self.period, "smoothing": self.smoothing, "gains": self.gains.snapshot(),
+                "losses": self.losses.snapshot(), "avg_gain": self.avg_gain, "avg_loss": self.avg_loss,
+                "prev": self.prev, "value": self.value}
+
+    @classmethod
+    def restore(cls, data: Dict[str, Any]) -> "Rsi":
+        rsi = cls(data["period"], data["smoothing"])
+        rsi.gains = RollingWindow.restore(data["gains"])
+        rsi.losses = RollingWindow.restore(data["losses"])
+        rsi.avg_gain, rsi.avg_loss = data["avg_gain"], data["avg_loss"]
+        rsi.prev, rsi.value = data["prev"], data["value"]
+        return rsi
+
+
+class Macd:
+    """MACD line, signal line and histogram (pandas-weighted EMAs)"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast, self.slow, self.signal = Ema(fast), Ema(slow), Ema(signal)
+        self.value: Optional[Tuple[float, float, float]] = None
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        line = self.fast.update(close) - self.slow.update(close)
+        signal = self.signal.update(line)
+        self.value = (line, signal, line - signal)
+        return self.value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"fast": self.fast.snapshot(), "slow": self.slow.snapshot(), "signal": self.signal.snapshot()}
+
+    @classmethod
+    def restore(cls, data: Dict[str, Any]) -> "Macd":
+        macd = cls()
+        macd.fast, macd.slow, macd.signal = (Ema.restore(data[k]) for k in ("fast", "slow", "signal"))
+        line = macd.fast.value - macd.slow.value if macd.fast.value is not None else None
+        if line is not None:
+            macd.value = (line, macd.signal.value, line - macd.signal.value)
+        return macd
+
+
+class Atr:
+    """Rolling-mean average true range"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.window = RollingWindow(period)
+        self.prev_close: Optional[float] = None
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        true_range = high - low
+        if self.prev_close is not None:
+            true_range = max(true_range, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        self.window.update(true_range)
+        return self.window.mean
+
+    @property
+    def value(self) -> Optional[float]:
+        return self.window.mean
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"period": self.period, "window": self.window.snapshot(), "prev_close": self.prev_close}
+
+    @classmethod
+    def restore(cls, data: Dict[str, Any]) -> "Atr":
+        atr = cls(data["period"])
+        atr.window = RollingWindow.restore(data["window"])
+        atr.prev_close = data["prev_close"]
+        return atr
+
+
+# Outputs tracked in history, in update order
+OUTPUTS = ("close", "rsi", "macd", "macd_signal", "macd_histogram", "bb_upper", "bb_middle",
+           "bb_lower", "atr", "volume_ma", "trend_ema")
+
+
+class IndicatorState:
+    """Every streaming indicator for one (instrument, granularity)"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, history: int = DEFAULT_HISTORY):
+        self.config = dict(DEFAULT_CONFIG)
+        self.config.update(config or {})
+        self.config["sma_periods"] = tuple(self.config["sma_periods"])
+        self.history_size = history
+        self.reset()
+
+    def reset(self):
+        cfg = self.config
+        self.rsi = Rsi(cfg["rsi_period"], cfg["rsi_smoothing"])
+        self.macd = Macd(cfg["macd_fast"], cfg["macd_slow"], cfg["macd_signal"])
+        self.bollinger = RollingWindow(cfg["bb_period"])
+        self.atr = Atr(cfg["atr_period"])
+        self.smas = {period: RollingWindow(period) for period in cfg["sma_periods"]}
+        self.volume = RollingWindow(cfg["volume_period"])
+        self.trend = Ema(cfg["trend_period"], adjust=False)
+        self.bars = 0
+        self.last_time: Optional[str] = None
+        self.history: Dict[str, Deque[float]] = {
+            name: deque(maxlen=self.history_size)
+            for name in OUTPUTS + tuple(f"sma_{p}" for p in cfg["sma_periods"])
+        }
+
+    @property
+    def warmup_bars(self) -> int:
+        cfg = self.config
+        return max(cfg["rsi_period"] + 1, cfg["macd_slow"], cfg["bb_period"], cfg["atr_period"],
+                   cfg["volume_period"], *cfg["sma_periods"])
+
+    @property
+    def warm(self) -> bool:
+        """Every rolling indicator has a full window"""
+        return self.bars >= self.warmup_bars
+
+    def matches(self, **periods: Any) -> bool:
+        """True when the state was built with these settings (e.g. rsi_period=14)"""
+        return all(self.config.get(name) == value for name, value in periods.items())
+
+    def update(self, time: Optional[str], high: float, low: float, close: float, volume: float = 0.0) -> bool:
+        """Apply one closed bar; False (ignored) if it is not newer than the last bar"""
+        if time is not None and self.last_time is not None and time <= self.last_time:
+            return False
+        self.last_time = time
+        self.bars += 1
+
+        line, signal, histogram = self.macd.update(close)
+        self.bollinger.update(close)
+        for sma in self.smas.values():
+            sma.update(close)
+        self.volume.update(volume)
+
+        middle = self.bollinger.mean
+        spread = self.bollinger.std() * self.config["bb_std"] if middle is not None else None
+        values = {
+            "close": close,
+            "rsi": self.rsi.update(close),
+            "macd": line,
+            "macd_signal": signal,
+            "macd_histogram": histogram,
+            "bb_upper": middle + spread if middle is not None else None,
+            "bb_middle": middle,
+            "bb_lower": middle - spread if middle is not None else None,
+            "atr": self.atr.update(high, low, close),
+            "volume_ma": self.volume.mean,
+            "trend_ema": self.trend.update(close),
+        }
+        values.update({f"sma_{period}": sma.mean for period, sma in self.smas.items()})
+        for name, value in values.items():
+            self.history[name].append(math.nan if value is None else value)
+        return True
+
+    def update_candles(self, candles: List[Dict[str, Any]]) -> int:
+        """Apply a batch of closed candles (OANDA or flat OHLCV dicts); returns bars applied"""
+        frame = decode_candles(candles)
+        applied = 0
+        for i, candle in enumerate(candles):
+            applied += self.update(candle.get("time", candle.get("start")), float(frame.high[i]),
+                                   float(frame.low[i]), float(frame.close[i]), float(frame.volume[i]))
+        return applied
+
+    def value(self, name: str) -> Optional[float]:
+        """Current value of one output (None while warming up)"""
+        series = self.history.get(name)
+        if not series or math.isnan(series[-1]):
+            return None
+        return series[-1]
+
+    def values(self) -> Dict[str, Optional[float]]:
+        return {name: self.value(name) for name in self.history}
+
+    def series(self, name: str):
+        """Recent values of one output as a float array (oldest first, NaN while warming up)"""
+        return np.fromiter(self.history[name], dtype=np.float64, count=len(self.history[name]))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "config": {**self.config, "sma_periods": list(self.config["sma_periods"])},
+            "history_size": self.history_size,
+            "bars": self.bars,
+            "last_time": self.last_time,
+            "rsi": self.rsi.snapshot(),
+            "macd": self.macd.snapshot(),
+            "bollinger": self.bollinger.snapshot(),
+            "atr": self.atr.snapshot(),
+            "smas": {str(period): sma.snapshot() for period, sma in self.smas.items()},
+            "volume": self.volume.snapshot(),
+            "trend": self.trend.snapshot(),
+            "history": {name: [None if math.isnan(v) else v for v in values]
+                        for name, values in self.history.items()},
+        }
+
+    @classmethod
+    def restore(cls, data: Dict[str, Any]) -> "IndicatorState":
+        state = cls(data["config"], data["history_size"])
+        state.bars, state.last_time = data["bars"], data["last_time"]
+        state.rsi = Rsi.restore(data["rsi"])
+        state.macd = Macd.restore(data["macd"])
+        state.bollinger = RollingWindow.restore(data["bollinger"])
+        state.atr = Atr.restore(data["atr"])
+        state.smas = {int(period): RollingWindow.restore(sma) for period, sma in data["smas"].items()}
+        state.volume = RollingWindow.restore(data["volume"])
+        state.trend = Ema.restore(data["trend"])
+        for name, values in data["history"].items():
+            if name in state.history:
+                state.history[name].extend(math.nan if v is None else v for v in values)
+        return state
+
+
+class IndicatorStore:
+    """
+    IndicatorState per (instrument, granularity), fed with closed candles.
+
+    Register on_candles as a CandleCache listener; every merged fetch then
+    advances the matching state by the newly closed bars only.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+        self._lock = threading.Lock()
+        self.bars_applied = 0
+        self.rebuilds = 0
+
+    def get(self, instrument: str, granularity: str) -> Optional[IndicatorState]:
+        return self._states.get((instrument, granularity))
+
+    def _state_for(self, key: Tuple[str, str]) -> IndicatorState:
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = IndicatorState(self.config)
+        return state
+
+    def on_candles(self, instrument: str, granularity: str, candles: List[Dict[str, Any]], full: bool = False):
+        """
+        Apply closed candles from a fetch.
+
+        A full window that does not contain the state's last bar may leave a
+        gap, so the state is rebuilt from that window instead.
+        """
+        closed = [c for c in candles if c.get("complete", True)]
+        if not closed:
+            return
+        with self._lock:
+            state = self._state_for((instrument, granularity))
+            if full and state.last_time is not None and closed[0].get("time", "") > state.last_time:
+                state.reset()
+                self.rebuilds += 1
+            self.bars_applied += state.update_candles(closed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {f"{inst}|{gran}": state.snapshot() for (inst, gran), state in self._states.items()}
+
+    def restore(self, data: Dict[str, Any]):
+        with self._lock:
+            for key, snapshot in data.items():
+                instrument, granularity = key.split("|", 1)
+                self._states[(instrument, granularity)] = IndicatorState.restore(snapshot)
+
+    def save(self, path: str):
+        """Write every state to a JSON file (atomically replaced)"""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as handle:
+            json.dump(self.snapshot(), handle)
+        os.replace(tmp, path)
+
+    def load(self, path: str) -> bool:
+        """Restore states saved by save(); False when there is no usable file"""
+        try:
+            with open(path) as handle:
+                self.restore(json.load(handle))
+            return True
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "series": len(self._states),
+                "warm": sum(1 for s in self._states.values() if s.warm),
+                "bars_applied": self.bars_applied,
+                "rebuilds": self.rebuilds,
+            }
+
+
+_shared_store: Optional[IndicatorStore] = None
+_shared_lock = threading.Lock()
+
+
+def get_indicator_store() -> IndicatorStore:
+    """Process-wide store fed by every connector's candle cache"""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = IndicatorStore()
+        return _shared_store
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Indicator Kernels - RBOTzilla UNI
+NumPy-vectorized RSI, EMA, MACD, ATR, Bollinger and rolling statistics
+shared by every wolf pack, the crypto engines and SmartLogicFilter.
+
+- Inputs are 1-D float arrays (CandleFrame columns, lists or pandas Series)
+- Series kernels return arrays aligned to the input, NaN where the window
+  is not yet full - the same values pandas rolling()/ewm() produce; they
+  also take (symbols x bars) panels and work along the last axis, each
+  row bit-identical to the 1-D result for that symbol
+- *_last kernels return the single current value the crypto engines and
+  SmartLogicFilter work with; *_rows variants do the same for every row
+  of a (candidates x bars) array
+- python indicators.py prints per-call cost for 120- and 5,000-bar inputs
+PIN: 841921
+"""
+
+import math
+from functools import lru_cache
+from typing import Any, Tuple
+
+import numpy as np
+
+# Longest EMA block whose decay factors stay inside float64 range
+_EMA_MAX_EXPONENT = 600.0
+
+
+def as_array(values: Any) -> np.ndarray:
+    """float64 view of a column (copies only when the dtype differs)"""
+    if hasattr(values, "to_numpy"):
+        values = values.to_numpy()
+    return np.asarray(values, dtype=np.float64)
+
+
+def rolling_mean(values: Any, window: int) -> np.ndarray:
+    """Simple moving average (pandas rolling(window).mean(); NaN windows stay NaN)"""
+    x = as_array(values)
+    out = np.full(x.shape, np.nan)
+    if not 0 < window <= x.shape[-1]:
+        return out
+    missing = np.isnan(x)
+    has_missing = missing.any()
+    if has_missing:
+        present = ~missing
+        if not present.any():
+            return out
+        # Gaps take each series' first present value; their windows are reset to NaN below
+        first = np.take_along_axis(x, present.argmax(axis=-1)[..., None], axis=-1)
+        x = np.where(missing, first, x)
+    # Window sums from one running sum of first-bar-centred values
+    origin = x[..., :1]
+    sums = np.cumsum(x - origin, axis=-1)
+    totals = sums[..., window - 1:].copy()
+    totals[..., 1:] -= sums[..., :-window]
+    out[..., window - 1:] = totals / window + origin
+    if has_missing:
+        counts = np.cumsum(missing, axis=-1)
+        gaps = counts[..., window - 1:].copy()
+        gaps[..., 1:] -= counts[..., :-window]
+        out[..., window - 1:][gaps > 0] = np.nan
+    return out
+
+
+def rolling_std(values: Any, window: int, ddof: int = 1) -> np.ndarray:
+    """Rolling sample standard deviation (pandas rolling(window).std())"""
+    x = as_array(values)
+    out = np.full(x.shape, np.nan)
+    if window <= ddof or window > x.shape[-1]:
+        return out
+    mean = rolling_mean(x, window)[..., window - 1:]
+    count = mean.shape[-1]
+    squares = np.zeros(mean.shape)
+    # Exact deviations from each window's mean, one vector pass per window offset
+    for offset in range(window):
+        deviation = x[..., offset:offset + count] - mean
+        squares += deviation * deviation
+    out[..., window - 1:] = np.sqrt(squares / (window - ddof))
+    return out
+
+
+@lru_cache(maxsize=64)
+def _ema_weights(decay: float, length: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(decay^-k, decay^k, sum of decay^j for j <= k) for k in 0..length-1"""
+    steps = np.arange(length)
+    grow = decay ** -steps
+    scale = decay ** steps
+    weight = np.cumsum(grow) * scale
+    for array in (grow, scale, weight):
+        array.flags.writeable = False
+    return grow, scale, weight
+
+
+def ema(values: Any, span: int) -> np.ndarray:
+    """
+    Exponential moving average with pandas ewm(span=span).mean() weighting.
+
+    Computed as a scaled cumulative sum in blocks short enough that the
+    decay factors cannot overflow; prices are centred on the first bar so
+    the scaling never costs precision on small differences such as MACD.
+    """
+    x = as_array(values)
+    length = x.shape[-1] if x.ndim else 0
+    if not length:
+        return x.copy()
+    decay = 1.0 - 2.0 / (span + 1.0)
+    if decay <= 0:
+        return x.copy()
+    origin = x[..., :1]
+    x = x - origin
+    block = max(1, int(_EMA_MAX_EXPONENT / -math.log(decay)))
+    out = np.empty(x.shape)
+    carry_num = carry_den = 0.0
+    for start in range(0, length, block):
+        chunk = x[..., start:start + block]
+        grow, scale, weight = _ema_weights(decay, chunk.shape[-1])
+        num = np.cumsum(chunk * grow, axis=-1) * scale + carry_num * decay * scale
+        den = weight + carry_den * decay * scale
+        out[..., start:start + chunk.shape[-1]] = num / den
+        carry_num, carry_den = num[..., -1:], den[-1]
+    return out + origin
+
+
+def ema_sma_seeded(values: Any, period: int) -> float:
+    """Classic EMA seeded with the SMA of the first `period` values (last value)"""
+    x = as_array(values)
+    if len(x) < period:
+        return float(x[-1]) if len(x) else 0.0
+    value = float(x[:period].mean())
+    multiplier = 2 / (period + 1)
+    for close in x[period:]:
+        value = (close - value) * multiplier + value
+    return value
+
+
+def ema_first_seeded(values: Any, span: int) -> float:
+    """Alpha-recursion EMA seeded with the first value (last value), as one weighted sum"""
+    x = as_array(values)
+    if not len(x):
+        return 0.0
+    alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+    # Weight of each later value is alpha * decay^(bars after it); old weights underflow to 0
+    weights = decay ** np.arange(len(x) - 2, -1, -1, dtype=np.float64)
+    return float(decay ** (len(x) - 1) * x[0] + alpha * (x[1:] @ weights))
+
+
+def rsi(values: Any, period: int = 14) -> np.ndarray:
+    """RSI from rolling-mean gains and losses (the wolf pack definition)"""
+    delta = np.diff(as_array(values), axis=-1, prepend=np.nan)
+    with np.errstate(invalid="ignore"):
+        gain = rolling_mean(np.where(delta > 0, delta, 0.0), period)
+        loss = rolling_mean(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - (100 / (1 + gain / loss))
+
+
+def rsi_last(values: Any, period: int = 14) -> float:
+    """
+    RSI of the most recent `period` price changes (fewer when not available).
+
+    100.0 when there were no losing bars.
+    """
+    changes = np.diff(as_array(values)[-(period + 1):])
+    if not len(changes):
+        return 50.0
+    avg_gain = float(changes[changes > 0].sum()) / len(changes)
+    avg_loss = float(-changes[changes <= 0].sum()) / len(changes)
+    if avg_loss == 0:
+        return 100.0
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def rsi_last_rows(values: Any, period: int = 14) -> np.ndarray:
+    """rsi_last for every row of a (candidates x bars) array"""
+    changes = np.diff(np.asarray(values, dtype=np.float64)[:, -(period + 1):], axis=1)
+    if not changes.shape[1]:
+        return np.full(len(changes), 50.0)
+    avg_gain = np.where(changes > 0, changes, 0.0).sum(axis=1) / changes.shape[1]
+    avg_loss = np.where(changes <= 0, -changes, 0.0).sum(axis=1) / changes.shape[1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(avg_loss == 0, 100.0, 100 - (100 / (1 + avg_gain / avg_loss)))
+
+
+def rate_of_change(values: Any, period: int = 10) -> float:
+    """(last - value `period` bars back) / that value; 0 when unavailable"""
+    x = as_array(values)
+    if len(x) < period or x[-period] == 0:
+        return 0.0
+    return float((x[-1] - x[-period]) / x[-period])
+
+
+def rate_of_change_rows(values: Any, period: int = 10) -> np.ndarray:
+    """rate_of_change for every row of a (candidates x bars) array"""
+    x = np.asarray(values, dtype=np.float64)
+    if x.shape[1] < period:
+        return np.zeros(len(x))
+    base = x[:, -period]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(base == 0, 0.0, (x[:, -1] - base) / base)
+
+
+def macd(values: Any, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(MACD line, signal line, histogram)"""
+    x = as_array(values)
+    line = ema(x, fast) - ema(x, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(values: Any, period: int = 20, num_std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(upper, middle, lower) bands"""
+    x = as_array(values)
+    middle = rolling_mean(x, period)
+    spread = rolling_std(x, period) * num_std
+    return middle + spread, middle, middle - spread
+
+
+def true_range(high: Any, low: Any, close: Any) -> np.ndarray:
+    """True range per bar; the first bar (no previous close) is high - low"""
+    high, low, close = as_array(high), as_array(low), as_array(close)
+    tr = high - low
+    if tr.shape[-1] > 1:
+        prev_close = close[..., :-1]
+        tr[..., 1:] = np.maximum(tr[..., 1:], np.maximum(np.abs(high[..., 1:] - prev_close),
+                                                         np.abs(low[..., 1:] - prev_close)))
+    return tr
+
+
+def atr(high: Any, low: Any, close: Any, period: int = 14) -> np.ndarray:
+    """Rolling-mean average true range"""
+    return rolling_mean(true_range(high, low, close), period)
+
+
+def atr_last(high: Any, low: Any, close: Any, period: int = 14) -> float:
+    """
+    Mean true range of the last `period` bars that have a previous close;
+    with fewer bars, the last bar's high - low
+    """
+    high, low, close = as_array(high), as_array(low), as_array(close)
+    if len(high) < period + 1:
+        return float(high[-1] - low[-1]) if len(high) else 0.0
+    window = slice(-(period + 1), None)
+    return float(true_range(high[window], low[window], close[window])[1:].sum()) / period
+
+
+def benchmark(sizes=(120, 5000), repeat: int = 200):
+    """Per-call cost in microseconds of each kernel against pandas, per input size"""
+    import time
+    import pandas as pd
+
+    def per_call(fn):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return (time.perf_counter() - start) / repeat * 1e6
+
+    rng = np.random.default_rng(841921)
+    results = {}
+    for size in sizes:
+        close = 1.1 + np.cumsum(rng.normal(0, 0.0005, size))
+        high, low = close + 0.0003, close - 0.0003
+        series = pd.Series(close)
+        delta = series.diff()
+        results[size] = {
+            "rsi": (per_call(lambda: rsi(close)),
+                    per_call(lambda: 100 - 100 / (1 + delta.where(delta > 0, 0).rolling(14).mean()
+                                                  / (-delta.where(delta < 0, 0)).rolling(14).mean()))),
+            "macd": (per_call(lambda: macd(close)),
+                     per_call(lambda: (series.ewm(span=12).mean() - series.ewm(span=26).mean()).ewm(span=9).mean())),
+            "bollinger": (per_call(lambda: bollinger(close)),
+                          per_call(lambda: (series.rolling(20).mean(), series.rolling(20).std()))),
+            "atr": (per_call(lambda: atr(high, low, close)),
+                    per_call(lambda: pd.concat([series + 0.0003 - (series - 0.0003),
+                                                (series + 0.0003 - series.shift(1)).abs(),
+                                                (series - 0.0003 - series.shift(1)).abs()],
+                                               axis=1).max(axis=1).rolling(14).mean())),
+            "rsi_last": (per_call(lambda: rsi_last(close)), None),
+            "atr_last": (per_call(lambda: atr_last(high, low, close)), None),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    for size, kernels in benchmark().items():
+        print(f"{size} bars")
+        for name, (numpy_us, pandas_us) in kernels.items():
+            versus = f"   pandas {pandas_us:8.1f} us" if pandas_us is not None else ""
+            print(f"  {name:<10} numpy {numpy_us:8.1f} us{versus}")
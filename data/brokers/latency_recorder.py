@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Latency Recorder - RBOTzilla UNI
+Fixed-bucket latency histograms shared by every broker connector.
+
+- One histogram per (broker, method, endpoint template); account, order,
+  trade and instrument ids are folded so /v3/accounts/{accountID}/orders is
+  one series no matter which account or order it hit
+- Constant memory: bucket counts instead of raw samples
+- p50/p90/p99/max, error and timeout counts, calls over the 300 ms budget
+- Periodic JSON export (logs/latency_stats.json) read by the monitoring
+  dashboard's /api/latency endpoint
+PIN: 841921
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bucket edges in ms; the final bucket is open-ended
+BUCKET_EDGES_MS: Tuple[float, ...] = (
+    1, 2, 5, 10, 20, 35, 50, 75, 100, 150, 200, 250, 300,
+    400, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000, 30000,
+)
+DEFAULT_BUDGET_MS = 300.0
+DEFAULT_EXPORT_PATH = os.getenv("RBZ_LATENCY_EXPORT", "logs/latency_stats.json")
+DEFAULT_EXPORT_INTERVAL_S = 10.0
+
+# Path segment following one of these collections is an identifier
+_ID_COLLECTIONS = {
+    "accounts": "{accountID}",
+    "instruments": "{instrument}",
+    "orders": "{orderID}",
+    "trades": "{tradeID}",
+    "positions": "{instrument}",
+    "transactions": "{transactionID}",
+    "products": "{productID}",
+}
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Fold ids out of an endpoint path: /v3/accounts/001-X/trades/42 -> /v3/accounts/{accountID}/trades/{tradeID}"""
+    path = endpoint.split("?", 1)[0]
+    if "://" in path:
+        path = "/" + path.split("://", 1)[1].split("/", 1)[-1]
+    segments = path.split("/")
+    for i in range(1, len(segments)):
+        placeholder = _ID_COLLECTIONS.get(segments[i - 1])
+        if placeholder and segments[i]:
+            segments[i] = placeholder
+    return "/".join(segments)
+
+
+class LatencyHistogram:
+    """Bucketed latency distribution for one endpoint series"""
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms", "errors", "timeouts", "over_budget")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_EDGES_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+        self.timeouts = 0
+        self.over_budget = 0
+
+    def percentile(self, q: float) -> float:
+        """Latency at quantile q (0-1), interpolated inside the bucket and capped at the observed max"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            if seen + bucket_count >= rank:
+                lower = BUCKET_EDGES_MS[index - 1] if index else 0.0
+                upper = BUCKET_EDGES_MS[index] if index < len(BUCKET_EDGES_MS) else self.max_ms
+                value = lower + (upper - lower) * max(0.0, rank - seen) / bucket_count
+                return min(value, self.max_ms)
+            seen += bucket_count
+        return self.max_ms
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50), 1),
+            "p90_ms": round(self.percentile(0.90), 1),
+            "p99_ms": round(self.percentile(0.99), 1),
+            "max_ms": round(self.max_ms, 1),
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "over_budget": self.over_budget,
+        }
+
+
+class LatencyRecorder:
+    """
+    Thread-safe registry of latency histograms keyed by (broker, method, template).
+
+    record() does the bucket search outside the lock and holds it only for a
+    handful of integer updates.
+    """
+
+    def __init__(self, budget_ms: float = DEFAULT_BUDGET_MS,
+                 export_path: Optional[str] = None,
+                 export_interval_s: float = DEFAULT_EXPORT_INTERVAL_S):
+        self.budget_ms = budget_ms
+        self.export_path = export_path
+        self.export_interval_s = export_interval_s
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+        self._last_export = time.monotonic()
+
+    def record(self, broker: str, method: str, endpoint: str, latency_ms: float,
+               error: bool = False, timeout: bool = False):
+        """Record one request (error/timeout requests are timed too)"""
+        key = (broker, method.upper(), endpoint_template(endpoint))
+        bucket = bisect.bisect_left(BUCKET_EDGES_MS, latency_ms)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+            histogram.counts[bucket] += 1
+            histogram.count += 1
+            histogram.total_ms += latency_ms
+            if latency_ms > histogram.max_ms:
+                histogram.max_ms = latency_ms
+            if latency_ms > self.budget_ms:
+                histogram.over_budget += 1
+            if error or timeout:
+                histogram.errors += 1
+            if timeout:
+                histogram.timeouts += 1
+        if self.export_path and time.monotonic() - self._last_export >= self.export_interval_s:
+            self._last_export = time.monotonic()
+            self.export(self.export_path)
+
+    def snapshot(self, broker: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Per-endpoint summaries (optionally for one broker), slowest p99 first"""
+        with self._lock:
+            items = [(key, histogram.summary()) for key, histogram in self._histograms.items()
+                     if broker is None or key[0] == broker]
+        rows = [{"broker": key[0], "method": key[1], "endpoint": key[2], **summary}
+                for key, summary in items]
+        rows.sort(key=lambda row: row["p99_ms"], reverse=True)
+        return rows
+
+    def broker_summary(self, broker: str) -> Dict[str, Any]:
+        """All endpoints of one broker merged into a single distribution"""
+        merged = LatencyHistogram()
+        with self._lock:
+            for key, histogram in self._histograms.items():
+                if key[0] != broker:
+                    continue
+                merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+                merged.count += histogram.count
+                merged.total_ms += histogram.total_ms
+                merged.max_ms = max(merged.max_ms, histogram.max_ms)
+                merged.errors += histogram.errors
+                merged.timeouts += histogram.timeouts
+                merged.over_budget += histogram.over_budget
+        return merged.summary()
+
+    def export(self, path: str):
+        """Atomically write the snapshot as JSON for out-of-process dashboards"""
+        payload = {
+            "generated_at": time.time(),
+            "budget_ms": self.budget_ms,
+            "endpoints": self.snapshot(),
+        }
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(payload, f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Latency export to {path} failed: {e}")
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+_shared_recorder: Optional[LatencyRecorder] = None
+_shared_lock = threading.Lock()
+
+
+def get_latency_recorder() -> LatencyRecorder:
+    """Process-wide recorder shared by every connector"""
+    global _shared_recorder
+    with _shared_lock:
+        if _shared_recorder is None:
+            _shared_recorder = LatencyRecorder(export_path=DEFAULT_EXPORT_PATH or None)
+        return _shared_recorder
+
+
+def load_exported_stats(path: str = DEFAULT_EXPORT_PATH) -> Dict[str, Any]:
+    """Read a snapshot written by LatencyRecorder.export (empty if none yet)"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"generated_at": None, "budget_ms": DEFAULT_BUDGET_MS, "endpoints": []}
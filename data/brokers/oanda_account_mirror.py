@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+OANDA Account Mirror - RBOTzilla UNI
+In-process model of the trading account kept current by the v20
+transactions stream (/v3/accounts/{id}/transactions/stream).
+
+- Bootstraps from the account details endpoint, then applies fills, order
+  creates/cancels, SL/TP triggers, financing and transfers locally
+- Balance, open trades, pending orders and positions are exact; NAV,
+  unrealized P/L and marginUsed are re-marked from the streamed quote board
+  and the FX conversion matrix (the last REST snapshot values are used for
+  anything without a quote)
+- Margin is seeded per trade from the broker's own figures (the snapshot's
+  marginUsed, a fill's initialMarginRequired), so per-instrument margin
+  rates (metals, indices, regulated crosses) carry over; only the move of
+  the base currency since then is re-marked. Trades without a figure use
+  the instrument's rate implied by another trade, else the account rate
+- Gap detection: a transaction ID that skips ahead, or a heartbeat whose
+  lastTransactionID is past what was applied, triggers a REST resync; so
+  does a stream reconnect and a periodic safety resync
+- Lag: broker transaction time to local apply, kept over a rolling window
+- Realized P/L of recently closed trades is kept from their fills
+PIN: 841921
+"""
+
+import json
+import time
+import random
+import logging
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+try:
+    from .http_transport import get_shared_transport
+    from .fx_matrix import FxMatrix, get_fx_matrix
+except ImportError:
+    from http_transport import get_shared_transport
+    from fx_matrix import FxMatrix, get_fx_matrix
+
+logger = logging.getLogger(__name__)
+
+# Pending order types that rest on the book until filled or cancelled
+_ENTRY_ORDER_TYPES = {"LIMIT_ORDER", "STOP_ORDER", "MARKET_IF_TOUCHED_ORDER"}
+
+# Orders attached to an open trade, and the trade field that holds each
+_DEPENDENT_ORDER_FIELDS = {
+    "TAKE_PROFIT_ORDER": "takeProfitOrder",
+    "STOP_LOSS_ORDER": "stopLossOrder",
+    "TRAILING_STOP_LOSS_ORDER": "trailingStopLossOrder",
+}
+
+# Closed trades whose realized P/L is kept for lookups
+_CLOSED_TRADES_KEPT = 1000
+
+# Trade fields copied from an order transaction into the mirrored order
+_ORDER_FIELDS = ("instrument", "units", "price", "timeInForce", "gtdTime", "tradeID",
+                 "takeProfitOnFill", "stopLossOnFill", "distance")
+
+
+def _broker_time(value: Optional[str]) -> Optional[float]:
+    """Epoch seconds for an RFC3339 v20 timestamp (nanosecond precision is truncated)"""
+    if not value:
+        return None
+    try:
+        stamp = value.rstrip("Z")
+        if "." in stamp:
+            head, frac = stamp.split(".", 1)
+            stamp = f"{head}.{frac[:6]}"
+        return datetime.fromisoformat(stamp + "+00:00").timestamp()
+    except ValueError:
+        return None
+
+
+class OandaAccountMirror:
+    """
+    Local account state fed by the transactions stream.
+
+    Reads (summary, trades, orders, positions, gate views) are served from
+    memory under a lock and never touch the network.
+    """
+
+    def __init__(self, connector, stream_base: str, account_id: str, headers: Dict[str, str],
+                 quote_fn: Optional[Callable[[str], Any]] = None, fx: Optional[FxMatrix] = None,
+                 heartbeat_timeout_s: float = 10.0, resync_interval_s: float = 300.0):
+        """
+        Args:
+            connector: OandaConnector used for the REST snapshot (its _make_request)
+            stream_base: Streaming base URL
+            quote_fn: instrument -> fresh Quote (bid/ask/mid) or None, e.g. connector.get_quote
+            fx: Currency -> USD conversions (default: the process-wide matrix)
+            heartbeat_timeout_s: Silence after which the stream is considered dead
+            resync_interval_s: Safety REST resync period while the stream is healthy
+        """
+        self.connector = connector
+        self.stream_base = stream_base
+        self.account_id = account_id
+        self.headers = headers
+        self.quote_fn = quote_fn
+        self.fx = fx or get_fx_matrix()
+        self.heartbeat_timeout_s = heartbeat_timeout_s
+        self.resync_interval_s = resync_interval_s
+
+        self.transport = get_shared_transport(stream_base, pool_size=2)
+        self._lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._response = None
+
+        # Account model
+        self.balance = 0.0
+        self.margin_rate = 0.02
+        self.currency = "USD"
+        self.trades: Dict[str, Dict[str, Any]] = {}
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.instrument_margin_rates: Dict[str, float] = {}  # implied by the broker's margin figures
+        self.closed_pl: "OrderedDict[str, float]" = OrderedDict()  # trade ID -> realized P/L (account ccy)
+        self._trade_margin: Dict[str, List[Optional[float]]] = {}  # trade ID -> [USD margin/unit, base USD rate]
+        self.last_transaction_id = 0
+        self._snapshot: Dict[str, float] = {}
+        self.bootstrapped = False
+
+        # Health / metrics
+        self.connected = False
+        self.last_message_at: Optional[float] = None
+        self.last_resync_at: Optional[float] = None
+        self.resyncs = 0
+        self.gaps = 0
+        self.reconnects = 0
+        self.applied = 0
+        self._lag_ms: Deque[float] = deque(maxlen=200)
+        self._needs_resync = True
+
+    # --- lifecycle ------------------------------------------------------------------------
+    @property
+    def healthy(self) -> bool:
+        """True while reads reflect the broker: bootstrapped, streaming and no pending resync"""
+        return (
+            self.bootstrapped
+            and self.connected
+            and not self._needs_resync
+            and self.last_message_at is not None
+            and time.monotonic() - self.last_message_at <= self.heartbeat_timeout_s
+        )
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="oanda-account-mirror", daemon=True)
+        self._thread.start()
+        logger.info(f"Account mirror started for {self.account_id}")
+
+    def stop(self):
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            response.close()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self.connected = False
+
+    def _run(self):
+        attempt = 0
+        while not self._stop.is_set():
+            try:
+                self._consume()
+                attempt = 0
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                logger.warning(f"Transactions stream dropped: {e}")
+            self.connected = False
+            self._needs_resync = True
+            if self._stop.is_set():
+                break
+            attempt += 1
+            self.reconnects += 1
+            self._stop.wait(random.uniform(0, min(30.0, 0.5 * (2 ** attempt))))
+
+    def _consume(self):
+        url = f"{self.stream_base}/v3/accounts/{self.account_id}/transactions/stream"
+        response = self.transport.session.get(url, headers=self.headers, stream=True,
+                                              timeout=(5.0, self.heartbeat_timeout_s))
+        self._response = response
+        try:
+            response.raise_for_status()
+            self.connected = True
+            self.last_message_at = time.monotonic()
+            # Stream is open before the snapshot is read, so nothing falls between them;
+            # transactions already in the snapshot are skipped by ID
+            self.resync()
+            for line in response.iter_lines(chunk_size=None):
+                if self._stop.is_set():
+                    return
+                if not line:
+                    continue
+                self._handle(json.loads(line))
+                if self._needs_resync or (
+                        self.last_resync_at is not None
+                        and time.monotonic() - self.last_resync_at >= self.resync_interval_s):
+                    self.resync()
+        finally:
+            self._response = None
+            response.close()
+
+    def _handle(self, msg: Dict[str, Any]):
+        self.last_message_at = time.monotonic()
+        if msg.get("type") == "HEARTBEAT":
+            last_id = int(msg.get("lastTransactionID") or 0)
+            if last_id > self.last_transaction_id:
+                self._gap(f"heartbeat at {last_id}, applied {self.last_transaction_id}")
+            return
+        self.apply(msg)
+
+    def _gap(self, reason: str):
+        self.gaps += 1
+        self._needs_resync = True
+        logger.warning(f"Account mirror gap ({reason}) - resyncing from REST")
+
+    # --- snapshot -------------------------------------------------------------------------
+    def resync(self) -> bool:
+        """Replace the model with the REST account details; False if the snapshot failed"""
+        resp = self.connector._make_request("GET", f"/v3/accounts/{self.account_id}")
+        if not resp.get("success"):
+            logger.warning(f"Account mirror resync failed: {resp.get('error')}")
+            self._needs_resync = True
+            return False
+        self.load_snapshot((resp.get("data") or {}).get("account", {}))
+        return True
+
+    def load_snapshot(self, account: Dict[str, Any]):
+        """Load a v20 Account (details endpoint shape)"""
+        with self._lock:
+            self.balance = float(account.get("balance", 0.0))
+            self.margin_rate = float(account.get("marginRate", self.margin_rate))
+            self.currency = account.get("currency", self.currency)
+            self.trades = {t["id"]: dict(t) for t in account.get("trades", [])}
+            self._trade_margin = {}
+            for trade in self.trades.values():
+                self._seed_margin(trade, trade.get("marginUsed"))
+            self.orders = {o["id"]: dict(o) for o in account.get("orders", [])
+                           if o.get("state", "PENDING") == "PENDING"}
+            for order in self.orders.values():
+                field = _DEPENDENT_ORDER_FIELDS.get(f"{order.get('type')}_ORDER")
+                trade = self.trades.get(order.get("tradeID"))
+                if field and trade is not None:
+                    trade[field] = order
+            self._snapshot = {key: float(account.get(key, 0.0))
+                              for key in ("NAV", "unrealizedPL", "marginUsed")}
+            self.last_transaction_id = int(account.get("lastTransactionID") or 0)
+            self.bootstrapped = True
+            self._needs_resync = False
+            self.resyncs += 1
+            self.last_resync_at = time.monotonic()
+
+    # --- transactions ---------------------------------------------------------------------
+    def apply(self, txn: Dict[str, Any]) -> bool:
+        """
+        Apply one transaction in ID order.
+
+        Already-applied IDs are ignored; an ID that skips ahead marks the
+        mirror for resync and returns False.
+        """
+        txn_id = int(txn.get("id") or 0)
+        with self._lock:
+            if txn_id <= self.last_transaction_id:
+                return True
+            if txn_id != self.last_transaction_id + 1:
+                self._gap(f"transaction {txn_id} after {self.last_transaction_id}")
+                return False
+
+            handler = getattr(self, f"_on_{txn.get('type', '').lower()}", None)
+            if handler is not None:
+                handler(txn)
+            elif txn.get("type") in _ENTRY_ORDER_TYPES:
+                self._add_order(txn)
+            elif txn.get("type") in _DEPENDENT_ORDER_FIELDS:
+                self._attach_dependent(txn)
+            self.last_transaction_id = txn_id
+            self.applied += 1
+
+        broker_ts = _broker_time(txn.get("time"))
+        if broker_ts is not None:
+            self._lag_ms.append(max(0.0, (time.time() - broker_ts) * 1000))
+        return True
+
+    def _add_order(self, txn: Dict[str, Any]) -> Dict[str, Any]:
+        order = {key: txn[key] for key in _ORDER_FIELDS if txn.get(key) is not None}
+        order.update(id=txn["id"], type=txn["type"][:-len("_ORDER")], state="PENDING", createTime=txn.get("time"))
+        self.orders[order["id"]] = order
+        replaced = txn.get("replacesOrderID")
+        if replaced:
+            self.orders.pop(replaced, None)
+        return order
+
+    def _attach_dependent(self, txn: Dict[str, Any]):
+        order = self._add_order(txn)
+        trade = self.trades.get(order.get("tradeID"))
+        if trade is None:
+            return
+        field = _DEPENDENT_ORDER_FIELDS[txn["type"]]
+        previous = trade.get(field)
+        if previous and previous.get("id") != order["id"]:
+            self.orders.pop(previous.get("id"), None)
+        trade[field] = order
+
+    def _on_order_fill(self, txn: Dict[str, Any]):
+        self.orders.pop(txn.get("orderID"), None)
+        opened = txn.get("tradeOpened")
+        if opened:
+            units = opened.get("units", txn.get("units"))
+            self.trades[opened["tradeID"]] = {
+                "id": opened["tradeID"], "instrument": txn.get("instrument"),
+                "price": opened.get("price", txn.get("price")), "openTime": txn.get("time"),
+                "initialUnits": units, "currentUnits": units, "state": "OPEN", "realizedPL": "0.0000",
+            }
+            self._seed_margin(self.trades[opened["tradeID"]], opened.get("initialMarginRequired"))
+        reduced = txn.get("tradeReduced")
+        if reduced and reduced.get("tradeID") in self.trades:
+            trade = self.trades[reduced["tradeID"]]
+            trade["currentUnits"] = str(int(float(trade["currentUnits"]) + float(reduced.get("units", 0))))
+            trade["realizedPL"] = f"{float(trade.get('realizedPL') or 0) + float(reduced.get('realizedPL') or 0):.4f}"
+        for closed in txn.get("tradesClosed") or []:
+            trade = self.trades.get(closed.get("tradeID"))
+            if closed.get("realizedPL") is not None:
+                earlier = float(trade.get("realizedPL") or 0) if trade is not None else 0.0
+                self.closed_pl[closed["tradeID"]] = earlier + float(closed["realizedPL"])
+                while len(self.closed_pl) > _CLOSED_TRADES_KEPT:
+                    self.closed_pl.popitem(last=False)
+            self._drop_trade(closed.get("tradeID"))
+        self._book_cash(txn)
+
+    def _drop_trade(self, trade_id: Optional[str]):
+        trade = self.trades.pop(trade_id, None)
+        self._trade_margin.pop(trade_id, None)
+        if trade is None:
+            return
+        for field in _DEPENDENT_ORDER_FIELDS.values():
+            if trade.get(field):
+                self.orders.pop(trade[field].get("id"), None)
+
+    def _on_order_cancel(self, txn: Dict[str, Any]):
+        order = self.orders.pop(txn.get("orderID"), None)
+        if order and order.get("tradeID") in self.trades:
+            field = _DEPENDENT_ORDER_FIELDS.get(f"{order['type']}_ORDER")
+            trade = self.trades[order["tradeID"]]
+            if field and (trade.get(field) or {}).get("id") == order["id"]:
+                trade.pop(field)
+
+    def _on_daily_financing(self, txn: Dict[str, Any]):
+        self._book_cash(txn)
+
+    def _on_transfer_funds(self, txn: Dict[str, Any]):
+        self._book_cash(txn)
+
+    def _book_cash(self, txn: Dict[str, Any]):
+        """Use the broker's running balance when present, else add the cash components"""
+        if txn.get("accountBalance") is not None:
+            self.balance = float(txn["accountBalance"])
+            return
+        for key in ("pl", "financing", "commission", "amount"):
+            if txn.get(key) is not None:
+                self.balance += float(txn[key])
+
+    # --- marking --------------------------------------------------------------------------
+    def _quote(self, instrument: str):
+        return self.quote_fn(instrument) if self.quote_fn is not None else None
+
+    def _seed_margin(self, trade: Dict[str, Any], margin_used: Any):
+        """Remember a trade's broker-reported margin (and the rate it implies for its instrument)"""
+        units = abs(float(trade.get("currentUnits") or 0))
+        if margin_used is None or not units:
+            return
+        per_unit = float(margin_used) / units
+        base_rate = self.fx.usd_rate(trade["instrument"].split("_", 1)[0])
+        self._trade_margin[trade["id"]] = [per_unit, base_rate]
+        if base_rate:
+            self.instrument_margin_rates[trade["instrument"]] = per_unit / base_rate
+
+    def _margin(self, trade: Dict[str, Any], units: float) -> Optional[float]:
+        """USD margin of one trade: its seeded figure scaled by the base currency's move"""
+        instrument = trade["instrument"]
+        seeded = self._trade_margin.get(trade["id"])
+        if seeded is None:
+            rate = self.instrument_margin_rates.get(instrument, self.margin_rate)
+            return self.fx.margin_estimate(instrument, units, rate)
+        per_unit, seeded_rate = seeded
+        base_rate = self.fx.usd_rate(instrument.split("_", 1)[0])
+        if seeded_rate is None and base_rate:
+            # FX was cold when seeded: the figure is taken as current from the first rate on
+            seeded[1] = seeded_rate = base_rate
+            self.instrument_margin_rates.setdefault(instrument, per_unit / base_rate)
+        if base_rate and seeded_rate:
+            per_unit *= base_rate / seeded_rate
+        return abs(units) * per_unit
+
+    def _mark(self, trade: Dict[str, Any]):
+        """(unrealized P/L, margin) in USD for one trade, None where no quote is available"""
+        instrument = trade["instrument"]
+        units = float(trade["currentUnits"])
+        upl = None
+        # Marked at the closeout side, like the broker: bid for longs, ask for shorts
+        book = self._quote(instrument)
+        exit_price = getattr(book, "bid" if units > 0 else "ask", None) if book is not None else None
+        if exit_price is not None:
+            upl = self.fx.pnl_usd(instrument, units, float(trade["price"]), exit_price)
+        return upl, self._margin(trade, units)
+
+    # --- reads ----------------------------------------------------------------------------
+    def account_summary(self) -> Dict[str, Any]:
+        """v20 AccountSummary fields (numbers as floats) computed in memory"""
+        with self._lock:
+            upl = margin = 0.0
+            unmarked_upl = unmarked_margin = False
+            for trade in self.trades.values():
+                trade_upl, trade_margin = self._mark(trade)
+                if trade_upl is None:
+                    unmarked_upl = True
+                else:
+                    upl += trade_upl
+                if trade_margin is None:
+                    unmarked_margin = True
+                else:
+                    margin += trade_margin
+            # Without quotes for every trade, the snapshot value is the better estimate
+            if unmarked_upl:
+                upl = self._snapshot.get("unrealizedPL", upl)
+            if unmarked_margin:
+                margin = self._snapshot.get("marginUsed", margin)
+            nav = self.balance + upl
+            return {
+                "id": self.account_id, "currency": self.currency,
+                "balance": self.balance, "NAV": nav, "unrealizedPL": upl,
+                "marginUsed": margin, "marginAvailable": max(0.0, nav - margin),
+                "openTradeCount": len(self.trades),
+                "openPositionCount": len({t["instrument"] for t in self.trades.values()}),
+                "pendingOrderCount": len(self.orders),
+                "lastTransactionID": str(self.last_transaction_id),
+                "mirror": True,
+            }
+
+    def get_trades(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            out = []
+            for trade in self.trades.values():
+                upl, _ = self._mark(trade)
+                row = dict(trade)
+                if upl is not None:
+                    row["unrealizedPL"] = f"{upl:.4f}"
+                out.append(row)
+            return out
+
+    def closed_trade_pl(self, trade_id: str) -> Optional[float]:
+        """Realized P/L of a trade closed while streaming, None if not seen"""
+        with self._lock:
+            return self.closed_pl.get(str(trade_id))
+
+    def get_orders(self) -> List[Dict[str, Any]]:
+        """Pending orders, including SL/TP orders attached to open trades"""
+        with self._lock:
+            return [dict(o) for o in self.orders.values()]
+
+    def get_positions(self) -> List[Dict[str, Any]]:
+        """Open positions in the v20 openPositions shape (units/averagePrice per side)"""
+        with self._lock:
+            positions: Dict[str, Dict[str, Any]] = {}
+            for trade in self.trades.values():
+                pos = positions.setdefault(trade["instrument"], {
+                    "instrument": trade["instrument"],
+                    "long": {"units": 0.0, "cost": 0.0, "tradeIDs": []},
+                    "short": {"units": 0.0, "cost": 0.0, "tradeIDs": []},
+                })
+                units = float(trade["currentUnits"])
+                side = pos["long"] if units > 0 else pos["short"]
+                side["units"] += units
+                side["cost"] += units * float(trade["price"])
+                side["tradeIDs"].append(trade["id"])
+            for pos in positions.values():
+                for side in (pos["long"], pos["short"]):
+                    units, cost = side.pop("units"), side.pop("cost")
+                    side["units"] = str(int(units))
+                    if units:
+                        side["averagePrice"] = str(round(cost / units, 6))
+            return list(positions.values())
+
+    def gate_account(self) -> Dict[str, float]:
+        """Account view in the GuardianGates shape"""
+        summary = self.account_summary()
+        return {"nav": summary["NAV"], "margin_used": summary["marginUsed"], "balance": summary["balance"]}
+
+    def gate_positions(self) -> List[Dict[str, Any]]:
+        """One entry per instrument and side in the GuardianGates shape"""
+        out = []
+        for pos in self.get_positions():
+            for side_name, side in (("BUY", pos["long"]), ("SELL", pos["short"])):
+                units = abs(int(side["units"]))
+                if units:
+                    out.append({"symbol": pos["instrument"], "side": side_name, "units": units,
+                                "entry_price": float(side["averagePrice"])})
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        lags = sorted(self._lag_ms)
+        return {
+            "healthy": self.healthy,
+            "connected": self.connected,
+            "last_transaction_id": self.last_transaction_id,
+            "applied": self.applied,
+            "gaps": self.gaps,
+            "resyncs": self.resyncs,
+            "reconnects": self.reconnects,
+            "open_trades": len(self.trades),
+            "pending_orders": len(self.orders),
+            "lag_p50_ms": round(lags[len(lags) // 2], 1) if lags else None,
+            "lag_max_ms": round(lags[-1], 1) if lags else None,
+            "last_message_age_s": (round(time.monotonic() - self.last_message_at, 3)
+                                   if self.last_message_at is not None else None),
+        }
+
+
+_active_mirror: Optional[OandaAccountMirror] = None
+
+
+def set_account_mirror(mirror: Optional[OandaAccountMirror]):
+    """Register the process-wide mirror (done by OandaConnector.start_account_mirror)"""
+    global _active_mirror
+    _active_mirror = mirror
+
+
+def get_account_mirror() -> Optional[OandaAccountMirror]:
+    """The running mirror, if any, for gates that have no connector handle"""
+    return _active_mirror
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Async OANDA Broker Connector - RBOTzilla UNI
+Native asyncio v20 REST client with the same surface as OandaConnector
+(candles, pricing, orders, trades, OCO placement) so engine loops never
+block on HTTP.
+PIN: 841921
+"""
+
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Any
+from urllib.parse import urljoin
+
+# aiohttp for non-blocking HTTP
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    logging.warning("⚠️ aiohttp not installed. Run: pip install aiohttp")
+
+try:
+    from .oanda_connector import OandaConnector, log_narration
+    from .candle_frame import CandleFrame, decode_candles
+    from .http_transport import IDEMPOTENT_METHODS, RETRYABLE_STATUS_CODES, DEFAULT_RETRY_POLICY, NO_RETRY
+    from .rate_limiter import AsyncSingleFlight, RateLimitExceeded, default_priority, request_key
+except ImportError:
+    from oanda_connector import OandaConnector, log_narration
+    from candle_frame import CandleFrame, decode_candles
+    from http_transport import IDEMPOTENT_METHODS, RETRYABLE_STATUS_CODES, DEFAULT_RETRY_POLICY, NO_RETRY
+    from rate_limiter import AsyncSingleFlight, RateLimitExceeded, default_priority, request_key
+
+
+class AsyncOandaConnector:
+    """
+    Asyncio OANDA v20 REST connector
+
+    Credentials, environment, charter pre-checks and order payloads come from
+    a wrapped OandaConnector, so both clients enforce identical rules. HTTP
+    runs over one keep-alive aiohttp session owned by the running event loop.
+    """
+
+    def __init__(self, pin: Optional[int] = None, environment: Optional[str] = None,
+                 pool_size: Optional[int] = None, connector: Optional[OandaConnector] = None):
+        """
+        Initialize async OANDA connector
+
+        Args:
+            pin: Charter PIN (841921)
+            environment: 'practice' or 'live' (ignored when connector is given)
+            pool_size: Max concurrent keep-alive connections (default: sync pool size)
+            connector: Existing OandaConnector to share credentials/config with
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError(
+                "aiohttp library required. Install with: pip install aiohttp"
+            )
+
+        self.sync = connector or OandaConnector(pin=pin, environment=environment, pool_size=pool_size)
+        self.logger = logging.getLogger(__name__)
+
+        self.environment = self.sync.environment
+        self.api_base = self.sync.api_base
+        self.account_id = self.sync.account_id
+        self.headers = self.sync.headers
+        self.default_timeout = self.sync.default_timeout
+        self.max_placement_latency_ms = self.sync.max_placement_latency_ms
+        self.pool_size = pool_size or self.sync.transport.pool_size
+
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self.request_times: Deque[float] = deque(maxlen=100)
+        self.latency = self.sync.latency
+        # Same per-host budget as the sync connector; coalescing is per event loop
+        self.rate_limiter = self.sync.rate_limiter
+        self.single_flight = AsyncSingleFlight()
+
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        """Create the pooled session lazily inside the running loop"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.default_timeout),
+            )
+        return self._session
+
+    async def close(self):
+        """Close the underlying HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _make_request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None,
+                            params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Make authenticated API request - async twin of OandaConnector._make_request
+
+        Idempotent methods are retried with the sync transport's per-endpoint
+        policy; order placement is never replayed. Requests share the sync
+        connector's rate limiter, and identical in-flight GETs are coalesced.
+
+        Returns:
+            Dict with API response (same shape as the sync connector)
+        """
+        method = method.upper()
+        if method == "GET":
+            key = request_key(method, endpoint, params)
+            if key is not None:
+                result = await self.single_flight.do(key, lambda: self._send(method, endpoint, data, params))
+                # Followers get their own top-level dict; payloads are read-only by convention
+                return dict(result)
+        return await self._send(method, endpoint, data, params)
+
+    async def _send(self, method: str, endpoint: str, data: Optional[Dict[str, Any]],
+                    params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        url = urljoin(self.api_base, endpoint)
+        endpoint_class = self.sync._endpoint_class(endpoint) if method == "GET" else None
+        if method in IDEMPOTENT_METHODS:
+            policy = self.sync.transport.retry_policies.get(endpoint_class, DEFAULT_RETRY_POLICY)
+        else:
+            policy = NO_RETRY
+        priority = default_priority(method, endpoint_class)
+        session = await self._get_session()
+        start_time = time.perf_counter()
+        attempt = 0
+
+        while True:
+            try:
+                await self.rate_limiter.acquire_async(endpoint_class, priority)
+                async with session.request(method, url, json=data, params=params) as response:
+                    if response.status in RETRYABLE_STATUS_CODES and attempt < policy.max_retries:
+                        attempt += 1
+                        await asyncio.sleep(policy.backoff(attempt))
+                        continue
+
+                    text = await response.text()
+                    latency_ms = (time.perf_counter() - start_time) * 1000
+                    self._record_latency(method, endpoint, latency_ms, error=response.status >= 400)
+
+                    if response.status >= 400:
+                        error_msg = f"HTTP {response.status}: {text}"
+                        self.logger.error(f"OANDA API ERROR ({self.environment}): {error_msg}")
+                        return {
+                            "success": False,
+                            "error": error_msg,
+                            "latency_ms": latency_ms,
+                            "status_code": response.status
+                        }
+
+                    if self.environment == "live":
+                        if latency_ms > self.max_placement_latency_ms:
+                            self.logger.error(f"LIVE OANDA API TIMEOUT: {latency_ms:.1f}ms for {method} {endpoint}")
+                        elif latency_ms > 200:  # Warning threshold
+                            self.logger.warning(f"LIVE OANDA API slow: {latency_ms:.1f}ms for {method} {endpoint}")
+
+                    return {
+                        "success": True,
+                        "data": await response.json(content_type=None) if text else {},
+                        "latency_ms": latency_ms,
+                        "status_code": response.status
+                    }
+
+            except RateLimitExceeded as e:
+                latency_ms = (time.perf_counter() - start_time) * 1000
+                self.logger.warning(f"OANDA request shed ({self.environment}): {method} {endpoint} - {e}")
+                return {
+                    "success": False,
+                    "error": str(e),
+                    "latency_ms": latency_ms,
+                    "status_code": 429
+                }
+
+            except asyncio.TimeoutError:
+                if attempt < policy.max_retries:
+                    attempt += 1
+                    await asyncio.sleep(policy.backoff(attempt))
+                    continue
+                latency_ms = (time.perf_counter() - start_time) * 1000
+                self._record_latency(method, endpoint, latency_ms, timeout=True)
+                self.logger.error(f"OANDA API TIMEOUT ({self.environment}): {latency_ms:.1f}ms for {method} {endpoint}")
+                return {
+                    "success": False,
+                    "error": "Request timeout - order execution failed",
+                    "latency_ms": latency_ms,
+                    "status_code": 408
+                }
+
+            except aiohttp.ClientConnectionError as e:
+                if attempt < policy.max_retries:
+                    attempt += 1
+                    await asyncio.sleep(policy.backoff(attempt))
+                    continue
+                latency_ms = (time.perf_counter() - start_time) * 1000
+                self._record_latency(method, endpoint, latency_ms, error=True)
+                self.logger.error(f"OANDA API EXCEPTION ({self.environment}): {str(e)}")
+                return {
+                    "success": False,
+                    "error": str(e),
+                    "latency_ms": latency_ms,
+                    "status_code": 0
+                }
+
+            except Exception as e:
+                latency_ms = (time.perf_counter() - start_time) * 1000
+                self._record_latency(method, endpoint, latency_ms, error=True)
+                self.logger.error(f"OANDA API EXCEPTION ({self.environment}): {str(e)}")
+                return {
+                    "success": False,
+                    "error": str(e),
+                    "latency_ms": latency_ms,
+                    "status_code": 0
+                }
+
+    def _record_latency(self, method: str, endpoint: str, latency_ms: float,
+                        error: bool = False, timeout: bool = False):
+        # Single event loop owns the window, so no lock is needed
+        self.request_times.append(latency_ms)
+        self.latency.record("OANDA", method, endpoint, latency_ms, error=error, timeout=timeout)
+
+    async def get_historical_data(self, instrument: str, count: int = 120, granularity: str = "M15") -> List[Dict[str, Any]]:
+        """Fetch historical mid candles through the sync connector's incremental cache (and warm HTF series)"""
+        cache = self.sync.candle_cache
+        params = cache.plan(instrument, granularity, count)
+        if params is None:
+            cache.memory_hits += 1
+        else:
+            endpoint = f"/v3/instruments/{instrument}/candles"
+            resp = await self._make_request("GET", endpoint, params=params)
+            if resp.get("success"):
+                cache.merge(instrument, granularity, (resp.get("data") or {}).get("candles", []),
+                            full="count" in params)
+            else:
+                self.logger.error(f"OANDA candles error for {instrument}: {resp.get('error', 'unknown error')}")
+                if "count" in params:
+                    return []
+        if granularity == self.sync.htf.base:
+            await self.warm_htf(instrument)
+        candles = cache.read(instrument, granularity, count)
+        if not candles:
+            self.logger.warning(f"No candles in response for {instrument}")
+        return candles
+
+    async def warm_htf(self, instrument: str) -> Dict[str, int]:
+        """Seed HTF series from UTC-aligned native candles (see OandaConnector.warm_htf)"""
+        htf = self.sync.htf
+        seeded = {}
+        for granularity, params in htf.warmup_requests(instrument):
+            resp = await self._make_request("GET", f"/v3/instruments/{instrument}/candles", params=params)
+            if not resp.get("success"):
+                self.logger.error(f"OANDA {granularity} warm-up error for {instrument}: {resp.get('error', 'unknown error')}")
+                htf.warmup_failed(instrument)
+                continue
+            seeded[granularity] = htf.seed(instrument, granularity, (resp.get("data") or {}).get("candles", []))
+        return seeded
+
+    async def get_candle_frame(self, instrument: str, count: int = 120, granularity: str = "M15") -> CandleFrame:
+        """Historical candles as a CandleFrame (see OandaConnector.get_candle_frame)"""
+        if not await self.get_historical_data(instrument, count, granularity):
+            return decode_candles([])
+        return self.sync.candle_cache.read_frame(instrument, granularity, count)
+
+    async def get_live_prices(self, instruments: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch bid/ask/mid snapshots (see OandaConnector.get_live_prices)"""
+        if not instruments:
+            return {}
+        endpoint = f"/v3/accounts/{self.account_id}/pricing"
+        resp = await self._make_request("GET", endpoint, params={"instruments": ",".join(instruments)})
+        if not resp.get("success"):
+            self.logger.error(f"Pricing API error: {resp.get('error')}")
+            return {}
+
+        out: Dict[str, Dict[str, Any]] = {}
+        for p in (resp.get("data") or {}).get("prices", []):
+            bids = p.get("bids", [])
+            asks = p.get("asks", [])
+            bid = float(bids[0]["price"]) if bids else None
+            ask = float(asks[0]["price"]) if asks else None
+            mid = (bid + ask) / 2.0 if (bid is not None and ask is not None) else None
+            out[p.get("instrument")] = {"bid": bid, "ask": ask, "mid": mid, "time": p.get("time")}
+        return out
+
+    async def get_orders(self, state: str = "PENDING") -> List[Dict[str, Any]]:
+        """Return pending orders for this account"""
+        resp = await self._make_request("GET", f"/v3/accounts/{self.account_id}/orders", params={"state": state})
+        return (resp.get("data") or {}).get("orders", []) if resp.get("success") else []
+
+    async def get_account_info(self) -> Dict[str, Any]:
+        """Account summary (NAV, balance, marginUsed, ...); empty dict on failure"""
+        resp = await self._make_request("GET", f"/v3/accounts/{self.account_id}/summary")
+        return (resp.get("data") or {}).get("account", {}) if resp.get("success") else {}
+
+    async def get_trades(self) -> List[Dict[str, Any]]:
+        """Return open trades for this account"""
+        resp = await self._make_request("GET", f"/v3/accounts/{self.account_id}/trades")
+        return (resp.get("data") or {}).get("trades", []) if resp.get("success") else []
+
+    async def cancel_order(self, order_id: str) -> Dict[str, Any]:
+        """Cancel a pending order by id"""
+        return await self._make_request("PUT", f"/v3/accounts/{self.account_id}/orders/{order_id}/cancel")
+
+    async def set_trade_stop(self, trade_id: str, stop_price: float) -> Dict[str, Any]:
+        """Set/modify the stop loss price for an existing trade"""
+        payload = {"stopLoss": {"price": str(stop_price)}}
+        return await self._make_request("PUT", f"/v3/accounts/{self.account_id}/trades/{trade_id}/orders", payload)
+
+    async def place_oco_order(self, instrument: str, entry_price: float, stop_loss: float,
+                              take_profit: float, units: int, ttl_hours: float = 24.0,
+                              order_type: str = "LIMIT",
+                              narration: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Place OCO bracket order - async twin of OandaConnector.place_oco_order
+
+        Charter pre-checks, payloads, narration and the live latency-breach
+        cancel are identical to the sync connector.
+        """
+        start_time = time.time()
+
+        rejection = self.sync._validate_oco_request(instrument, entry_price, stop_loss, take_profit, units)
+        if rejection:
+            return rejection
+
+        env_label = "LIVE" if self.environment == "live" else "PRACTICE"
+        if self.environment == "live" and (not self.sync.api_token or self.sync.api_token == "your_live_token_here"):
+            self.logger.error("LIVE OANDA token not configured - cannot place real orders")
+            return {
+                "success": False,
+                "error": "LIVE API credentials not configured",
+                "latency_ms": 0,
+                "execution_time_ms": (time.time() - start_time) * 1000,
+                "broker": "OANDA",
+                "environment": self.environment
+            }
+
+        # Practice accounts always rest a LIMIT entry (matches sync connector)
+        effective_type = order_type if self.environment == "live" else "LIMIT"
+        order_data = self.sync._build_oco_order_data(
+            instrument, entry_price, stop_loss, take_profit, units, ttl_hours, effective_type
+        )
+        response = await self._make_request("POST", f"/v3/accounts/{self.account_id}/orders", order_data)
+        execution_time = (time.time() - start_time) * 1000
+
+        if not response["success"]:
+            self.logger.error(f"{env_label} OANDA OCO failed: {response['error']}")
+            return {
+                "success": False,
+                "error": f"{env_label} API error: {response['error']}",
+                "latency_ms": response.get("latency_ms", execution_time),
+                "execution_time_ms": execution_time,
+                "broker": "OANDA",
+                "environment": self.environment
+            }
+
+        order_id = (response["data"] or {}).get("orderCreateTransaction", {}).get("id")
+        self.logger.info(
+            f"{env_label} OANDA OCO placed (async): {instrument} | Entry: {entry_price} | "
+            f"SL: {stop_loss} | TP: {take_profit} | Latency: {response['latency_ms']:.1f}ms | "
+            f"Order ID: {order_id}"
+        )
+        log_narration(
+            event_type="OCO_PLACED",
+            details={
+                "order_id": order_id,
+                "entry_price": entry_price,
+                "stop_loss": stop_loss,
+                "take_profit": take_profit,
+                "units": units,
+                "latency_ms": response['latency_ms'],
+                "environment": env_label,
+                "async_client": True,
+                **(narration or {})
+            },
+            symbol=instrument,
+            venue="oanda"
+        )
+
+        if response["latency_ms"] > self.max_placement_latency_ms:
+            if self.environment == "live":
+                self.logger.error(f"LIVE OCO latency {response['latency_ms']:.1f}ms exceeds Charter limit - CANCELLING ORDER")
+                if order_id:
+                    cancel_response = await self.cancel_order(order_id)
+                    if cancel_response["success"]:
+                        self.logger.info(f"Order {order_id} cancelled due to latency breach")
+                return {
+                    "success": False,
+                    "error": f"Order cancelled - latency {response['latency_ms']:.1f}ms exceeds Charter limit",
+                    "latency_ms": response["latency_ms"],
+                    "execution_time_ms": execution_time,
+                    "broker": "OANDA",
+                    "environment": self.environment,
+                    "cancelled": True
+                }
+            self.logger.warning(f"PRACTICE OCO latency {response['latency_ms']:.1f}ms exceeds Charter limit")
+
+        return {
+            "success": True,
+            "order_id": order_id,
+            "instrument": instrument,
+            "entry_price": entry_price,
+            "stop_loss": stop_loss,
+            "take_profit": take_profit,
+            "units": units,
+            "latency_ms": response["latency_ms"],
+            "execution_time_ms": execution_time,
+            "broker": "OANDA",
+            "environment": self.environment,
+            "ttl_hours": ttl_hours,
+            "simulated": False
+        }
+
+    def get_performance_stats(self) -> Dict[str, Any]:
+        """Async client latency stats alongside the sync connector's"""
+        stats = self.sync.get_performance_stats()
+        times = list(self.request_times)
+        stats["async_requests"] = len(times)
+        stats["async_avg_latency_ms"] = round(sum(times) / len(times), 1) if times else 0
+        return stats
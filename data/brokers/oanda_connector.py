@@ -11,6 +11,7 @@ import time
 import logging
 import requests
 import threading
+from collections import deque
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
@@ -18,6 +19,60 @@ from datetime import datetime, timezone, timedelta
 import websocket
 from urllib.parse import urljoin, urlencode
 
+# Pooled keep-alive transport shared by all connectors on the same API host
+try:
+    from .http_transport import get_shared_transport, RetryPolicy, DEFAULT_POOL_SIZE
+except ImportError:
+    from http_transport import get_shared_transport, RetryPolicy, DEFAULT_POOL_SIZE
+
+# Shared per-host request budget (priority admission, load shedding)
+try:
+    from .rate_limiter import RateLimit, RateLimitExceeded, get_rate_limiter
+except ImportError:
+    from rate_limiter import RateLimit, RateLimitExceeded, get_rate_limiter
+
+# Streaming quote board (pricing stream subscriber)
+try:
+    from .oanda_price_stream import OandaPriceStream, QuoteBoard
+except ImportError:
+    from oanda_price_stream import OandaPriceStream, QuoteBoard
+
+# Currency -> USD conversion matrix fed by the quote board
+try:
+    from .fx_matrix import get_fx_matrix
+except ImportError:
+    from fx_matrix import get_fx_matrix
+
+# Account state mirror (transactions stream subscriber)
+try:
+    from .oanda_account_mirror import OandaAccountMirror, set_account_mirror
+except ImportError:
+    from oanda_account_mirror import OandaAccountMirror, set_account_mirror
+
+# Incremental candle ring buffers per (instrument, granularity)
+try:
+    from .candle_cache import CandleCache
+    from .candle_frame import CandleFrame, decode_candles
+    from .indicator_state import get_indicator_store
+    from .bar_memo import get_bar_memo
+    from .feature_store import get_feature_store
+    from .htf_resampler import get_htf_resampler
+    from .correlation_engine import get_correlation_engine
+except ImportError:
+    from candle_cache import CandleCache
+    from candle_frame import CandleFrame, decode_candles
+    from indicator_state import get_indicator_store
+    from bar_memo import get_bar_memo
+    from feature_store import get_feature_store
+    from htf_resampler import get_htf_resampler
+    from correlation_engine import get_correlation_engine
+
+# Per-endpoint latency histograms shared by every connector
+try:
+    from .latency_recorder import get_latency_recorder
+except ImportError:
+    from latency_recorder import get_latency_recorder
+
 # Charter compliance imports
 try:
     from ..foundation.rick_charter import validate_pin
@@ -95,13 +150,34 @@ class OandaConnector:
     Supports dynamic mode switching via .upgrade_toggle
     """
     
-    def __init__(self, pin: Optional[int] = None, environment: Optional[str] = None):
+    # Per-endpoint retry policies for idempotent GETs (orders are never retried)
+    RETRY_POLICIES = {
+        "candles": RetryPolicy(max_retries=3, backoff_base_s=0.2, backoff_cap_s=2.0),
+        "pricing": RetryPolicy(max_retries=2, backoff_base_s=0.05, backoff_cap_s=0.5),
+        "account": RetryPolicy(max_retries=2, backoff_base_s=0.1, backoff_cap_s=1.0),
+    }
+    
+    # OANDA allows 120 REST requests/s per host; stay under it with headroom.
+    # Candle scans get their own bucket so a full-universe scan cannot use it all.
+    RATE_LIMIT = RateLimit(rate_per_s=100, burst=100)
+    RATE_LIMITS = {
+        "candles": RateLimit(rate_per_s=40, burst=60),
+    }
+    
+    def __init__(self, pin: Optional[int] = None, environment: Optional[str] = None,
+                 pool_size: Optional[int] = None, api_base: Optional[str] = None,
+                 stream_base: Optional[str] = None):
         """
         Initialize OANDA connector
         
         Args:
             pin: Charter PIN (841921)
             environment: 'practice' or 'live' (if None, reads from .upgrade_toggle)
+            pool_size: Keep-alive connection pool size (default: OANDA_HTTP_POOL_SIZE or 10)
+            api_base: REST base URL override (default: OANDA_API_BASE or the environment's host),
+                      e.g. a local stand-in from testing/oanda_v20_standin.py
+            stream_base: Streaming base URL override (default: OANDA_STREAM_BASE, else api_base
+                         when that was overridden, else the environment's stream host)
         """
         if pin and not validate_pin(pin):
             raise PermissionError("Invalid PIN for OandaConnector")
@@ -139,6 +215,16 @@ class OandaConnector:
             self.api_base = "https://api-fxpractice.oanda.com"
             self.stream_base = "https://stream-fxpractice.oanda.com"
         
+        # Explicit/env overrides (local stand-in, proxies)
+        api_base = api_base or os.getenv("OANDA_API_BASE")
+        stream_base = stream_base or os.getenv("OANDA_STREAM_BASE") or api_base
+        if api_base:
+            self.api_base = api_base.rstrip("/")
+        if stream_base:
+            self.stream_base = stream_base.rstrip("/")
+        if api_base or stream_base:
+            self.logger.warning(f"OANDA endpoints overridden: api={self.api_base} stream={self.stream_base}")
+        
         # Headers for API requests
         self.headers = {
             "Authorization": f"Bearer {self.api_token}",
@@ -146,8 +232,48 @@ class OandaConnector:
             "Accept-Datetime-Format": "RFC3339"
         }
         
-        # Performance tracking
-        self.request_times = []
+        # Pooled keep-alive transport (shared per API host across connector instances)
+        if pool_size is None:
+            pool_size = int(os.getenv("OANDA_HTTP_POOL_SIZE", DEFAULT_POOL_SIZE))
+        rate_limit = self.RATE_LIMIT
+        if os.getenv("OANDA_RATE_LIMIT_PER_S"):
+            rate = float(os.getenv("OANDA_RATE_LIMIT_PER_S"))
+            rate_limit = RateLimit(rate_per_s=rate, burst=rate)
+        self.rate_limiter = get_rate_limiter(self.api_base, rate_limit, self.RATE_LIMITS)
+        self.transport = get_shared_transport(
+            self.api_base, pool_size=pool_size, retry_policies=self.RETRY_POLICIES,
+            rate_limiter=self.rate_limiter
+        )
+        
+        # Streaming quote board (off until start_price_stream is called)
+        self.price_stream: Optional[OandaPriceStream] = None
+        
+        # Notional/margin/P&L conversions (kept current by every quote read)
+        self.fx = get_fx_matrix()
+        
+        # Account mirror (off until start_account_mirror is called)
+        self.account_mirror: Optional[OandaAccountMirror] = None
+        
+        # Incremental candle cache under get_historical_data; every merge
+        # advances the streaming indicator state by the newly closed bars
+        # and expires per-bar memoized filter/regime/strategy results and
+        # shared market features; closed M15 bars also build the H1/H4/D series
+        # and advance the rolling cross-instrument correlations
+        self.candle_cache = CandleCache()
+        self.indicators = get_indicator_store()
+        self.candle_cache.add_listener(self.indicators.on_candles)
+        self.bar_memo = get_bar_memo()
+        self.candle_cache.add_listener(self.bar_memo.on_candles)
+        self.features = get_feature_store()
+        self.candle_cache.add_listener(self.features.on_candles)
+        self.htf = get_htf_resampler()
+        self.candle_cache.add_listener(self.htf.on_candles)
+        self.correlations = get_correlation_engine()
+        self.candle_cache.add_listener(self.correlations.on_candles)
+        
+        # Performance tracking (recent window + per-endpoint histograms)
+        self.request_times = deque(maxlen=100)
+        self.latency = get_latency_recorder()
         self._lock = threading.Lock()
         
         # Charter compliance
@@ -195,7 +321,8 @@ class OandaConnector:
     
     def place_oco_order(self, instrument: str, entry_price: float, stop_loss: float, 
                        take_profit: float, units: int, ttl_hours: float = 24.0, 
-                       order_type: str = "LIMIT") -> Dict[str, Any]:
+                       order_type: str = "LIMIT",
+                       narration: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Place OCO order using OANDA's bracket order functionality - LIVE VERSION
         
@@ -207,126 +334,16 @@ class OandaConnector:
             units: Position size (positive for buy, negative for sell)
             ttl_hours: Time to live in hours (default 24h for limit orders, prevents early expiry)
             order_type: "LIMIT" (wait for price) or "MARKET" (immediate execution)
+            narration: Extra fields for the OCO_PLACED narration event (e.g. pre-trade timings)
             
         Returns:
             Dict with OCO order result
         """
         start_time = time.time()
 
-        # Enforce immutable/mandatory OCO: stop_loss and take_profit must be provided
-        if stop_loss is None or take_profit is None:
-            self.logger.error("OCO required: stop_loss and take_profit must be provided for all orders")
-            
-            # Narration log error
-            log_narration(
-                event_type="OCO_ERROR",
-                details={
-                    "error": "OCO_REQUIRED",
-                    "message": "stop_loss and take_profit must be specified",
-                    "entry_price": entry_price,
-                    "units": units
-                },
-                symbol=instrument,
-                venue="oanda"
-            )
-            
-            return {
-                "success": False,
-                "error": "OCO_REQUIRED: stop_loss and take_profit must be specified",
-                "broker": "OANDA",
-                "environment": self.environment
-            }
-        
-        # Enforce charter minimum notional (match Coinbase behavior)
-        try:
-            # Import RickCharter if available
-            try:
-                from ..foundation.rick_charter import RickCharter
-            except ImportError:
-                try:
-                    from foundation.rick_charter import RickCharter
-                except ImportError:
-                    RickCharter = None
-            
-            if RickCharter:
-                min_notional = RickCharter.MIN_NOTIONAL_USD
-                
-                # Calculate USD notional based on pair type
-                # For USD-based pairs (USD_XXX), units are already in USD
-                # For other pairs (XXX_USD), need to convert: units × price
-                base_currency = instrument.split("_")[0]
-                if base_currency == "USD":
-                    notional = abs(units)  # Units already in USD
-                else:
-                    notional = abs(units) * float(entry_price)  # Convert to USD
-                
-                if notional < min_notional:
-                    # REJECT order instead of auto-adjusting
-                    # Auto-adjusting could create unexpected large positions
-                    self.logger.error(
-                        f"❌ ORDER REJECTED: Charter requires minimum ${min_notional:,} notional. "
-                        f"Order notional: ${notional:,.2f} for {instrument} ({abs(units)} units @ {entry_price})"
-                    )
-                    
-                    # Narration log the rejection
-                    log_narration(
-                        event_type="ORDER_REJECTED_MIN_NOTIONAL",
-                        details={
-                            "units": units,
-                            "notional": notional,
-                            "min_notional": min_notional,
-                            "entry_price": entry_price,
-                            "reason": "below_charter_minimum",
-                            "charter_pin": 841921
-                        },
-                        symbol=instrument,
-                        venue="oanda"
-                    )
-                    
-                    return {
-                        "success": False,
-                        "error": f"ORDER_REJECTED: Notional ${notional:,.2f} below Charter minimum ${min_notional:,}",
-                        "notional": notional,
-                        "min_notional": min_notional,
-                        "broker": "OANDA",
-                        "environment": self.environment
-                    }
-        except Exception as e:
-            # Don't block order placement if enforcement fails
-            self.logger.warning(f"Min-notional enforcement check failed: {e}")
-
-        # Enforce charter minimum expected PnL (gross) at TP
-        try:
-            if RickCharter and hasattr(RickCharter, "MIN_EXPECTED_PNL_USD"):
-                # Use final units (after any min-notional bump). Magnitude only.
-                expected_pnl_usd = abs((float(take_profit) - float(entry_price)) * float(units))
-                min_expected = float(RickCharter.MIN_EXPECTED_PNL_USD)
-                if expected_pnl_usd < min_expected:
-                    self.logger.warning(
-                        f"Charter min expected PnL ${min_expected:.2f} not met "
-                        f"(got ${expected_pnl_usd:.2f}) for {instrument}. Blocking order."
-                    )
-                    log_narration(
-                        event_type="CHARTER_VIOLATION",
-                        details={
-                            "code": "MIN_EXPECTED_PNL_USD",
-                            "expected_pnl_usd": expected_pnl_usd,
-                            "min_expected_pnl_usd": min_expected,
-                            "entry_price": entry_price,
-                            "take_profit": take_profit,
-                            "units": units
-                        },
-                        symbol=instrument,
-                        venue="oanda"
-                    )
-                    return {
-                        "success": False,
-                        "error": f"EXPECTED_PNL_BELOW_MIN: {expected_pnl_usd:.2f} < {min_expected:.2f}",
-                        "broker": "OANDA",
-                        "environment": self.environment
-                    }
-        except Exception as e:
-            self.logger.warning(f"Min-expected-PnL enforcement failed: {e}")
+        rejection = self._validate_oco_request(instrument, entry_price, stop_loss, take_profit, units)
+        if rejection:
+            return rejection
         
         try:
             # For LIVE environment, validate API credentials first
@@ -344,44 +361,9 @@ class OandaConnector:
                 
                 # LIVE ORDER PLACEMENT
                 # Support both LIMIT and MARKET order types
-                if order_type.upper() == "MARKET":
-                    # MARKET order - immediate execution with OCO brackets
-                    order_data = {
-                        "order": {
-                            "type": OandaOrderType.MARKET.value,
-                            "instrument": instrument,
-                            "units": str(units),
-                            "timeInForce": OandaTimeInForce.FOK.value,  # Fill or Kill
-                            "stopLossOnFill": {
-                                "price": str(stop_loss),
-                                "timeInForce": OandaTimeInForce.GTC.value
-                            },
-                            "takeProfitOnFill": {
-                                "price": str(take_profit),
-                                "timeInForce": OandaTimeInForce.GTC.value
-                            }
-                        }
-                    }
-                else:
-                    # LIMIT order - wait for specific entry price with extended TTL (24h default)
-                    order_data = {
-                        "order": {
-                            "type": OandaOrderType.LIMIT.value,
-                            "instrument": instrument,
-                            "units": str(units),
-                            "price": str(entry_price),
-                            "timeInForce": OandaTimeInForce.GTD.value,
-                            "gtdTime": (datetime.now(timezone.utc) + timedelta(hours=ttl_hours)).isoformat(),
-                            "stopLossOnFill": {
-                                "price": str(stop_loss),
-                                "timeInForce": OandaTimeInForce.GTC.value
-                            },
-                            "takeProfitOnFill": {
-                                "price": str(take_profit),
-                                "timeInForce": OandaTimeInForce.GTC.value
-                            }
-                        }
-                    }
+                order_data = self._build_oco_order_data(
+                    instrument, entry_price, stop_loss, take_profit, units, ttl_hours, order_type
+                )
                 
                 # Make LIVE API call
                 response = self._make_request("POST", f"/v3/accounts/{self.account_id}/orders", order_data)
@@ -408,7 +390,8 @@ class OandaConnector:
                             "take_profit": take_profit,
                             "units": units,
                             "latency_ms": response['latency_ms'],
-                            "environment": "LIVE"
+                            "environment": "LIVE",
+                            **(narration or {})
                         },
                         symbol=instrument,
                         venue="oanda"
@@ -461,24 +444,9 @@ class OandaConnector:
             else:
                 # PRACTICE MODE - Place REAL orders on OANDA practice account
                 # (Not simulation - actual API calls to practice endpoint)
-                order_data = {
-                    "order": {
-                        "type": "LIMIT",
-                        "instrument": instrument,
-                        "units": str(units),
-                        "price": str(entry_price),
-                        "timeInForce": "GTD",
-                        "gtdTime": (datetime.now(timezone.utc) + timedelta(hours=ttl_hours)).isoformat(),
-                        "stopLossOnFill": {
-                            "price": str(stop_loss),
-                            "timeInForce": "GTC"
-                        },
-                        "takeProfitOnFill": {
-                            "price": str(take_profit),
-                            "timeInForce": "GTC"
-                        }
-                    }
-                }
+                order_data = self._build_oco_order_data(
+                    instrument, entry_price, stop_loss, take_profit, units, ttl_hours, "LIMIT"
+                )
                 
                 # Make PRACTICE API call (real order on practice account)
                 response = self._make_request("POST", f"/v3/accounts/{self.account_id}/orders", order_data)
@@ -507,7 +475,8 @@ class OandaConnector:
                             "latency_ms": response['latency_ms'],
                             "environment": "PRACTICE",
                             "simulated": False,  # Real API order
-                            "visible_in_oanda": True
+                            "visible_in_oanda": True,
+                            **(narration or {})
                         },
                         symbol=instrument,
                         venue="oanda"
@@ -555,6 +524,172 @@ class OandaConnector:
                 "environment": self.environment
             }
     
+    def _validate_oco_request(self, instrument: str, entry_price: float, stop_loss: float,
+                              take_profit: float, units: int) -> Optional[Dict[str, Any]]:
+        """Charter pre-checks shared by sync and async OCO placement.
+
+        Returns:
+            Rejection result dict, or None if the order may be submitted
+        """
+        # Enforce immutable/mandatory OCO: stop_loss and take_profit must be provided
+        if stop_loss is None or take_profit is None:
+            self.logger.error("OCO required: stop_loss and take_profit must be provided for all orders")
+            
+            # Narration log error
+            log_narration(
+                event_type="OCO_ERROR",
+                details={
+                    "error": "OCO_REQUIRED",
+                    "message": "stop_loss and take_profit must be specified",
+                    "entry_price": entry_price,
+                    "units": units
+                },
+                symbol=instrument,
+                venue="oanda"
+            )
+            
+            return {
+                "success": False,
+                "error": "OCO_REQUIRED: stop_loss and take_profit must be specified",
+                "broker": "OANDA",
+                "environment": self.environment
+            }
+        
+        # Enforce charter minimum notional (match Coinbase behavior)
+        try:
+            # Import RickCharter if available
+            try:
+                from ..foundation.rick_charter import RickCharter
+            except ImportError:
+                try:
+                    from foundation.rick_charter import RickCharter
+                except ImportError:
+                    RickCharter = None
+            
+            if RickCharter:
+                min_notional = RickCharter.MIN_NOTIONAL_USD
+                
+                # Calculate USD notional based on pair type
+                # For USD-based pairs (USD_XXX), units are already in USD
+                # For other pairs (XXX_USD), need to convert: units × price
+                base_currency = instrument.split("_")[0]
+                if base_currency == "USD":
+                    notional = abs(units)  # Units already in USD
+                else:
+                    notional = abs(units) * float(entry_price)  # Convert to USD
+                
+                if notional < min_notional:
+                    # REJECT order instead of auto-adjusting
+                    # Auto-adjusting could create unexpected large positions
+                    self.logger.error(
+                        f"❌ ORDER REJECTED: Charter requires minimum ${min_notional:,} notional. "
+                        f"Order notional: ${notional:,.2f} for {instrument} ({abs(units)} units @ {entry_price})"
+                    )
+                    
+                    # Narration log the rejection
+                    log_narration(
+                        event_type="ORDER_REJECTED_MIN_NOTIONAL",
+                        details={
+                            "units": units,
+                            "notional": notional,
+                            "min_notional": min_notional,
+                            "entry_price": entry_price,
+                            "reason": "below_charter_minimum",
+                            "charter_pin": 841921
+                        },
+                        symbol=instrument,
+                        venue="oanda"
+                    )
+                    
+                    return {
+                        "success": False,
+                        "error": f"ORDER_REJECTED: Notional ${notional:,.2f} below Charter minimum ${min_notional:,}",
+                        "notional": notional,
+                        "min_notional": min_notional,
+                        "broker": "OANDA",
+                        "environment": self.environment
+                    }
+        except Exception as e:
+            # Don't block order placement if enforcement fails
+            self.logger.warning(f"Min-notional enforcement check failed: {e}")
+
+        # Enforce charter minimum expected PnL (gross) at TP
+        try:
+            if RickCharter and hasattr(RickCharter, "MIN_EXPECTED_PNL_USD"):
+                # Use final units (after any min-notional bump). Magnitude only.
+                expected_pnl_usd = abs((float(take_profit) - float(entry_price)) * float(units))
+                min_expected = float(RickCharter.MIN_EXPECTED_PNL_USD)
+                if expected_pnl_usd < min_expected:
+                    self.logger.warning(
+                        f"Charter min expected PnL ${min_expected:.2f} not met "
+                        f"(got ${expected_pnl_usd:.2f}) for {instrument}. Blocking order."
+                    )
+                    log_narration(
+                        event_type="CHARTER_VIOLATION",
+                        details={
+                            "code": "MIN_EXPECTED_PNL_USD",
+                            "expected_pnl_usd": expected_pnl_usd,
+                            "min_expected_pnl_usd": min_expected,
+                            "entry_price": entry_price,
+                            "take_profit": take_profit,
+                            "units": units
+                        },
+                        symbol=instrument,
+                        venue="oanda"
+                    )
+                    return {
+                        "success": False,
+                        "error": f"EXPECTED_PNL_BELOW_MIN: {expected_pnl_usd:.2f} < {min_expected:.2f}",
+                        "broker": "OANDA",
+                        "environment": self.environment
+                    }
+        except Exception as e:
+            self.logger.warning(f"Min-expected-PnL enforcement failed: {e}")
+        
+        return None
+    
+    def _build_oco_order_data(self, instrument: str, entry_price: float, stop_loss: float,
+                              take_profit: float, units: int, ttl_hours: float,
+                              order_type: str = "LIMIT") -> Dict[str, Any]:
+        """Build the v20 order payload with SL/TP brackets attached on fill"""
+        if order_type.upper() == "MARKET":
+            # MARKET order - immediate execution with OCO brackets
+            return {
+                "order": {
+                    "type": OandaOrderType.MARKET.value,
+                    "instrument": instrument,
+                    "units": str(units),
+                    "timeInForce": OandaTimeInForce.FOK.value,  # Fill or Kill
+                    "stopLossOnFill": {
+                        "price": str(stop_loss),
+                        "timeInForce": OandaTimeInForce.GTC.value
+                    },
+                    "takeProfitOnFill": {
+                        "price": str(take_profit),
+                        "timeInForce": OandaTimeInForce.GTC.value
+                    }
+                }
+            }
+        # LIMIT order - wait for specific entry price with extended TTL (24h default)
+        return {
+            "order": {
+                "type": OandaOrderType.LIMIT.value,
+                "instrument": instrument,
+                "units": str(units),
+                "price": str(entry_price),
+                "timeInForce": OandaTimeInForce.GTD.value,
+                "gtdTime": (datetime.now(timezone.utc) + timedelta(hours=ttl_hours)).isoformat(),
+                "stopLossOnFill": {
+                    "price": str(stop_loss),
+                    "timeInForce": OandaTimeInForce.GTC.value
+                },
+                "takeProfitOnFill": {
+                    "price": str(take_profit),
+                    "timeInForce": OandaTimeInForce.GTC.value
+                }
+            }
+        }
+    
     def _make_request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Make authenticated API request with performance tracking - LIVE VERSION
@@ -568,34 +703,30 @@ class OandaConnector:
         Returns:
             Dict with API response
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         url = urljoin(self.api_base, endpoint)
         
         try:
-            # Prepare request
+            # Prepare request over the pooled keep-alive session
             if method.upper() == "GET":
                 # Pass params for query string support (e.g., candles)
-                response = requests.get(url, headers=self.headers, params=params, timeout=self.default_timeout)
-            elif method.upper() == "POST":
-                response = requests.post(url, headers=self.headers, json=data, timeout=self.default_timeout)
-            elif method.upper() == "PUT":
-                response = requests.put(url, headers=self.headers, json=data, timeout=self.default_timeout)
+                response = self.transport.request("GET", url, endpoint_class=self._endpoint_class(endpoint),
+                                                  headers=self.headers, params=params, timeout=self.default_timeout)
+            elif method.upper() in ("POST", "PUT"):
+                response = self.transport.request(method, url, headers=self.headers, json=data,
+                                                  timeout=self.default_timeout)
             elif method.upper() == "DELETE":
-                response = requests.delete(url, headers=self.headers, timeout=self.default_timeout)
+                response = self.transport.request("DELETE", url, headers=self.headers, timeout=self.default_timeout)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
-            # Track request latency
-            latency_ms = (time.time() - start_time) * 1000
-            with self._lock:
-                self.request_times.append(latency_ms)
-                if len(self.request_times) > 100:
-                    self.request_times = self.request_times[-100:]
+            latency_ms = (time.perf_counter() - start_time) * 1000
             
             # Check response
             response.raise_for_status()
             
             result = response.json() if response.content else {}
+            self._track_latency(method, endpoint, latency_ms)
             
             # Log performance for LIVE environment
             if self.environment == "live":
@@ -611,8 +742,19 @@ class OandaConnector:
                 "status_code": response.status_code
             }
             
+        except RateLimitExceeded as e:
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            self.logger.warning(f"OANDA request shed ({self.environment}): {method} {endpoint} - {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "latency_ms": latency_ms,
+                "status_code": 429
+            }
+            
         except requests.exceptions.Timeout:
-            latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            self._track_latency(method, endpoint, latency_ms, timeout=True)
             self.logger.error(f"OANDA API TIMEOUT ({self.environment}): {latency_ms:.1f}ms for {method} {endpoint}")
             return {
                 "success": False,
@@ -622,7 +764,7 @@ class OandaConnector:
             }
             
         except requests.exceptions.HTTPError as e:
-            latency_ms = (time.time() - start_time) * 1000
+            self._track_latency(method, endpoint, latency_ms, error=True)
             error_msg = f"HTTP {response.status_code}: {response.text}"
             self.logger.error(f"OANDA API ERROR ({self.environment}): {error_msg}")
             return {
@@ -633,7 +775,8 @@ class OandaConnector:
             }
             
         except Exception as e:
-            latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            self._track_latency(method, endpoint, latency_ms, error=True)
             self.logger.error(f"OANDA API EXCEPTION ({self.environment}): {str(e)}")
             return {
                 "success": False,
@@ -642,10 +785,29 @@ class OandaConnector:
                 "status_code": 0
             }
     
+    def _track_latency(self, method: str, endpoint: str, latency_ms: float,
+                       error: bool = False, timeout: bool = False):
+        """Record one request in the recent window and the per-endpoint histogram"""
+        with self._lock:
+            self.request_times.append(latency_ms)
+        self.latency.record("OANDA", method, endpoint, latency_ms, error=error, timeout=timeout)
+    
+    @staticmethod
+    def _endpoint_class(endpoint: str) -> Optional[str]:
+        """Map an endpoint path to its transport retry-policy class"""
+        path = endpoint.split("?", 1)[0]
+        if path.endswith("/candles"):
+            return "candles"
+        if path.endswith("/pricing"):
+            return "pricing"
+        if path.endswith(("/summary", "/openPositions", "/trades", "/orders")):
+            return "account"
+        return None
+    
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get connector performance statistics"""
         with self._lock:
-            request_times = self.request_times.copy()
+            request_times = list(self.request_times)
         
         if not request_times:
             return {
@@ -654,7 +816,18 @@ class OandaConnector:
                 "max_latency_ms": 0,
                 "charter_compliance_rate": 0,
                 "environment": self.environment,
-                "account_id": "stub"
+                "account_id": "stub",
+                "transport": self.transport.stats(),
+                "price_stream": self.price_stream.stats() if self.price_stream else None,
+                "account_mirror": self.account_mirror.stats() if self.account_mirror else None,
+                "candle_cache": self.candle_cache.stats(),
+                "indicators": self.indicators.stats(),
+                "bar_memo": self.bar_memo.stats(),
+                "features": self.features.stats(),
+                "htf": self.htf.stats(),
+                "correlations": self.correlations.stats(),
+                "latency": self.latency.broker_summary("OANDA"),
+                "endpoints": self.latency.snapshot("OANDA")
             }
         
         avg_latency = sum(request_times) / len(request_times)
@@ -668,12 +841,26 @@ class OandaConnector:
             "max_latency_ms": round(max_latency, 1),
             "charter_compliance_rate": round(compliance_rate, 3),
             "environment": self.environment,
-            "account_id": self.account_id[-4:] if self.account_id else "N/A"
+            "account_id": self.account_id[-4:] if self.account_id else "N/A",
+            "transport": self.transport.stats(),
+            "price_stream": self.price_stream.stats() if self.price_stream else None,
+            "account_mirror": self.account_mirror.stats() if self.account_mirror else None,
+            "candle_cache": self.candle_cache.stats(),
+            "indicators": self.indicators.stats(),
+            "bar_memo": self.bar_memo.stats(),
+            "features": self.features.stats(),
+            "htf": self.htf.stats(),
+            "correlations": self.correlations.stats(),
+            "latency": self.latency.broker_summary("OANDA"),
+            "endpoints": self.latency.snapshot("OANDA")
         }
 
     # --- Convenience management API helpers -------------------------------------------------
     def get_orders(self, state: str = "PENDING") -> List[Dict[str, Any]]:
         """Return pending orders from OANDA for this account."""
+        mirror = self._mirror()
+        if mirror is not None and state == "PENDING":
+            return mirror.get_orders()
         try:
             endpoint = f"/v3/accounts/{self.account_id}/orders?state={state}"
             resp = self._make_request("GET", endpoint)
@@ -684,8 +871,29 @@ class OandaConnector:
             self.logger.warning(f"Failed to fetch orders: {e}")
         return []
 
+    def _mirror(self) -> Optional[OandaAccountMirror]:
+        """The account mirror when it is running and in sync, else None (read REST)"""
+        mirror = self.account_mirror
+        return mirror if mirror is not None and mirror.healthy else None
+
+    def get_account_info(self) -> Dict[str, Any]:
+        """Return the account summary (NAV, balance, marginUsed, ...); empty dict on failure."""
+        mirror = self._mirror()
+        if mirror is not None:
+            return mirror.account_summary()
+        try:
+            resp = self._make_request("GET", f"/v3/accounts/{self.account_id}/summary")
+            if resp.get("success"):
+                return (resp.get("data") or {}).get("account", {})
+        except Exception as e:
+            self.logger.warning(f"Failed to fetch account summary: {e}")
+        return {}
+
     def get_trades(self) -> List[Dict[str, Any]]:
         """Return open trades for this account."""
+        mirror = self._mirror()
+        if mirror is not None:
+            return mirror.get_trades()
         try:
             endpoint = f"/v3/accounts/{self.account_id}/trades"
             resp = self._make_request("GET", endpoint)
@@ -697,19 +905,39 @@ class OandaConnector:
         return []
 
 
+    def get_closed_trade_pl(self, trade_id: str) -> Optional[float]:
+        """Realized P/L of a closed trade from its fills; None while open or unavailable
+
+        The account mirror answers for trades it saw close; otherwise one
+        GET /trades/{id}.
+        """
+        mirror = self.account_mirror
+        if mirror is not None:
+            pl = mirror.closed_trade_pl(trade_id)
+            if pl is not None:
+                return pl
+        try:
+            resp = self._make_request("GET", f"/v3/accounts/{self.account_id}/trades/{trade_id}")
+            if resp.get("success"):
+                trade = (resp.get("data") or {}).get("trade") or {}
+                if trade.get("state") == "CLOSED" and trade.get("realizedPL") is not None:
+                    return float(trade["realizedPL"])
+        except Exception as e:
+            self.logger.warning(f"Failed to fetch trade {trade_id}: {e}")
+        return None
+
     def _safe_request_get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Runtime-safe GET wrapper that ALWAYS bypasses _make_request.
-        Directly uses requests.get() for maximum compatibility with legacy stubs.
+        Goes straight to the pooled transport for maximum compatibility with legacy stubs.
         """
+        start_time = time.perf_counter()
         try:
             url = urljoin(self.api_base, endpoint)
-            r = requests.get(url, headers=self.headers, params=params, timeout=self.default_timeout)
+            r = self.transport.request("GET", url, endpoint_class=self._endpoint_class(endpoint),
+                                       headers=self.headers, params=params, timeout=self.default_timeout)
+            latency_ms = (time.perf_counter() - start_time) * 1000
             r.raise_for_status()
-            latency_ms = 0  # Direct call timing
-            with self._lock:
-                self.request_times.append(latency_ms)
-                if len(self.request_times) > 100:
-                    self.request_times = self.request_times[-100:]
+            self._track_latency("GET", endpoint, latency_ms)
             return {
                 "success": True,
                 "data": r.json() if r.content else {},
@@ -717,49 +945,163 @@ class OandaConnector:
                 "status_code": r.status_code
             }
         except Exception as e:
+            self._track_latency("GET", endpoint, (time.perf_counter() - start_time) * 1000,
+                                error=True, timeout=isinstance(e, requests.exceptions.Timeout))
             self.logger.error(f"_safe_request_get failed: {e}")
             return {"success": False, "error": str(e)}
 
-    def get_historical_data(self, instrument: str, count: int = 120, granularity: str = "M15") -> List[Dict[str, Any]]:
+    def get_historical_data(self, instrument: str, count: int = 120, granularity: str = "M15",
+                            use_cache: bool = True) -> List[Dict[str, Any]]:
         """Fetch historical candle data from OANDA for signal generation
         
+        Reads go through the incremental candle cache: once warm, only bars after
+        the last completed candle are requested and the forming bar is replaced.
+        The first cached base-granularity read of an instrument also seeds its
+        H1/H4/D series from native candles (see warm_htf).
+        
         Args:
             instrument: Trading pair (e.g., "EUR_USD")
             count: Number of candles to fetch (default: 120)
             granularity: Candle period (default: "M15" for 15 minutes)
+            use_cache: Set False to force a full download that bypasses the cache
             
         Returns:
             List of candle dicts with format:
-            [{'time': 'ISO8601', 'volume': int, 'mid': {'o': str, 'h': str, 'l': str, 'c': str}}, ...]
+            [{'time': 'ISO8601', 'volume': int, 'complete': bool, 'mid': {'o': str, 'h': str, 'l': str, 'c': str}}, ...]
         """
         try:
-            endpoint = f"/v3/instruments/{instrument}/candles"
-            params = {
-                "count": count,
-                "granularity": granularity,
-                "price": "M"   # Mid prices only
-            }
-            # Use safe wrapper that handles legacy signatures
-            resp = self._safe_request_get(endpoint, params=params)
+            if not use_cache:
+                params = {
+                    "count": count,
+                    "granularity": granularity,
+                    "price": "M"   # Mid prices only
+                }
+                return self._fetch_candles(instrument, params) or []
             
-            if resp.get("success"):
-                data = resp.get("data") or {}
-                candles = data.get("candles", [])
-                if candles:
-                    return candles
+            candles = self.candle_cache.get(
+                instrument, granularity, count,
+                lambda params: self._fetch_candles(instrument, params)
+            )
+            if granularity == self.htf.base:
+                self.warm_htf(instrument)
+            if not candles:
                 self.logger.warning(f"No candles in response for {instrument}")
-                return []
-            else:
-                err = resp.get("error", "unknown error")
-                self.logger.error(f"OANDA candles error for {instrument}: {err}")
-                return []
+            return candles
         except Exception as e:
             self.logger.error(f"Failed to fetch candles for {instrument}: {e}")
             return []
+    
+    def get_candle_frame(self, instrument: str, count: int = 120, granularity: str = "M15",
+                         use_cache: bool = True) -> CandleFrame:
+        """Historical candles decoded once into NumPy columns (see get_historical_data)
+        
+        Cached windows are decoded once per refresh, so the regime detector,
+        smart filter and wolf pack reading the same bar share one CandleFrame.
+        """
+        if not use_cache:
+            return decode_candles(self.get_historical_data(instrument, count, granularity, use_cache=False))
+        if not self.get_historical_data(instrument, count, granularity):
+            return decode_candles([])
+        return self.candle_cache.read_frame(instrument, granularity, count)
+    
+    def get_indicator_state(self, instrument: str, granularity: str = "M15"):
+        """Streaming RSI/MACD/ATR/Bollinger state fed by this connector's candle reads (None before the first)"""
+        return self.indicators.get(instrument, granularity)
+    
+    def warm_htf(self, instrument: str) -> Dict[str, int]:
+        """Seed the instrument's HTF series from UTC-aligned native candles (once per process)
+
+        Returns {granularity: bars seeded}; a failed fetch releases the claim
+        so a later read retries the warm-up.
+        """
+        seeded = {}
+        for granularity, params in self.htf.warmup_requests(instrument):
+            candles = self._fetch_candles(instrument, params)
+            if candles is None:
+                self.htf.warmup_failed(instrument)
+                continue
+            seeded[granularity] = self.htf.seed(instrument, granularity, candles)
+        return seeded
+
+    def _fetch_candles(self, instrument: str, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """One candles request; None on API error so the cache can keep its window"""
+        endpoint = f"/v3/instruments/{instrument}/candles"
+        # Use safe wrapper that handles legacy signatures
+        resp = self._safe_request_get(endpoint, params=params)
+        if not resp.get("success"):
+            err = resp.get("error", "unknown error")
+            self.logger.error(f"OANDA candles error for {instrument}: {err}")
+            return None
+        data = resp.get("data") or {}
+        return data.get("candles", [])
+
+    def start_price_stream(self, instruments: List[str], stale_after_s: float = 5.0) -> OandaPriceStream:
+        """Start the pricing-stream subscriber feeding the in-memory quote board.
+
+        Once running, get_live_prices serves fresh quotes from memory and only
+        falls back to REST for instruments whose quote is stale or missing.
+        """
+        if self.price_stream is None:
+            self.price_stream = OandaPriceStream(
+                stream_base=self.stream_base,
+                account_id=self.account_id,
+                headers=self.headers,
+                instruments=instruments,
+                board=QuoteBoard(stale_after_s=stale_after_s)
+            )
+            self.price_stream.board.add_listener(self.fx.on_quote)
+        self.price_stream.start()
+        return self.price_stream
+
+    def stop_price_stream(self):
+        """Stop the pricing-stream subscriber (quote board is discarded)"""
+        if self.price_stream is not None:
+            self.price_stream.stop()
+            self.price_stream = None
+
+    def start_account_mirror(self, heartbeat_timeout_s: float = 10.0,
+                             resync_interval_s: float = 300.0) -> OandaAccountMirror:
+        """Start the transactions-stream account mirror.
+
+        Once in sync, get_account_info, get_trades and get_orders("PENDING")
+        are served from memory; they fall back to REST whenever the mirror is
+        disconnected or resyncing. Quotes for marking come from the pricing
+        stream's board when it is running.
+        """
+        if self.account_mirror is None:
+            self.account_mirror = OandaAccountMirror(
+                connector=self,
+                stream_base=self.stream_base,
+                account_id=self.account_id,
+                headers=self.headers,
+                quote_fn=self.get_quote,
+                fx=self.fx,
+                heartbeat_timeout_s=heartbeat_timeout_s,
+                resync_interval_s=resync_interval_s
+            )
+        self.account_mirror.start()
+        set_account_mirror(self.account_mirror)
+        return self.account_mirror
+
+    def stop_account_mirror(self):
+        """Stop the account mirror; reads go back to REST"""
+        if self.account_mirror is not None:
+            self.account_mirror.stop()
+            set_account_mirror(None)
+            self.account_mirror = None
+
+    def get_quote(self, instrument: str, max_age_s: Optional[float] = None):
+        """Fresh streamed Quote for instrument, or None if streaming is off or the quote is stale"""
+        if self.price_stream is None:
+            return None
+        return self.price_stream.board.get(instrument, max_age_s)
 
     def get_live_prices(self, instruments: List[str]) -> Dict[str, Dict[str, Any]]:
         """Fetch real-time price snapshots (bid/ask/mid) for instruments.
 
+        Reads the streaming quote board first when it is running; only stale
+        or missing instruments go to the REST pricing endpoint.
+
         Args:
             instruments: list like ["EUR_USD", "GBP_USD"]
 
@@ -769,24 +1111,37 @@ class OandaConnector:
         if not instruments:
             return {}
 
+        out: Dict[str, Dict[str, Any]] = {}
+        board = self.price_stream.board if self.price_stream is not None else None
+        if board is not None:
+            for inst, quote in board.get_many(instruments).items():
+                out[inst] = quote.as_price()
+            instruments = [inst for inst in instruments if inst not in out]
+            if not instruments:
+                return out
+
         try:
             endpoint = f"/v3/accounts/{self.account_id}/pricing"
             params = {"instruments": ",".join(instruments)}
             resp = self._safe_request_get(endpoint, params=params)
             if not resp.get("success"):
                 self.logger.error(f"Pricing API error: {resp.get('error')}")
-                return {}
+                return out
 
             data = resp.get("data", {})
             prices = data.get("prices", [])
-            out: Dict[str, Dict[str, Any]] = {}
             for p in prices:
+                if board is not None:
+                    # REST refresh keeps the board warm for the next reader
+                    board.update_from_message(p, source="rest")
                 inst = p.get("instrument")
                 bids = p.get("bids", [])
                 asks = p.get("asks", [])
                 bid = float(bids[0]["price"]) if bids else None
                 ask = float(asks[0]["price"]) if asks else None
                 mid = (bid + ask) / 2.0 if (bid is not None and ask is not None) else None
+                if board is None and mid is not None:
+                    self.fx.update(inst, mid)
                 out[inst] = {
                     "bid": bid,
                     "ask": ask,
@@ -796,7 +1151,7 @@ class OandaConnector:
             return out
         except Exception as e:
             self.logger.error(f"Failed to fetch live prices: {e}")
-            return {}
+            return out
 
     def cancel_order(self, order_id: str) -> Dict[str, Any]:
         """Cancel a pending order by id."""
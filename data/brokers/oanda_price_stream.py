@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+OANDA Pricing Stream - RBOTzilla UNI
+Long-lived subscriber to /v3/accounts/{id}/pricing/stream feeding an
+in-memory quote board.
+
+- QuoteBoard: thread-safe bid/ask/mid/time per instrument with staleness
+  metadata; reads are a dict lookup (microseconds, no network); listeners
+  (e.g. the FX conversion matrix) see every update
+- OandaPriceStream: background thread that keeps the stream open,
+  detects missing heartbeats and reconnects with backoff
+PIN: 841921
+"""
+
+import json
+import time
+import random
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Any, Iterable
+
+try:
+    from .http_transport import get_shared_transport
+except ImportError:
+    from http_transport import get_shared_transport
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Quote:
+    """Latest top-of-book quote for one instrument"""
+    instrument: str
+    bid: Optional[float]
+    ask: Optional[float]
+    mid: Optional[float]
+    time: Optional[str]          # Broker timestamp (RFC3339)
+    received_at: float           # Local monotonic receive time
+    source: str = "stream"       # "stream" | "rest"
+    tradeable: bool = True
+
+    @property
+    def age_s(self) -> float:
+        return time.monotonic() - self.received_at
+
+    def as_price(self) -> Dict[str, Any]:
+        """Same shape as OandaConnector.get_live_prices values"""
+        return {"bid": self.bid, "ask": self.ask, "mid": self.mid, "time": self.time}
+
+
+def _parse_price(msg: Dict[str, Any], source: str) -> Quote:
+    bids = msg.get("bids", [])
+    asks = msg.get("asks", [])
+    bid = float(bids[0]["price"]) if bids else None
+    ask = float(asks[0]["price"]) if asks else None
+    mid = (bid + ask) / 2.0 if (bid is not None and ask is not None) else None
+    return Quote(
+        instrument=msg.get("instrument"),
+        bid=bid,
+        ask=ask,
+        mid=mid,
+        time=msg.get("time"),
+        received_at=time.monotonic(),
+        source=source,
+        tradeable=bool(msg.get("tradeable", True)),
+    )
+
+
+class QuoteBoard:
+    """Thread-safe in-memory quote board with staleness checks"""
+
+    def __init__(self, stale_after_s: float = 5.0):
+        """
+        Args:
+            stale_after_s: Quotes older than this are treated as stale
+        """
+        self.stale_after_s = stale_after_s
+        self._quotes: Dict[str, Quote] = {}
+        self._lock = threading.Lock()
+        self.listeners: List[Callable[[Quote], None]] = []
+        self.hits = 0
+        self.stale_misses = 0
+
+    def add_listener(self, listener: Callable[[Quote], None]):
+        """Call listener(quote) after every update (must be cheap; runs on the stream thread)"""
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def update(self, quote: Quote):
+        with self._lock:
+            self._quotes[quote.instrument] = quote
+        for listener in self.listeners:
+            listener(quote)
+
+    def update_from_message(self, msg: Dict[str, Any], source: str = "stream") -> Quote:
+        """Apply a v20 ClientPrice message (stream PRICE or REST pricing entry)"""
+        quote = _parse_price(msg, source)
+        self.update(quote)
+        return quote
+
+    def get(self, instrument: str, max_age_s: Optional[float] = None) -> Optional[Quote]:
+        """Return the quote if it is fresh, else None"""
+        limit = self.stale_after_s if max_age_s is None else max_age_s
+        quote = self._quotes.get(instrument)  # dict read is atomic; no lock on the hot path
+        if quote is None or quote.age_s > limit:
+            self.stale_misses += 1
+            return None
+        self.hits += 1
+        return quote
+
+    def get_many(self, instruments: Iterable[str], max_age_s: Optional[float] = None) -> Dict[str, Quote]:
+        """Fresh quotes for the requested instruments (stale/missing omitted)"""
+        out = {}
+        for inst in instruments:
+            quote = self.get(inst, max_age_s)
+            if quote is not None:
+                out[inst] = quote
+        return out
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """All quotes with staleness metadata"""
+        with self._lock:
+            quotes = list(self._quotes.values())
+        return {
+            q.instrument: dict(q.as_price(), age_s=round(q.age_s, 3), source=q.source,
+                               stale=q.age_s > self.stale_after_s)
+            for q in quotes
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.stale_misses
+        return {
+            "instruments": len(self._quotes),
+            "hits": self.hits,
+            "stale_misses": self.stale_misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+class OandaPriceStream:
+    """
+    Background pricing-stream subscriber.
+
+    OANDA sends a HEARTBEAT every ~5s on an idle stream; if neither a price
+    nor a heartbeat arrives within heartbeat_timeout_s the stream is
+    considered dead and is reopened.
+    """
+
+    def __init__(self, stream_base: str, account_id: str, headers: Dict[str, str],
+                 instruments: List[str], board: Optional[QuoteBoard] = None,
+                 heartbeat_timeout_s: float = 10.0):
+        self.stream_base = stream_base
+        self.account_id = account_id
+        self.headers = headers
+        self.instruments = list(instruments)
+        self.board = board or QuoteBoard()
+        self.heartbeat_timeout_s = heartbeat_timeout_s
+
+        self.transport = get_shared_transport(stream_base, pool_size=2)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._response = None
+
+        self.connected = False
+        self.last_message_at: Optional[float] = None
+        self.last_heartbeat_time: Optional[str] = None
+        self.reconnects = 0
+        self.messages = 0
+
+    @property
+    def healthy(self) -> bool:
+        """True while the stream is connected and heartbeats are on time"""
+        return (
+            self.connected
+            and self.last_message_at is not None
+            and time.monotonic() - self.last_message_at <= self.heartbeat_timeout_s
+        )
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="oanda-price-stream", daemon=True)
+        self._thread.start()
+        logger.info(f"Pricing stream started for {len(self.instruments)} instruments")
+
+    def stop(self):
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            response.close()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self.connected = False
+
+    def _run(self):
+        attempt = 0
+        while not self._stop.is_set():
+            try:
+                self._consume()
+                attempt = 0
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                logger.warning(f"Pricing stream dropped: {e}")
+            self.connected = False
+            if self._stop.is_set():
+                break
+            attempt += 1
+            self.reconnects += 1
+            self._stop.wait(random.uniform(0, min(30.0, 0.5 * (2 ** attempt))))
+
+    def _consume(self):
+        url = f"{self.stream_base}/v3/accounts/{self.account_id}/pricing/stream"
+        # Read timeout doubles as heartbeat watchdog: a silent socket raises
+        response = self.transport.session.get(
+            url,
+            headers=self.headers,
+            params={"instruments": ",".join(self.instruments)},
+            stream=True,
+            timeout=(5.0, self.heartbeat_timeout_s),
+        )
+        self._response = response
+        try:
+            response.raise_for_status()
+            self.connected = True
+            # chunk_size=None yields each transfer chunk as it arrives (OANDA streams are chunked)
+            for line in response.iter_lines(chunk_size=None):
+                if self._stop.is_set():
+                    return
+                if not line:
+                    continue
+                self._handle(json.loads(line))
+        finally:
+            self._response = None
+            response.close()
+
+    def _handle(self, msg: Dict[str, Any]):
+        self.last_message_at = time.monotonic()
+        self.messages += 1
+        msg_type = msg.get("type")
+        if msg_type == "PRICE":
+            self.board.update_from_message(msg, source="stream")
+        elif msg_type == "HEARTBEAT":
+            self.last_heartbeat_time = msg.get("time")
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            self.board.stats(),
+            connected=self.connected,
+            healthy=self.healthy,
+            reconnects=self.reconnects,
+            messages=self.messages,
+            last_heartbeat=self.last_heartbeat_time,
+        )
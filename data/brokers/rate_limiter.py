@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Broker Rate Limiter - RBOTzilla UNI
+Shared request budget and single-flight GET coalescing for broker connectors.
+
+- One token bucket per broker host plus optional buckets per endpoint class
+  (candles, pricing, account, ...), shared by every connector instance
+- Priority admission: order placement may drain the bucket to zero, account
+  reads keep half the reserve free, scans keep the whole reserve free, so a
+  scan burst can never delay an order
+- Near the limit, requests wait in line; a request that would wait longer
+  than its priority allows is shed with RateLimitExceeded
+- Single-flight: identical in-flight GETs (same URL, params and credentials)
+  share the first caller's response instead of hitting the broker again
+PIN: 841921
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Lower value = more important
+PRIORITY_ORDER = 0
+PRIORITY_ACCOUNT = 1
+PRIORITY_SCAN = 2
+
+PRIORITY_NAMES = {PRIORITY_ORDER: "order", PRIORITY_ACCOUNT: "account", PRIORITY_SCAN: "scan"}
+
+# Longest a request of each priority may queue before it is shed
+DEFAULT_MAX_WAIT_S = {PRIORITY_ORDER: 5.0, PRIORITY_ACCOUNT: 2.0, PRIORITY_SCAN: 1.0}
+
+# Share of each bucket held back from lower-priority traffic
+DEFAULT_RESERVE_FRACTION = 0.2
+
+
+class RateLimitExceeded(Exception):
+    """Request shed because the broker budget would not admit it in time"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Sustained rate and burst size for one bucket"""
+    rate_per_s: float
+    burst: float
+
+
+def default_priority(method: str, endpoint_class: Optional[str] = None) -> int:
+    """Orders (any non-GET) first, account reads next, market data scans last"""
+    if method.upper() not in ("GET", "HEAD", "OPTIONS"):
+        return PRIORITY_ORDER
+    if endpoint_class == "account":
+        return PRIORITY_ACCOUNT
+    return PRIORITY_SCAN
+
+
+class TokenBucket:
+    """Thread-safe token bucket with per-priority admission floors"""
+
+    def __init__(self, limit: RateLimit, reserve_fraction: float = DEFAULT_RESERVE_FRACTION):
+        self.rate = float(limit.rate_per_s)
+        self.capacity = float(limit.burst)
+        self.reserve_fraction = reserve_fraction
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _floor(self, priority: int) -> float:
+        reserve = self.capacity * self.reserve_fraction * min(priority, PRIORITY_SCAN) / PRIORITY_SCAN
+        # A bucket smaller than its reserve must still admit every priority eventually
+        return max(0.0, min(reserve, self.capacity - 1.0))
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, priority: int) -> float:
+        """Take a token if priority admits one now; otherwise return seconds until it would"""
+        floor = self._floor(priority)
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens - 1.0 >= floor:
+                self.tokens -= 1.0
+                return 0.0
+            return (floor + 1.0 - self.tokens) / self.rate
+
+    def refund(self):
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + 1.0)
+
+
+class RateLimiter:
+    """
+    Request budget for one broker host.
+
+    Every request takes a token from the host bucket and, if its endpoint
+    class has one, from that class's bucket.
+    """
+
+    def __init__(self, name: str, default: RateLimit, limits: Optional[Dict[str, RateLimit]] = None,
+                 max_wait_s: Optional[Dict[int, float]] = None):
+        self.name = name
+        self.bucket = TokenBucket(default)
+        self.class_buckets: Dict[str, TokenBucket] = {
+            endpoint_class: TokenBucket(limit) for endpoint_class, limit in (limits or {}).items()
+        }
+        self.max_wait_s = dict(DEFAULT_MAX_WAIT_S)
+        self.max_wait_s.update(max_wait_s or {})
+
+        self._lock = threading.Lock()
+        self.admitted = {priority: 0 for priority in PRIORITY_NAMES}
+        self.queued = {priority: 0 for priority in PRIORITY_NAMES}
+        self.shed = {priority: 0 for priority in PRIORITY_NAMES}
+        self.wait_s = 0.0
+
+    def set_limit(self, endpoint_class: str, limit: RateLimit):
+        """Register a bucket for an endpoint class (kept if one already exists)"""
+        with self._lock:
+            self.class_buckets.setdefault(endpoint_class, TokenBucket(limit))
+
+    def delay(self, endpoint_class: Optional[str], priority: int) -> float:
+        """Take the tokens for one request, or return how long to wait before retrying"""
+        class_bucket = self.class_buckets.get(endpoint_class) if endpoint_class else None
+        if class_bucket is not None:
+            wait = class_bucket.reserve(priority)
+            if wait:
+                return wait
+        wait = self.bucket.reserve(priority)
+        if wait and class_bucket is not None:
+            class_bucket.refund()
+        return wait
+
+    def _admit(self, priority: int, waited: float, wait: float) -> bool:
+        """Book-keeping for one admission attempt; False means shed"""
+        with self._lock:
+            if not wait:
+                self.admitted[priority] += 1
+                if waited:
+                    self.queued[priority] += 1
+                    self.wait_s += waited
+                return True
+            if waited + wait > self.max_wait_s.get(priority, DEFAULT_MAX_WAIT_S[PRIORITY_SCAN]):
+                self.shed[priority] += 1
+                return False
+        return True
+
+    def _shed(self, endpoint_class: Optional[str], priority: int):
+        logger.warning(f"{self.name}: shedding {PRIORITY_NAMES.get(priority, priority)} request "
+                       f"({endpoint_class or 'default'}) - rate limit")
+        raise RateLimitExceeded(f"{self.name} rate limit: {endpoint_class or 'default'} request shed")
+
+    def acquire(self, endpoint_class: Optional[str] = None, priority: int = PRIORITY_SCAN) -> float:
+        """Block until the request is admitted; returns seconds spent queued"""
+        waited = 0.0
+        while True:
+            wait = self.delay(endpoint_class, priority)
+            if not self._admit(priority, waited, wait):
+                self._shed(endpoint_class, priority)
+            if not wait:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, endpoint_class: Optional[str] = None, priority: int = PRIORITY_SCAN) -> float:
+        """Asyncio twin of acquire()"""
+        waited = 0.0
+        while True:
+            wait = self.delay(endpoint_class, priority)
+            if not self._admit(priority, waited, wait):
+                self._shed(endpoint_class, priority)
+            if not wait:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "tokens": round(self.bucket.tokens, 1),
+                "admitted": {PRIORITY_NAMES[p]: n for p, n in self.admitted.items()},
+                "queued": {PRIORITY_NAMES[p]: n for p, n in self.queued.items()},
+                "shed": {PRIORITY_NAMES[p]: n for p, n in self.shed.items()},
+                "queue_wait_s": round(self.wait_s, 3),
+            }
+
+
+class _Flight:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapse concurrent identical calls (threads) into one execution"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn once for every caller that arrives while key is in flight"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"executed": self.executed, "shared": self.shared, "in_flight": len(self._flights)}
+
+
+class AsyncSingleFlight:
+    """Collapse concurrent identical coroutines on one event loop"""
+
+    def __init__(self):
+        self._flights: Dict[Hashable, "asyncio.Future"] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._flights.get(key)
+        if future is not None:
+            self.shared += 1
+            # shield: one cancelled follower must not cancel the shared call
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._flights[key] = future
+        self.executed += 1
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieved here so an unshared failure is not reported as "never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._flights.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {"executed": self.executed, "shared": self.shared, "in_flight": len(self._flights)}
+
+
+def request_key(method: str, url: str, params: Any = None, credentials: Optional[str] = None) -> Optional[Hashable]:
+    """Coalescing key for a GET, or None when params cannot be keyed"""
+    try:
+        items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    except (AttributeError, TypeError):
+        return None
+    return (method.upper(), url, items, credentials)
+
+
+_shared_limiters: Dict[str, RateLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter(key: str, default: RateLimit, limits: Optional[Dict[str, RateLimit]] = None) -> RateLimiter:
+    """
+    Return the process-wide limiter for a broker host (e.g. its API base URL).
+
+    The default budget of the first caller wins; later endpoint-class
+    limits are added if not already configured.
+    """
+    with _shared_lock:
+        limiter = _shared_limiters.get(key)
+        if limiter is None:
+            limiter = _shared_limiters[key] = RateLimiter(key, default, limits)
+        else:
+            for endpoint_class, limit in (limits or {}).items():
+                limiter.set_limit(endpoint_class, limit)
+        return limiter
+
+
+def reset_rate_limiters():
+    """Forget every shared limiter (test helper)"""
+    with _shared_lock:
+        _shared_limiters.clear()
@@ -22,8 +22,11 @@ import time
 import asyncio
 import logging
 import json
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
+
+import numpy as np
 
 # Add parent for rick_hive access
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -31,6 +34,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Coinbase connector
 from coinbase_connector import CoinbaseConnector
 
+# Columnar candle decoding (data/brokers/candle_frame.py)
+from brokers.candle_frame import CandleFrame, decode_candles
+from brokers import indicators
+
+CandleInput = Union[CandleFrame, List[Dict]]
+
 # RICK Hive Mind
 try:
     from rick_hive.rick_charter import RickCharter as CHARTER
@@ -42,6 +51,26 @@ except ImportError:
         MIN_RISK_REWARD_RATIO = 3.0  # Slightly lower due to perps funding
 
 
+@dataclass
+class AccountSnapshot:
+    """
+    Cycle-scoped view of the Coinbase account
+
+    Fetched once at the start of a cycle and shared by every instrument and
+    Position Police step; dropped only when this engine places or closes an order.
+    """
+    positions: List[Dict]
+    open_orders: List[Dict]
+    balances: Dict[str, float]
+    fetched_at: float = field(default_factory=time.time)
+
+    def has_position(self, symbol: str) -> bool:
+        return any(p.get("product_id") == symbol for p in self.positions)
+
+    def positions_for(self, symbol: str) -> List[Dict]:
+        return [p for p in self.positions if p.get("product_id") == symbol]
+
+
 class CryptoPerpsWolfPack:
     """
     Consolidated wolf pack strategies for crypto spot + perps
@@ -75,49 +104,21 @@ class CryptoPerpsWolfPack:
         self.logger = logger
         self.last_funding_check = {}
     
-    def calculate_rsi(self, candles: List[Dict], period: int = 14) -> float:
+    def calculate_rsi(self, candles: CandleInput, period: int = 14) -> float:
         """Calculate RSI (same as IBKR/OANDA)"""
-        if len(candles) < period + 1:
+        frame = decode_candles(candles)
+        if len(frame) < period + 1:
             return 50.0
         
-        closes = [c["close"] for c in candles[-(period + 1):]]
-        
-        gains = []
-        losses = []
-        for i in range(1, len(closes)):
-            change = closes[i] - closes[i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-        
-        avg_gain = sum(gains) / period
-        avg_loss = sum(losses) / period
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+        return indicators.rsi_last(frame.close, period)
     
-    def calculate_ema(self, candles: List[Dict], period: int) -> float:
+    def calculate_ema(self, candles: CandleInput, period: int) -> float:
         """Calculate EMA"""
-        if len(candles) < period:
-            return candles[-1]["close"] if candles else 0.0
-        
-        closes = [c["close"] for c in candles[-period:]]
-        
-        ema = sum(closes[:period]) / period
-        multiplier = 2 / (period + 1)
+        frame = decode_candles(candles)
+        if len(frame) < period:
+            return float(frame.close[-1]) if len(frame) else 0.0
         
-        for close in closes[period:]:
-            ema = (close - ema) * multiplier + ema
-        
-        return ema
+        return indicators.ema_sma_seeded(frame.close[-period:], period)
     
     def get_funding_rate(self, symbol: str, connector) -> float:
         """
@@ -155,7 +156,7 @@ class CryptoPerpsWolfPack:
     def analyze_crypto_perps(
         self,
         symbol: str,
-        candles: List[Dict],
+        candles: CandleInput,
         current_price: float,
         connector = None
     ) -> Optional[Dict]:
@@ -169,13 +170,14 @@ class CryptoPerpsWolfPack:
         
         Args:
             symbol: BTC-USD, BTC-PERP, ETH-USD, etc.
-            candles: Historical OHLCV
+            candles: Historical OHLCV (CandleFrame or list of candle dicts)
             current_price: Current market price
             connector: CoinbaseConnector (for funding rate)
             
         Returns:
             Signal dict or None
         """
+        candles = decode_candles(candles)  # no-op when the engine already decoded
         if len(candles) < 60:
             self.logger.warning(f"{symbol}: Insufficient candles ({len(candles)})")
             return None
@@ -199,9 +201,10 @@ class CryptoPerpsWolfPack:
         funding_crowded_short = funding_rate < self.FUNDING_RATE_LOW
         
         # Recent momentum
-        recent_candles = candles[-3:]
-        momentum_up = all(c["close"] > c["open"] for c in recent_candles)
-        momentum_down = all(c["close"] < c["open"] for c in recent_candles)
+        recent_close = candles.close[-3:]
+        recent_open = candles.open[-3:]
+        momentum_up = bool(np.all(recent_close > recent_open))
+        momentum_down = bool(np.all(recent_close < recent_open))
         
         signal = None
         
@@ -233,7 +236,7 @@ class CryptoPerpsWolfPack:
         self,
         symbol: str,
         entry: float,
-        candles: List[Dict],
+        candles: CandleInput,
         strategy: str
     ) -> Dict:
         """Generate LONG signal with OCO levels"""
@@ -264,7 +267,7 @@ class CryptoPerpsWolfPack:
         self,
         symbol: str,
         entry: float,
-        candles: List[Dict],
+        candles: CandleInput,
         strategy: str
     ) -> Dict:
         """Generate SHORT signal with OCO levels"""
@@ -289,25 +292,10 @@ class CryptoPerpsWolfPack:
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
-    def _calculate_atr(self, candles: List[Dict], period: int = 14) -> float:
+    def _calculate_atr(self, candles: CandleInput, period: int = 14) -> float:
         """Calculate Average True Range"""
-        if len(candles) < period + 1:
-            return candles[-1]["high"] - candles[-1]["low"] if candles else 0.0
-        
-        true_ranges = []
-        for i in range(1, len(candles)):
-            high = candles[i]["high"]
-            low = candles[i]["low"]
-            prev_close = candles[i-1]["close"]
-            
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
-            )
-            true_ranges.append(tr)
-        
-        return sum(true_ranges[-period:]) / period
+        frame = decode_candles(candles)
+        return indicators.atr_last(frame.high, frame.low, frame.close, period)
 
 
 class CoinbaseTradingEngine:
@@ -343,7 +331,11 @@ class CoinbaseTradingEngine:
         
         # Position tracking
         self.position_open_times = {}
-        
+
+        # Cycle-scoped account snapshot (positions, open orders, balances)
+        self._snapshot: Optional[AccountSnapshot] = None
+        self.snapshot_fetches = 0
+
         # Cycle interval (crypto = faster than futures/forex)
         self.cycle_interval = 180  # 3 minutes (vs 5 min IBKR, 15 min forex)
         
@@ -387,7 +379,10 @@ class CoinbaseTradingEngine:
         try:
             while True:
                 cycle_start = time.time()
-                
+
+                # One account fetch per cycle, shared by every step below
+                self.refresh_account_snapshot()
+
                 # Process each crypto instrument
                 for symbol in self.wolf_pack.INSTRUMENTS.keys():
                     try:
@@ -417,23 +412,21 @@ class CoinbaseTradingEngine:
     async def _process_instrument(self, symbol: str):
         """Process single crypto instrument"""
         # Fetch historical data
-        candles = self.connector.get_historical_candles(
+        # Decoded once into NumPy columns; every indicator reads the same frame
+        candles = decode_candles(self.connector.get_historical_candles(
             symbol,
             granularity=300,  # 5-min candles
             count=60
-        )
+        ))
         
-        if not candles:
+        if not len(candles):
             self.logger.warning(f"{symbol}: No candles received")
             return
         
-        current_price = candles[-1]["close"]
+        current_price = candles.last_close
         
         # Check for existing position
-        positions = self.connector.get_open_positions()
-        has_position = any(p["product_id"] == symbol for p in positions)
-        
-        if has_position:
+        if self.account_snapshot().has_position(symbol):
             self.logger.info(f"{symbol}: Position already open, monitoring")
             return
         
@@ -457,7 +450,8 @@ class CoinbaseTradingEngine:
             stop_loss=signal["stop_loss"],
             take_profit=signal["take_profit"]
         )
-        
+        self.invalidate_account_snapshot()
+
         if result.get("success"):
             self.position_open_times[symbol] = datetime.now(timezone.utc)
             self.logger.info(f"✅ Trade executed: {symbol} {signal['side']}")
@@ -466,10 +460,45 @@ class CoinbaseTradingEngine:
                 f"❌ Trade rejected: {symbol} - {result.get('error', 'Unknown')}"
             )
     
+    def account_snapshot(self) -> AccountSnapshot:
+        """Current cycle's account snapshot (fetched lazily after an invalidation)"""
+        if self._snapshot is None:
+            self.refresh_account_snapshot()
+        return self._snapshot
+
+    def refresh_account_snapshot(self) -> AccountSnapshot:
+        """Fetch positions, open orders and balances once for this cycle"""
+        # get_open_positions() reads /orders?status=open, so it is also the open-order list
+        positions = self.connector.get_open_positions()
+        balances = {}
+        if hasattr(self.connector, "get_account_balances"):
+            balances = self.connector.get_account_balances()
+        self._snapshot = AccountSnapshot(
+            positions=positions,
+            open_orders=positions,
+            balances=balances,
+        )
+        self.snapshot_fetches += 1
+        return self._snapshot
+
+    def invalidate_account_snapshot(self):
+        """Drop the snapshot after this engine places or closes an order"""
+        self._snapshot = None
+
+    def _close_position(self, symbol: str) -> Dict:
+        """Close via the connector using the snapshot's orders, then invalidate it"""
+        # After an earlier close in the same cycle the connector re-reads /orders itself
+        positions = self._snapshot.positions_for(symbol) if self._snapshot else None
+        try:
+            result = self.connector.close_position(symbol, positions=positions)
+        finally:
+            self.invalidate_account_snapshot()
+        return result
+
     def _position_police(self):
         """Charter enforcement: Close positions violating MIN_NOTIONAL"""
-        positions = self.connector.get_open_positions()
-        
+        positions = self.account_snapshot().positions
+
         for pos in positions:
             symbol = pos["product_id"]
             size = float(pos.get("size", 0))
@@ -481,7 +510,7 @@ class CoinbaseTradingEngine:
                     f"🚨 POSITION POLICE: {symbol} notional ${notional:.2f} < "
                     f"${CHARTER.MIN_NOTIONAL_USD} - CLOSING"
                 )
-                self.connector.close_position(symbol)
+                self._close_position(symbol)
     
     def _check_hold_time_violations(self):
         """Charter enforcement: Close positions exceeding MAX_HOLD_TIME (4 hours)"""
@@ -496,7 +525,7 @@ class CoinbaseTradingEngine:
                     f"🚨 MAX_HOLD violation: {symbol} open for {hold_duration.total_seconds()/3600:.1f}h - CLOSING"
                 )
                 
-                result = self.connector.close_position(symbol)
+                result = self._close_position(symbol)
                 
                 if result.get("success"):
                     del self.position_open_times[symbol]
@@ -7,10 +7,18 @@ M15-H1 timeframes | PIN: 841921 | Phase 12
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
 import logging
 from datetime import datetime, timezone
 
+# Shared indicator kernels and per-bar result memo (data/brokers/)
+try:
+    from brokers import indicators
+    from brokers.bar_memo import closed_bar_time, config_hash, get_bar_memo, settings
+except ImportError:
+    from data.brokers import indicators
+    from data.brokers.bar_memo import closed_bar_time, config_hash, get_bar_memo, settings
+
 class BearishWolf:
     """
     PROF_QUANT (35%): Advanced regime logic and confluence scoring for bear markets
@@ -60,13 +68,7 @@ class BearishWolf:
         if period is None:
             period = self.rsi_period
             
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return pd.Series(indicators.rsi(prices, period), index=prices.index)
     
     def calculate_macd(self, prices: pd.Series, fast: int = None, slow: int = None, signal: int = None) -> Dict[str, pd.Series]:
         """Calculate MACD line, signal line, and histogram"""
@@ -77,22 +79,34 @@ class BearishWolf:
         if signal is None:
             signal = self.macd_signal
             
-        ema_fast = prices.ewm(span=fast).mean()
-        ema_slow = prices.ewm(span=slow).mean()
-        
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal).mean()
-        histogram = macd_line - signal_line
+        macd_line, signal_line, histogram = indicators.macd(prices, fast, slow, signal)
         
         return {
-            'macd': macd_line,
-            'signal': signal_line,
-            'histogram': histogram
+            'macd': pd.Series(macd_line, index=prices.index),
+            'signal': pd.Series(signal_line, index=prices.index),
+            'histogram': pd.Series(histogram, index=prices.index)
         }
     
     def calculate_sma(self, prices: pd.Series, period: int) -> pd.Series:
         """Calculate Simple Moving Average"""
-        return prices.rolling(window=period).mean()
+        return pd.Series(indicators.rolling_mean(prices, period), index=prices.index)
+    
+    def _state_usable(self, state: Any) -> bool:
+        return state is not None and state.warm and state.matches(
+            rsi_period=self.rsi_period, macd_fast=self.macd_fast, macd_slow=self.macd_slow,
+            macd_signal=self.macd_signal) and {self.sma_short, self.sma_long} <= set(state.config['sma_periods'])
+    
+    def indicators_from_state(self, state: Any):
+        """(rsi, macd, smas) in calculate_* form from streaming IndicatorState history"""
+        rsi = pd.Series(state.series('rsi'))
+        macd = {
+            'macd': pd.Series(state.series('macd')),
+            'signal': pd.Series(state.series('macd_signal')),
+            'histogram': pd.Series(state.series('macd_histogram'))
+        }
+        smas = {'short': pd.Series(state.series(f'sma_{self.sma_short}')),
+                'long': pd.Series(state.series(f'sma_{self.sma_long}'))}
+        return rsi, macd, smas
     
     def analyze_rsi_signal(self, rsi: pd.Series) -> Dict[str, Any]:
         """
@@ -105,7 +119,10 @@ class BearishWolf:
         """
         current_rsi = rsi.iloc[-1]
         prev_rsi = rsi.iloc[-2] if len(rsi) > 1 else current_rsi
-        
+        return self._score_rsi(current_rsi, prev_rsi)
+    
+    def _score_rsi(self, current_rsi: float, prev_rsi: float) -> Dict[str, Any]:
+        """RSI signals and score from the current and previous reading"""
         signals = []
         score = 0
         
@@ -162,7 +179,11 @@ class BearishWolf:
         prev_macd = macd['macd'].iloc[-2] if len(macd['macd']) > 1 else current_macd
         prev_signal = macd['signal'].iloc[-2] if len(macd['signal']) > 1 else current_signal
         prev_hist = macd['histogram'].iloc[-2] if len(macd['histogram']) > 1 else current_hist
-        
+        return self._score_macd(current_macd, current_signal, current_hist, prev_macd, prev_signal, prev_hist)
+    
+    def _score_macd(self, current_macd: float, current_signal: float, current_hist: float,
+                    prev_macd: float, prev_signal: float, prev_hist: float) -> Dict[str, Any]:
+        """MACD signals and score from the current and previous line, signal and histogram"""
         signals = []
         score = 0
         
@@ -206,7 +227,7 @@ class BearishWolf:
             'momentum': 'BEARISH' if current_macd < current_signal else 'BULLISH'
         }
     
-    def analyze_sma_signal(self, price: pd.Series) -> Dict[str, Any]:
+    def analyze_sma_signal(self, price: pd.Series, smas: Optional[Dict[str, pd.Series]] = None) -> Dict[str, Any]:
         """
         TRADER_PSYCH: SMA resistance analysis for bear regime
         Bear market SMA characteristics:
@@ -218,14 +239,22 @@ class BearishWolf:
         if len(price) < max(self.sma_short, self.sma_long):
             return {'signals': [], 'score': 0}
         
+        if smas is None:
+            smas = {'short': self.calculate_sma(price, self.sma_short),
+                    'long': self.calculate_sma(price, self.sma_long)}
+        
         current_price = price.iloc[-1]
-        sma_short = self.calculate_sma(price, self.sma_short).iloc[-1]
-        sma_long = self.calculate_sma(price, self.sma_long).iloc[-1]
+        sma_short = smas['short'].iloc[-1]
+        sma_long = smas['long'].iloc[-1]
         
         prev_price = price.iloc[-2] if len(price) > 1 else current_price
-        prev_sma_short = self.calculate_sma(price, self.sma_short).iloc[-2]
-        prev_sma_long = self.calculate_sma(price, self.sma_long).iloc[-2]
-        
+        prev_sma_short = smas['short'].iloc[-2]
+        prev_sma_long = smas['long'].iloc[-2]
+        return self._score_sma(current_price, prev_price, sma_short, sma_long, prev_sma_short, prev_sma_long)
+    
+    def _score_sma(self, current_price: float, prev_price: float, sma_short: float, sma_long: float,
+                   prev_sma_short: float, prev_sma_long: float) -> Dict[str, Any]:
+        """SMA signals and score from the current and previous price and averages"""
         signals = []
         score = 0
         
@@ -286,7 +315,7 @@ class BearishWolf:
             return {'signals': [], 'score': 0, 'volume_ratio': 1.0}
         
         current_volume = volume.iloc[-1]
-        volume_ma = volume.rolling(window=self.volume_ma_period).mean().iloc[-1]
+        volume_ma = indicators.rolling_mean(volume, self.volume_ma_period)[-1]
         volume_ratio = current_volume / volume_ma
         
         # Price movement for volume confirmation
@@ -294,6 +323,14 @@ class BearishWolf:
         prev_price = price.iloc[-2] if len(price) > 1 else current_price
         price_change_pct = (current_price - prev_price) / prev_price * 100
         
+        # Volume trend inputs (last 5 bars vs the 5 before)
+        recent_volume_avg = volume.tail(5).mean()
+        older_volume_avg = volume.iloc[-10:-5].mean() if len(volume) >= 10 else recent_volume_avg
+        return self._score_volume(volume_ratio, price_change_pct, recent_volume_avg, older_volume_avg)
+    
+    def _score_volume(self, volume_ratio: float, price_change_pct: float, recent_volume_avg: float,
+                      older_volume_avg: float) -> Dict[str, Any]:
+        """Volume signals and score from the volume ratio, price change and volume trend"""
         signals = []
         score = 0
         
@@ -316,9 +353,6 @@ class BearishWolf:
                 score += 0.2
         
         # Volume trend analysis (declining volume = bear market characteristic)
-        recent_volume_avg = volume.tail(5).mean()
-        older_volume_avg = volume.iloc[-10:-5].mean() if len(volume) >= 10 else recent_volume_avg
-        
         if recent_volume_avg < older_volume_avg * 0.9:
             signals.append("VOLUME_TREND_DOWN")
             score += 0.3  # Declining volume can be bearish
@@ -347,20 +381,44 @@ class BearishWolf:
         
         return min(total_score, 1.0)
     
-    def generate_trade_signal(self, data: Dict[str, pd.Series]) -> Dict[str, Any]:
+    def generate_trade_signal(self, data: Dict[str, pd.Series], state: Any = None, symbol: Optional[str] = None,
+                              granularity: str = "M15", bar_time: Any = None) -> Dict[str, Any]:
         """
         MENTOR_BK: Main strategy logic - analyze all indicators and generate trade signal
         
         Args:
             data: Dict containing 'close', 'volume' price series
+                  (or a CandleFrame from brokers/candle_frame.py)
+            state: Optional streaming IndicatorState for this symbol
+                   (brokers/indicator_state.py); when warm, indicator values
+                   through the last closed bar are read instead of recomputed
+            symbol, granularity, bar_time: with a symbol and a known last
+                   closed bar (bar_time, or a CandleFrame ending on a complete
+                   bar) the signal is memoized until the next bar closes
+                   (brokers/bar_memo.py); callers get their own copy of the dict
             
         Returns:
             Dict with trade decision, confidence, direction, and analysis details
         """
+        bar_time = closed_bar_time(data, bar_time)
+        if not symbol or bar_time is None:
+            return self._generate_trade_signal(data, state)
+        signal = get_bar_memo().get_or_compute(
+            "bearish_wolf", symbol, granularity, bar_time,
+            config_hash(settings(self), self._state_usable(state)),
+            lambda: self._generate_trade_signal(data, state)
+        )
+        return dict(signal)
+    
+    def _generate_trade_signal(self, data: Dict[str, pd.Series], state: Any = None) -> Dict[str, Any]:
         try:
             if not self.pin_verified:
                 raise ValueError("PIN verification required for Bearish Wolf")
             
+            # CandleFrame input: use its shared zero-copy column views
+            if hasattr(data, "as_series"):
+                data = data.as_series()
+            
             # Validate input data
             required_keys = ['close', 'volume']
             for key in required_keys:
@@ -370,25 +428,23 @@ class BearishWolf:
             close_prices = data['close']
             volume_data = data['volume']
             
-            if len(close_prices) < max(self.rsi_period, self.sma_long, self.macd_slow):
-                return {
-                    'trade': False,
-                    'confidence': 0.0,
-                    'direction': 'HOLD',
-                    'reason': 'Insufficient data for analysis',
-                    'regime': self.regime
-                }
+            if len(close_prices) < self.min_bars:
+                return self._insufficient_signal()
             
             current_price = close_prices.iloc[-1]
             
-            # Calculate all technical indicators
-            rsi = self.calculate_rsi(close_prices)
-            macd = self.calculate_macd(close_prices)
+            # Calculate all technical indicators (or read the streaming state)
+            smas = None
+            if self._state_usable(state):
+                rsi, macd, smas = self.indicators_from_state(state)
+            else:
+                rsi = self.calculate_rsi(close_prices)
+                macd = self.calculate_macd(close_prices)
             
             # Analyze each indicator
             rsi_analysis = self.analyze_rsi_signal(rsi)
             macd_analysis = self.analyze_macd_signal(macd)
-            sma_analysis = self.analyze_sma_signal(close_prices)
+            sma_analysis = self.analyze_sma_signal(close_prices, smas)
             volume_analysis = self.analyze_volume_signal(volume_data, close_prices)
             
             # Compile indicator results
@@ -399,51 +455,138 @@ class BearishWolf:
                 'volume': volume_analysis
             }
             
-            # Calculate confluence score
-            confluence_score = self.calculate_confluence_score(indicator_results)
+            return self._compose_signal(indicator_results, current_price,
+                                        rsi.iloc[-1] if not rsi.empty else None)
+            
+        except Exception as e:
+            return self._error_signal(e)
+    
+    def generate_panel_signals(self, panel: Dict[str, Any], symbols: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Trade signals for many symbols from one aligned price/volume panel
+        
+        Args:
+            panel: 'close' and 'volume' as (symbols x bars) matrices, one row
+                   per symbol over the same bars
+            symbols: Symbol for each row
+            
+        Returns:
+            {symbol: signal dict}, each identical to generate_trade_signal on
+            that symbol's row; RSI, MACD, SMAs and volume statistics are
+            computed for every symbol in one vectorized pass
+        """
+        try:
+            if not self.pin_verified:
+                raise ValueError("PIN verification required for Bearish Wolf")
             
-            # Determine trade signal
-            should_trade = confluence_score >= self.confidence_threshold
-            direction = 'SELL' if should_trade else 'HOLD'
+            for key in ['close', 'volume']:
+                if key not in panel:
+                    raise ValueError(f"Missing required data: {key}")
             
-            # Collect all signals for transparency
-            all_signals = []
-            for indicator_name, results in indicator_results.items():
-                all_signals.extend([f"{indicator_name.upper()}_{signal}" for signal in results.get('signals', [])])
+            close = indicators.as_array(panel['close'])
+            volume = indicators.as_array(panel['volume'])
+            if close.ndim != 2 or volume.shape != close.shape or len(close) != len(symbols):
+                raise ValueError("Panel needs aligned (symbols x bars) close and volume matrices")
             
-            # Log decision
-            self.logger.info(f"Bearish Wolf Analysis: Confidence={confluence_score:.3f}, Signals={len(all_signals)}")
+            if close.shape[1] < self.min_bars:
+                return {symbol: self._insufficient_signal() for symbol in symbols}
             
-            return {
-                'trade': should_trade,
-                'confidence': confluence_score,
-                'direction': direction,
-                'regime': self.regime,
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'signals': all_signals,
-                'signal_count': len(all_signals),
-                'indicator_scores': {k: v.get('score', 0) for k, v in indicator_results.items()},
-                'technical_data': {
-                    'current_price': current_price,
-                    'rsi': rsi.iloc[-1] if not rsi.empty else None,
-                    'macd_histogram': macd_analysis.get('histogram'),
-                    'sma_short': sma_analysis.get('sma_short'),
-                    'sma_long': sma_analysis.get('sma_long'),
-                    'volume_ratio': volume_analysis.get('volume_ratio')
-                },
-                'reason': f"Confluence score {confluence_score:.3f} {'≥' if should_trade else '<'} threshold {self.confidence_threshold}"
-            }
+            rsi = indicators.rsi(close, self.rsi_period)
+            macd_line, signal_line, histogram = indicators.macd(close, self.macd_fast, self.macd_slow, self.macd_signal)
+            sma_short = indicators.rolling_mean(close, self.sma_short)
+            sma_long = indicators.rolling_mean(close, self.sma_long)
             
+            volume_ready = volume.shape[1] >= self.volume_ma_period
+            if volume_ready:
+                volume_ratio = volume[:, -1] / indicators.rolling_mean(volume, self.volume_ma_period)[:, -1]
+                price_change_pct = (close[:, -1] - close[:, -2]) / close[:, -2] * 100
+                recent_volume_avg = volume[:, -5:].mean(axis=1)
+                older_volume_avg = volume[:, -10:-5].mean(axis=1) if volume.shape[1] >= 10 else recent_volume_avg
         except Exception as e:
-            self.logger.error(f"Bearish Wolf analysis failed: {str(e)}")
-            return {
-                'trade': False,
-                'confidence': 0.0,
-                'direction': 'HOLD',
-                'regime': self.regime,
-                'error': str(e),
-                'reason': 'Analysis error occurred'
-            }
+            return {symbol: self._error_signal(e) for symbol in symbols}
+        
+        signals = {}
+        for row, symbol in enumerate(symbols):
+            try:
+                indicator_results = {
+                    'rsi': self._score_rsi(rsi[row, -1], rsi[row, -2]),
+                    'macd': self._score_macd(macd_line[row, -1], signal_line[row, -1], histogram[row, -1],
+                                             macd_line[row, -2], signal_line[row, -2], histogram[row, -2]),
+                    'sma': self._score_sma(close[row, -1], close[row, -2], sma_short[row, -1], sma_long[row, -1],
+                                           sma_short[row, -2], sma_long[row, -2]),
+                    'volume': self._score_volume(volume_ratio[row], price_change_pct[row], recent_volume_avg[row],
+                                                 older_volume_avg[row]) if volume_ready
+                              else {'signals': [], 'score': 0, 'volume_ratio': 1.0}
+                }
+                signals[symbol] = self._compose_signal(indicator_results, close[row, -1], rsi[row, -1])
+            except Exception as e:
+                signals[symbol] = self._error_signal(e)
+        return signals
+    
+    def _compose_signal(self, indicator_results: Dict[str, Dict], current_price: float,
+                        current_rsi: Optional[float]) -> Dict[str, Any]:
+        """Trade decision dict from the per-indicator analyses"""
+        # Calculate confluence score
+        confluence_score = self.calculate_confluence_score(indicator_results)
+        
+        # Determine trade signal
+        should_trade = confluence_score >= self.confidence_threshold
+        direction = 'SELL' if should_trade else 'HOLD'
+        
+        # Collect all signals for transparency
+        all_signals = []
+        for indicator_name, results in indicator_results.items():
+            all_signals.extend([f"{indicator_name.upper()}_{signal}" for signal in results.get('signals', [])])
+        
+        # Log decision
+        self.logger.info(f"Bearish Wolf Analysis: Confidence={confluence_score:.3f}, Signals={len(all_signals)}")
+        
+        return {
+            'trade': should_trade,
+            'confidence': confluence_score,
+            'direction': direction,
+            'regime': self.regime,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'signals': all_signals,
+            'signal_count': len(all_signals),
+            'indicator_scores': {k: v.get('score', 0) for k, v in indicator_results.items()},
+            'technical_data': {
+                'current_price': current_price,
+                'rsi': current_rsi,
+                'macd_histogram': indicator_results['macd'].get('histogram'),
+                'sma_short': indicator_results['sma'].get('sma_short'),
+                'sma_long': indicator_results['sma'].get('sma_long'),
+                'volume_ratio': indicator_results['volume'].get('volume_ratio')
+            },
+            'reason': f"Confluence score {confluence_score:.3f} {'≥' if should_trade else '<'} threshold {self.confidence_threshold}"
+        }
+    
+    @property
+    def min_bars(self) -> int:
+        """Bars needed before every indicator is defined"""
+        return max(self.rsi_period, self.sma_long, self.macd_slow)
+    
+    def _insufficient_signal(self) -> Dict[str, Any]:
+        """HOLD result for a history shorter than min_bars"""
+        return {
+            'trade': False,
+            'confidence': 0.0,
+            'direction': 'HOLD',
+            'reason': 'Insufficient data for analysis',
+            'regime': self.regime
+        }
+    
+    def _error_signal(self, e: Exception) -> Dict[str, Any]:
+        """HOLD result for an analysis that raised"""
+        self.logger.error(f"Bearish Wolf analysis failed: {str(e)}")
+        return {
+            'trade': False,
+            'confidence': 0.0,
+            'direction': 'HOLD',
+            'regime': self.regime,
+            'error': str(e),
+            'reason': 'Analysis error occurred'
+        }
 
 def get_bearish_wolf(pin: int = 841921) -> BearishWolf:
     """Convenience function to get Bearish Wolf strategy instance"""
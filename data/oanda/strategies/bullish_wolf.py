@@ -7,10 +7,18 @@ M15-H1 timeframes | PIN: 841921 | Phase 12
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
 import logging
 from datetime import datetime, timezone
 
+# Shared indicator kernels and per-bar result memo (data/brokers/)
+try:
+    from brokers import indicators
+    from brokers.bar_memo import closed_bar_time, config_hash, get_bar_memo, settings
+except ImportError:
+    from data.brokers import indicators
+    from data.brokers.bar_memo import closed_bar_time, config_hash, get_bar_memo, settings
+
 class BullishWolf:
     """
     PROF_QUANT (35%): Advanced regime logic and confluence scoring for bull markets
@@ -60,13 +68,7 @@ class BullishWolf:
         if period is None:
             period = self.rsi_period
             
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return pd.Series(indicators.rsi(prices, period), index=prices.index)
     
     def calculate_bollinger_bands(self, prices: pd.Series, period: int = None, std: float = None) -> Dict[str, pd.Series]:
         """Calculate Bollinger Bands"""
@@ -75,13 +77,12 @@ class BullishWolf:
         if std is None:
             std = self.bb_std
             
-        sma = prices.rolling(window=period).mean()
-        rolling_std = prices.rolling(window=period).std()
+        upper, middle, lower = indicators.bollinger(prices, period, std)
         
         return {
-            'upper': sma + (rolling_std * std),
-            'middle': sma,
-            'lower': sma - (rolling_std * std)
+            'upper': pd.Series(upper, index=prices.index),
+            'middle': pd.Series(middle, index=prices.index),
+            'lower': pd.Series(lower, index=prices.index)
         }
     
     def calculate_macd(self, prices: pd.Series, fast: int = None, slow: int = None, signal: int = None) -> Dict[str, pd.Series]:
@@ -93,19 +94,30 @@ class BullishWolf:
         if signal is None:
             signal = self.macd_signal
             
-        ema_fast = prices.ewm(span=fast).mean()
-        ema_slow = prices.ewm(span=slow).mean()
-        
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal).mean()
-        histogram = macd_line - signal_line
+        macd_line, signal_line, histogram = indicators.macd(prices, fast, slow, signal)
         
         return {
-            'macd': macd_line,
-            'signal': signal_line,
-            'histogram': histogram
+            'macd': pd.Series(macd_line, index=prices.index),
+            'signal': pd.Series(signal_line, index=prices.index),
+            'histogram': pd.Series(histogram, index=prices.index)
         }
     
+    def _state_usable(self, state: Any) -> bool:
+        return state is not None and state.warm and state.matches(
+            rsi_period=self.rsi_period, bb_period=self.bb_period, bb_std=self.bb_std,
+            macd_fast=self.macd_fast, macd_slow=self.macd_slow, macd_signal=self.macd_signal)
+    
+    def indicators_from_state(self, state: Any):
+        """(rsi, bollinger, macd) in calculate_* form from streaming IndicatorState history"""
+        rsi = pd.Series(state.series('rsi'))
+        bollinger = {name: pd.Series(state.series(f'bb_{name}')) for name in ('upper', 'middle', 'lower')}
+        macd = {
+            'macd': pd.Series(state.series('macd')),
+            'signal': pd.Series(state.series('macd_signal')),
+            'histogram': pd.Series(state.series('macd_histogram'))
+        }
+        return rsi, bollinger, macd
+    
     def analyze_rsi_signal(self, rsi: pd.Series) -> Dict[str, Any]:
         """
         PROF_QUANT: RSI analysis for bullish regime
@@ -116,7 +128,10 @@ class BullishWolf:
         """
         current_rsi = rsi.iloc[-1]
         prev_rsi = rsi.iloc[-2] if len(rsi) > 1 else current_rsi
-        
+        return self._score_rsi(current_rsi, prev_rsi)
+    
+    def _score_rsi(self, current_rsi: float, prev_rsi: float) -> Dict[str, Any]:
+        """RSI signals and score from the current and previous reading"""
         signals = []
         score = 0
         
@@ -158,7 +173,11 @@ class BullishWolf:
         current_upper = bb['upper'].iloc[-1]
         current_middle = bb['middle'].iloc[-1]  
         current_lower = bb['lower'].iloc[-1]
-        
+        return self._score_bollinger(price, current_upper, current_middle, current_lower)
+    
+    def _score_bollinger(self, price: float, current_upper: float, current_middle: float,
+                         current_lower: float) -> Dict[str, Any]:
+        """Bollinger signals and score from the current bands"""
         signals = []
         score = 0
         
@@ -214,7 +233,11 @@ class BullishWolf:
         prev_macd = macd['macd'].iloc[-2] if len(macd['macd']) > 1 else current_macd
         prev_signal = macd['signal'].iloc[-2] if len(macd['signal']) > 1 else current_signal
         prev_hist = macd['histogram'].iloc[-2] if len(macd['histogram']) > 1 else current_hist
-        
+        return self._score_macd(current_macd, current_signal, current_hist, prev_macd, prev_signal, prev_hist)
+    
+    def _score_macd(self, current_macd: float, current_signal: float, current_hist: float,
+                    prev_macd: float, prev_signal: float, prev_hist: float) -> Dict[str, Any]:
+        """MACD signals and score from the current and previous line, signal and histogram"""
         signals = []
         score = 0
         
@@ -265,7 +288,7 @@ class BullishWolf:
             return {'signals': [], 'score': 0, 'volume_ratio': 1.0}
         
         current_volume = volume.iloc[-1]
-        volume_ma = volume.rolling(window=self.volume_ma_period).mean().iloc[-1]
+        volume_ma = indicators.rolling_mean(volume, self.volume_ma_period)[-1]
         volume_ratio = current_volume / volume_ma
         
         # Price movement for volume confirmation
@@ -273,6 +296,14 @@ class BullishWolf:
         prev_price = price.iloc[-2] if len(price) > 1 else current_price
         price_change_pct = (current_price - prev_price) / prev_price * 100
         
+        # Volume trend inputs (last 5 bars vs the 5 before)
+        recent_volume_avg = volume.tail(5).mean()
+        older_volume_avg = volume.iloc[-10:-5].mean() if len(volume) >= 10 else recent_volume_avg
+        return self._score_volume(volume_ratio, price_change_pct, recent_volume_avg, older_volume_avg)
+    
+    def _score_volume(self, volume_ratio: float, price_change_pct: float, recent_volume_avg: float,
+                      older_volume_avg: float) -> Dict[str, Any]:
+        """Volume signals and score from the volume ratio, price change and volume trend"""
         signals = []
         score = 0
         
@@ -292,9 +323,6 @@ class BullishWolf:
             score += 0.3
         
         # Volume trend analysis
-        recent_volume_avg = volume.tail(5).mean()
-        older_volume_avg = volume.iloc[-10:-5].mean() if len(volume) >= 10 else recent_volume_avg
-        
         if recent_volume_avg > older_volume_avg * 1.1:
             signals.append("VOLUME_TREND_UP")
             score += 0.2
@@ -323,20 +351,44 @@ class BullishWolf:
         
         return min(total_score, 1.0)
     
-    def generate_trade_signal(self, data: Dict[str, pd.Series]) -> Dict[str, Any]:
+    def generate_trade_signal(self, data: Dict[str, pd.Series], state: Any = None, symbol: Optional[str] = None,
+                              granularity: str = "M15", bar_time: Any = None) -> Dict[str, Any]:
         """
         MENTOR_BK: Main strategy logic - analyze all indicators and generate trade signal
         
         Args:
             data: Dict containing 'close', 'volume' price series
+                  (or a CandleFrame from brokers/candle_frame.py)
+            state: Optional streaming IndicatorState for this symbol
+                   (brokers/indicator_state.py); when warm, indicator values
+                   through the last closed bar are read instead of recomputed
+            symbol, granularity, bar_time: with a symbol and a known last
+                   closed bar (bar_time, or a CandleFrame ending on a complete
+                   bar) the signal is memoized until the next bar closes
+                   (brokers/bar_memo.py); callers get their own copy of the dict
             
         Returns:
             Dict with trade decision, confidence, direction, and analysis details
         """
+        bar_time = closed_bar_time(data, bar_time)
+        if not symbol or bar_time is None:
+            return self._generate_trade_signal(data, state)
+        signal = get_bar_memo().get_or_compute(
+            "bullish_wolf", symbol, granularity, bar_time,
+            config_hash(settings(self), self._state_usable(state)),
+            lambda: self._generate_trade_signal(data, state)
+        )
+        return dict(signal)
+    
+    def _generate_trade_signal(self, data: Dict[str, pd.Series], state: Any = None) -> Dict[str, Any]:
         try:
             if not self.pin_verified:
                 raise ValueError("PIN verification required for Bullish Wolf")
             
+            # CandleFrame input: use its shared zero-copy column views
+            if hasattr(data, "as_series"):
+                data = data.as_series()
+            
             # Validate input data
             required_keys = ['close', 'volume']
             for key in required_keys:
@@ -346,21 +398,18 @@ class BullishWolf:
             close_prices = data['close']
             volume_data = data['volume']
             
-            if len(close_prices) < max(self.rsi_period, self.bb_period, self.macd_slow):
-                return {
-                    'trade': False,
-                    'confidence': 0.0,
-                    'direction': 'HOLD',
-                    'reason': 'Insufficient data for analysis',
-                    'regime': self.regime
-                }
+            if len(close_prices) < self.min_bars:
+                return self._insufficient_signal()
             
             current_price = close_prices.iloc[-1]
             
-            # Calculate all technical indicators
-            rsi = self.calculate_rsi(close_prices)
-            bollinger = self.calculate_bollinger_bands(close_prices)
-            macd = self.calculate_macd(close_prices)
+            # Calculate all technical indicators (or read the streaming state)
+            if self._state_usable(state):
+                rsi, bollinger, macd = self.indicators_from_state(state)
+            else:
+                rsi = self.calculate_rsi(close_prices)
+                bollinger = self.calculate_bollinger_bands(close_prices)
+                macd = self.calculate_macd(close_prices)
             
             # Analyze each indicator
             rsi_analysis = self.analyze_rsi_signal(rsi)
@@ -376,50 +425,135 @@ class BullishWolf:
                 'volume': volume_analysis
             }
             
-            # Calculate confluence score
-            confluence_score = self.calculate_confluence_score(indicator_results)
+            return self._compose_signal(indicator_results, current_price,
+                                        rsi.iloc[-1] if not rsi.empty else None)
             
-            # Determine trade signal
-            should_trade = confluence_score >= self.confidence_threshold
-            direction = 'BUY' if should_trade else 'HOLD'
+        except Exception as e:
+            return self._error_signal(e)
+    
+    def generate_panel_signals(self, panel: Dict[str, Any], symbols: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Trade signals for many symbols from one aligned price/volume panel
+        
+        Args:
+            panel: 'close' and 'volume' as (symbols x bars) matrices, one row
+                   per symbol over the same bars
+            symbols: Symbol for each row
             
-            # Collect all signals for transparency
-            all_signals = []
-            for indicator_name, results in indicator_results.items():
-                all_signals.extend([f"{indicator_name.upper()}_{signal}" for signal in results.get('signals', [])])
+        Returns:
+            {symbol: signal dict}, each identical to generate_trade_signal on
+            that symbol's row; RSI, Bollinger, MACD and volume statistics are
+            computed for every symbol in one vectorized pass
+        """
+        try:
+            if not self.pin_verified:
+                raise ValueError("PIN verification required for Bullish Wolf")
             
-            # Log decision
-            self.logger.info(f"Bullish Wolf Analysis: Confidence={confluence_score:.3f}, Signals={len(all_signals)}")
+            for key in ['close', 'volume']:
+                if key not in panel:
+                    raise ValueError(f"Missing required data: {key}")
             
-            return {
-                'trade': should_trade,
-                'confidence': confluence_score,
-                'direction': direction,
-                'regime': self.regime,
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'signals': all_signals,
-                'signal_count': len(all_signals),
-                'indicator_scores': {k: v.get('score', 0) for k, v in indicator_results.items()},
-                'technical_data': {
-                    'current_price': current_price,
-                    'rsi': rsi.iloc[-1] if not rsi.empty else None,
-                    'bb_position': bb_analysis.get('position'),
-                    'macd_histogram': macd_analysis.get('histogram'),
-                    'volume_ratio': volume_analysis.get('volume_ratio')
-                },
-                'reason': f"Confluence score {confluence_score:.3f} {'≥' if should_trade else '<'} threshold {self.confidence_threshold}"
-            }
+            close = indicators.as_array(panel['close'])
+            volume = indicators.as_array(panel['volume'])
+            if close.ndim != 2 or volume.shape != close.shape or len(close) != len(symbols):
+                raise ValueError("Panel needs aligned (symbols x bars) close and volume matrices")
             
+            if close.shape[1] < self.min_bars:
+                return {symbol: self._insufficient_signal() for symbol in symbols}
+            
+            rsi = indicators.rsi(close, self.rsi_period)
+            upper, middle, lower = indicators.bollinger(close, self.bb_period, self.bb_std)
+            macd_line, signal_line, histogram = indicators.macd(close, self.macd_fast, self.macd_slow, self.macd_signal)
+            
+            volume_ready = volume.shape[1] >= self.volume_ma_period
+            if volume_ready:
+                volume_ratio = volume[:, -1] / indicators.rolling_mean(volume, self.volume_ma_period)[:, -1]
+                price_change_pct = (close[:, -1] - close[:, -2]) / close[:, -2] * 100
+                recent_volume_avg = volume[:, -5:].mean(axis=1)
+                older_volume_avg = volume[:, -10:-5].mean(axis=1) if volume.shape[1] >= 10 else recent_volume_avg
         except Exception as e:
-            self.logger.error(f"Bullish Wolf analysis failed: {str(e)}")
-            return {
-                'trade': False,
-                'confidence': 0.0,
-                'direction': 'HOLD',
-                'regime': self.regime,
-                'error': str(e),
-                'reason': 'Analysis error occurred'
-            }
+            return {symbol: self._error_signal(e) for symbol in symbols}
+        
+        signals = {}
+        for row, symbol in enumerate(symbols):
+            try:
+                indicator_results = {
+                    'rsi': self._score_rsi(rsi[row, -1], rsi[row, -2]),
+                    'bollinger': self._score_bollinger(close[row, -1], upper[row, -1], middle[row, -1], lower[row, -1]),
+                    'macd': self._score_macd(macd_line[row, -1], signal_line[row, -1], histogram[row, -1],
+                                             macd_line[row, -2], signal_line[row, -2], histogram[row, -2]),
+                    'volume': self._score_volume(volume_ratio[row], price_change_pct[row], recent_volume_avg[row],
+                                                 older_volume_avg[row]) if volume_ready
+                              else {'signals': [], 'score': 0, 'volume_ratio': 1.0}
+                }
+                signals[symbol] = self._compose_signal(indicator_results, close[row, -1], rsi[row, -1])
+            except Exception as e:
+                signals[symbol] = self._error_signal(e)
+        return signals
+    
+    def _compose_signal(self, indicator_results: Dict[str, Dict], current_price: float,
+                        current_rsi: Optional[float]) -> Dict[str, Any]:
+        """Trade decision dict from the per-indicator analyses"""
+        # Calculate confluence score
+        confluence_score = self.calculate_confluence_score(indicator_results)
+        
+        # Determine trade signal
+        should_trade = confluence_score >= self.confidence_threshold
+        direction = 'BUY' if should_trade else 'HOLD'
+        
+        # Collect all signals for transparency
+        all_signals = []
+        for indicator_name, results in indicator_results.items():
+            all_signals.extend([f"{indicator_name.upper()}_{signal}" for signal in results.get('signals', [])])
+        
+        # Log decision
+        self.logger.info(f"Bullish Wolf Analysis: Confidence={confluence_score:.3f}, Signals={len(all_signals)}")
+        
+        return {
+            'trade': should_trade,
+            'confidence': confluence_score,
+            'direction': direction,
+            'regime': self.regime,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'signals': all_signals,
+            'signal_count': len(all_signals),
+            'indicator_scores': {k: v.get('score', 0) for k, v in indicator_results.items()},
+            'technical_data': {
+                'current_price': current_price,
+                'rsi': current_rsi,
+                'bb_position': indicator_results['bollinger'].get('position'),
+                'macd_histogram': indicator_results['macd'].get('histogram'),
+                'volume_ratio': indicator_results['volume'].get('volume_ratio')
+            },
+            'reason': f"Confluence score {confluence_score:.3f} {'≥' if should_trade else '<'} threshold {self.confidence_threshold}"
+        }
+    
+    @property
+    def min_bars(self) -> int:
+        """Bars needed before every indicator is defined"""
+        return max(self.rsi_period, self.bb_period, self.macd_slow)
+    
+    def _insufficient_signal(self) -> Dict[str, Any]:
+        """HOLD result for a history shorter than min_bars"""
+        return {
+            'trade': False,
+            'confidence': 0.0,
+            'direction': 'HOLD',
+            'reason': 'Insufficient data for analysis',
+            'regime': self.regime
+        }
+    
+    def _error_signal(self, e: Exception) -> Dict[str, Any]:
+        """HOLD result for an analysis that raised"""
+        self.logger.error(f"Bullish Wolf analysis failed: {str(e)}")
+        return {
+            'trade': False,
+            'confidence': 0.0,
+            'direction': 'HOLD',
+            'regime': self.regime,
+            'error': str(e),
+            'reason': 'Analysis error occurred'
+        }
 
 def get_bullish_wolf(pin: int = 841921) -> BullishWolf:
     """Convenience function to get Bullish Wolf strategy instance"""
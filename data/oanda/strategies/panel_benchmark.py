@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Wolf Pack Panel Benchmark - RBOTzilla UNI
+Per-symbol generate_trade_signal loop against one generate_panel_signals
+call over a (symbols x bars) panel, for each wolf.
+
+- python -m data.oanda.strategies.panel_benchmark prints ms per scan and
+  the speedup for 28 symbols (the major/cross FX pairs) at 200 M15 bars
+PIN: 841921
+"""
+
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from strategies.bearish_wolf import BearishWolf
+    from strategies.bullish_wolf import BullishWolf
+    from strategies.sideways_wolf import SidewaysWolf
+except ImportError:
+    from data.oanda.strategies.bearish_wolf import BearishWolf
+    from data.oanda.strategies.bullish_wolf import BullishWolf
+    from data.oanda.strategies.sideways_wolf import SidewaysWolf
+
+
+def benchmark(symbols: int = 28, bars: int = 200, repeat: int = 5) -> Dict[str, Tuple[float, float]]:
+    """{wolf: (per-symbol loop ms, panel ms)} per full scan"""
+    rng = np.random.default_rng(841921)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0005, (symbols, bars)), axis=1)
+    high = close + np.abs(rng.normal(0, 0.0003, (symbols, bars)))
+    low = close - np.abs(rng.normal(0, 0.0003, (symbols, bars)))
+    volume = rng.integers(50, 500, (symbols, bars)).astype(float)
+    names = [f"PAIR_{i:02d}" for i in range(symbols)]
+    panel = {"close": close, "high": high, "low": low, "volume": volume}
+    frames = [{"close": pd.Series(close[i]), "high": pd.Series(high[i]), "low": pd.Series(low[i]),
+               "volume": pd.Series(volume[i])} for i in range(symbols)]
+
+    def per_scan(fn):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return (time.perf_counter() - start) / repeat * 1e3
+
+    results = {}
+    for wolf_class in (BullishWolf, BearishWolf, SidewaysWolf):
+        wolf = wolf_class()
+        # _generate_trade_signal bypasses the per-bar memo so every scan does the work
+        loop_ms = per_scan(lambda: [wolf._generate_trade_signal(data) for data in frames])
+        panel_ms = per_scan(lambda: wolf.generate_panel_signals(panel, names))
+        results[wolf_class.__name__] = (loop_ms, panel_ms)
+    return results
+
+
+if __name__ == "__main__":
+    for name, (loop_ms, panel_ms) in benchmark().items():
+        print(f"{name:<13} loop {loop_ms:8.2f} ms   panel {panel_ms:8.2f} ms   {loop_ms / panel_ms:5.1f}x")
@@ -7,10 +7,18 @@ M15-H1 timeframes | PIN: 841921 | Phase 12
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
 import logging
 from datetime import datetime, timezone
 
+# Shared indicator kernels and per-bar result memo (data/brokers/)
+try:
+    from brokers import indicators
+    from brokers.bar_memo import closed_bar_time, config_hash, get_bar_memo, settings
+except ImportError:
+    from data.brokers import indicators
+    from data.brokers.bar_memo import closed_bar_time, config_hash, get_bar_memo, settings
+
 class SidewaysWolf:
     """
     PROF_QUANT (35%): Advanced regime logic and confluence scoring for sideways markets
@@ -65,14 +73,13 @@ class SidewaysWolf:
         if std is None:
             std = self.bb_std
             
-        sma = prices.rolling(window=period).mean()
-        rolling_std = prices.rolling(window=period).std()
+        upper, middle, lower = indicators.bollinger(prices, period, std)
         
         return {
-            'upper': sma + (rolling_std * std),
-            'middle': sma,
-            'lower': sma - (rolling_std * std),
-            'width': (sma + (rolling_std * std)) - (sma - (rolling_std * std))
+            'upper': pd.Series(upper, index=prices.index),
+            'middle': pd.Series(middle, index=prices.index),
+            'lower': pd.Series(lower, index=prices.index),
+            'width': pd.Series(upper - lower, index=prices.index)
         }
     
     def calculate_atr(self, high: pd.Series, low: pd.Series, close: pd.Series, period: int = None) -> pd.Series:
@@ -80,29 +87,24 @@ class SidewaysWolf:
         if period is None:
             period = self.atr_period
         
-        # True Range calculation
-        prev_close = close.shift(1)
-        tr1 = high - low
-        tr2 = abs(high - prev_close)
-        tr3 = abs(low - prev_close)
-        
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = true_range.rolling(window=period).mean()
-        
-        return atr
+        return pd.Series(indicators.atr(high, low, close, period), index=close.index)
     
     def calculate_rsi(self, prices: pd.Series, period: int = None) -> pd.Series:
         """Calculate Relative Strength Index"""
         if period is None:
             period = self.rsi_period
             
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return pd.Series(indicators.rsi(prices, period), index=prices.index)
+    
+    def _state_usable(self, state: Any) -> bool:
+        return state is not None and state.warm and state.matches(
+            bb_period=self.bb_period, bb_std=self.bb_std, atr_period=self.atr_period, rsi_period=self.rsi_period)
+    
+    def indicators_from_state(self, state: Any):
+        """(bollinger, atr, rsi) in calculate_* form from streaming IndicatorState history"""
+        bollinger = {name: pd.Series(state.series(f'bb_{name}')) for name in ('upper', 'middle', 'lower')}
+        bollinger['width'] = bollinger['upper'] - bollinger['lower']
+        return bollinger, pd.Series(state.series('atr')), pd.Series(state.series('rsi'))
     
     def detect_support_resistance(self, prices: pd.Series) -> Dict[str, float]:
         """
@@ -117,7 +119,10 @@ class SidewaysWolf:
         # Simple support/resistance using rolling min/max
         support = recent_prices.rolling(window=10).min().min()
         resistance = recent_prices.rolling(window=10).max().max()
-        
+        return self._range_levels(support, resistance)
+    
+    def _range_levels(self, support: float, resistance: float) -> Dict[str, float]:
+        """Support/resistance dict with range percentage and midpoint"""
         # Calculate range percentage
         range_pct = (resistance - support) / support if support > 0 else 0
         
@@ -141,7 +146,12 @@ class SidewaysWolf:
         current_middle = bb['middle'].iloc[-1]  
         current_lower = bb['lower'].iloc[-1]
         current_width = bb['width'].iloc[-1]
-        
+        prev_width = bb['width'].iloc[-2] if len(bb['width']) > 1 else current_width
+        return self._score_bollinger(price, current_upper, current_middle, current_lower, current_width, prev_width)
+    
+    def _score_bollinger(self, price: float, current_upper: float, current_middle: float, current_lower: float,
+                         current_width: float, prev_width: float) -> Dict[str, Any]:
+        """Bollinger signals and score from the current bands and band width"""
         signals = []
         score = 0
         
@@ -166,7 +176,6 @@ class SidewaysWolf:
             score += 0.3  # Neutral zone
         
         # Band direction (range vs trend)
-        prev_width = bb['width'].iloc[-2] if len(bb['width']) > 1 else current_width
         if current_width < prev_width:
             signals.append("BB_CONTRACTING")
             score += 0.2  # Favors range conditions
@@ -204,9 +213,12 @@ class SidewaysWolf:
         atr_pct = current_atr / current_price if current_price > 0 else 0
         
         # ATR trend
-        atr_ma = atr.rolling(window=10).mean().iloc[-1] if len(atr) >= 10 else current_atr
+        atr_ma = indicators.rolling_mean(atr, 10)[-1] if len(atr) >= 10 else current_atr
         atr_trend = current_atr / atr_ma if atr_ma > 0 else 1.0
-        
+        return self._score_atr(atr_pct, atr_trend)
+    
+    def _score_atr(self, atr_pct: float, atr_trend: float) -> Dict[str, Any]:
+        """ATR signals and score from ATR as a share of price and its trend"""
         signals = []
         score = 0
         
@@ -252,7 +264,11 @@ class SidewaysWolf:
         """
         current_rsi = rsi.iloc[-1]
         prev_rsi = rsi.iloc[-2] if len(rsi) > 1 else current_rsi
-        
+        rsi_3_back = rsi.iloc[-3] if len(rsi) >= 3 else None
+        return self._score_rsi(current_rsi, prev_rsi, rsi_3_back)
+    
+    def _score_rsi(self, current_rsi: float, prev_rsi: float, rsi_3_back: Optional[float]) -> Dict[str, Any]:
+        """RSI signals and score from the last three readings (rsi_3_back None when unavailable)"""
         signals = []
         score = 0
         
@@ -286,15 +302,14 @@ class SidewaysWolf:
             score += 0.2  # Low conviction in neutral zone
         
         # RSI reversal patterns
-        if len(rsi) >= 3:
-            rsi_3_back = rsi.iloc[-3]
+        if rsi_3_back is not None:
             # RSI double bottom/top patterns
             if (current_rsi < 35 and rsi_3_back < 35 and 
-                current_rsi > prev_rsi and rsi.iloc[-2] > rsi_3_back):
+                current_rsi > prev_rsi and prev_rsi > rsi_3_back):
                 signals.append("RSI_DOUBLE_BOTTOM")
                 score += 0.4
             elif (current_rsi > 65 and rsi_3_back > 65 and 
-                  current_rsi < prev_rsi and rsi.iloc[-2] < rsi_3_back):
+                  current_rsi < prev_rsi and prev_rsi < rsi_3_back):
                 signals.append("RSI_DOUBLE_TOP")
                 score += 0.4
         
@@ -317,9 +332,16 @@ class SidewaysWolf:
             return {'signals': [], 'score': 0, 'volume_ratio': 1.0}
         
         current_volume = volume.iloc[-1]
-        volume_ma = volume.rolling(window=self.volume_ma_period).mean().iloc[-1]
+        volume_ma = indicators.rolling_mean(volume, self.volume_ma_period)[-1]
         volume_ratio = current_volume / volume_ma
         
+        # Volume trend inputs (last 5 bars vs the 5 before)
+        recent_volume_avg = volume.tail(5).mean()
+        older_volume_avg = volume.iloc[-10:-5].mean() if len(volume) >= 10 else recent_volume_avg
+        return self._score_volume(volume_ratio, recent_volume_avg, older_volume_avg)
+    
+    def _score_volume(self, volume_ratio: float, recent_volume_avg: float, older_volume_avg: float) -> Dict[str, Any]:
+        """Volume signals and score from the volume ratio and volume trend"""
         signals = []
         score = 0
         
@@ -339,9 +361,6 @@ class SidewaysWolf:
             score += 0.2  # Could be breakout or false breakout
         
         # Volume trend (stable volume favors range)
-        recent_volume_avg = volume.tail(5).mean()
-        older_volume_avg = volume.iloc[-10:-5].mean() if len(volume) >= 10 else recent_volume_avg
-        
         volume_change = (recent_volume_avg - older_volume_avg) / older_volume_avg if older_volume_avg > 0 else 0
         
         if abs(volume_change) < 0.1:  # Volume stable (within 10%)
@@ -404,20 +423,44 @@ class SidewaysWolf:
         
         return 'HOLD'  # No clear direction
     
-    def generate_trade_signal(self, data: Dict[str, pd.Series]) -> Dict[str, Any]:
+    def generate_trade_signal(self, data: Dict[str, pd.Series], state: Any = None, symbol: Optional[str] = None,
+                              granularity: str = "M15", bar_time: Any = None) -> Dict[str, Any]:
         """
         MENTOR_BK: Main strategy logic - analyze all indicators and generate trade signal
         
         Args:
             data: Dict containing 'close', 'high', 'low', 'volume' price series
+                  (or a CandleFrame from brokers/candle_frame.py)
+            state: Optional streaming IndicatorState for this symbol
+                   (brokers/indicator_state.py); when warm, indicator values
+                   through the last closed bar are read instead of recomputed
+            symbol, granularity, bar_time: with a symbol and a known last
+                   closed bar (bar_time, or a CandleFrame ending on a complete
+                   bar) the signal is memoized until the next bar closes
+                   (brokers/bar_memo.py); callers get their own copy of the dict
             
         Returns:
             Dict with trade decision, confidence, direction, and analysis details
         """
+        bar_time = closed_bar_time(data, bar_time)
+        if not symbol or bar_time is None:
+            return self._generate_trade_signal(data, state)
+        signal = get_bar_memo().get_or_compute(
+            "sideways_wolf", symbol, granularity, bar_time,
+            config_hash(settings(self), self._state_usable(state)),
+            lambda: self._generate_trade_signal(data, state)
+        )
+        return dict(signal)
+    
+    def _generate_trade_signal(self, data: Dict[str, pd.Series], state: Any = None) -> Dict[str, Any]:
         try:
             if not self.pin_verified:
                 raise ValueError("PIN verification required for Sideways Wolf")
             
+            # CandleFrame input: use its shared zero-copy column views
+            if hasattr(data, "as_series"):
+                data = data.as_series()
+            
             # Validate input data
             required_keys = ['close', 'volume']
             for key in required_keys:
@@ -431,21 +474,18 @@ class SidewaysWolf:
             high_prices = data.get('high', close_prices)
             low_prices = data.get('low', close_prices)
             
-            if len(close_prices) < max(self.bb_period, self.atr_period, self.rsi_period):
-                return {
-                    'trade': False,
-                    'confidence': 0.0,
-                    'direction': 'HOLD',
-                    'reason': 'Insufficient data for analysis',
-                    'regime': self.regime
-                }
+            if len(close_prices) < self.min_bars:
+                return self._insufficient_signal()
             
             current_price = close_prices.iloc[-1]
             
-            # Calculate all technical indicators
-            bollinger = self.calculate_bollinger_bands(close_prices)
-            atr = self.calculate_atr(high_prices, low_prices, close_prices)
-            rsi = self.calculate_rsi(close_prices)
+            # Calculate all technical indicators (or read the streaming state)
+            if self._state_usable(state):
+                bollinger, atr, rsi = self.indicators_from_state(state)
+            else:
+                bollinger = self.calculate_bollinger_bands(close_prices)
+                atr = self.calculate_atr(high_prices, low_prices, close_prices)
+                rsi = self.calculate_rsi(close_prices)
             sr_levels = self.detect_support_resistance(close_prices)
             
             # Analyze each indicator
@@ -462,53 +502,155 @@ class SidewaysWolf:
                 'volume': volume_analysis
             }
             
-            # Calculate confluence score
-            confluence_score = self.calculate_confluence_score(indicator_results)
+            return self._compose_signal(indicator_results, current_price,
+                                        rsi.iloc[-1] if not rsi.empty else None, sr_levels)
             
-            # Determine trade signal and direction
-            should_trade = confluence_score >= self.confidence_threshold
-            direction = self.determine_trade_direction(indicator_results, current_price, sr_levels) if should_trade else 'HOLD'
+        except Exception as e:
+            return self._error_signal(e)
+    
+    def generate_panel_signals(self, panel: Dict[str, Any], symbols: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Trade signals for many symbols from one aligned price/volume panel
+        
+        Args:
+            panel: 'close', 'volume' and optionally 'high'/'low' as (symbols x
+                   bars) matrices, one row per symbol over the same bars
+            symbols: Symbol for each row
+            
+        Returns:
+            {symbol: signal dict}, each identical to generate_trade_signal on
+            that symbol's row; Bollinger, ATR, RSI, range levels and volume
+            statistics are computed for every symbol in one vectorized pass
+        """
+        try:
+            if not self.pin_verified:
+                raise ValueError("PIN verification required for Sideways Wolf")
             
-            # Collect all signals for transparency
-            all_signals = []
-            for indicator_name, results in indicator_results.items():
-                all_signals.extend([f"{indicator_name.upper()}_{signal}" for signal in results.get('signals', [])])
+            for key in ['close', 'volume']:
+                if key not in panel:
+                    raise ValueError(f"Missing required data: {key}")
             
-            # Log decision
-            self.logger.info(f"Sideways Wolf Analysis: Confidence={confluence_score:.3f}, Signals={len(all_signals)}")
+            close = indicators.as_array(panel['close'])
+            volume = indicators.as_array(panel['volume'])
+            high = indicators.as_array(panel['high']) if 'high' in panel else close
+            low = indicators.as_array(panel['low']) if 'low' in panel else close
+            if close.ndim != 2 or len(close) != len(symbols) or any(m.shape != close.shape for m in (volume, high, low)):
+                raise ValueError("Panel needs aligned (symbols x bars) close, volume, high and low matrices")
             
-            return {
-                'trade': should_trade,
-                'confidence': confluence_score,
-                'direction': direction,
-                'regime': self.regime,
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'signals': all_signals,
-                'signal_count': len(all_signals),
-                'indicator_scores': {k: v.get('score', 0) for k, v in indicator_results.items()},
-                'technical_data': {
-                    'current_price': current_price,
-                    'support': sr_levels.get('support'),
-                    'resistance': sr_levels.get('resistance'),
-                    'range_pct': sr_levels.get('range_pct'),
-                    'rsi': rsi.iloc[-1] if not rsi.empty else None,
-                    'bb_position': bb_analysis.get('position'),
-                    'atr_pct': atr_analysis.get('atr_pct'),
-                    'volume_ratio': volume_analysis.get('volume_ratio')
-                },
-                'reason': f"Confluence score {confluence_score:.3f} {'≥' if should_trade else '<'} threshold {self.confidence_threshold}"
-            }
+            bars = close.shape[1]
+            if bars < self.min_bars:
+                return {symbol: self._insufficient_signal() for symbol in symbols}
+            
+            upper, middle, lower = indicators.bollinger(close, self.bb_period, self.bb_std)
+            width = upper - lower
+            atr = indicators.atr(high, low, close, self.atr_period)
+            rsi = indicators.rsi(close, self.rsi_period)
+            
+            # Support/resistance over the S/R window (the whole history when shorter)
+            recent = close[:, -self.support_resistance_periods:]
+            support, resistance = recent.min(axis=1), recent.max(axis=1)
             
+            current_price = close[:, -1]
+            atr_pct = atr[:, -1] / current_price
+            atr_ma = indicators.rolling_mean(atr, 10)[:, -1] if bars >= 10 else atr[:, -1]
+            atr_trend = atr[:, -1] / atr_ma
+            
+            volume_ready = bars >= self.volume_ma_period
+            if volume_ready:
+                volume_ratio = volume[:, -1] / indicators.rolling_mean(volume, self.volume_ma_period)[:, -1]
+                recent_volume_avg = volume[:, -5:].mean(axis=1)
+                older_volume_avg = volume[:, -10:-5].mean(axis=1) if bars >= 10 else recent_volume_avg
         except Exception as e:
-            self.logger.error(f"Sideways Wolf analysis failed: {str(e)}")
-            return {
-                'trade': False,
-                'confidence': 0.0,
-                'direction': 'HOLD',
-                'regime': self.regime,
-                'error': str(e),
-                'reason': 'Analysis error occurred'
-            }
+            return {symbol: self._error_signal(e) for symbol in symbols}
+        
+        signals = {}
+        for row, symbol in enumerate(symbols):
+            try:
+                price = current_price[row]
+                if bars < self.support_resistance_periods:
+                    sr_levels = {'support': support[row], 'resistance': resistance[row], 'range_pct': 0}
+                else:
+                    sr_levels = self._range_levels(support[row], resistance[row])
+                indicator_results = {
+                    'bollinger': self._score_bollinger(price, upper[row, -1], middle[row, -1], lower[row, -1],
+                                                       width[row, -1], width[row, -2]),
+                    'atr': self._score_atr(atr_pct[row] if price > 0 else 0,
+                                           atr_trend[row] if atr_ma[row] > 0 else 1.0),
+                    'rsi': self._score_rsi(rsi[row, -1], rsi[row, -2], rsi[row, -3]),
+                    'volume': self._score_volume(volume_ratio[row], recent_volume_avg[row], older_volume_avg[row])
+                              if volume_ready else {'signals': [], 'score': 0, 'volume_ratio': 1.0}
+                }
+                signals[symbol] = self._compose_signal(indicator_results, price, rsi[row, -1], sr_levels)
+            except Exception as e:
+                signals[symbol] = self._error_signal(e)
+        return signals
+    
+    def _compose_signal(self, indicator_results: Dict[str, Dict], current_price: float,
+                        current_rsi: Optional[float], sr_levels: Dict[str, float]) -> Dict[str, Any]:
+        """Trade decision dict from the per-indicator analyses"""
+        # Calculate confluence score
+        confluence_score = self.calculate_confluence_score(indicator_results)
+        
+        # Determine trade signal and direction
+        should_trade = confluence_score >= self.confidence_threshold
+        direction = self.determine_trade_direction(indicator_results, current_price, sr_levels) if should_trade else 'HOLD'
+        
+        # Collect all signals for transparency
+        all_signals = []
+        for indicator_name, results in indicator_results.items():
+            all_signals.extend([f"{indicator_name.upper()}_{signal}" for signal in results.get('signals', [])])
+        
+        # Log decision
+        self.logger.info(f"Sideways Wolf Analysis: Confidence={confluence_score:.3f}, Signals={len(all_signals)}")
+        
+        return {
+            'trade': should_trade,
+            'confidence': confluence_score,
+            'direction': direction,
+            'regime': self.regime,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'signals': all_signals,
+            'signal_count': len(all_signals),
+            'indicator_scores': {k: v.get('score', 0) for k, v in indicator_results.items()},
+            'technical_data': {
+                'current_price': current_price,
+                'support': sr_levels.get('support'),
+                'resistance': sr_levels.get('resistance'),
+                'range_pct': sr_levels.get('range_pct'),
+                'rsi': current_rsi,
+                'bb_position': indicator_results['bollinger'].get('position'),
+                'atr_pct': indicator_results['atr'].get('atr_pct'),
+                'volume_ratio': indicator_results['volume'].get('volume_ratio')
+            },
+            'reason': f"Confluence score {confluence_score:.3f} {'≥' if should_trade else '<'} threshold {self.confidence_threshold}"
+        }
+    
+    @property
+    def min_bars(self) -> int:
+        """Bars needed before every indicator is defined"""
+        return max(self.bb_period, self.atr_period, self.rsi_period)
+    
+    def _insufficient_signal(self) -> Dict[str, Any]:
+        """HOLD result for a history shorter than min_bars"""
+        return {
+            'trade': False,
+            'confidence': 0.0,
+            'direction': 'HOLD',
+            'reason': 'Insufficient data for analysis',
+            'regime': self.regime
+        }
+    
+    def _error_signal(self, e: Exception) -> Dict[str, Any]:
+        """HOLD result for an analysis that raised"""
+        self.logger.error(f"Sideways Wolf analysis failed: {str(e)}")
+        return {
+            'trade': False,
+            'confidence': 0.0,
+            'direction': 'HOLD',
+            'regime': self.regime,
+            'error': str(e),
+            'reason': 'Analysis error occurred'
+        }
 
 def get_sideways_wolf(pin: int = 841921) -> SidewaysWolf:
     """Convenience function to get Sideways Wolf strategy instance"""
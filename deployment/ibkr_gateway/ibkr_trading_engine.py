@@ -21,7 +21,9 @@ import time
 import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
+
+import numpy as np
 
 # Add parent for rick_hive access
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -29,6 +31,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # IBKR connector
 from ibkr_connector import IBKRConnector, position_police_check
 
+# Columnar candle decoding (data/brokers/candle_frame.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data"))
+from brokers.candle_frame import CandleFrame, decode_candles
+from brokers import indicators
+
+CandleInput = Union[CandleFrame, List[Dict]]
+
 # RICK Hive Mind
 try:
     from rick_hive.rick_charter import RickCharter as CHARTER
@@ -59,51 +68,21 @@ class CryptoWolfPack:
     def __init__(self, logger: logging.Logger):
         self.logger = logger
     
-    def calculate_rsi(self, candles: List[Dict], period: int = 14) -> float:
+    def calculate_rsi(self, candles: CandleInput, period: int = 14) -> float:
         """Calculate RSI from candle data"""
-        if len(candles) < period + 1:
+        frame = decode_candles(candles)
+        if len(frame) < period + 1:
             return 50.0  # Neutral if insufficient data
         
-        closes = [c["close"] for c in candles[-(period + 1):]]
-        
-        gains = []
-        losses = []
-        for i in range(1, len(closes)):
-            change = closes[i] - closes[i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-        
-        avg_gain = sum(gains) / period
-        avg_loss = sum(losses) / period
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+        return indicators.rsi_last(frame.close, period)
     
-    def calculate_ema(self, candles: List[Dict], period: int) -> float:
+    def calculate_ema(self, candles: CandleInput, period: int) -> float:
         """Calculate EMA from candles"""
-        if len(candles) < period:
-            return candles[-1]["close"] if candles else 0.0
-        
-        closes = [c["close"] for c in candles[-period:]]
-        
-        # Initial SMA
-        ema = sum(closes[:period]) / period
-        
-        # Apply EMA formula
-        multiplier = 2 / (period + 1)
-        for close in closes[period:]:
-            ema = (close - ema) * multiplier + ema
+        frame = decode_candles(candles)
+        if len(frame) < period:
+            return float(frame.close[-1]) if len(frame) else 0.0
         
-        return ema
+        return indicators.ema_sma_seeded(frame.close[-period:], period)
     
     def check_session_active(self) -> bool:
         """Check if CME crypto session is active (not in hourly break)"""
@@ -119,7 +98,7 @@ class CryptoWolfPack:
     def analyze_crypto_futures(
         self,
         symbol: str,
-        candles: List[Dict],
+        candles: CandleInput,
         current_price: float
     ) -> Optional[Dict]:
         """
@@ -132,12 +111,13 @@ class CryptoWolfPack:
         
         Args:
             symbol: BTC or ETH
-            candles: Historical OHLCV data
+            candles: Historical OHLCV (CandleFrame or list of candle dicts)
             current_price: Current market price
             
         Returns:
             Signal dict or None
         """
+        candles = decode_candles(candles)  # no-op when the engine already decoded
         if len(candles) < 60:
             self.logger.warning(f"{symbol}: Insufficient candles ({len(candles)})")
             return None
@@ -161,9 +141,10 @@ class CryptoWolfPack:
         overbought = rsi > self.RSI_OVERBOUGHT
         
         # Recent momentum (last 3 candles)
-        recent_candles = candles[-3:]
-        momentum_up = all(c["close"] > c["open"] for c in recent_candles)
-        momentum_down = all(c["close"] < c["open"] for c in recent_candles)
+        recent_close = candles.close[-3:]
+        recent_open = candles.open[-3:]
+        momentum_up = bool(np.all(recent_close > recent_open))
+        momentum_down = bool(np.all(recent_close < recent_open))
         
         # Signal generation
         signal = None
@@ -188,7 +169,7 @@ class CryptoWolfPack:
         self,
         symbol: str,
         entry: float,
-        candles: List[Dict]
+        candles: CandleInput
     ) -> Dict:
         """Generate LONG signal with OCO levels"""
         # ATR for stop/target calculation
@@ -220,7 +201,7 @@ class CryptoWolfPack:
         self,
         symbol: str,
         entry: float,
-        candles: List[Dict]
+        candles: CandleInput
     ) -> Dict:
         """Generate SHORT signal with OCO levels"""
         atr = self._calculate_atr(candles, period=14)
@@ -244,25 +225,10 @@ class CryptoWolfPack:
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
-    def _calculate_atr(self, candles: List[Dict], period: int = 14) -> float:
+    def _calculate_atr(self, candles: CandleInput, period: int = 14) -> float:
         """Calculate Average True Range"""
-        if len(candles) < period + 1:
-            return candles[-1]["high"] - candles[-1]["low"] if candles else 0.0
-        
-        true_ranges = []
-        for i in range(1, len(candles)):
-            high = candles[i]["high"]
-            low = candles[i]["low"]
-            prev_close = candles[i-1]["close"]
-            
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
-            )
-            true_ranges.append(tr)
-        
-        return sum(true_ranges[-period:]) / period
+        frame = decode_candles(candles)
+        return indicators.atr_last(frame.high, frame.low, frame.close, period)
 
 
 class IBKRTradingEngine:
@@ -371,13 +337,14 @@ class IBKRTradingEngine:
     async def _process_instrument(self, symbol: str):
         """Process single crypto futures instrument"""
         # Fetch historical data
-        candles = self.connector.get_historical_data(symbol, count=60, timeframe="1H")
+        # Decoded once into NumPy columns; every indicator reads the same frame
+        candles = decode_candles(self.connector.get_historical_data(symbol, count=60, timeframe="1H"))
         
-        if not candles:
+        if not len(candles):
             self.logger.warning(f"{symbol}: No candles received")
             return
         
-        current_price = candles[-1]["close"]
+        current_price = candles.last_close
         
         # Check for existing position
         positions = self.connector.get_open_positions()
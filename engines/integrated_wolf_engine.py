@@ -84,6 +84,9 @@ class IntegratedWolfEngine:
             practice=practice
         )
         
+        # Account mirror (transactions stream): gates read NAV/margin/positions in-process
+        self.account_mirror = self.connector.start_account_mirror()
+        
         # Wolf Pack Strategies
         self.strategies = {
             MarketRegime.BULLISH: BullishWolf(),
@@ -97,6 +100,7 @@ class IntegratedWolfEngine:
         self.guardian_gates = GuardianGates(account_nav=account_nav)
         self.margin_gate = MarginCorrelationGate(
             account_nav=account_nav,
+            fx=self.connector.fx,
             margin_cap_pct=0.35  # 35% from Charter
         )
         logger.info("✅ Guardian Gates armed")
@@ -126,31 +130,39 @@ class IntegratedWolfEngine:
     def get_account_nav(self) -> float:
         """Get account NAV for gate initialization."""
         try:
-            summary = self.connector.get_account_summary()
+            mirror = self.account_mirror
+            if mirror is not None and mirror.healthy:
+                summary = mirror.account_summary()
+            else:
+                summary = self.connector.get_account_summary()
             return float(summary.get('NAV', 100000))
         except Exception as e:
             logger.warning(f"Could not fetch NAV: {e}, using default 100k")
             return 100000.0
     
+    def get_account_state(self) -> Tuple[Dict, List[Dict]]:
+        """(account, positions) for the gates: in-process mirror when in sync, else the broker."""
+        mirror = self.account_mirror
+        if mirror is not None and mirror.healthy:
+            return mirror.gate_account(), mirror.gate_positions()
+        return self.connector.get_account_summary(), self.connector.get_open_positions()
+    
     def detect_current_regime(self, symbol: str) -> MarketRegime:
         """Detect current market regime for symbol."""
         try:
-            # Get recent price data
-            candles = self.connector.get_historical_data(
-                symbol=symbol,
+            # Get recent price data (decoded once; shared with the strategy step)
+            frame = self.connector.get_candle_frame(
+                instrument=symbol,
                 granularity="M15",
                 count=200
             )
             
-            if not candles:
+            if not len(frame):
                 logger.warning("No candle data, defaulting to SIDEWAYS")
                 return MarketRegime.SIDEWAYS
             
-            # Extract closing prices
-            prices = [float(c['mid']['c']) for c in candles]
-            
-            # Detect regime
-            regime_data = detect_market_regime(prices, symbol)
+            # Detect regime straight from the close column
+            regime_data = detect_market_regime(frame, symbol)
             regime_str = regime_data.get('regime', 'SIDEWAYS')
             
             # Map to enum
@@ -202,13 +214,13 @@ class IntegratedWolfEngine:
         
         # Step 3: Get candle data for strategy
         try:
-            candles = self.connector.get_historical_data(
-                symbol=symbol,
+            candles = self.connector.get_candle_frame(
+                instrument=symbol,
                 granularity=timeframe,
                 count=200
             )
             
-            if not candles or len(candles) < 50:
+            if len(candles) < 50:
                 logger.warning("Insufficient candle data")
                 return None
             
@@ -239,8 +251,7 @@ class IntegratedWolfEngine:
         
         # Gate 1: Guardian Gates (4 sub-gates)
         try:
-            account = self.connector.get_account_summary()
-            positions = self.connector.get_open_positions()
+            account, positions = self.get_account_state()
             
             gate_result = self.guardian_gates.validate_signal(
                 signal=signal,
@@ -13,6 +13,8 @@ import os
 import asyncio
 import threading
 import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 from collections import defaultdict
@@ -64,6 +66,31 @@ class MultiBrokerEngine:
     - All 6 systems orchestrated
     """
     
+    # Symbols scanned per broker each cycle
+    MARKET_UNIVERSE = {
+        'oanda': ['EUR_USD', 'GBP_USD', 'USD_JPY', 'AUD_USD', 'USD_CAD'],
+        'coinbase': ['BTC-USD', 'ETH-USD', 'SOL-USD', 'XRP-USD'],
+        'ibkr': ['AAPL', 'MSFT', 'GOOGL', 'TSLA', 'NVDA'],
+    }
+    
+    # Per-broker time budget (seconds) for one market data collection
+    MARKET_DATA_DEADLINES_S = {
+        'oanda': 5.0,
+        'coinbase': 5.0,
+        'ibkr': 8.0,
+    }
+    
+    # Brokers whose connector is bound to the event loop of the thread that
+    # connected it (ib_insync is not thread-safe): collected on the calling
+    # thread while the REST brokers run on their workers
+    LOOP_BOUND_BROKERS = {'ibkr'}
+    
+    # Connector methods that fetch many symbols in one call
+    BATCH_QUOTE_METHODS = {
+        'oanda': 'get_live_prices',     # one /pricing request for all pairs
+        'ibkr': 'get_bid_ask_many',     # streaming ticker table, one event-loop pump
+    }
+    
     def __init__(self, pin: int = 841921):
         """Initialize multi-broker engine"""
         self.pin = pin
@@ -75,6 +102,13 @@ class MultiBrokerEngine:
         self.brokers = {}
         self._init_brokers()
         
+        # One market data worker per REST broker, so a slow gateway only delays itself
+        self._data_workers = {
+            broker: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"md-{broker}")
+            for broker in self.brokers if broker not in self.LOOP_BOUND_BROKERS
+        }
+        self._data_inflight = {}  # {broker: Future} still running past its deadline
+        
         # Initialize trading systems
         self.strategy_aggregator = StrategyAggregator()
         self.hive_mind = RickHiveMind()
@@ -135,48 +169,91 @@ class MultiBrokerEngine:
         if not self.brokers:
             raise RuntimeError("No brokers available!")
     
+    def _fetch_broker_market_data(self, broker: str, symbols: List[str]) -> Dict[str, Dict]:
+        """Collect quotes for one broker (on its worker, or the calling thread if loop-bound)"""
+        connector = self.brokers[broker]
+        
+        batch = getattr(connector, self.BATCH_QUOTE_METHODS.get(broker, ''), None)
+        if batch is not None:
+            quotes = batch(symbols) or {}
+            return {symbol: data for symbol, data in quotes.items() if data and not data.get('error')}
+        
+        fetch = getattr(connector, 'get_market_data', None) or getattr(connector, 'get_current_bid_ask')
+        collected = {}
+        for symbol in symbols:
+            data = fetch(symbol)
+            if data:
+                collected[symbol] = data
+        return collected
+    
     def get_market_data(self):
-        """Fetch market data from all active brokers"""
+        """
+        Fetch market data from all active brokers concurrently
+        
+        Each REST broker runs on its own worker with its own deadline; results
+        are merged into self.market_data as they arrive. A broker that misses
+        its deadline (or is still busy with last cycle's request) is skipped
+        this cycle and its stale data dropped, without stalling the others; so
+        is a broker whose fetch raised. Loop-bound brokers (IBKR) are fetched
+        on this thread meanwhile, bounded by the connector's own quote timeout.
+        """
         print("\n📊 Fetching market data from all brokers...")
         
-        # Forex (OANDA)
-        if 'oanda' in self.brokers:
-            try:
-                forex_pairs = ['EUR_USD', 'GBP_USD', 'USD_JPY', 'AUD_USD', 'USD_CAD']
-                for pair in forex_pairs:
-                    data = self.brokers['oanda'].get_market_data(pair)
-                    if data:
-                        self.market_data['oanda'][pair] = data
-                print(f"  ✅ OANDA: {len(self.market_data['oanda'])} pairs")
-            except Exception as e:
-                print(f"  ❌ OANDA data fetch failed: {e}")
+        start = time.monotonic()
+        pending = {}
+        loop_bound = []
+        for broker, symbols in self.MARKET_UNIVERSE.items():
+            if broker not in self.brokers:
+                continue
+            if broker in self.LOOP_BOUND_BROKERS:
+                loop_bound.append((broker, symbols))
+                continue
+            inflight = self._data_inflight.get(broker)
+            if inflight is not None and not inflight.done():
+                print(f"  ⏭️  {broker.upper()}: previous request still running - skipped this cycle")
+                self.market_data.pop(broker, None)
+                continue
+            future = self._data_workers[broker].submit(self._fetch_broker_market_data, broker, symbols)
+            self._data_inflight[broker] = future
+            pending[future] = broker
         
-        # Crypto (Coinbase)
-        if 'coinbase' in self.brokers:
-            try:
-                crypto_pairs = ['BTC-USD', 'ETH-USD', 'SOL-USD', 'XRP-USD']
-                for pair in crypto_pairs:
-                    data = self.brokers['coinbase'].get_market_data(pair)
-                    if data:
-                        self.market_data['coinbase'][pair] = data
-                print(f"  ✅ Coinbase: {len(self.market_data['coinbase'])} pairs")
-            except Exception as e:
-                print(f"  ❌ Coinbase data fetch failed: {e}")
+        for broker, symbols in loop_bound:
+            self._store_market_data(broker, lambda: self._fetch_broker_market_data(broker, symbols), start)
         
-        # Equities (IBKR)
-        if 'ibkr' in self.brokers:
-            try:
-                stocks = ['AAPL', 'MSFT', 'GOOGL', 'TSLA', 'NVDA']
-                for stock in stocks:
-                    data = self.brokers['ibkr'].get_market_data(stock)
-                    if data:
-                        self.market_data['ibkr'][stock] = data
-                print(f"  ✅ IBKR: {len(self.market_data['ibkr'])} symbols")
-            except Exception as e:
-                print(f"  ❌ IBKR data fetch failed: {e}")
+        while pending:
+            now = time.monotonic() - start
+            next_deadline = min(self.MARKET_DATA_DEADLINES_S.get(pending[f], 5.0) for f in pending)
+            done, _ = wait(list(pending), timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                self._store_market_data(pending.pop(future), future.result, start)
+            
+            elapsed = time.monotonic() - start
+            for future, broker in list(pending.items()):
+                if elapsed >= self.MARKET_DATA_DEADLINES_S.get(broker, 5.0):
+                    del pending[future]
+                    self.market_data.pop(broker, None)
+                    print(f"  ⏱️  {broker.upper()}: missed {self.MARKET_DATA_DEADLINES_S.get(broker, 5.0):g}s "
+                          f"deadline - skipped this cycle")
+                    log_narration(
+                        event_type="MARKET_DATA_DEADLINE_MISSED",
+                        details={"broker": broker, "deadline_s": self.MARKET_DATA_DEADLINES_S.get(broker, 5.0)},
+                        venue=broker
+                    )
         
         return self.market_data
     
+    def _store_market_data(self, broker: str, fetch, start: float):
+        """Merge one broker's result; a fetch that raised drops the broker's data"""
+        try:
+            data = fetch()
+        except Exception as e:
+            self.market_data.pop(broker, None)
+            print(f"  ❌ {broker.upper()} data fetch failed: {e}")
+            return
+        self.market_data[broker] = data
+        print(f"  ✅ {broker.upper()}: {len(data)} symbols ({(time.monotonic() - start) * 1000:.0f}ms)")
+    
     def run_strategy_analysis(self):
         """Run all 5 strategies against market data"""
         print("\n🎯 Running strategy analysis...")
@@ -359,6 +436,9 @@ class MultiBrokerEngine:
         """Clean shutdown"""
         print("\n🛑 Shutting down multi-broker engine...")
         
+        for worker in self._data_workers.values():
+            worker.shutdown(wait=False)
+        
         for broker, connector in self.brokers.items():
             try:
                 connector.close()
@@ -14,7 +14,9 @@ from pathlib import Path
 import os
 import time
 import asyncio
-import requests
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
 
@@ -34,6 +36,9 @@ if os.path.exists(env_file):
 from foundation.rick_charter import RickCharter
 from foundation.margin_correlation_gate import MarginCorrelationGate, Position, Order, HookResult
 from brokers.oanda_connector import OandaConnector
+from brokers.http_transport import get_shared_transport
+from brokers.oanda_async_connector import AsyncOandaConnector
+from brokers.fx_matrix import get_fx_matrix
 from util.terminal_display import TerminalDisplay, Colors
 from util.narration_logger import log_narration, log_pnl
 from util.rick_narrator import RickNarrator
@@ -65,6 +70,52 @@ except ImportError:
     MOMENTUM_SYSTEM_AVAILABLE = False
     print("⚠️  Momentum/Trailing system not available")
 
+@dataclass
+class PreTradeContext:
+    """Inputs place_trade needs before sizing and gating, gathered in parallel"""
+    price: Optional[Dict]
+    margin_used: float = 0.0
+    base_usd_rate: Optional[float] = None  # USD per unit of the base currency (crosses only)
+    account_cached: bool = False
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    wall_ms: float = 0.0
+
+    @property
+    def sequential_ms(self) -> float:
+        """What the same fetches would have cost one after another"""
+        return sum(self.timings_ms.values())
+
+    @property
+    def saved_ms(self) -> float:
+        return max(0.0, self.sequential_ms - self.wall_ms)
+
+    def usd_per_unit(self, symbol: str, entry_price: float) -> Optional[float]:
+        """USD value of one unit of the base currency, or None if the cross rate is missing"""
+        base, quote = symbol.split('_', 1)
+        if base == 'USD':
+            return 1.0
+        if quote == 'USD':
+            return entry_price
+        return self.base_usd_rate
+
+    def narration(self) -> Dict:
+        return {
+            "pretrade_ms": round(self.wall_ms, 1),
+            "pretrade_sequential_ms": round(self.sequential_ms, 1),
+            "pretrade_saved_ms": round(self.saved_ms, 1),
+            "pretrade_inputs_ms": {name: round(ms, 1) for name, ms in self.timings_ms.items()},
+            "price_streamed": bool(self.price and self.price.get('streamed')),
+            "account_cached": self.account_cached
+        }
+
+
+def _timed(fn, *args):
+    """Run fn and return (result, elapsed ms)"""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
 class OandaTradingEngine:
     """
     RBOTzilla Charter-Compliant OANDA Trading Engine
@@ -76,13 +127,26 @@ class OandaTradingEngine:
     - Sub-300ms execution tracking
     """
     
-    def __init__(self, environment='practice'):
+    def __init__(self, environment='practice', async_io=False, stream_prices=True,
+                 api_base=None, stream_base=None, account_mirror=True, indicator_state_path=None):
         """
         Initialize Trading Engine
         
         Args:
             environment: 'practice' or 'live' (default: practice)
                         Only difference is API endpoint and token used
+            async_io: Use the native asyncio OANDA client so scans, trade
+                      management and Position Police sweeps overlap
+            stream_prices: Keep a pricing-stream quote board for all trading
+                           pairs; price reads fall back to REST only when stale
+            api_base: REST base URL override (e.g. a local stand-in from
+                      testing/oanda_v20_standin.py); default OANDA_API_BASE or OANDA's host
+            stream_base: Streaming base URL override (default: api_base)
+            account_mirror: Mirror account state from the transactions stream so
+                            margin, trades, orders and Position Police reads are in-process
+            indicator_state_path: JSON file the streaming indicator state is restored
+                                  from at start and saved to at session end
+                                  (default: indicator_state.json next to this engine)
         """
         # Validate Charter PIN
         if not RickCharter.validate_pin(841921):
@@ -92,12 +156,26 @@ class OandaTradingEngine:
         self.environment = environment
         
         # Initialize OANDA connector: environment determines endpoint only
-        self.oanda = OandaConnector(environment=environment)
+        self.oanda = OandaConnector(environment=environment, api_base=api_base, stream_base=stream_base)
         env_label = "PRACTICE" if environment == 'practice' else "LIVE"
         self.display.success(f"✅ {env_label} API connected")
         print(f"   Account: {self.oanda.account_id}")
         print(f"   Endpoint: {self.oanda.api_base}")
         
+        # Streaming RSI/MACD/ATR/Bollinger state survives restarts
+        self.indicator_state_path = indicator_state_path or str(Path(__file__).parent / 'indicator_state.json')
+        if self.oanda.indicators.load(self.indicator_state_path):
+            self.display.success(f"✅ Indicator state restored ({self.oanda.indicators.stats()['series']} series)")
+        
+        # Optional non-blocking client sharing the connector's credentials/charter checks
+        self.async_oanda = None
+        if async_io:
+            try:
+                self.async_oanda = AsyncOandaConnector(connector=self.oanda)
+                self.display.success("✅ Async OANDA client enabled (non-blocking I/O)")
+            except ImportError as e:
+                self.display.warning(f"⚠️  Async OANDA client unavailable ({e}) - using blocking client")
+        
         # Initialize Rick's narration system
         self.narrator = RickNarrator()
         
@@ -162,7 +240,8 @@ class OandaTradingEngine:
         except Exception as e:
             self.display.warn(f"⚠️  Could not fetch account NAV: {e}, using default $2000")
         
-        self.gate = MarginCorrelationGate(account_nav=account_nav)
+        self.fx = self.oanda.fx  # currency -> USD matrix fed by the quote board
+        self.gate = MarginCorrelationGate(account_nav=account_nav, fx=self.fx)
         self.current_positions = []  # Track positions for gate monitoring
         self.pending_orders = []      # Track pending orders for gate monitoring
         self.display.success("🛡️  Margin & Correlation Guardian Gates ACTIVE")
@@ -180,6 +259,28 @@ class OandaTradingEngine:
             'AUD_CHF', 'NZD_CHF', 'EUR_AUD', 'GBP_AUD'
         ]
         
+        # Streaming quote board for every traded pair (REST polling becomes the fallback)
+        if stream_prices:
+            self.oanda.start_price_stream(self.trading_pairs)
+            self.display.success(f"✅ Pricing stream subscribed ({len(self.trading_pairs)} pairs)")
+        
+        # Local account model fed by the transactions stream (REST when out of sync)
+        if account_mirror:
+            self.oanda.start_account_mirror()
+            self.display.success("✅ Account mirror subscribed (transactions stream)")
+        
+        # Signal scan fan-out: bounded concurrency and per-cycle deadline
+        self.scan_concurrency = 8
+        self.scan_deadline_seconds = 30.0
+        self.last_scan = {}
+        
+        # Pre-trade inputs (price, USD cross rate, margin) are fetched side by side;
+        # the account summary is reused between placements for a few seconds
+        self._pretrade_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="pretrade")
+        self.account_info_ttl_s = 5.0
+        self._account_info = None
+        self._account_info_at = 0.0
+        
         self.min_trade_interval = 300  # 5 minutes (MICRO TRADING DISABLED - Minimum 5min enforced)
         
         # IMMUTABLE RISK MANAGEMENT (Charter Section 3.2)
@@ -277,16 +378,35 @@ class OandaTradingEngine:
         self.display.divider()
         print()
     
+    def _streamed_price(self, pair):
+        """Fresh quote from the pricing-stream board, or None if stale/unavailable"""
+        quote = self.oanda.get_quote(pair)
+        if quote is None or quote.bid is None or quote.ask is None:
+            return None
+        return {
+            'bid': quote.bid,
+            'ask': quote.ask,
+            'spread': round((quote.ask - quote.bid) * 10000, 1),  # in pips
+            'real_api': True,
+            'streamed': True
+        }
+    
     def get_current_price(self, pair):
-        """Get current real-time price from OANDA API (environment-agnostic)"""
+        """Get current real-time price (streamed quote board first, REST when stale)"""
+        streamed = self._streamed_price(pair)
+        if streamed:
+            return streamed
         try:
             # Get real-time prices from OANDA API (practice or live based on connector config)
             api_base = self.oanda.api_base
             headers = self.oanda.headers
             account_id = self.oanda.account_id
             
-            response = requests.get(
+            # Pooled keep-alive session shared with the connector
+            response = self.oanda.transport.request(
+                "GET",
                 f"{api_base}/v3/accounts/{account_id}/pricing",
+                endpoint_class="pricing",
                 headers=headers,
                 params={"instruments": pair},
                 timeout=5
@@ -299,6 +419,7 @@ class OandaTradingEngine:
                     bid = float(price_info['bids'][0]['price'])
                     ask = float(price_info['asks'][0]['price'])
                     spread = round((ask - bid) * 10000, 1)  # in pips
+                    self.fx.update(pair, (bid + ask) / 2.0)
                     
                     return {
                         'bid': bid,
@@ -315,6 +436,34 @@ class OandaTradingEngine:
             self.display.warning(f"⚠️  API error for {pair}: {str(e)}, using fallback")
             return self._get_fallback_price(pair)
     
+    async def get_current_price_async(self, pair):
+        """Non-blocking get_current_price (async mode); same result shape and fallback"""
+        if not self.async_oanda:
+            return self.get_current_price(pair)
+        streamed = self._streamed_price(pair)
+        if streamed:
+            return streamed
+        try:
+            quote = (await self.async_oanda.get_live_prices([pair])).get(pair)
+            if quote and quote['bid'] is not None and quote['ask'] is not None:
+                self.fx.update(pair, (quote['bid'] + quote['ask']) / 2.0)
+                return {
+                    'bid': quote['bid'],
+                    'ask': quote['ask'],
+                    'spread': round((quote['ask'] - quote['bid']) * 10000, 1),  # in pips
+                    'real_api': True
+                }
+            self.display.warning(f"⚠️  API pricing failed for {pair}, using fallback")
+        except Exception as e:
+            self.display.warning(f"⚠️  API error for {pair}: {str(e)}, using fallback")
+        return self._get_fallback_price(pair)
+    
+    async def _broker(self, method: str, *args, **kwargs):
+        """Call a connector method, awaiting the async client when async mode is on"""
+        if self.async_oanda:
+            return await getattr(self.async_oanda, method)(*args, **kwargs)
+        return getattr(self.oanda, method)(*args, **kwargs)
+    
     def _get_fallback_price(self, symbol: str) -> Dict:
         """Fallback to approximate prices if live API unavailable"""
         import random
@@ -602,9 +751,8 @@ class OandaTradingEngine:
         # Get account NAV for calculations
         account_nav = 2000.0
         try:
-            if hasattr(self.oanda, 'get_account_info'):
-                account_info = self.oanda.get_account_info()
-                account_nav = float(account_info.get('NAV', 2000.0))
+            account_info, _ = self._cached_account_info()
+            account_nav = float(account_info.get('NAV', 2000.0))
         except Exception:
             pass
         
@@ -669,11 +817,83 @@ class OandaTradingEngine:
             'reason': f'Low risk profile (margin: {margin_utilization:.1%}, notional: ${notional:,.0f})'
         }
     
+    def _cached_account_info(self) -> Tuple[Dict, bool]:
+        """Account summary, reused for account_info_ttl_s; returns (info, served_from_cache)"""
+        mirror = self.oanda.account_mirror
+        if mirror is not None and mirror.healthy:
+            return mirror.account_summary(), True
+        if self._account_info is not None and time.monotonic() - self._account_info_at < self.account_info_ttl_s:
+            return self._account_info, True
+        if not hasattr(self.oanda, 'get_account_info'):
+            return {}, False
+        account_info = self.oanda.get_account_info() or {}
+        if account_info:
+            self._account_info = account_info
+            self._account_info_at = time.monotonic()
+        return account_info, False
+    
+    def _invalidate_account_info(self):
+        """Margin changes with every placement - next trade must re-read it"""
+        self._account_info = None
+    
+    def _fetch_usd_rate(self, currency: str) -> Optional[float]:
+        """Cold FX matrix: price the currency's USD pair (feeds the matrix); no simulated fallback"""
+        pair = f"{currency}_USD" if f"{currency}_USD" in self.trading_pairs else f"USD_{currency}"
+        try:
+            mid = self.oanda.get_live_prices([pair]).get(pair, {}).get('mid')
+        except Exception as e:
+            self.display.warning(f"⚠️  Could not fetch conversion rate {pair}: {e}")
+            return None
+        if not mid:
+            return None
+        self.fx.update(pair, mid)
+        return self.fx.usd_rate(currency)
+    
+    def _account_margin(self) -> Tuple[float, bool]:
+        try:
+            account_info, cached = self._cached_account_info()
+            return float(account_info.get('marginUsed', 0)), cached
+        except Exception as e:
+            self.display.warning(f"⚠️  Could not fetch margin info: {e}")
+            return 0.0, False
+    
+    def _gather_pretrade_context(self, symbol: str) -> PreTradeContext:
+        """
+        Fetch price, USD conversion rate and account margin concurrently.
+        
+        Latency is bounded by the slowest input instead of their sum; warm
+        inputs (streamed quotes, the FX matrix, the account mirror) return
+        immediately.
+        """
+        base, quote = symbol.split('_', 1)
+        # Crosses need the base currency in USD: an in-memory lookup unless the matrix is cold
+        base_usd_rate = None if 'USD' in (base, quote) else self.fx.usd_rate(base)
+        calls = {'price': (self.get_current_price, symbol), 'margin': (self._account_margin,)}
+        if 'USD' not in (base, quote) and base_usd_rate is None:
+            calls['conversion'] = (self._fetch_usd_rate, base)
+        
+        start = time.perf_counter()
+        futures = {name: self._pretrade_pool.submit(_timed, *call) for name, call in calls.items()}
+        results, timings = {}, {}
+        for name, future in futures.items():
+            results[name], timings[name] = future.result()
+        
+        margin_used, account_cached = results['margin']
+        return PreTradeContext(
+            price=results['price'],
+            margin_used=margin_used,
+            base_usd_rate=results.get('conversion', base_usd_rate),
+            account_cached=account_cached,
+            timings_ms=timings,
+            wall_ms=(time.perf_counter() - start) * 1000
+        )
+    
     def place_trade(self, symbol: str, direction: str):
         """Place Charter-compliant OCO order with full logging (environment-agnostic)"""
         try:
-            # Get current price
-            price_data = self.get_current_price(symbol)
+            # Price, USD conversion rate and margin in parallel
+            context = self._gather_pretrade_context(symbol)
+            price_data = context.price
             if not price_data:
                 self.display.error(f"Could not get price for {symbol}")
                 log_narration(
@@ -690,8 +910,13 @@ class OandaTradingEngine:
             # Calculate Charter-compliant position size
             position_size = self.calculate_position_size(symbol, entry_price)
             
-            # Calculate notional value in TRUE USD (handles cross pairs correctly)
-            notional_value = get_usd_notional(position_size, symbol, entry_price, self.oanda)
+            # Calculate notional value in TRUE USD (handles cross pairs correctly);
+            # the converter only runs when the prefetched cross rate is missing
+            usd_per_unit = context.usd_per_unit(symbol, entry_price)
+            if usd_per_unit is not None:
+                notional_value = position_size * usd_per_unit
+            else:
+                notional_value = get_usd_notional(position_size, symbol, entry_price, self.oanda)
             if notional_value is None:
                 self.display.error(f"❌ Cannot calculate USD notional for {symbol}")
                 return None
@@ -699,14 +924,8 @@ class OandaTradingEngine:
             # ========================================================================
             # 🛡️ PRE-TRADE GUARDIAN GATE CHECK (NEW)
             # ========================================================================
-            # Get current account margin
-            current_margin_used = 0
-            try:
-                if hasattr(self.oanda, 'get_account_info'):
-                    account_info = self.oanda.get_account_info()
-                    current_margin_used = float(account_info.get('marginUsed', 0))
-            except Exception as e:
-                self.display.warn(f"⚠️  Could not fetch margin info: {e}")
+            # Current account margin (prefetched with the price)
+            current_margin_used = context.margin_used
             
             # Create order object for gate validation
             gate_order = Order(
@@ -842,10 +1061,12 @@ class OandaTradingEngine:
                 stop_loss=stop_loss,
                 take_profit=take_profit,
                 units=units,
-                ttl_hours=6.0  # Charter: 6 hour max hold
+                ttl_hours=6.0,  # Charter: 6 hour max hold
+                narration=context.narration()
             )
             
             if order_result.get('success'):
+                self._invalidate_account_info()
                 order_id = order_result.get('order_id')
                 latency_ms = order_result.get('latency_ms', 0)
                 
@@ -1077,7 +1298,7 @@ class OandaTradingEngine:
 
                     # Get current price to calculate profit
                     try:
-                        current_price_data = self.get_current_price(symbol)
+                        current_price_data = await self.get_current_price_async(symbol)
                         if not current_price_data:
                             continue
                         current_price = current_price_data['ask'] if direction == 'BUY' else current_price_data['bid']
@@ -1175,7 +1396,7 @@ class OandaTradingEngine:
 
                         # Attempt to cancel TP order(s) associated with this OCO
                         try:
-                            cancel_resp = self.oanda.cancel_order(order_id)
+                            cancel_resp = await self._broker("cancel_order", order_id)
 
                             log_narration(
                                 event_type="TP_CANCEL_ATTEMPT",
@@ -1190,7 +1411,7 @@ class OandaTradingEngine:
                             )
 
                             # Find open trades for this symbol and set an initial trailing stop
-                            trades = self.oanda.get_trades()
+                            trades = await self._broker("get_trades")
                             for t in trades:
                                 trade_instrument = t.get('instrument') or t.get('symbol')
                                 trade_id = t.get('id') or t.get('tradeID') or t.get('trade_id')
@@ -1221,7 +1442,7 @@ class OandaTradingEngine:
                                         # Fallback: use existing stop_loss
                                         adaptive_sl = pos.get('stop_loss')
                                     
-                                    set_resp = self.oanda.set_trade_stop(trade_id, adaptive_sl)
+                                    set_resp = await self._broker("set_trade_stop", trade_id, adaptive_sl)
 
                                     log_narration(
                                         event_type="TRAILING_SL_SET",
@@ -1267,14 +1488,21 @@ class OandaTradingEngine:
         position = self.active_positions[trade_id]
         
         try:
-            # Get trade details from OANDA
-            trades = self.oanda.get_trades()
-            
-            # Assume win for now (we'd need to check actual closing price)
-            # In real implementation, you'd query the closed trade details
-            is_win = True  # Placeholder
-            
-            pnl = 50.0 if is_win else -20.0  # Placeholder values
+            # Realized P&L of the actual fills (account mirror, else GET /trades/{id})
+            pnl = self.oanda.get_closed_trade_pl(trade_id)
+            if pnl is None:
+                # Never book a guess: the trade leaves the book without touching the stats
+                del self.active_positions[trade_id]
+                self.display.warning(f"⚠️  No realized P&L for trade {trade_id} - not counted in stats")
+                log_narration(
+                    event_type="TRADE_PNL_UNAVAILABLE",
+                    details={"trade_id": trade_id},
+                    symbol=position['symbol'],
+                    venue="oanda"
+                )
+                return
+            is_win = pnl >= 0
+            self.total_pnl += pnl
             
             if is_win:
                 self.wins += 1
@@ -1313,6 +1541,109 @@ class OandaTradingEngine:
         
         self.display.stats_panel(stats)
     
+    async def _scan_pair(self, pair: str, semaphore: asyncio.Semaphore) -> Dict:
+        """Fetch candles and evaluate one pair; never raises"""
+        async with semaphore:
+            start = time.perf_counter()
+            signal, confidence, error = None, 0.0, None
+            try:
+                if self.async_oanda:
+                    candles = await self.async_oanda.get_historical_data(pair, count=120, granularity="M15")
+                else:
+                    candles = await asyncio.to_thread(self.oanda.get_historical_data, pair, 120, "M15")
+                signal, confidence = generate_signal(pair, candles)  # ("BUY"/"SELL", confidence) or (None, 0)
+            except Exception as e:
+                error = str(e)
+            return {
+                'pair': pair,
+                'signal': signal,
+                'confidence': float(confidence or 0.0),
+                'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+                'error': error
+            }
+    
+    async def scan_all_pairs(self) -> List[Dict]:
+        """
+        Fetch and evaluate every trading pair concurrently
+        
+        Concurrency is bounded by scan_concurrency and the whole scan by
+        scan_deadline_seconds; pairs still running at the deadline are dropped
+        for this cycle. Per-pair timings are kept in self.last_scan.
+        
+        Returns:
+            Valid BUY/SELL results ranked by confidence (best first)
+        """
+        scan_start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.scan_concurrency)
+        tasks = {asyncio.create_task(self._scan_pair(pair, semaphore)): pair for pair in self.trading_pairs}
+        done, pending = await asyncio.wait(tasks.keys(), timeout=self.scan_deadline_seconds)
+        for task in pending:
+            task.cancel()
+        
+        results = [task.result() for task in done]
+        timed_out = sorted(tasks[task] for task in pending)
+        for r in results:
+            if r['error']:
+                self.display.error(f"Signal error for {r['pair']}: {r['error']}")
+        
+        candidates = sorted(
+            (r for r in results if r['signal'] in ("BUY", "SELL")),
+            key=lambda r: r['confidence'],
+            reverse=True
+        )
+        timings = {r['pair']: r['elapsed_ms'] for r in results}
+        slowest = sorted(timings.items(), key=lambda kv: kv[1], reverse=True)[:3]
+        self.last_scan = {
+            'elapsed_ms': round((time.perf_counter() - scan_start) * 1000, 1),
+            'timings_ms': timings,
+            'timed_out': timed_out,
+            'candidates': [(r['pair'], r['signal'], r['confidence']) for r in candidates]
+        }
+        
+        log_narration(
+            event_type="SIGNAL_SCAN",
+            details={
+                "pairs": len(self.trading_pairs),
+                "elapsed_ms": self.last_scan['elapsed_ms'],
+                "signals": len(candidates),
+                "best": self.last_scan['candidates'][0] if candidates else None,
+                "slowest_ms": slowest,
+                "timed_out": timed_out
+            },
+            symbol="SYSTEM",
+            venue="oanda"
+        )
+        if timed_out:
+            self.display.warning(f"⚠️  Scan deadline hit - skipped {', '.join(timed_out)}")
+        
+        return candidates
+    
+    def _quote_board(self):
+        """Streaming quote board, if the pricing stream is running"""
+        return self.oanda.price_stream.board if self.oanda.price_stream else None
+    
+    async def position_police_loop(self, interval_seconds: float = 900):
+        """Position Police sweeps in a worker thread, never blocking scans or trade management"""
+        while self.is_running:
+            await asyncio.sleep(interval_seconds)
+            try:
+                self.display.info("🚓 Position Police sweep starting...")
+                result = await asyncio.to_thread(_rbz_force_min_notional_position_police,
+                                                 session=self.oanda.transport.session,
+                                                 quote_board=self._quote_board(), api_base=self.oanda.api_base,
+                                                 account_id=self.oanda.account_id, token=self.oanda.api_token,
+                                                 account_mirror=self.oanda.account_mirror, fx=self.fx)
+                if result:
+                    self.display.success(
+                        f"✅ Position Police sweep complete ({result['positions_checked']} positions, "
+                        f"{result['violations_closed']}/{result['violations_found']} violations closed, "
+                        f"{result['sweep_ms']:.0f}ms)"
+                    )
+                else:
+                    self.display.success("✅ Position Police sweep complete")
+            except Exception as e:
+                self.display.error(f"❌ Position Police error: {e}")
+    
     async def run_trading_loop(self):
         """Main trading loop (environment-agnostic)"""
         self.is_running = True
@@ -1324,52 +1655,43 @@ class OandaTradingEngine:
         print()
         
         trade_count = 0
-        last_police_sweep = time.time()  # Track last Position Police sweep
         police_sweep_interval = 900  # 15 minutes (M15 charter compliance)
         
         # Start TradeManager background task
         trade_manager_task = asyncio.create_task(self.trade_manager_loop())
+        # AUTOMATED POSITION POLICE SWEEP (every 15 minutes, background task)
+        police_task = asyncio.create_task(self.position_police_loop(police_sweep_interval))
         
         while self.is_running:
             try:
-                # AUTOMATED POSITION POLICE SWEEP (every 15 minutes)
-                current_time = time.time()
-                if current_time - last_police_sweep >= police_sweep_interval:
-                    try:
-                        self.display.info("🚓 Position Police sweep starting...")
-                        _rbz_force_min_notional_position_police()
-                        last_police_sweep = current_time
-                        self.display.success("✅ Position Police sweep complete")
-                    except Exception as e:
-                        self.display.error(f"❌ Position Police error: {e}")
-                
                 # Check existing positions
                 self.check_positions()
                 
                 # Place new trade if we have less than 3 active positions
                 if len(self.active_positions) < 3:
-                    # Deterministic signal scan across configured pairs
+                    # Concurrent scan of all pairs, best confidence wins
                     symbol = None
                     direction = None
-                    for _candidate in self.trading_pairs:
-                        try:
-                            candles = self.oanda.get_historical_data(_candidate, count=120, granularity="M15")
-                            sig, conf = generate_signal(_candidate, candles)  # returns ("BUY"/"SELL", confidence) or (None, 0)
-                        except Exception as e:
-                            self.display.error(f"Signal error for {_candidate}: {e}")
-                            continue
-                        if sig in ("BUY","SELL"):
-                            symbol = _candidate
-                            direction = sig
-                            self.display.success(f"✓ Signal: {symbol} {direction} (confidence: {conf:.1%})")
-                            break
+                    candidates = await self.scan_all_pairs()
+                    if candidates:
+                        best = candidates[0]
+                        symbol = best['pair']
+                        direction = best['signal']
+                        self.display.success(
+                            f"✓ Signal: {symbol} {direction} (confidence: {best['confidence']:.1%}, "
+                            f"best of {len(candidates)})"
+                        )
                     
                     if not symbol or not direction:
                         self.display.warning("No valid signals across pairs - skipping cycle")
                         await asyncio.sleep(self.min_trade_interval)
                         continue
                     
-                    trade_id = self.place_trade(symbol, direction)
+                    if self.async_oanda:
+                        # Order pipeline runs in a worker so trade management keeps reacting
+                        trade_id = await asyncio.to_thread(self.place_trade, symbol, direction)
+                    else:
+                        trade_id = self.place_trade(symbol, direction)
                     
                     if trade_id:
                         trade_count += 1
@@ -1392,11 +1714,20 @@ class OandaTradingEngine:
         
         self.display.section("SESSION COMPLETE")
         self._display_stats()
-        # Cancel trade manager task
+        # Cancel background tasks
         try:
             trade_manager_task.cancel()
+            police_task.cancel()
         except Exception:
             pass
+        if self.async_oanda:
+            await self.async_oanda.close()
+        self.oanda.stop_price_stream()
+        self.oanda.stop_account_mirror()
+        try:
+            self.oanda.indicators.save(self.indicator_state_path)
+        except OSError as e:
+            self.display.warning(f"⚠️  Could not save indicator state: {e}")
 
 
 async def main():
@@ -1408,6 +1739,16 @@ async def main():
                        choices=['practice', 'live'], 
                        default='practice',
                        help='Trading environment (practice=demo, live=real money)')
+    parser.add_argument('--no-stream', action='store_true',
+                       help='Disable the pricing-stream quote board (poll REST pricing instead)')
+    parser.add_argument('--async-io', action='store_true',
+                       help='Use the native asyncio OANDA client (non-blocking scans/trade management)')
+    parser.add_argument('--api-base',
+                       help='OANDA REST base URL override, e.g. http://127.0.0.1:8765 for the local v20 stand-in')
+    parser.add_argument('--stream-base',
+                       help='OANDA streaming base URL override (default: --api-base)')
+    parser.add_argument('--no-account-mirror', action='store_true',
+                       help='Disable the transactions-stream account mirror (poll REST account state instead)')
     
     args = parser.parse_args()
     
@@ -1422,7 +1763,9 @@ async def main():
             return
         print("\n✅ Live trading confirmed. Initializing engine...\n")
     
-    engine = OandaTradingEngine(environment=args.env)
+    engine = OandaTradingEngine(environment=args.env, async_io=args.async_io, stream_prices=not args.no_stream,
+                                api_base=args.api_base, stream_base=args.stream_base,
+                                account_mirror=not args.no_account_mirror)
     await engine.run_trading_loop()
 
 
@@ -1435,7 +1778,7 @@ try:
 except Exception:
     class RickCharter: MIN_NOTIONAL_USD = 15000
 
-def _rbz_usd_notional(instrument: str, units: float, price: float) -> float:
+def _rbz_usd_notional(instrument: str, units: float, price: float, fx=None) -> float:
     try:
         base, quote = instrument.split("_",1)
         u = abs(float(units))
@@ -1444,51 +1787,106 @@ def _rbz_usd_notional(instrument: str, units: float, price: float) -> float:
             return u * p
         if base == "USD":       # e.g., USD_JPY
             return u * 1.0
-        return 0.0              # non-USD crosses (ignored by charter)
+        # crosses (e.g., EUR_GBP): base currency through the FX matrix; 0 (skipped) while it is cold
+        notional = fx.usd_notional(instrument, u) if fx is not None else None
+        return notional or 0.0
     except Exception:
         return 0.0
 
-def _rbz_fetch_price(sess, acct: str, inst: str, tok: str):
-    import requests
+def _rbz_api_base(api_base=None) -> str:
+    # Explicit base (engine's connector), then OANDA_API_BASE, then the practice host
+    return (api_base or os.environ.get("OANDA_API_BASE") or "https://api-fxpractice.oanda.com").rstrip("/")
+
+def _rbz_fetch_prices(sess, acct: str, instruments, tok: str, quote_board=None, api_base=None) -> Dict[str, float]:
+    # Streamed quote board first (no network), then ONE batched REST pricing call for the rest
+    prices: Dict[str, float] = {}
+    missing = []
+    for inst in dict.fromkeys(instruments):
+        quote = quote_board.get(inst) if quote_board is not None else None
+        if quote is not None and quote.ask is not None:
+            prices[inst] = quote.ask
+        else:
+            missing.append(inst)
+    if not missing:
+        return prices
     try:
         r = sess.get(
-            f"https://api-fxpractice.oanda.com/v3/accounts/{acct}/pricing",
+            f"{_rbz_api_base(api_base)}/v3/accounts/{acct}/pricing",
             headers={"Authorization": f"Bearer {tok}"},
-            params={"instruments": inst}, timeout=5,
+            params={"instruments": ",".join(missing)}, timeout=5,
         )
-        return float(r.json()["prices"][0]["closeoutAsk"])
+        for price in r.json().get("prices", []):
+            prices[price["instrument"]] = float(price["closeoutAsk"])
     except Exception:
-        return None
+        pass
+    return prices
+
+def _rbz_fetch_price(sess, acct: str, inst: str, tok: str, quote_board=None, api_base=None):
+    return _rbz_fetch_prices(sess, acct, [inst], tok, quote_board, api_base).get(inst)
 
-def _rbz_force_min_notional_position_police():
+def _rbz_close_position(sess, base: str, acct: str, tok: str, inst: str, side: str) -> bool:
+    # Close entire side
+    payload = {"longUnits":"ALL"} if side=="long" else {"shortUnits":"ALL"}
+    try:
+        close_response = sess.put(
+            f"{base}/v3/accounts/{acct}/positions/{inst}/close",
+            headers={"Authorization": f"Bearer {tok}", "Content-Type":"application/json"},
+            data=json.dumps(payload), timeout=7,
+        )
+        return close_response.status_code == 200
+    except Exception as e:
+        print(f"[RBZ_POLICE] close failed for {inst}: {e}")
+        return False
+
+def _rbz_force_min_notional_position_police(session=None, quote_board=None, api_base=None, max_workers=4,
+                                            account_mirror=None, fx=None, account_id=None, token=None):
     """
     AUTOMATED POSITION POLICE - GATED CHARTER ENFORCEMENT
     Closes any position < MIN_NOTIONAL_USD ($15,000)
-    Runs: (1) On engine startup, (2) Every 15 minutes during trading loop
+    Runs: (1) On engine startup, (2) Every 15 minutes as a background task
+    Uses the caller's pooled session, or the shared transport for api_base
+    (default OANDA_API_BASE or the practice host). An api_base always comes
+    with the account_id/token of the same connector; without them the
+    practice credentials from the environment are used against the
+    practice host (or OANDA_API_BASE) only.
+    Sweep: one openPositions read (from the account mirror when it is in
+    sync), one batched pricing read for positions without an average price
+    (streaming quote board first), then all closes concurrently on a
+    bounded worker pool. Crosses are valued through the FX matrix.
+    Returns the sweep summary.
     PIN: 841921 | IMMUTABLE
     """
-    import os, json, requests
+    import os, json
     from datetime import datetime, timezone
     
     MIN_NOTIONAL = getattr(RickCharter, "MIN_NOTIONAL_USD", 15000)
-    acct = os.environ.get("OANDA_PRACTICE_ACCOUNT_ID") or os.environ.get("OANDA_ACCOUNT_ID")
-    tok  = os.environ.get("OANDA_PRACTICE_TOKEN") or os.environ.get("OANDA_TOKEN")
+    if api_base and not (account_id and token):
+        print('[RBZ_POLICE] skipped (api_base without its account credentials)'); return None
+    if account_id and token:
+        acct, tok = account_id, token
+    else:
+        acct = os.environ.get("OANDA_PRACTICE_ACCOUNT_ID") or os.environ.get("OANDA_ACCOUNT_ID")
+        tok  = os.environ.get("OANDA_PRACTICE_TOKEN") or os.environ.get("OANDA_TOKEN")
     if not acct or not tok:
-        print('[RBZ_POLICE] skipped (no creds)'); return
+        print('[RBZ_POLICE] skipped (no creds)'); return None
 
-    s = requests.Session()
-    violations_found = 0
-    violations_closed = 0
-    
-    # 1) fetch open positions
-    r = s.get(
-        f"https://api-fxpractice.oanda.com/v3/accounts/{acct}/openPositions",
-        headers={"Authorization": f"Bearer {tok}"}, timeout=7,
-    )
+    sweep_start = time.perf_counter()
+    fx = fx or get_fx_matrix()
+    base = _rbz_api_base(api_base)
+    s = session or get_shared_transport(base).session
     
-    positions = r.json().get("positions", [])
+    # 1) open positions: in-process mirror, REST only when it is out of sync
+    if account_mirror is not None and account_mirror.healthy:
+        positions = account_mirror.get_positions()
+    else:
+        r = s.get(
+            f"{base}/v3/accounts/{acct}/openPositions",
+            headers={"Authorization": f"Bearer {tok}"}, timeout=7,
+        )
+        positions = r.json().get("positions", [])
     timestamp = datetime.now(timezone.utc).isoformat()
     
+    held = []
     for pos in positions:
         inst = pos.get("instrument")
         long_u  = float(pos.get("long",{}).get("units","0"))
@@ -1496,13 +1894,19 @@ def _rbz_force_min_notional_position_police():
         net = long_u + short_u
         if net == 0:
             continue
-
         avg = pos.get("long",{}).get("averagePrice") or pos.get("short",{}).get("averagePrice")
-        price = float(avg) if avg else (_rbz_fetch_price(s, acct, inst, tok) or 0.0)
-        notional = _rbz_usd_notional(inst, net, price)
+        held.append((inst, net, float(avg) if avg else None))
+    
+    # 2) one batched pricing request for every position without an average price
+    unpriced = [inst for inst, _, avg in held if avg is None]
+    fetched = _rbz_fetch_prices(s, acct, unpriced, tok, quote_board, base) if unpriced else {}
+    
+    violations = []
+    for inst, net, avg in held:
+        price = avg if avg is not None else (fetched.get(inst) or 0.0)
+        notional = _rbz_usd_notional(inst, net, price, fx)
 
         if 0 < notional < MIN_NOTIONAL:
-            violations_found += 1
             violation_data = {
                 "timestamp": timestamp,
                 "event_type": "CHARTER_VIOLATION",
@@ -1528,53 +1932,57 @@ def _rbz_force_min_notional_position_police():
                 log_narration(**violation_data)
             except:
                 pass  # Narration logger may not be available
-            
-            # Close entire side
-            side = "long" if net > 0 else "short"
-            payload = {"longUnits":"ALL"} if side=="long" else {"shortUnits":"ALL"}
-            close_response = s.put(
-                f"https://api-fxpractice.oanda.com/v3/accounts/{acct}/positions/{inst}/close",
-                headers={"Authorization": f"Bearer {tok}", "Content-Type":"application/json"},
-                data=json.dumps(payload), timeout=7,
-            )
-            
-            if close_response.status_code == 200:
-                violations_closed += 1
-                close_data = {
-                    "timestamp": timestamp,
-                    "event_type": "POSITION_CLOSED",
-                    "action": "CHARTER_ENFORCEMENT_SUCCESS",
-                    "details": {
-                        "instrument": inst,
-                        "reason": "BELOW_MIN_NOTIONAL",
-                        "status": "CLOSED_BY_POSITION_POLICE"
-                    },
-                    "symbol": inst,
-                    "venue": "oanda"
-                }
-                print(json.dumps(close_data))
-                try:
-                    log_narration(**close_data)
-                except:
-                    pass
+            violations.append((inst, "long" if net > 0 else "short"))
     
-    # Summary logging
-    if violations_found > 0:
-        summary = {
+    # 3) close every violation concurrently (bounded pool, one PUT per instrument)
+    closed = []
+    if violations:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(violations))),
+                                thread_name_prefix="rbz-police") as pool:
+            results = pool.map(lambda v: _rbz_close_position(s, base, acct, tok, v[0], v[1]), violations)
+            closed = [inst for (inst, _), ok in zip(violations, results) if ok]
+    
+    for inst in closed:
+        close_data = {
             "timestamp": timestamp,
-            "event_type": "POSITION_POLICE_SUMMARY",
+            "event_type": "POSITION_CLOSED",
+            "action": "CHARTER_ENFORCEMENT_SUCCESS",
             "details": {
-                "violations_found": violations_found,
-                "violations_closed": violations_closed,
-                "enforcement": "GATED_LOGIC_AUTOMATIC",
-                "min_notional_usd": MIN_NOTIONAL
-            }
+                "instrument": inst,
+                "reason": "BELOW_MIN_NOTIONAL",
+                "status": "CLOSED_BY_POSITION_POLICE"
+            },
+            "symbol": inst,
+            "venue": "oanda"
         }
+        print(json.dumps(close_data))
+        try:
+            log_narration(**close_data)
+        except:
+            pass
+    
+    summary = {
+        "timestamp": timestamp,
+        "event_type": "POSITION_POLICE_SUMMARY",
+        "details": {
+            "positions_checked": len(held),
+            "prices_fetched": len(fetched),
+            "violations_found": len(violations),
+            "violations_closed": len(closed),
+            "close_failures": sorted(set(inst for inst, _ in violations) - set(closed)),
+            "sweep_ms": round((time.perf_counter() - sweep_start) * 1000, 1),
+            "enforcement": "GATED_LOGIC_AUTOMATIC",
+            "min_notional_usd": MIN_NOTIONAL
+        }
+    }
+    # Summary logging
+    if violations:
         print(json.dumps(summary))
         try:
             log_narration(**summary)
         except:
             pass
+    return summary["details"]
             
 # ===== /POSITION POLICE =====
 
@@ -22,6 +22,11 @@ from risk.dynamic_leverage import DynamicLeverageCalculator
 from position_manager import get_position_manager
 
 
+# Connector instances reused across manual trades, keyed by (broker, environment).
+# OANDA connectors additionally share one pooled keep-alive transport per API host.
+_CONNECTORS: Dict[tuple, Any] = {}
+
+
 @dataclass
 class ManualTrade:
     symbol: str
@@ -95,6 +100,22 @@ def _import_connector(broker: str):
     raise ImportError(f"Connector not found for broker: {broker}")
 
 
+def _get_connector(pin: int, broker: str, env: str):
+    """Return a cached connector for (broker, env), instantiating it on first use."""
+    key = (broker, env)
+    connector = _CONNECTORS.get(key)
+    if connector is None:
+        ConnectorCls = _import_connector(broker)
+        # Pass pin where supported, and environment if available.
+        try:
+            connector = ConnectorCls(pin=pin, environment=env)
+        except TypeError:
+            # Some connectors may not take environment
+            connector = ConnectorCls(pin=pin)
+        _CONNECTORS[key] = connector
+    return connector
+
+
 def _normalize_symbol(broker: str, symbol: str) -> str:
     """Best-effort normalization for instrument naming per broker.
     Minimal and intentionally conservative; users can pass exact symbols.
@@ -123,15 +144,8 @@ def place_trade(pin: int, trade: ManualTrade) -> Dict[str, Any]:
     mode = _load_active_mode()
     env = _env_for_broker(mode, broker)
 
-    ConnectorCls = _import_connector(broker)
-
-    # Instantiate connector; pass pin where supported, and environment if available.
     try:
-        try:
-            connector = ConnectorCls(pin=pin, environment=env)
-        except TypeError:
-            # Some connectors may not take environment
-            connector = ConnectorCls(pin=pin)
+        connector = _get_connector(pin, broker, env)
     except Exception as e:
         return {"success": False, "error": f"Connector init failed: {e}"}
 
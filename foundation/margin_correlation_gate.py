@@ -74,12 +74,18 @@ class MarginCorrelationGate:
     MIN_R_RATIO_AT_3H = 0.5  # Close if R < 0.5 at 3h
     SCALE_OUT_TARGET_MARGIN_PCT = 0.25  # Scale to 25% if over 35%
 
-    def __init__(self, account_nav: float = 1970.0):
+    MARGIN_RATE = 0.02  # ~50:1 FX margin used for order estimates
+
+    def __init__(self, account_nav: float = 1970.0, fx=None):
         """
         Args:
             account_nav: Net account value in USD
+            fx: Optional FX conversion matrix (data/brokers/fx_matrix.FxMatrix);
+                when given, margin estimates and currency buckets are in USD,
+                so crosses and USD-base pairs are sized correctly
         """
         self.account_nav = account_nav
+        self.fx = fx
         self.max_margin_usd = account_nav * self.MARGIN_CAP_PCT
         logger.info(f"🛡️  Margin & Correlation Gate Initialized")
         logger.info(f"   Account NAV: ${account_nav:,.2f}")
@@ -97,11 +103,19 @@ class MarginCorrelationGate:
             return parts[0], parts[1]
         raise ValueError(f"Invalid symbol: {symbol}")
 
+    def _leg_size(self, symbol: str, units: float) -> float:
+        """Size of each currency leg: USD notional with an FX matrix, else raw units"""
+        if self.fx is not None:
+            notional = self.fx.usd_notional(symbol, units)
+            if notional is not None:
+                return notional
+        return units
+
     def currency_bucket_exposure(
         self, positions: List[Position], orders: List[Order] = None
     ) -> Dict[str, float]:
         """
-        Calculate net exposure by currency (in units).
+        Calculate net exposure by currency (in units, or USD with an FX matrix).
 
         Example:
           Long EUR/CHF 16k  → +EUR 16k, -CHF 16k
@@ -117,16 +131,18 @@ class MarginCorrelationGate:
         for pos in positions:
             base, quote = self.split_symbol(pos.symbol)
             sign = 1 if pos.side.upper() == "LONG" else -1
-            exposure[base] += sign * pos.units
-            exposure[quote] -= sign * pos.units
+            size = self._leg_size(pos.symbol, pos.units)
+            exposure[base] += sign * size
+            exposure[quote] -= sign * size
 
         # Add pending order exposures
         if orders:
             for order in orders:
                 base, quote = self.split_symbol(order.symbol)
                 sign = 1 if order.side.upper() == "BUY" else -1
-                exposure[base] += sign * order.units
-                exposure[quote] -= sign * order.units
+                size = self._leg_size(order.symbol, order.units)
+                exposure[base] += sign * size
+                exposure[quote] -= sign * size
 
         return dict(exposure)
 
@@ -207,7 +223,13 @@ class MarginCorrelationGate:
 
         # New order would exceed
         if new_order:
-            estimated_order_margin = new_order.units * new_order.price * 0.02  # ~2% margin
+            estimated_order_margin = None
+            if self.fx is not None:
+                estimated_order_margin = self.fx.margin_estimate(
+                    new_order.symbol, new_order.units, self.MARGIN_RATE, new_order.price
+                )
+            if estimated_order_margin is None:
+                estimated_order_margin = new_order.units * new_order.price * self.MARGIN_RATE  # ~2% margin
             projected_margin = total_margin_used + estimated_order_margin
             projected_pct = projected_margin / self.account_nav
 
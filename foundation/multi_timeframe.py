@@ -3,36 +3,73 @@
 This wrapper applies a higher-timeframe trend confirmation before allowing
 an underlying strategy's signal to be used for entry. It is intentionally
 lightweight and deterministic-free: all sampling is stochastic-by-default.
+
+HTF candles no longer have to be aggregated by the caller: the shared
+resampler (brokers/htf_resampler.py) builds H1/H4/D bars from the cached
+M15 bars as they close and keeps their trend EMA streaming, so
+htf_trend(instrument) is an O(1) lookup for any instrument and strategy.
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import numpy as np
 
+# Shared indicator kernels and HTF resampler (data/brokers/)
+try:
+    from brokers import indicators
+    from brokers.htf_resampler import get_htf_resampler
+except ImportError:
+    from data.brokers import indicators
+    from data.brokers.htf_resampler import get_htf_resampler
+
 
-def higher_timeframe_trend(candles: Dict[str, Any], period: int = 200) -> bool:
+def higher_timeframe_trend(candles: Dict[str, Any], period: int = 200, state: Optional[Any] = None) -> bool:
     """Very small higher-timeframe trend check: returns True when higher-timeframe
     EMA slope is positive. This function uses the provided candles and does not
-    resample — callers should pass aggregated HTF candles when available.
+    resample — callers should pass aggregated HTF candles, or use htf_trend()
+    for the resampler-built series.
+
+    When a streaming IndicatorState for the HTF series is given
+    (brokers/indicator_state.py, built with trend_period == period) its
+    running EMA is read instead of recomputing over the full history.
     """
+    if state is not None and state.matches(trend_period=period):
+        ema = state.value('trend_ema')
+        if state.bars < period or ema is None:
+            return False
+        return (state.value('close') - ema) > 0
     closes = np.asarray(candles.get('close', []))
     if len(closes) < period:
         # insufficient HTF data: be conservative and require the underlying strategy
         return False
-    # compute a simple EMA-like slope approximation
-    alpha = 2.0 / (period + 1)
-    ema = closes[0]
-    for p in closes[1:]:
-        ema = alpha * p + (1 - alpha) * ema
+    # compute a simple EMA-like slope approximation (alpha EMA seeded with the first close)
+    ema = indicators.ema_first_seeded(closes, period)
     # slope approx: difference between last value and ema
     return (closes[-1] - ema) > 0
 
 
-def wrap_strategy(underlying_fn, candles: Dict[str, Any], htf_candles: Dict[str, Any], config: Dict[str, Any]):
+def htf_trend(instrument: str, granularity: str = 'H4', period: int = 200, resampler: Optional[Any] = None) -> bool:
+    """HTF trend of an instrument from the resampler's streaming state (False until warmed up)"""
+    resampler = resampler if resampler is not None else get_htf_resampler()
+    state = resampler.state(instrument, granularity)
+    if state is None:
+        return False
+    return higher_timeframe_trend({}, period, state=state)
+
+
+def wrap_strategy(underlying_fn, candles: Dict[str, Any], htf_candles: Optional[Dict[str, Any]], config: Dict[str, Any]):
     """Apply higher-timeframe confirmation and return underlying signal or WAIT.
 
     Returns the exact structure of the underlying function when allowed, else a
-    'WAIT' signal dictionary.
+    'WAIT' signal dictionary. config['htf_state'] may carry the streaming
+    IndicatorState of the HTF series in place of recomputing from htf_candles;
+    with config['instrument'] (and optionally 'htf_granularity', default H4)
+    and no htf_candles, the resampler's state for that instrument is used.
     """
-    htf_ok = higher_timeframe_trend(htf_candles, period=config.get('htf_period', 200))
+    period = config.get('htf_period', 200)
+    state = config.get('htf_state')
+    if state is None and htf_candles is None and config.get('instrument'):
+        resampler = config.get('htf_resampler') or get_htf_resampler()
+        state = resampler.state(config['instrument'], config.get('htf_granularity', 'H4'))
+    htf_ok = higher_timeframe_trend(htf_candles or {}, period=period, state=state)
     if not htf_ok:
         return {'signal': 'WAIT', 'reason': 'HTF trend not confirmed'}
 
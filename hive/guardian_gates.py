@@ -26,6 +26,8 @@ GATE EXECUTION SEQUENCE:
   
   3. Correlation Guard (Gate 3)
      └─ Check: No same-side USD exposure
+     └─ Check: No open position whose measured return correlation
+        makes it the same bet (|rho| >= 0.7 in the same direction)
      └─ If FAIL → Stop, return false
   
   4. Crypto Consensus Gate (Gate 4 - Crypto only)
@@ -88,6 +90,7 @@ COMPLETE DOCUMENTATION IN:
 """
 
 import os
+import sys
 import json
 import logging
 from datetime import datetime, timezone
@@ -118,10 +121,15 @@ class GuardianGates:
     All gates must pass (AND logic) before order placement
     """
     
-    def __init__(self, pin: int = 841921):
-        if str(pin) != RickCharter.CHARTER_PIN:
+    # Measured correlation at which an open position counts as the same bet
+    CORRELATION_LIMIT = 0.70
+
+    def __init__(self, pin: int = 841921, correlations=None):
+        if str(pin) != str(RickCharter.PIN):
             raise PermissionError("Invalid PIN for GuardianGates")
         
+        # Rolling correlation engine; defaults to the one a connector is running
+        self.correlations = correlations
         self.logger = logging.getLogger(__name__)
         self.logger.info("Guardian Gates initialized with PIN verification")
     
@@ -212,7 +220,7 @@ class GuardianGates:
             
             # Check if both involve USD and same direction
             if any(usd in pos_symbol for usd in usd_pairs) and any(usd in symbol for usd in usd_pairs):
-                if pos_side == side:
+                if str(pos_side).lower() == str(side).lower():
                     same_side_exposure += abs(float(pos.get('units', 0)))
         
         # Block if significant same-side USD exposure exists
@@ -224,6 +232,25 @@ class GuardianGates:
                 {"exposure": same_side_exposure, "side": side}
             )
         
+        # Measured correlations: a long on a pair moving with an open long
+        # (or against an open short) doubles the same exposure
+        engine = self.correlations if self.correlations is not None else _running_correlation_engine()
+        if engine is not None and positions:
+            measured = engine.correlations_of(symbol)
+            for pos in positions:
+                rho = measured.get(pos.get('symbol', ''))
+                if rho is None:
+                    continue
+                same_side = str(pos.get('side', '')).lower() == str(side).lower()
+                effective = rho if same_side else -rho
+                if effective >= self.CORRELATION_LIMIT:
+                    return GateResult(
+                        "correlation",
+                        False,
+                        f"Correlated exposure: {symbol} vs open {pos.get('symbol')} rho={rho:.2f}",
+                        {"position": pos.get('symbol'), "correlation": rho, "side": side}
+                    )
+        
         return GateResult("correlation", True, "No correlated USD exposure")
     
     def _gate_crypto(self, signal: Dict) -> GateResult:
@@ -273,31 +300,62 @@ def _get_guardian(pin: int = 841921) -> GuardianGates:
     return _guardian_singleton
 
 
+def _running_account_mirror():
+    """OANDA account mirror started by a connector in this process, if any.
+
+    Looked up in sys.modules so the gates never import broker code
+    themselves (the module is loaded as brokers.* or data.brokers.*
+    depending on the entry point).
+    """
+    for module_name in ("brokers.oanda_account_mirror", "data.brokers.oanda_account_mirror"):
+        module = sys.modules.get(module_name)
+        mirror = module.get_account_mirror() if module is not None else None
+        if mirror is not None:
+            return mirror
+    return None
+
+
+def _running_correlation_engine():
+    """Rolling correlation engine started by a connector in this process, if any"""
+    for module_name in ("brokers.correlation_engine", "data.brokers.correlation_engine"):
+        module = sys.modules.get(module_name)
+        engine = module.running_correlation_engine() if module is not None else None
+        if engine is not None:
+            return engine
+    return None
+
+
 def apply_all_gates(*, symbol: str, direction: str, size: float, broker: str) -> Tuple[bool, str]:
     """Convenience wrapper used by orchestration/autonomous_controller.
 
     It adapts the richer GuardianGates.validate_all interface to a
     simple (bool, reason) tuple while pulling minimal account/position
-    context from the position manager. All risk limits (margin,
+    context from the OANDA account mirror when one is running and in
+    sync, otherwise from the position manager. All risk limits (margin,
     positions, correlation, crypto consensus) are still enforced by the
     underlying GuardianGates implementation.
     """
-    try:
-        from position_manager import get_position_manager  # local import to avoid cycles
-    except Exception:
-        # If we cannot introspect positions/account, fail closed.
-        return False, "Position manager unavailable for guardian gates"
-
-    pm = get_position_manager()
-    try:
-        account = pm.get_account_snapshot()  # type: ignore[attr-defined]
-    except Exception:
-        account = {"nav": 0.0, "margin_used": 0.0}
-
-    try:
-        positions = pm.get_open_positions()  # type: ignore[attr-defined]
-    except Exception:
-        positions = []
+    mirror = _running_account_mirror() if broker.lower() == "oanda" else None
+    if mirror is not None and mirror.healthy:
+        account = mirror.gate_account()
+        positions = mirror.gate_positions()
+    else:
+        try:
+            from position_manager import get_position_manager  # local import to avoid cycles
+        except Exception:
+            # If we cannot introspect positions/account, fail closed.
+            return False, "Position manager unavailable for guardian gates"
+
+        pm = get_position_manager()
+        try:
+            account = pm.get_account_snapshot()  # type: ignore[attr-defined]
+        except Exception:
+            account = {"nav": 0.0, "margin_used": 0.0}
+
+        try:
+            positions = pm.get_open_positions()  # type: ignore[attr-defined]
+        except Exception:
+            positions = []
 
     signal = {
         "symbol": symbol,
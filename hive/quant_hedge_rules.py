@@ -152,7 +152,7 @@ import numpy as np
 import logging
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 from datetime import datetime, timezone
@@ -162,6 +162,16 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from foundation.rick_charter import RickCharter
 from logic.regime_detector import StochasticRegimeDetector, MarketRegime
 
+# Per-bar feature store shared with the regime detector, leverage and filter modules
+try:
+    from brokers.feature_store import get_feature_store, return_volatility, trend_strength
+    from brokers.correlation_engine import get_correlation_engine
+    from brokers.oanda_account_mirror import get_account_mirror
+except ImportError:
+    from data.brokers.feature_store import get_feature_store, return_volatility, trend_strength
+    from data.brokers.correlation_engine import get_correlation_engine
+    from data.brokers.oanda_account_mirror import get_account_mirror
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -236,12 +246,18 @@ class QuantHedgeRules:
     Evaluates market conditions and provides positioning recommendations
     """
     
-    def __init__(self, pin: int = 841921):
+    def __init__(self, pin: int = 841921, features: Any = None, correlations: Any = None, mirror: Any = None):
         if not RickCharter.validate_pin(pin):
             raise PermissionError("Invalid PIN for QuantHedgeRules")
         
         self.pin_verified = True
-        self.regime_detector = StochasticRegimeDetector(pin=pin)
+        # Per-bar feature store (brokers/feature_store.py), shared process-wide by default
+        self.features = features if features is not None else get_feature_store()
+        self.regime_detector = StochasticRegimeDetector(pin=pin, features=self.features)
+        # Rolling return correlations across instruments (brokers/correlation_engine.py)
+        self.correlations = correlations if correlations is not None else get_correlation_engine()
+        # Open positions (brokers/oanda_account_mirror.py); the running mirror when not given
+        self.mirror = mirror
         self.logger = logger
         
         # Condition thresholds
@@ -271,7 +287,10 @@ class QuantHedgeRules:
         margin_used: float,
         open_positions: int,
         correlation_matrix: Dict[str, float] = None,
-        lookback_periods: int = 50
+        lookback_periods: int = 50,
+        symbol: Optional[str] = None,
+        granularity: str = "M15",
+        bar_time: Any = None
     ) -> QuantHedgeAnalysis:
         """
         Comprehensive multi-condition analysis
@@ -282,8 +301,13 @@ class QuantHedgeRules:
             account_nav: Net asset value
             margin_used: Current margin utilization $
             open_positions: Number of open positions
-            correlation_matrix: Dict of symbol correlations
+            correlation_matrix: Dict of symbol correlations; when None and a
+                symbol is given, its live rolling correlations with the
+                instruments of open positions are used (none without a mirror)
             lookback_periods: Historical periods to analyze
+            symbol, granularity, bar_time: Instrument and last closed bar the
+                arrays end on; when given, volatility, trend, volume profile
+                and regime are shared per bar with the other consumers
             
         Returns:
             QuantHedgeAnalysis with recommendations
@@ -294,25 +318,27 @@ class QuantHedgeRules:
         condition_scores = {}
         
         # CONDITION 1: Volatility Analysis
-        volatility = self._calculate_volatility(prices)
+        volatility = self.features.volatility(prices, symbol, granularity, bar_time) * np.sqrt(252)  # Annualize
         vol_level = self._classify_volatility(volatility)
         vol_condition = self._evaluate_volatility_condition(volatility, vol_level)
         conditions.append(vol_condition)
         condition_scores['volatility'] = self._score_volatility(vol_level)
         
         # CONDITION 2: Trend Strength
-        trend = self._calculate_trend(prices)
+        trend = self.features.trend_strength(prices, symbol, granularity, bar_time)
         trend_condition = self._evaluate_trend_condition(trend)
         conditions.append(trend_condition)
         condition_scores['trend_strength'] = self._score_trend(trend)
         
         # CONDITION 3: Correlation Risk
+        if correlation_matrix is None and symbol:
+            correlation_matrix = self._open_position_correlations(symbol)
         corr_condition = self._evaluate_correlation_condition(correlation_matrix)
         conditions.append(corr_condition)
         condition_scores['correlation'] = self._score_correlation(corr_condition)
         
         # CONDITION 4: Volume Analysis
-        vol_analysis = self._analyze_volume(volume)
+        vol_analysis = self._analyze_volume(volume, symbol, granularity, bar_time)
         volume_condition = self._evaluate_volume_condition(vol_analysis)
         conditions.append(volume_condition)
         condition_scores['volume'] = self._score_volume(volume_condition)
@@ -330,7 +356,7 @@ class QuantHedgeRules:
         )
         
         # Detect regime
-        regime_data = self.regime_detector.detect_regime(prices)
+        regime_data = self.regime_detector.detect_regime(prices, symbol or "UNKNOWN", granularity, bar_time)
         regime = regime_data.regime.value if regime_data else "triage"
         
         # Generate hedge recommendation
@@ -390,8 +416,7 @@ class QuantHedgeRules:
         """Calculate annualized volatility"""
         if len(prices) < 2:
             return 0.0
-        returns = np.diff(prices) / prices[:-1]
-        return np.std(returns) * np.sqrt(252)  # Annualize
+        return return_volatility(prices) * np.sqrt(252)  # Annualize
     
     def _classify_volatility(self, volatility: float) -> str:
         """Classify volatility into levels"""
@@ -432,9 +457,7 @@ class QuantHedgeRules:
         """Calculate trend strength (-1 to 1)"""
         if len(prices) < 2:
             return 0.0
-        x = np.arange(len(prices))
-        slope, _ = np.polyfit(x, prices, 1)
-        return slope / np.mean(prices)
+        return float(trend_strength(prices))
     
     def _evaluate_trend_condition(self, trend: float) -> HedgeCondition:
         """Evaluate trend condition"""
@@ -466,6 +489,15 @@ class QuantHedgeRules:
             details={'trend_type': trend_type, 'trend_direction': 'UP' if trend > 0 else 'DOWN'}
         )
     
+    def _open_position_correlations(self, symbol: str) -> Optional[Dict[str, float]]:
+        """Live correlations of symbol with the instruments currently held"""
+        mirror = self.mirror if self.mirror is not None else get_account_mirror()
+        if mirror is None:
+            return None
+        held = {pos['symbol'] for pos in mirror.gate_positions()}
+        measured = self.correlations.correlations_of(symbol)
+        return {other: rho for other, rho in measured.items() if other in held}
+    
     def _evaluate_correlation_condition(self, correlation_matrix: Dict = None) -> HedgeCondition:
         """Evaluate correlation risk"""
         if correlation_matrix is None or len(correlation_matrix) == 0:
@@ -496,13 +528,15 @@ class QuantHedgeRules:
             details={'high_correlation_pairs': len(high_corrs) if correlation_matrix else 0}
         )
     
-    def _analyze_volume(self, volume: np.ndarray) -> Dict:
+    def _analyze_volume(self, volume: np.ndarray, symbol: Optional[str] = None, granularity: str = "M15",
+                        bar_time: Any = None) -> Dict:
         """Analyze volume trends"""
         if len(volume) < 20:
             return {'trend': 'insufficient_data', 'ma_ratio': 1.0}
         
-        recent_vol = np.mean(volume[-5:])
-        ma_vol = np.mean(volume[-20:])
+        profile = self.features.volume_profile(volume, symbol, granularity, bar_time)
+        recent_vol = profile['recent_mean']
+        ma_vol = profile['baseline_mean']
         ratio = recent_vol / ma_vol if ma_vol > 0 else 1.0
         
         if ratio > 1.5:
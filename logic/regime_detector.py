@@ -2,6 +2,13 @@
 """
 Stochastic Regime Detector - RBOTzilla UNI Phase 5
 Market regime classification using volatility and trend analysis.
+
+- detect_regimes() classifies a (symbols x bars) panel and rolling_regimes()
+  every bar of a long history in one vectorized pass (O(n) in bars)
+- Noise comes from the detector's own RNG (seed= for reproducible runs);
+  deterministic=True drops it for backtests
+- Volatility and trend for a named symbol's closed bar come from the
+  shared per-bar feature store (brokers/feature_store.py)
 PIN: 841921 | Generated: 2025-09-26
 """
 
@@ -10,7 +17,14 @@ import logging
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
-from datetime import datetime, timezone
+
+# Per-bar result memo and feature store (data/brokers/)
+try:
+    from brokers.bar_memo import closed_bar_time, config_hash, get_bar_memo, settings
+    from brokers.feature_store import get_feature_store, return_volatility, trend_strength
+except ImportError:
+    from data.brokers.bar_memo import closed_bar_time, config_hash, get_bar_memo, settings
+    from data.brokers.feature_store import get_feature_store, return_volatility, trend_strength
 
 class MarketRegime(Enum):
     BULL = "bull"
@@ -19,6 +33,12 @@ class MarketRegime(Enum):
     CRASH = "crash"
     TRIAGE = "triage"
 
+# Column order of batch probability matrices (the order detect_regime reports them in)
+REGIME_ORDER = (MarketRegime.BULL, MarketRegime.BEAR, MarketRegime.SIDEWAYS, MarketRegime.CRASH, MarketRegime.TRIAGE)
+
+# Bars per block of rolling cumulative sums; keeps the sums small so long histories keep precision
+_ROLLING_BLOCK = 4096
+
 @dataclass
 class RegimeData:
     regime: MarketRegime
@@ -27,70 +47,184 @@ class RegimeData:
     trend_strength: float
     regime_probabilities: Dict[str, float]
 
+@dataclass
+class RegimeBatch:
+    """Regimes for many symbols or bars; batch[i] is row i as RegimeData"""
+    regimes: List[MarketRegime]
+    confidence: np.ndarray
+    volatility: np.ndarray
+    trend_strength: np.ndarray
+    probabilities: np.ndarray  # (rows x regimes), columns in REGIME_ORDER
+    
+    def __len__(self) -> int:
+        return len(self.regimes)
+    
+    def __getitem__(self, i: int) -> RegimeData:
+        return RegimeData(
+            regime=self.regimes[i],
+            confidence=float(self.confidence[i]),
+            volatility=float(self.volatility[i]),
+            trend_strength=float(self.trend_strength[i]),
+            regime_probabilities={r.value: float(p) for r, p in zip(REGIME_ORDER, self.probabilities[i])}
+        )
+
+def _window_sums(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Sum of values[start:end] for each (start, end) pair from one cumulative sum"""
+    totals = np.concatenate(([0.0], np.cumsum(values)))
+    return totals[ends] - totals[starts]
+
 class StochasticRegimeDetector:
-    def __init__(self, pin: int = None):
+    def __init__(self, pin: int = None, memo: Any = None, seed: Optional[int] = None,
+                 deterministic: bool = False, features: Any = None):
         if pin and pin != 841921:
             raise PermissionError("Invalid PIN")
         self.lookback_period = 50
+        self.min_bars = 10
+        # Softmax score noise; deterministic=True turns it off
+        self.noise_std = 0.05
+        self.deterministic = deterministic
+        self._rng = np.random.default_rng(seed)
+        # Per-bar memo (brokers/bar_memo.py), shared process-wide by default
+        self.memo = memo if memo is not None else get_bar_memo()
+        # Per-bar feature store (brokers/feature_store.py), shared process-wide by default
+        self.features = features if features is not None else get_feature_store()
         
     def _calculate_volatility(self, prices: np.ndarray) -> float:
         """Calculate rolling volatility using standard deviation"""
         if len(prices) < 2:
             return 0.0
-        returns = np.diff(prices) / prices[:-1]
-        return np.std(returns) * np.sqrt(252)  # Annualized
+        return return_volatility(prices) * np.sqrt(252)  # Annualized
         
     def _calculate_trend_strength(self, prices: np.ndarray) -> float:
         """Calculate trend using linear regression slope"""
         if len(prices) < 2:
             return 0.0
-        x = np.arange(len(prices))
-        slope, _ = np.polyfit(x, prices, 1)
-        return slope / np.mean(prices)
+        return float(trend_strength(prices))
         
     def _calculate_regime_probabilities(self, vol: float, trend: float) -> Dict[str, float]:
         """Calculate regime probabilities using softmax"""
-        # Base scores for each regime
-        scores = {}
+        probabilities = self._regime_probabilities(np.array([vol]), np.array([trend]))[0]
+        return {regime.value: float(p) for regime, p in zip(REGIME_ORDER, probabilities)}
+    
+    def _regime_probabilities(self, vol: np.ndarray, trend: np.ndarray) -> np.ndarray:
+        """Softmax regime probabilities for arrays of volatility/trend; columns in REGIME_ORDER"""
+        scores = np.empty(vol.shape + (len(REGIME_ORDER),))
         
         # Bull: positive trend, controlled volatility
-        scores[MarketRegime.BULL.value] = max(0, trend * 10) * max(0.1, 1.0 - vol * 5)
+        scores[..., 0] = np.maximum(0, trend * 10) * np.maximum(0.1, 1.0 - vol * 5)
         
         # Bear: negative trend
-        scores[MarketRegime.BEAR.value] = max(0, -trend * 10) * min(2.0, 1.0 + vol * 2)
+        scores[..., 1] = np.maximum(0, -trend * 10) * np.minimum(2.0, 1.0 + vol * 2)
         
         # Sideways: low trend, low vol
-        scores[MarketRegime.SIDEWAYS.value] = max(0, 1.0 - abs(trend) * 20) * max(0.1, 1.0 - vol * 10)
+        scores[..., 2] = np.maximum(0, 1.0 - np.abs(trend) * 20) * np.maximum(0.1, 1.0 - vol * 10)
         
         # Crash: extreme negative trend + high vol
-        if trend < -0.02 and vol > 0.05:
-            scores[MarketRegime.CRASH.value] = (-trend * 20) * (vol * 10)
-        else:
-            scores[MarketRegime.CRASH.value] = 0.1
-            
+        scores[..., 3] = np.where((trend < -0.02) & (vol > 0.05), (-trend * 20) * (vol * 10), 0.1)
+        
         # Triage: uncertainty baseline
-        scores[MarketRegime.TRIAGE.value] = 1.0
-        if vol > 0.03:
-            scores[MarketRegime.TRIAGE.value] *= 1.5
-            
-        # Add stochastic noise
-        np.random.seed(int(datetime.now().timestamp() * 1000) % 2**32)
-        noise = np.random.normal(0, 0.05, len(scores))
+        scores[..., 4] = np.where(vol > 0.03, 1.5, 1.0)
         
-        score_values = np.array(list(scores.values())) + noise
+        # Add stochastic noise
+        if not self.deterministic:
+            scores += self._rng.normal(0, self.noise_std, scores.shape)
         
         # Softmax conversion
-        exp_scores = np.exp(score_values - np.max(score_values))
-        probabilities = exp_scores / np.sum(exp_scores)
+        exp_scores = np.exp(scores - scores.max(axis=-1, keepdims=True))
+        return exp_scores / exp_scores.sum(axis=-1, keepdims=True)
+    
+    def _batch(self, volatility: np.ndarray, trend: np.ndarray, ready: np.ndarray) -> RegimeBatch:
+        """RegimeBatch for metric arrays; rows that are not ready get the short-history TRIAGE result"""
+        probabilities = self._regime_probabilities(volatility, trend)
+        probabilities[~ready] = 1.0 / len(MarketRegime)
+        best = probabilities.argmax(axis=-1)
+        confidence = np.where(ready, probabilities[np.arange(len(best)), best], 0.3)
+        regimes = [REGIME_ORDER[b] if r else MarketRegime.TRIAGE for b, r in zip(best, ready)]
+        return RegimeBatch(
+            regimes=regimes,
+            confidence=confidence,
+            volatility=np.where(ready, volatility, 0.0),
+            trend_strength=np.where(ready, trend, 0.0),
+            probabilities=probabilities
+        )
+    
+    def detect_regimes(self, price_panel: Any) -> RegimeBatch:
+        """
+        Regime of every row of a (symbols x bars) close-price panel, each as
+        detect_regime would classify that row, in one vectorized pass
+        """
+        prices = np.atleast_2d(np.asarray(price_panel, dtype=float))
+        windows = prices[:, -self.lookback_period:]
+        ready = np.full(len(prices), prices.shape[1] >= self.min_bars)
+        if not ready.any():
+            return self._batch(np.zeros(len(prices)), np.zeros(len(prices)), ready)
+        volatility = return_volatility(windows) * np.sqrt(252)
+        return self._batch(volatility, trend_strength(windows), ready)
+    
+    def rolling_regimes(self, prices: Any) -> RegimeBatch:
+        """
+        Regime at every bar of a price history: row t is what detect_regime
+        gives for prices[:t + 1]
         
-        regime_names = list(scores.keys())
-        return {regime_names[i]: float(probabilities[i]) for i in range(len(regime_names))}
+        Window sums come from running sums, so the whole history costs O(n)
+        however long the lookback; backtests get the regime for every bar.
+        """
+        y = np.asarray(getattr(prices, "close", prices), dtype=float)
+        bars, lookback = len(y), self.lookback_period
+        volatility, trend = np.zeros(bars), np.zeros(bars)
+        for block in range(0, bars, _ROLLING_BLOCK):
+            stop = min(bars, block + _ROLLING_BLOCK)
+            origin = max(0, block - lookback + 1)
+            segment = y[origin:stop]
+            
+            # Window [starts, ends) in segment positions for each bar of the block
+            ends = np.arange(block, stop) - origin + 1
+            starts = np.maximum(0, ends - lookback)
+            counts = ends - starts
+            
+            # Regression slope: sum((k - mean k) * y) / sum((k - mean k)^2) on first-bar-centred prices
+            centred = segment - segment[0]
+            position = np.arange(len(segment))
+            sum_y = _window_sums(centred, starts, ends)
+            sum_ky = _window_sums(position * centred, starts, ends)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                slope = (sum_ky - (starts + ends - 1) / 2 * sum_y) / (counts * (counts ** 2 - 1) / 12)
+                trend[block:stop] = slope / (sum_y / counts + segment[0])
+            
+            # Population std of the window's returns
+            returns = np.diff(segment) / segment[:-1]
+            n_returns = np.maximum(counts - 1, 1)
+            mean = _window_sums(returns, starts, ends - 1) / n_returns
+            square = _window_sums(returns * returns, starts, ends - 1) / n_returns
+            volatility[block:stop] = np.sqrt(np.maximum(square - mean * mean, 0.0)) * np.sqrt(252)
+        
+        ready = np.arange(bars) + 1 >= self.min_bars
+        return self._batch(volatility, np.where(ready, trend, 0.0), ready)
+        
+    def detect_regime(self, prices: Any, symbol: str = "UNKNOWN", granularity: str = "M15",
+                      bar_time: Any = None) -> RegimeData:
+        """Main regime detection function
         
-    def detect_regime(self, prices: List[float], symbol: str = "UNKNOWN") -> RegimeData:
-        """Main regime detection function"""
-        price_array = np.array(prices, dtype=float)
+        prices: close prices (list/array) or a CandleFrame, whose close
+        column is used as-is without re-parsing
+        
+        For a named symbol whose last closed bar is known (bar_time, or a
+        CandleFrame ending on a complete bar) the result is memoized until
+        the next bar closes, so every caller within a bar sees one regime
+        """
+        bar_time = closed_bar_time(prices, bar_time)
+        if symbol == "UNKNOWN" or bar_time is None:
+            return self._detect_regime(prices)
+        return self.memo.get_or_compute(
+            "regime", symbol, granularity, bar_time, config_hash(settings(self)),
+            lambda: self._detect_regime(prices, symbol, granularity, bar_time)
+        )
+    
+    def _detect_regime(self, prices: Any, symbol: Optional[str] = None, granularity: str = "M15",
+                       bar_time: Any = None) -> RegimeData:
+        price_array = np.asarray(getattr(prices, "close", prices), dtype=float)
         
-        if len(price_array) < 10:
+        if len(price_array) < self.min_bars:
             return RegimeData(
                 regime=MarketRegime.TRIAGE,
                 confidence=0.3,
@@ -102,12 +236,12 @@ class StochasticRegimeDetector:
         # Use recent data for analysis
         analysis_prices = price_array[-self.lookback_period:] if len(price_array) > self.lookback_period else price_array
         
-        # Calculate metrics
-        volatility = self._calculate_volatility(analysis_prices)
-        trend_strength = self._calculate_trend_strength(analysis_prices)
+        # Calculate metrics (shared per closed bar through the feature store)
+        volatility = self.features.volatility(analysis_prices, symbol, granularity, bar_time) * np.sqrt(252)
+        trend = self.features.trend_strength(analysis_prices, symbol, granularity, bar_time)
         
         # Get probabilities
-        regime_probs = self._calculate_regime_probabilities(volatility, trend_strength)
+        regime_probs = self._calculate_regime_probabilities(volatility, trend)
         
         # Select highest probability regime
         best_regime_name = max(regime_probs.keys(), key=lambda k: regime_probs[k])
@@ -118,11 +252,11 @@ class StochasticRegimeDetector:
             regime=best_regime,
             confidence=confidence,
             volatility=volatility,
-            trend_strength=trend_strength,
+            trend_strength=trend,
             regime_probabilities=regime_probs
         )
 
-def detect_market_regime(prices: List[float], symbol: str = "UNKNOWN") -> Dict[str, Any]:
+def detect_market_regime(prices: Any, symbol: str = "UNKNOWN") -> Dict[str, Any]:
     """Convenience function matching required format"""
     detector = StochasticRegimeDetector(pin=841921)
     result = detector.detect_regime(prices, symbol)
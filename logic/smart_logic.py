@@ -21,6 +21,16 @@ from enum import Enum
 from datetime import datetime, timezone
 import json
 
+# Shared indicator kernels, per-bar result memo and feature store (data/brokers/)
+try:
+    from brokers import indicators
+    from brokers.bar_memo import closed_bar_time, config_hash, get_bar_memo, settings
+    from brokers.feature_store import get_feature_store, volume_profile
+except ImportError:
+    from data.brokers import indicators
+    from data.brokers.bar_memo import closed_bar_time, config_hash, get_bar_memo, settings
+    from data.brokers.feature_store import get_feature_store, volume_profile
+
 # Simplified charter constants for testing
 class RickCharter:
     MIN_RISK_REWARD_RATIO = 3.0
@@ -92,8 +102,16 @@ class SmartLogicFilter:
     Enforces RICK Charter compliance with weighted filter system
     """
     
-    def __init__(self, pin: int = None):
-        """Initialize smart logic filter system"""
+    def __init__(self, pin: int = None, memo: Any = None, features: Any = None):
+        """
+        Initialize smart logic filter system
+        
+        memo: per-bar result memo (brokers/bar_memo.py); defaults to the
+        process-wide one so every caller validating a symbol within a bar
+        shares the filter scores
+        features: per-bar feature store (brokers/feature_store.py); defaults
+        to the process-wide one, serving the volume profile
+        """
         if pin and not RickCharter.validate_pin(pin):
             raise PermissionError("Invalid PIN for SmartLogicFilter access")
         
@@ -117,6 +135,9 @@ class SmartLogicFilter:
         # Fibonacci levels for confluence
         self.fib_levels = [0.236, 0.382, 0.5, 0.618, 0.786, 1.0, 1.618, 2.618]
         
+        self.memo = memo if memo is not None else get_bar_memo()
+        self.features = features if features is not None else get_feature_store()
+        
         self.logger.info("SmartLogicFilter initialized with charter enforcement")
     
     def _validate_risk_reward(self, signal_dict: Dict[str, Any]) -> FilterScore:
@@ -185,59 +206,82 @@ class SmartLogicFilter:
             details={"calculated_rr": rr_ratio, "excess_ratio": excess_ratio}
         )
     
+    @staticmethod
+    def _group_by_length(signals: List[Dict[str, Any]], members: List[int], *keys: str) -> Dict[Tuple[int, ...], List[int]]:
+        """Positions of `members` grouped by the lengths of their `keys` histories"""
+        groups: Dict[Tuple[int, ...], List[int]] = {}
+        for i in members:
+            groups.setdefault(tuple(len(signals[i].get(key, [])) for key in keys), []).append(i)
+        return groups
+    
+    @staticmethod
+    def _stack(signals: List[Dict[str, Any]], key: str, width: Optional[int] = None) -> np.ndarray:
+        """(candidates x bars) float array of signal[key][:width] for equal-length histories"""
+        return np.array([indicators.as_array(signal[key])[:width] for signal in signals], dtype=np.float64)
+    
     def _validate_fvg_confluence(self, signal_dict: Dict[str, Any]) -> FilterScore:
         """
         Fair Value Gap confluence validation
         Simulates FVG detection and alignment with signal direction
         """
-        entry_price = signal_dict.get("entry_price", 0)
-        direction = signal_dict.get("direction", "buy").lower()
-        high_prices = signal_dict.get("recent_highs", [])
-        low_prices = signal_dict.get("recent_lows", [])
-        close_prices = signal_dict.get("recent_closes", [])
-        
-        if not entry_price or len(high_prices) < 3:
-            return FilterScore(
-                filter_name="fvg_confluence",
-                passed=False,
-                score=0.3,  # Neutral score for insufficient data
-                weight=self.filter_weights["fvg_confluence"],
-                reason="Insufficient price data for FVG analysis",
-                details={"data_points": len(high_prices)}
-            )
-        
-        # Simulate FVG detection (simplified)
-        # In reality, this would analyze 3-candle patterns for gaps
-        fvg_zones = []
-        
-        # Look for potential FVG zones in recent price action
-        for i in range(len(high_prices) - 2):
-            candle1_high = high_prices[i]
-            candle1_low = low_prices[i]
-            candle2_high = high_prices[i + 1]  
-            candle2_low = low_prices[i + 1]
-            candle3_high = high_prices[i + 2]
-            candle3_low = low_prices[i + 2]
+        return self._fvg_scores([signal_dict])[0]
+    
+    def _fvg_scores(self, signals: List[Dict[str, Any]]) -> List[FilterScore]:
+        """FVG confluence for each signal, gaps found with array masks per history length"""
+        scores: List[Optional[FilterScore]] = [None] * len(signals)
+        members = []
+        for i, signal in enumerate(signals):
+            high_prices = signal.get("recent_highs", [])
+            if not signal.get("entry_price", 0) or len(high_prices) < 3:
+                scores[i] = FilterScore(
+                    filter_name="fvg_confluence",
+                    passed=False,
+                    score=0.3,  # Neutral score for insufficient data
+                    weight=self.filter_weights["fvg_confluence"],
+                    reason="Insufficient price data for FVG analysis",
+                    details={"data_points": len(high_prices)}
+                )
+            else:
+                members.append(i)
+        
+        for (n_highs, n_lows), positions in self._group_by_length(signals, members, "recent_highs", "recent_lows").items():
+            if n_lows < n_highs:
+                raise IndexError("recent_lows is shorter than recent_highs")
+            group = [signals[i] for i in positions]
+            highs = self._stack(group, "recent_highs")
+            lows = self._stack(group, "recent_lows", n_highs)
+            entry = np.array([float(signal["entry_price"]) for signal in group])[:, None]
+            directions = [signal.get("direction", "buy").lower() for signal in group]
+            is_buy = np.array([d in ["buy", "long"] for d in directions])[:, None]
+            is_sell = np.array([d in ["sell", "short"] for d in directions])[:, None]
             
-            # Bullish FVG: candle1_low > candle3_high (gap up)
-            if candle1_low > candle3_high:
-                fvg_zones.append({
-                    "type": "bullish",
-                    "upper": candle1_low,
-                    "lower": candle3_high,
-                    "strength": (candle1_low - candle3_high) / entry_price
-                })
+            # Candle i against candle i+2: bullish gap up (candle1_low > candle3_high)
+            # or bearish gap down (candle1_high < candle3_low)
+            bullish = lows[:, :-2] > highs[:, 2:]
+            bearish = highs[:, :-2] < lows[:, 2:]
+            upper = np.where(bullish, lows[:, :-2], lows[:, 2:])
+            lower = np.where(bullish, highs[:, 2:], highs[:, :-2])
+            strength = (upper - lower) / entry
             
-            # Bearish FVG: candle1_high < candle3_low (gap down)
-            if candle1_high < candle3_low:
-                fvg_zones.append({
-                    "type": "bearish", 
-                    "upper": candle3_low,
-                    "lower": candle1_high,
-                    "strength": (candle3_low - candle1_high) / entry_price
-                })
-        
-        if not fvg_zones:
+            # Zones that contain the entry and match the signal direction
+            aligned = ((bullish & is_buy) | (bearish & is_sell)) & (lower <= entry) & (entry <= upper)
+            zone_counts = (bullish | bearish).sum(axis=1)
+            aligned_counts = aligned.sum(axis=1)
+            strongest = np.where(aligned, strength, -np.inf).argmax(axis=1)
+            
+            for row, i in enumerate(positions):
+                column = strongest[row]
+                scores[i] = self._fvg_score(
+                    int(zone_counts[row]),
+                    int(aligned_counts[row]),
+                    "bullish" if bullish[row, column] else "bearish",
+                    float(strength[row, column])
+                )
+        return scores
+    
+    def _fvg_score(self, zone_count: int, aligned_count: int, zone_type: str, strength: float) -> FilterScore:
+        """Score FVG confluence from the zone counts and the strongest aligned zone"""
+        if not zone_count:
             return FilterScore(
                 filter_name="fvg_confluence",
                 passed=False,
@@ -247,39 +291,26 @@ class SmartLogicFilter:
                 details={"zones_found": 0}
             )
         
-        # Check alignment with signal direction
-        aligned_zones = []
-        for zone in fvg_zones:
-            zone_contains_entry = zone["lower"] <= entry_price <= zone["upper"]
-            direction_aligned = (
-                (direction in ["buy", "long"] and zone["type"] == "bullish") or
-                (direction in ["sell", "short"] and zone["type"] == "bearish")
-            )
-            
-            if zone_contains_entry and direction_aligned:
-                aligned_zones.append(zone)
-        
-        if not aligned_zones:
+        if not aligned_count:
             return FilterScore(
                 filter_name="fvg_confluence",
                 passed=False,
                 score=0.2,
                 weight=self.filter_weights["fvg_confluence"],
                 reason="No FVG zones align with signal direction and entry",
-                details={"total_zones": len(fvg_zones), "aligned_zones": 0}
+                details={"total_zones": zone_count, "aligned_zones": 0}
             )
         
         # Score based on strongest aligned zone
-        strongest_zone = max(aligned_zones, key=lambda z: z["strength"])
-        strength_score = min(1.0, strongest_zone["strength"] * 100)  # Convert to 0-1 scale
+        strength_score = min(1.0, strength * 100)  # Convert to 0-1 scale
         
         return FilterScore(
             filter_name="fvg_confluence",
             passed=True,
             score=max(0.6, strength_score),  # Minimum 60% for passing
             weight=self.filter_weights["fvg_confluence"],
-            reason=f"FVG confluence detected with {strongest_zone['type']} zone",
-            details={"aligned_zones": len(aligned_zones), "strongest_strength": strongest_zone["strength"]}
+            reason=f"FVG confluence detected with {zone_type} zone",
+            details={"aligned_zones": aligned_count, "strongest_strength": strength}
         )
     
     def _validate_fibonacci_confluence(self, signal_dict: Dict[str, Any]) -> FilterScore:
@@ -287,46 +318,55 @@ class SmartLogicFilter:
         Fibonacci retracement/extension confluence validation
         Checks if entry aligns with key Fibonacci levels
         """
-        entry_price = signal_dict.get("entry_price", 0)
-        swing_high = signal_dict.get("swing_high", 0)
-        swing_low = signal_dict.get("swing_low", 0)
-        direction = signal_dict.get("direction", "buy").lower()
-        
-        if not all([entry_price, swing_high, swing_low]) or swing_high <= swing_low:
-            return FilterScore(
-                filter_name="fibonacci",
-                passed=False,
-                score=0.3,
-                weight=self.filter_weights["fibonacci"],
-                reason="Missing or invalid swing high/low for Fibonacci analysis",
-                details={"swing_high": swing_high, "swing_low": swing_low}
-            )
-        
-        # Calculate Fibonacci levels
+        return self._fibonacci_scores([signal_dict])[0]
+    
+    def _fibonacci_scores(self, signals: List[Dict[str, Any]]) -> List[FilterScore]:
+        """Fibonacci confluence for each signal from one (candidates x levels) distance matrix"""
+        scores: List[Optional[FilterScore]] = [None] * len(signals)
+        members = []
+        for i, signal in enumerate(signals):
+            entry_price = signal.get("entry_price", 0)
+            swing_high = signal.get("swing_high", 0)
+            swing_low = signal.get("swing_low", 0)
+            if not all([entry_price, swing_high, swing_low]) or swing_high <= swing_low:
+                scores[i] = FilterScore(
+                    filter_name="fibonacci",
+                    passed=False,
+                    score=0.3,
+                    weight=self.filter_weights["fibonacci"],
+                    reason="Missing or invalid swing high/low for Fibonacci analysis",
+                    details={"swing_high": swing_high, "swing_low": swing_low}
+                )
+            else:
+                members.append(i)
+        if not members:
+            return scores
+        
+        levels = np.array(self.fib_levels)
+        level_names = [f"ret_{level}" if level <= 1.0 else f"ext_{level}" for level in self.fib_levels]
+        entry = np.array([float(signals[i]["entry_price"]) for i in members])[:, None]
+        swing_high = np.array([float(signals[i]["swing_high"]) for i in members])[:, None]
+        swing_low = np.array([float(signals[i]["swing_low"]) for i in members])[:, None]
         swing_range = swing_high - swing_low
-        fib_levels_prices = {}
-        
-        # Retracement levels (from swing high)
-        for level in self.fib_levels:
-            if level <= 1.0:  # Retracement
-                fib_price = swing_high - (swing_range * level)
-                fib_levels_prices[f"ret_{level}"] = fib_price
-            else:  # Extension
-                fib_price = swing_high + (swing_range * (level - 1.0))
-                fib_levels_prices[f"ext_{level}"] = fib_price
-        
-        # Find closest Fibonacci level to entry price
-        closest_level = None
-        min_distance = float('inf')
-        
-        for level_name, fib_price in fib_levels_prices.items():
-            distance = abs(entry_price - fib_price)
-            relative_distance = distance / entry_price  # Relative to entry price
-            
-            if relative_distance < min_distance:
-                min_distance = relative_distance
-                closest_level = (level_name, fib_price)
         
+        # Retracements measured down from the swing high, extensions beyond it
+        fib_prices = np.where(
+            levels <= 1.0,
+            swing_high - (swing_range * levels),
+            swing_high + (swing_range * (levels - 1.0))
+        )
+        distances = np.abs(entry - fib_prices) / entry  # Relative to entry price
+        closest = distances.argmin(axis=1)
+        
+        for row, i in enumerate(members):
+            column = closest[row]
+            scores[i] = self._fibonacci_score(
+                level_names[column], float(fib_prices[row, column]), float(distances[row, column])
+            )
+        return scores
+    
+    def _fibonacci_score(self, level_name: str, fib_price: float, min_distance: float) -> FilterScore:
+        """Score Fibonacci confluence from the closest level and its relative distance"""
         # Tolerance for Fibonacci confluence (within 0.5% of price)
         tolerance = 0.005
         
@@ -337,14 +377,14 @@ class SmartLogicFilter:
                 score=0.3,
                 weight=self.filter_weights["fibonacci"],
                 reason=f"Entry not close to Fibonacci level (closest: {min_distance:.1%} away)",
-                details={"closest_level": closest_level[0] if closest_level else None, "distance": min_distance}
+                details={"closest_level": level_name, "distance": min_distance}
             )
         
         # Score based on how close to the Fibonacci level
         proximity_score = 1.0 - (min_distance / tolerance)
         
         # Bonus for key levels (0.618, 0.5, 1.618)
-        level_value = float(closest_level[0].split('_')[1])
+        level_value = float(level_name.split('_')[1])
         key_levels = [0.5, 0.618, 1.618]
         is_key_level = any(abs(level_value - key) < 0.01 for key in key_levels)
         
@@ -357,8 +397,8 @@ class SmartLogicFilter:
             passed=True,
             score=max(0.6, final_score),
             weight=self.filter_weights["fibonacci"],
-            reason=f"Entry aligns with Fibonacci {closest_level[0]} level",
-            details={"level": closest_level[0], "fib_price": closest_level[1], "distance": min_distance, "is_key_level": is_key_level}
+            reason=f"Entry aligns with Fibonacci {level_name} level",
+            details={"level": level_name, "fib_price": fib_price, "distance": min_distance, "is_key_level": is_key_level}
         )
     
     def _validate_volume_profile(self, signal_dict: Dict[str, Any]) -> FilterScore:
@@ -366,50 +406,77 @@ class SmartLogicFilter:
         Volume profile and behavior-based signal validation
         Simulates volume analysis for signal strength
         """
-        entry_price = signal_dict.get("entry_price", 0)
-        volumes = signal_dict.get("recent_volumes", [])
-        prices = signal_dict.get("recent_closes", [])
-        direction = signal_dict.get("direction", "buy").lower()
-        
-        if len(volumes) < 10 or len(prices) < 10:
-            return FilterScore(
-                filter_name="volume_profile",
-                passed=False,
-                score=0.4,
-                weight=self.filter_weights["volume_profile"],
-                reason="Insufficient volume data for analysis",
-                details={"volume_points": len(volumes), "price_points": len(prices)}
-            )
-        
-        # Calculate volume metrics
-        avg_volume = np.mean(volumes)
-        recent_volume = volumes[-1] if volumes else 0
-        volume_ratio = recent_volume / avg_volume if avg_volume > 0 else 0
-        
-        # Volume trend analysis (last 5 vs previous 5)
-        if len(volumes) >= 10:
-            recent_vol_avg = np.mean(volumes[-5:])
-            previous_vol_avg = np.mean(volumes[-10:-5])
-            volume_trend = (recent_vol_avg - previous_vol_avg) / previous_vol_avg if previous_vol_avg > 0 else 0
-        else:
-            volume_trend = 0
-        
-        # Price-volume relationship
-        price_changes = np.diff(prices) if len(prices) > 1 else [0]
-        volume_changes = np.diff(volumes) if len(volumes) > 1 else [0]
-        
-        # Positive correlation between price and volume movement
-        if len(price_changes) > 0 and len(volume_changes) > 0:
-            try:
-                correlation = np.corrcoef(price_changes[-10:], volume_changes[-10:])[0, 1]
-                if np.isnan(correlation):
-                    correlation = 0
-            except:
-                correlation = 0
-        else:
-            correlation = 0
+        return self._volume_scores([signal_dict])[0]
+    
+    def _volume_scores(self, signals: List[Dict[str, Any]]) -> List[FilterScore]:
+        """Volume profile for each signal, statistics computed row-wise per history length"""
+        scores: List[Optional[FilterScore]] = [None] * len(signals)
+        members = []
+        for i, signal in enumerate(signals):
+            volumes = signal.get("recent_volumes", [])
+            prices = signal.get("recent_closes", [])
+            if len(volumes) < 10 or len(prices) < 10:
+                scores[i] = FilterScore(
+                    filter_name="volume_profile",
+                    passed=False,
+                    score=0.4,
+                    weight=self.filter_weights["volume_profile"],
+                    reason="Insufficient volume data for analysis",
+                    details={"volume_points": len(volumes), "price_points": len(prices)}
+                )
+            else:
+                members.append(i)
         
-        # Scoring based on volume confirmation
+        for _, positions in self._group_by_length(signals, members, "recent_volumes", "recent_closes").items():
+            group = [signals[i] for i in positions]
+            volumes = self._stack(group, "recent_volumes")
+            prices = self._stack(group, "recent_closes")
+            
+            profile = volume_profile(volumes)
+            for row, i in enumerate(positions):
+                # Signals on a known closed bar share the profile with the hedge rules
+                symbol = group[row].get("symbol")
+                bar_time = closed_bar_time(group[row].get("candles"), group[row].get("bar_time"))
+                if symbol and bar_time is not None:
+                    shared = self.features.volume_profile(volumes[row], symbol, group[row].get("granularity", "M15"),
+                                                          bar_time)
+                    for name, values in profile.items():
+                        values[row] = shared[name]
+            
+            with np.errstate(divide="ignore", invalid="ignore"):
+                # Latest volume against the average, last 5 against the previous 5
+                avg_volume = profile["mean"]
+                volume_ratio = np.where(avg_volume > 0, profile["last"] / avg_volume, 0.0)
+                recent_vol_avg = profile["recent_mean"]
+                previous_vol_avg = profile["previous_mean"]
+                volume_trend = np.where(
+                    previous_vol_avg > 0, (recent_vol_avg - previous_vol_avg) / previous_vol_avg, 0.0
+                )
+            # Price-volume relationship over the last 10 changes
+            correlation = self._row_correlation(np.diff(prices, axis=1)[:, -10:], np.diff(volumes, axis=1)[:, -10:])
+            
+            for row, i in enumerate(positions):
+                scores[i] = self._volume_score(
+                    signals[i].get("direction", "buy").lower(),
+                    float(volume_ratio[row]),
+                    float(volume_trend[row]),
+                    float(correlation[row])
+                )
+        return scores
+    
+    @staticmethod
+    def _row_correlation(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Pearson correlation of each row pair (np.corrcoef per row); 0 where undefined"""
+        if x.shape != y.shape:
+            return np.zeros(len(x))
+        x = x - x.mean(axis=1, keepdims=True)
+        y = y - y.mean(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlation = np.clip((x * y).sum(axis=1) / np.sqrt((x * x).sum(axis=1) * (y * y).sum(axis=1)), -1.0, 1.0)
+        return np.where(np.isnan(correlation), 0.0, correlation)
+    
+    def _volume_score(self, direction: str, volume_ratio: float, volume_trend: float, correlation: float) -> FilterScore:
+        """Score volume confirmation from the ratio, trend and price-volume correlation"""
         score_components = []
         
         # Volume surge (above average)
@@ -462,47 +529,40 @@ class SmartLogicFilter:
         Momentum confirmation using simple technical indicators
         RSI, MACD-like momentum analysis
         """
-        prices = signal_dict.get("recent_closes", [])
-        direction = signal_dict.get("direction", "buy").lower()
-        
-        if len(prices) < 14:
-            return FilterScore(
-                filter_name="momentum",
-                passed=False,
-                score=0.4,
-                weight=self.filter_weights["momentum"],
-                reason="Insufficient price data for momentum analysis",
-                details={"price_points": len(prices)}
-            )
+        return self._momentum_scores([signal_dict])[0]
+    
+    def _momentum_scores(self, signals: List[Dict[str, Any]]) -> List[FilterScore]:
+        """Momentum for each signal, RSI and rate of change computed row-wise per history length"""
+        scores: List[Optional[FilterScore]] = [None] * len(signals)
+        members = []
+        for i, signal in enumerate(signals):
+            prices = signal.get("recent_closes", [])
+            if len(prices) < 14:
+                scores[i] = FilterScore(
+                    filter_name="momentum",
+                    passed=False,
+                    score=0.4,
+                    weight=self.filter_weights["momentum"],
+                    reason="Insufficient price data for momentum analysis",
+                    details={"price_points": len(prices)}
+                )
+            else:
+                members.append(i)
         
-        # Simple RSI calculation (14-period)
-        def calculate_rsi(prices_array, period=14):
-            deltas = np.diff(prices_array)
-            gains = np.where(deltas > 0, deltas, 0)
-            losses = np.where(deltas < 0, -deltas, 0)
-            
-            avg_gain = np.mean(gains[-period:])
-            avg_loss = np.mean(losses[-period:])
+        for _, positions in self._group_by_length(signals, members, "recent_closes").items():
+            closes = self._stack([signals[i] for i in positions], "recent_closes")
+            # 14-period RSI and 10-bar rate of change (brokers/indicators.py kernels)
+            rsi = indicators.rsi_last_rows(closes, 14)
+            momentum = indicators.rate_of_change_rows(closes, 10)
             
-            if avg_loss == 0:
-                return 100
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi
-        
-        # Simple momentum (rate of change)
-        def calculate_momentum(prices_array, period=10):
-            if len(prices_array) < period:
-                return 0
-            current = prices_array[-1]
-            previous = prices_array[-period]
-            return (current - previous) / previous if previous != 0 else 0
-        
-        rsi = calculate_rsi(np.array(prices))
-        momentum = calculate_momentum(np.array(prices))
-        
-        # Momentum scoring
+            for row, i in enumerate(positions):
+                scores[i] = self._momentum_score(
+                    signals[i].get("direction", "buy").lower(), float(rsi[row]), float(momentum[row])
+                )
+        return scores
+    
+    def _momentum_score(self, direction: str, rsi: float, momentum: float) -> FilterScore:
+        """Score momentum confirmation from RSI and rate of change"""
         score_components = []
         
         # RSI analysis
@@ -557,12 +617,130 @@ class SmartLogicFilter:
             }
         )
     
+    def _with_candle_columns(self, signal_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fill recent_highs/lows/closes/volumes from a CandleFrame passed as
+        signal_dict["candles"]; explicit recent_* keys still take precedence
+        """
+        frame = signal_dict.get("candles")
+        if frame is None or not hasattr(frame, "close"):
+            return signal_dict
+        
+        filled = dict(signal_dict)
+        filled.setdefault("recent_highs", frame.high)
+        filled.setdefault("recent_lows", frame.low)
+        filled.setdefault("recent_closes", frame.close)
+        filled.setdefault("recent_volumes", frame.volume)
+        return filled
+    
+    def _memo_key(self, signal_dict: Dict[str, Any]) -> Optional[Tuple[str, str, Any, str]]:
+        """
+        (symbol, granularity, last closed bar time, config hash) for the
+        confluence filter scores, or None when the closed bar is unknown
+        
+        The bar comes from signal_dict["bar_time"] or a "candles" CandleFrame
+        ending on a complete bar; the hash covers the filter settings and the
+        signal levels the filters score against
+        """
+        symbol = signal_dict.get("symbol")
+        bar_time = closed_bar_time(signal_dict.get("candles"), signal_dict.get("bar_time"))
+        if not symbol or bar_time is None:
+            return None
+        levels = {key: signal_dict.get(key) for key in ("direction", "entry_price", "swing_high", "swing_low")}
+        return symbol, signal_dict.get("granularity", "M15"), bar_time, config_hash(settings(self), levels)
+    
+    def _confluence_scores(self, signals: List[Dict[str, Any]]) -> List[Tuple[FilterScore, ...]]:
+        """
+        (FVG, Fibonacci, volume profile, momentum) scores per signal, served
+        from the per-bar memo where possible; misses run as one vectorized batch
+        """
+        keys = [self._memo_key(signal) for signal in signals]
+        scores: List[Optional[Tuple[FilterScore, ...]]] = [
+            self.memo.lookup("smart_logic", *key) if key else None for key in keys
+        ]
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            batch = [signals[i] for i in missing]
+            computed = zip(
+                self._fvg_scores(batch),
+                self._fibonacci_scores(batch),
+                self._volume_scores(batch),
+                self._momentum_scores(batch)
+            )
+            for i, score in zip(missing, computed):
+                scores[i] = score
+                if keys[i]:
+                    self.memo.store("smart_logic", *keys[i], score)
+        return scores
+    
+    def _rr_rejection(self, signal_dict: Dict[str, Any], rr_result: FilterScore) -> SignalValidation:
+        """Immediate rejection for a signal that fails the hard RR requirement"""
+        return SignalValidation(
+            passed=False,
+            score=0.0,
+            reject_reason=rr_result.reason,
+            filter_scores=[rr_result],
+            risk_reward_ratio=signal_dict.get("risk_reward_ratio", 0),
+            confluence_count=0,
+            validation_timestamp=datetime.now(timezone.utc).isoformat(),
+            charter_compliant=False
+        )
+    
+    def _combine(self, filter_results: List[FilterScore]) -> SignalValidation:
+        """Weighted confluence verdict from the RR result followed by the other filter results"""
+        rr_result = filter_results[0]
+        
+        # Calculate weighted average score
+        total_weighted_score = 0
+        total_weight = 0
+        passing_filters = 0
+        
+        for result in filter_results:
+            weighted_score = result.score * result.weight
+            total_weighted_score += weighted_score
+            total_weight += result.weight
+            
+            if result.passed:
+                passing_filters += 1
+        
+        final_score = total_weighted_score / total_weight if total_weight > 0 else 0
+        
+        # Determine if signal passes overall
+        score_passes = final_score >= self.min_total_score
+        confluence_passes = passing_filters >= self.min_confluence_count
+        overall_pass = score_passes and confluence_passes
+        
+        # Determine reject reason if failed
+        reject_reason = None
+        if not overall_pass:
+            if not score_passes:
+                reject_reason = f"Total score {final_score:.2f} below minimum {self.min_total_score}"
+            elif not confluence_passes:
+                reject_reason = f"Only {passing_filters} filters passed, need {self.min_confluence_count}"
+        
+        return SignalValidation(
+            passed=overall_pass,
+            score=final_score,
+            reject_reason=reject_reason,
+            filter_scores=filter_results,
+            risk_reward_ratio=rr_result.details.get("calculated_rr", 0) if rr_result.details else 0,
+            confluence_count=passing_filters,
+            validation_timestamp=datetime.now(timezone.utc).isoformat(),
+            charter_compliant=rr_result.passed  # Charter compliance (RR already checked)
+        )
+    
     def validate_signal(self, signal_dict: Dict[str, Any]) -> SignalValidation:
         """
         Main signal validation function
         Returns comprehensive validation result with weighted scoring
+        
+        Price history comes from recent_* lists/arrays or a CandleFrame
+        under "candles" (columns are used directly, not re-parsed). With a
+        symbol and a known closed bar ("bar_time" or complete candles) the
+        filter scores are reused until the next bar closes
         """
         start_time = datetime.now()
+        signal_dict = self._with_candle_columns(signal_dict)
         
         # Log validation start
         self.tracker.log_event(
@@ -573,97 +751,28 @@ class SmartLogicFilter:
         )
         
         try:
-            # Run all filters
-            filter_results = []
-            
             # 1. Risk-Reward (hard requirement)
             rr_result = self._validate_risk_reward(signal_dict)
-            filter_results.append(rr_result)
             
             # If RR fails, immediately reject
             if not rr_result.passed:
-                return SignalValidation(
-                    passed=False,
-                    score=0.0,
-                    reject_reason=rr_result.reason,
-                    filter_scores=filter_results,
-                    risk_reward_ratio=signal_dict.get("risk_reward_ratio", 0),
-                    confluence_count=0,
-                    validation_timestamp=datetime.now(timezone.utc).isoformat(),
-                    charter_compliant=False
-                )
-            
-            # 2. FVG Confluence
-            fvg_result = self._validate_fvg_confluence(signal_dict)
-            filter_results.append(fvg_result)
-            
-            # 3. Fibonacci Confluence  
-            fib_result = self._validate_fibonacci_confluence(signal_dict)
-            filter_results.append(fib_result)
-            
-            # 4. Volume Profile
-            volume_result = self._validate_volume_profile(signal_dict)
-            filter_results.append(volume_result)
-            
-            # 5. Momentum
-            momentum_result = self._validate_momentum(signal_dict)
-            filter_results.append(momentum_result)
-            
-            # Calculate weighted average score
-            total_weighted_score = 0
-            total_weight = 0
-            passing_filters = 0
-            
-            for result in filter_results:
-                weighted_score = result.score * result.weight
-                total_weighted_score += weighted_score
-                total_weight += result.weight
-                
-                if result.passed:
-                    passing_filters += 1
-            
-            final_score = total_weighted_score / total_weight if total_weight > 0 else 0
-            
-            # Determine if signal passes overall
-            score_passes = final_score >= self.min_total_score
-            confluence_passes = passing_filters >= self.min_confluence_count
-            overall_pass = score_passes and confluence_passes
+                return self._rr_rejection(signal_dict, rr_result)
             
-            # Determine reject reason if failed
-            reject_reason = None
-            if not overall_pass:
-                if not score_passes:
-                    reject_reason = f"Total score {final_score:.2f} below minimum {self.min_total_score}"
-                elif not confluence_passes:
-                    reject_reason = f"Only {passing_filters} filters passed, need {self.min_confluence_count}"
-            
-            # Charter compliance (RR already checked above)
-            charter_compliant = rr_result.passed
-            
-            # Create result
-            result = SignalValidation(
-                passed=overall_pass,
-                score=final_score,
-                reject_reason=reject_reason,
-                filter_scores=filter_results,
-                risk_reward_ratio=rr_result.details.get("calculated_rr", 0) if rr_result.details else 0,
-                confluence_count=passing_filters,
-                validation_timestamp=datetime.now(timezone.utc).isoformat(),
-                charter_compliant=charter_compliant
-            )
+            # 2. FVG, 3. Fibonacci, 4. Volume Profile, 5. Momentum (memoized per bar)
+            result = self._combine([rr_result, *self._confluence_scores([signal_dict])[0]])
             
             # Log completion
             validation_time = (datetime.now() - start_time).total_seconds()
             self.tracker.log_event(
                 EventType.PHASE_COMPLETE,
                 "smart_logic",
-                f"Signal validation completed: {'PASSED' if overall_pass else 'REJECTED'} ({final_score:.2f})",
+                f"Signal validation completed: {'PASSED' if result.passed else 'REJECTED'} ({result.score:.2f})",
                 {
-                    "passed": overall_pass,
-                    "score": final_score,
-                    "confluence_count": passing_filters,
+                    "passed": result.passed,
+                    "score": result.score,
+                    "confluence_count": result.confluence_count,
                     "validation_time_ms": int(validation_time * 1000),
-                    "reject_reason": reject_reason
+                    "reject_reason": result.reject_reason
                 }
             )
             
@@ -689,6 +798,55 @@ class SmartLogicFilter:
                 charter_compliant=False
             )
     
+    def validate_signals(self, batch: List[Dict[str, Any]]) -> List[SignalValidation]:
+        """
+        Validate a batch of candidate signals in one pass
+        Returns one SignalValidation per signal, in order, equal to validate_signal's
+        
+        Histories are stacked into (candidates x bars) arrays per history
+        length, so FVG gaps, Fibonacci distances, volume statistics and
+        momentum are computed for all candidates in vectorized passes
+        """
+        start_time = datetime.now()
+        signals = [self._with_candle_columns(signal_dict) for signal_dict in batch]
+        
+        self.tracker.log_event(
+            EventType.PHASE_START,
+            "smart_logic",
+            f"Starting batch validation of {len(signals)} signals",
+            {"symbols": [signal.get("symbol", "UNKNOWN") for signal in signals]}
+        )
+        
+        try:
+            # RR is the hard requirement; only survivors reach the confluence filters
+            rr_results = [self._validate_risk_reward(signal) for signal in signals]
+            survivors = [signal for signal, rr_result in zip(signals, rr_results) if rr_result.passed]
+            confluence = iter(self._confluence_scores(survivors))
+            results = [
+                self._combine([rr_result, *next(confluence)]) if rr_result.passed
+                else self._rr_rejection(signal, rr_result)
+                for signal, rr_result in zip(signals, rr_results)
+            ]
+        except Exception as e:
+            # A malformed history fails its whole group; per-signal validation confines it
+            self.logger.warning(f"Batch validation falling back to per-signal path: {e}")
+            return [self.validate_signal(signal_dict) for signal_dict in batch]
+        
+        validation_time = (datetime.now() - start_time).total_seconds()
+        passed = sum(1 for result in results if result.passed)
+        self.tracker.log_event(
+            EventType.PHASE_COMPLETE,
+            "smart_logic",
+            f"Batch validation completed: {passed}/{len(results)} PASSED",
+            {
+                "passed": passed,
+                "rejected": len(results) - passed,
+                "validation_time_ms": int(validation_time * 1000)
+            }
+        )
+        
+        return results
+    
     def get_filter_summary(self, validation: SignalValidation) -> Dict[str, Any]:
         """Get human-readable validation summary"""
         return {
@@ -243,7 +243,10 @@ class SmartTrailingSystem:
 class AdvancedHedgingSystem:
     """Correlation-based quantitative hedging with Golden Age adjustments"""
 
-    def __init__(self):
+    def __init__(self, correlations=None):
+        # Optional rolling correlation engine (data/brokers/correlation_engine.py);
+        # the static table is used for symbols it has no live data for
+        self.correlations = correlations
         self.base_correlations = {
             'EURUSD': {'GBPUSD': 0.82, 'USDJPY': -0.68, 'USDCHF': -0.75, 'GOLD': 0.58},
             'GBPUSD': {'EURUSD': 0.82, 'USDJPY': -0.62, 'USDCHF': -0.68, 'GOLD': 0.52},
@@ -254,6 +257,11 @@ class AdvancedHedgingSystem:
 
     def find_optimal_hedge(self, symbol: str, market_conditions: MarketConditions) -> Tuple[Optional[str], float]:
         """Find best hedge pair with strongest negative correlation"""
+        if self.correlations is not None:
+            live = self._live_hedge(symbol)
+            if live is not None:
+                return live
+
         if symbol not in self.current_correlations:
             return None, 0.0
 
@@ -269,6 +277,21 @@ class AdvancedHedgingSystem:
 
         return best_hedge, best_correlation
 
+    def _live_hedge(self, symbol: str) -> Optional[Tuple[str, float]]:
+        """Strongest measured anti-correlated partner (< -0.5), None without live data"""
+        names = [symbol]
+        if len(symbol) == 6 and symbol.isalpha():
+            names.append(f"{symbol[:3]}_{symbol[3:]}")  # EURUSD -> OANDA EUR_USD
+        for name in names:
+            partners = self.correlations.partners(name, top=1)
+            if not partners['correlated'] and not partners['anti_correlated']:
+                continue
+            anti = partners['anti_correlated']
+            if anti and anti[0][1] < -0.5:  # Strong negative
+                return anti[0]
+            return None, 0.0
+        return None
+
     def calculate_hedge_ratio(self, correlation: float, market_conditions: MarketConditions) -> float:
         """Calculate hedge size with Golden Age adjustments"""
         base_ratio = abs(correlation) * 0.6
@@ -1715,6 +1715,24 @@ def api_live_brokers():
         logger.error(f"Brokers API error: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/latency')
+def api_latency():
+    """Per-endpoint latency percentiles exported by the broker connectors."""
+    try:
+        from data.brokers.latency_recorder import DEFAULT_EXPORT_PATH, load_exported_stats
+        path = DEFAULT_EXPORT_PATH
+        if not os.path.isabs(path):
+            path = os.path.join(ROOT, path)
+        stats = load_exported_stats(path)
+        budget = stats.get('budget_ms')
+        stats['over_budget_endpoints'] = [
+            row for row in stats.get('endpoints', []) if budget and row.get('p99_ms', 0) > budget
+        ]
+        return jsonify(stats)
+    except Exception as e:
+        logger.error(f"Latency API error: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/live/positions')
 def api_live_positions():
     """Get all active positions across all brokers."""
@@ -470,10 +470,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 import numpy as np
 
+# Per-bar feature store shared with the regime, hedge and filter modules
+try:
+    from brokers.feature_store import get_feature_store
+except ImportError:
+    from data.brokers.feature_store import get_feature_store
+
 
 @dataclass
 class LeverageResult:
@@ -500,10 +506,13 @@ class DynamicLeverageCalculator:
         max_leverage: float = 25.0,
         base_risk_per_trade: float = 0.002,
         max_position_fraction: float = 0.15,
+        features: Any = None,
     ) -> None:
         self.max_leverage = max_leverage
         self.base_risk_per_trade = base_risk_per_trade
         self.max_position_fraction = max_position_fraction
+        # Per-bar feature store (brokers/feature_store.py), shared process-wide by default
+        self.features = features if features is not None else get_feature_store()
 
         self.confidence_weights: Dict[float, float] = {
             0.95: 1.5,
@@ -513,18 +522,25 @@ class DynamicLeverageCalculator:
             0.55: 0.4,
         }
 
-    def calculate_volatility(self, price_history: List[float], periods: int = 14) -> float:
+    def calculate_volatility(
+        self,
+        price_history: List[float],
+        periods: int = 14,
+        symbol: Optional[str] = None,
+        granularity: str = "M15",
+        bar_time: Any = None,
+    ) -> float:
         """Calculate rolling volatility from price history.
 
         Returns a value in [0.01, 0.5] representing 1%–50% annualised vol.
+        With a symbol and the closed bar the history ends on, the return
+        volatility is shared per bar through the feature store.
         """
 
         if len(price_history) < periods:
             return 0.02
 
-        prices = np.array(price_history[-periods:])
-        returns = np.diff(prices) / prices[:-1]
-        volatility = float(np.std(returns) * np.sqrt(24.0))
+        volatility = float(self.features.volatility(price_history, symbol, granularity, bar_time, window=periods) * np.sqrt(24.0))
 
         return max(0.01, min(0.5, volatility))
 
@@ -542,14 +558,17 @@ class DynamicLeverageCalculator:
         account_balance: float,
         current_positions: int = 0,
         market_conditions: str = "normal",
+        granularity: str = "M15",
+        bar_time: Any = None,
     ) -> LeverageResult:
         """Return leverage and position sizing for a candidate trade.
 
         This is a pure calculation: it does not talk to brokers or mutate
-        any external state.
+        any external state. bar_time (the closed bar price_history ends on)
+        lets the volatility come from the shared per-bar feature store.
         """
 
-        volatility = self.calculate_volatility(price_history)
+        volatility = self.calculate_volatility(price_history, symbol=pair, granularity=granularity, bar_time=bar_time)
         confidence_mult = self._confidence_multiplier(confidence)
 
         market_mult_map: Dict[str, float] = {
@@ -6,12 +6,18 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import List, Dict
+from typing import Any, List, Dict, Optional
 
 import numpy as np
 
 from config.narration_logger import get_narration_logger
 
+# Per-bar feature store shared with the regime, hedge and filter modules
+try:
+    from brokers.feature_store import get_feature_store
+except ImportError:
+    from data.brokers.feature_store import get_feature_store
+
 
 @dataclass
 class LeverageResult:
@@ -25,18 +31,19 @@ class LeverageResult:
 
 
 class DynamicLeverageCalculator:
-    def __init__(self, max_leverage: float = 25.0, base_risk_per_trade: float = 0.002, max_position_fraction: float = 0.15) -> None:
+    def __init__(self, max_leverage: float = 25.0, base_risk_per_trade: float = 0.002, max_position_fraction: float = 0.15, features: Any = None) -> None:
         self.max_leverage = max_leverage
         self.base_risk_per_trade = base_risk_per_trade
         self.max_position_fraction = max_position_fraction
         self.confidence_weights: Dict[float, float] = {0.95: 1.5, 0.85: 1.2, 0.75: 1.0, 0.65: 0.7, 0.55: 0.4}
+        # Per-bar feature store (brokers/feature_store.py), shared process-wide by default
+        self.features = features if features is not None else get_feature_store()
 
-    def calculate_volatility(self, price_history: List[float], periods: int = 14) -> float:
+    def calculate_volatility(self, price_history: List[float], periods: int = 14, symbol: Optional[str] = None, granularity: str = "M15", bar_time: Any = None) -> float:
         if len(price_history) < periods:
             return 0.02
-        prices = np.array(price_history[-periods:])
-        returns = np.diff(prices) / prices[:-1]
-        volatility = float(np.std(returns) * np.sqrt(24.0))
+        # Shared per closed bar when the symbol and bar time are known
+        volatility = float(self.features.volatility(price_history, symbol, granularity, bar_time, window=periods) * np.sqrt(24.0))
         v = max(0.01, min(0.5, volatility))
         try:
             get_narration_logger().narrate_info("DYNAMIC_LEVERAGE_VOL_CALC", {"periods": periods, "volatility": v})
@@ -50,8 +57,8 @@ class DynamicLeverageCalculator:
                 return mult
         return 0.2
 
-    def calculate_for_signal(self, pair: str, confidence: float, price_history: List[float], account_balance: float, current_positions: int = 0, market_conditions: str = "normal") -> LeverageResult:
-        volatility = self.calculate_volatility(price_history)
+    def calculate_for_signal(self, pair: str, confidence: float, price_history: List[float], account_balance: float, current_positions: int = 0, market_conditions: str = "normal", granularity: str = "M15", bar_time: Any = None) -> LeverageResult:
+        volatility = self.calculate_volatility(price_history, symbol=pair, granularity=granularity, bar_time=bar_time)
         confidence_mult = self._confidence_multiplier(confidence)
         market_mult = {"calm": 1.3, "normal": 1.0, "volatile": 0.7, "extreme": 0.4}.get(market_conditions, 1.0)
         position_penalty = max(0.3, 1.0 - (current_positions * 0.15))
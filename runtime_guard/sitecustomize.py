@@ -206,7 +206,7 @@ class _PatchLoader(importlib.abc.Loader):
                     if module.__name__ == "__main__" and mod_file.endswith("/oanda_trading_engine.py"):
                         needs_stub = True
             if needs_stub:
-                def _pp_stub():
+                def _pp_stub(*args, **kwargs):
                     return None
                 setattr(module, "_rbz_force_min_notional_position_police", _pp_stub)
                 _log("POSITION_POLICE_STUB_INJECTED")
@@ -258,7 +258,7 @@ def _inject_position_police_stub_main() -> bool:
         if not mod_file:
             return False
         if os.path.basename(mod_file) == "oanda_trading_engine.py" or mod_file.endswith("/oanda_trading_engine.py"):
-            def _pp_stub():
+            def _pp_stub(*args, **kwargs):
                 return None
             setattr(main, "_rbz_force_min_notional_position_police", _pp_stub)
             _log("POSITION_POLICE_STUB_INJECTED", target="__main__")
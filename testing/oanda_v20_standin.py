@@ -0,0 +1,973 @@
+#!/usr/bin/env python3
+"""
+OANDA v20 Stand-in Server - RBOTzilla UNI
+Local HTTP server speaking the subset of the v20 REST API this project uses,
+for offline load and latency testing.
+
+- Candles, pricing, pricing stream, orders with SL/TP brackets on fill,
+  order cancel, trades (and one trade, open or closed), trade orders PUT,
+  openPositions, position close, account details/summary and the
+  transactions stream
+- Synthetic (seeded random walk) or recorded (CSV) price paths replayed
+  on a simulated clock running `speed` times faster than wall time; any
+  well-formed AAA_BBB instrument without a path gets a synthetic one on
+  first request (crosses start at the rate implied by their USD legs)
+- Injected latency/jitter, HTTP errors and dropped connections per route
+- Any Bearer token and any account ID are accepted (one simulated account)
+
+All broker timestamps (candle times, gtdTime expiry, fills) are simulated time.
+
+Usage:
+    python -m testing.oanda_v20_standin --port 8765 --speed 60 --latency-ms 40 --error-rate 0.02
+    python engines/oanda_trading_engine.py --api-base http://127.0.0.1:8765
+PIN: 841921
+"""
+
+import re
+import csv
+import json
+import math
+import zlib
+import time
+import random
+import logging
+import argparse
+import itertools
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Any, Tuple, FrozenSet
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+GRANULARITY_SECONDS = {
+    "S5": 5, "S10": 10, "S15": 15, "S30": 30,
+    "M1": 60, "M2": 120, "M4": 240, "M5": 300, "M10": 600, "M15": 900, "M30": 1800,
+    "H1": 3600, "H2": 7200, "H3": 10800, "H4": 14400, "H6": 21600, "H8": 28800, "H12": 43200,
+    "D": 86400,
+}
+
+DEFAULT_START_PRICES = {
+    "EUR_USD": 1.0850, "GBP_USD": 1.2700, "AUD_USD": 0.6600, "NZD_USD": 0.6100,
+    "USD_JPY": 150.00, "USD_CAD": 1.3600, "USD_CHF": 0.8800,
+    "EUR_GBP": 0.8550, "EUR_JPY": 162.80, "GBP_JPY": 190.50, "AUD_JPY": 99.00,
+    "CHF_JPY": 170.45, "EUR_CHF": 0.9548, "GBP_CHF": 1.1176, "AUD_CHF": 0.5808,
+    "NZD_CHF": 0.5368, "EUR_AUD": 1.6439, "GBP_AUD": 1.9242,
+}
+
+_INSTRUMENT = re.compile(r"^[A-Z]{3}_[A-Z]{3}$")
+
+MAX_CANDLES = 5000
+
+
+def _rfc3339(epoch_s: float) -> str:
+    """Epoch seconds -> RFC3339 with nanoseconds, as OANDA sends it"""
+    whole = int(math.floor(epoch_s))
+    nanos = int(round((epoch_s - whole) * 1e9))
+    return datetime.fromtimestamp(whole, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S") + f".{nanos:09d}Z"
+
+
+def _parse_time(value: str) -> float:
+    """RFC3339 (any fractional precision) or epoch seconds -> epoch seconds"""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    text = value.strip().replace("Z", "+00:00")
+    if "." in text:
+        head, rest = text.split(".", 1)
+        digits = "".join(itertools.takewhile(str.isdigit, rest))
+        text = f"{head}.{digits[:6].ljust(6, '0')}{rest[len(digits):]}"
+    parsed = datetime.fromisoformat(text)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _start_price(instrument: str) -> float:
+    """Default start price, or the cross rate implied by the default USD pairs"""
+    if instrument in DEFAULT_START_PRICES:
+        return DEFAULT_START_PRICES[instrument]
+
+    def usd_value(currency: str) -> Optional[float]:
+        if currency == "USD":
+            return 1.0
+        if f"{currency}_USD" in DEFAULT_START_PRICES:
+            return DEFAULT_START_PRICES[f"{currency}_USD"]
+        if f"USD_{currency}" in DEFAULT_START_PRICES:
+            return 1.0 / DEFAULT_START_PRICES[f"USD_{currency}"]
+        return None
+
+    base, quote = (usd_value(c) for c in instrument.split("_"))
+    return base / quote if base and quote else 1.0
+
+
+def _pip(instrument: str) -> float:
+    return 0.01 if instrument.endswith("_JPY") else 0.0001
+
+
+def _fmt(instrument: str, price: float) -> str:
+    return f"{price:.3f}" if instrument.endswith("_JPY") else f"{price:.5f}"
+
+
+class SimClock:
+    """Simulated broker clock: starts at `start` and runs `speed`x wall time"""
+
+    def __init__(self, speed: float = 1.0, start: Optional[float] = None):
+        self.speed = speed
+        self.start = time.time() if start is None else start
+        self._t0 = time.monotonic()
+
+    def now(self) -> float:
+        return self.start + (time.monotonic() - self._t0) * self.speed
+
+
+class PricePath:
+    """
+    Mid-price path on a fixed tick grid (origin + i * tick_s).
+
+    Synthetic paths extend lazily with a seeded random walk; recorded paths
+    hold their last price once the recording runs out.
+    """
+
+    def __init__(self, instrument: str, mids: np.ndarray, origin: float, tick_s: float,
+                 spread_pips: float = 1.5, rng: Optional[np.random.Generator] = None,
+                 volatility: float = 0.0):
+        self.instrument = instrument
+        self.mids = np.asarray(mids, dtype=np.float64)
+        self.origin = origin
+        self.tick_s = tick_s
+        self.spread = spread_pips * _pip(instrument)
+        self.rng = rng
+        self.volatility = volatility  # per-tick log-return std (synthetic only)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def synthetic(cls, instrument: str, start_time: float, history_s: float = 30 * 86400,
+                  tick_s: float = 15.0, start_price: Optional[float] = None,
+                  annual_vol: float = 0.08, seed: int = 42, spread_pips: float = 1.5) -> "PricePath":
+        price = start_price or _start_price(instrument)
+        per_tick_vol = annual_vol * math.sqrt(tick_s / (365 * 86400))
+        rng = np.random.default_rng([seed, zlib.crc32(instrument.encode())])  # stable per instrument
+        path = cls(instrument, np.array([price]), start_time - history_s, tick_s,
+                   spread_pips=spread_pips, rng=rng, volatility=per_tick_vol)
+        path._ensure(int(history_s / tick_s))
+        return path
+
+    def _ensure(self, index: int):
+        """Extend the path so mids[index] exists"""
+        with self._lock:
+            missing = index + 1 - len(self.mids)
+            if missing <= 0:
+                return
+            if self.rng is None:
+                tail = np.full(missing, self.mids[-1])
+            else:
+                steps = self.rng.normal(0.0, self.volatility, missing)
+                tail = self.mids[-1] * np.exp(np.cumsum(steps))
+            self.mids = np.concatenate([self.mids, tail])
+
+    def index_at(self, t: float) -> int:
+        return max(0, int((t - self.origin) // self.tick_s))
+
+    def mid_at(self, t: float) -> float:
+        idx = self.index_at(t)
+        self._ensure(idx)
+        return float(self.mids[idx])
+
+    def quote(self, t: float) -> Tuple[float, float]:
+        mid = self.mid_at(t)
+        return mid - self.spread / 2, mid + self.spread / 2
+
+    def candles(self, now: float, granularity: str, count: Optional[int] = None,
+                from_time: Optional[float] = None, include_first: bool = True) -> List[Dict[str, Any]]:
+        """v20 mid candles ending with the (incomplete) bar that contains `now`"""
+        step = GRANULARITY_SECONDS[granularity]
+        current = math.floor(now / step) * step
+        if from_time is not None:
+            first = math.ceil(from_time / step) * step
+            if not include_first and first == from_time:
+                first += step
+            n = int((current - first) // step) + 1
+            if count:
+                n = min(n, count)
+        else:
+            n = count or 500
+            first = current - (n - 1) * step
+        n = max(0, min(n, MAX_CANDLES))
+        if n == 0:
+            return []
+
+        starts = first + step * np.arange(n)
+        begin = np.maximum(((starts - self.origin) // self.tick_s).astype(np.int64), 0)
+        end_idx = self.index_at(now)
+        self._ensure(end_idx)
+        end = np.minimum(((starts + step - self.origin) // self.tick_s).astype(np.int64), end_idx + 1)
+        end = np.maximum(end, begin + 1)
+
+        mids = self.mids
+        segment = mids[begin[0]:end[-1]]
+        offsets = begin - begin[0]
+        highs = np.maximum.reduceat(segment, offsets)
+        lows = np.minimum.reduceat(segment, offsets)
+        opens = mids[begin]
+        closes = mids[end - 1]
+        volumes = end - begin
+
+        out = []
+        for i in range(n):
+            start = float(starts[i])
+            out.append({
+                "complete": start + step <= now,
+                "volume": int(volumes[i]),
+                "time": _rfc3339(start),
+                "mid": {
+                    "o": _fmt(self.instrument, opens[i]),
+                    "h": _fmt(self.instrument, highs[i]),
+                    "l": _fmt(self.instrument, lows[i]),
+                    "c": _fmt(self.instrument, closes[i]),
+                },
+            })
+        return out
+
+
+def load_recorded_paths(csv_path: str, tick_s: float = 15.0, spread_pips: float = 1.5) -> Tuple[Dict[str, PricePath], float]:
+    """
+    Load a recording with columns time,instrument and mid (or bid,ask).
+
+    Returns (paths, first recorded time) - start the SimClock at that time to
+    replay the recording from its beginning.
+    """
+    rows: Dict[str, List[Tuple[float, float]]] = {}
+    with open(csv_path, newline="") as f:
+        for row in csv.DictReader(f):
+            if row.get("mid"):
+                mid = float(row["mid"])
+            else:
+                mid = (float(row["bid"]) + float(row["ask"])) / 2
+            rows.setdefault(row["instrument"], []).append((_parse_time(row["time"]), mid))
+    if not rows:
+        raise ValueError(f"No price rows in {csv_path}")
+
+    origin = min(min(t for t, _ in points) for points in rows.values())
+    paths = {}
+    for instrument, points in rows.items():
+        points.sort()
+        times = np.array([p[0] for p in points])
+        mids = np.array([p[1] for p in points])
+        grid = origin + tick_s * np.arange(int((times[-1] - origin) // tick_s) + 1)
+        # Forward-fill the recording onto the tick grid
+        idx = np.clip(np.searchsorted(times, grid, side="right") - 1, 0, len(mids) - 1)
+        paths[instrument] = PricePath(instrument, mids[idx], origin, tick_s, spread_pips=spread_pips)
+    return paths, origin
+
+
+@dataclass
+class FaultConfig:
+    """Injected latency and failures, optionally limited to some routes"""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0          # Fraction of requests answered with error_status
+    error_status: int = 503
+    drop_rate: float = 0.0           # Fraction of connections closed without a response
+    routes: Optional[FrozenSet[str]] = None  # None = every route
+    seed: int = 7
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    def applies(self, route: str) -> bool:
+        return self.routes is None or route in self.routes
+
+    def delay_s(self) -> float:
+        with self._lock:
+            jitter = self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return (self.latency_ms + jitter) / 1000.0
+
+    def roll(self) -> Optional[str]:
+        """'drop', 'error' or None for this request"""
+        with self._lock:
+            r = self._rng.random()
+        if r < self.drop_rate:
+            return "drop"
+        if r < self.drop_rate + self.error_rate:
+            return "error"
+        return None
+
+
+class StandInError(Exception):
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.body = {"errorCode": code, "errorMessage": message}
+
+
+class SimAccount:
+    """Single simulated v20 account: pending orders, open trades, balance"""
+
+    MARGIN_RATE = 0.02  # 50:1
+    # Instruments margined above the account rate (the higher rate applies), like ESMA minor crosses
+    INSTRUMENT_MARGIN_RATES = {"GBP_JPY": 0.05, "EUR_AUD": 0.05, "GBP_AUD": 0.05}
+
+    def __init__(self, account_id: str, balance: float, quote_fn, clock: SimClock):
+        self.account_id = account_id
+        self.balance = balance
+        self.quote_fn = quote_fn  # instrument -> (bid, ask)
+        self.clock = clock
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.trades: Dict[str, Dict[str, Any]] = {}
+        self.closed_trades: Dict[str, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self.last_transaction_id = "0"
+        self.transactions: List[Dict[str, Any]] = []
+        self._lock = threading.RLock()
+
+    def _txn(self, kind: str, **fields) -> Dict[str, Any]:
+        txn_id = str(next(self._ids))
+        self.last_transaction_id = txn_id
+        txn = dict(id=txn_id, type=kind, accountID=self.account_id,
+                   time=_rfc3339(self.clock.now()), **fields)
+        self.transactions.append(txn)
+        return txn
+
+    def transactions_since(self, txn_id: int) -> Tuple[List[Dict[str, Any]], str]:
+        """Transactions after txn_id plus the last transaction ID, read atomically"""
+        with self._lock:
+            # ids are 1-based and contiguous, so the log index is id - 1
+            return [dict(t) for t in self.transactions[txn_id:]], self.last_transaction_id
+
+    def _usd_rate(self, currency: str) -> float:
+        if currency == "USD":
+            return 1.0
+        for instrument, invert in ((f"{currency}_USD", False), (f"USD_{currency}", True)):
+            try:
+                bid, ask = self.quote_fn(instrument)
+            except StandInError:
+                continue
+            mid = (bid + ask) / 2
+            return 1.0 / mid if invert else mid
+        return 1.0
+
+    def _pl_usd(self, instrument: str, units: float, entry: float, exit_price: float) -> float:
+        return units * (exit_price - entry) * self._usd_rate(instrument.split("_")[1])
+
+    # --- orders ---------------------------------------------------------------------------
+    def create_order(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        order = body.get("order") or {}
+        kind = order.get("type")
+        instrument = order.get("instrument")
+        try:
+            units = int(float(order.get("units", "0")))
+        except ValueError:
+            units = 0
+        if kind not in ("MARKET", "LIMIT") or not instrument or units == 0:
+            raise StandInError(400, "INVALID_ORDER", f"Unsupported order {kind} {instrument} {units}")
+        self.quote_fn(instrument)  # 400 for unknown instruments
+
+        with self._lock:
+            create = self._txn(f"{kind}_ORDER", instrument=instrument, units=str(units),
+                               reason="CLIENT_ORDER", **{k: v for k, v in order.items()
+                                                         if k not in ("type", "instrument", "units")})
+            response = {"orderCreateTransaction": create}
+            pending = {
+                "id": create["id"], "type": kind, "instrument": instrument, "units": str(units),
+                "state": "PENDING", "createTime": create["time"], "timeInForce": order.get("timeInForce", "GTC"),
+                "takeProfitOnFill": order.get("takeProfitOnFill"), "stopLossOnFill": order.get("stopLossOnFill"),
+            }
+            if kind == "LIMIT":
+                pending["price"] = order.get("price")
+                if order.get("gtdTime"):
+                    pending["gtdTime"] = order["gtdTime"]
+                self.orders[create["id"]] = pending
+            else:
+                response["orderFillTransaction"] = self._fill(pending)
+            response["lastTransactionID"] = self.last_transaction_id
+            return response
+
+    def _fill(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        instrument = order["instrument"]
+        units = int(order["units"])
+        bid, ask = self.quote_fn(instrument)
+        price = ask if units > 0 else bid
+        fill = self._txn("ORDER_FILL", orderID=order["id"], instrument=instrument, units=str(units),
+                         price=_fmt(instrument, price), reason=f"{order['type']}_ORDER")
+        trade = {
+            "id": fill["id"], "instrument": instrument, "price": _fmt(instrument, price),
+            "openTime": fill["time"], "initialUnits": str(units), "currentUnits": str(units),
+            "state": "OPEN", "realizedPL": "0.0000",
+        }
+        for key, name in (("takeProfitOnFill", "takeProfitOrder"), ("stopLossOnFill", "stopLossOrder")):
+            if order.get(key) and order[key].get("price"):
+                trade[name] = self._dependent_order(name, trade["id"], order[key]["price"])
+        self.trades[trade["id"]] = trade
+        order["state"] = "FILLED"
+        fill["tradeOpened"] = {"tradeID": trade["id"], "units": str(units), "price": trade["price"],
+                               "initialMarginRequired": f"{self._margin(trade):.4f}"}
+        return fill
+
+    def _dependent_order(self, name: str, trade_id: str, price: str) -> Dict[str, Any]:
+        kind = "TAKE_PROFIT" if name == "takeProfitOrder" else "STOP_LOSS"
+        txn = self._txn(f"{kind}_ORDER", tradeID=trade_id, price=str(price), timeInForce="GTC")
+        return {"id": txn["id"], "type": kind, "tradeID": trade_id, "price": str(price),
+                "state": "PENDING", "timeInForce": "GTC", "createTime": txn["time"]}
+
+    def cancel_order(self, order_id: str) -> Dict[str, Any]:
+        with self._lock:
+            order = self.orders.pop(order_id, None)
+            if order is None:
+                raise StandInError(404, "ORDER_DOESNT_EXIST", f"Order {order_id} does not exist")
+            order["state"] = "CANCELLED"
+            txn = self._txn("ORDER_CANCEL", orderID=order_id, reason="CLIENT_REQUEST")
+            return {"orderCancelTransaction": txn, "lastTransactionID": self.last_transaction_id}
+
+    def list_orders(self, state: str = "PENDING") -> List[Dict[str, Any]]:
+        with self._lock:
+            orders = [dict(o) for o in self.orders.values() if state in ("ALL", o["state"])]
+            for trade in self.trades.values():
+                for name in ("takeProfitOrder", "stopLossOrder"):
+                    if trade.get(name) and state in ("ALL", "PENDING"):
+                        orders.append(dict(trade[name]))
+            return orders
+
+    # --- trades / positions ---------------------------------------------------------------
+    def _unrealized(self, trade: Dict[str, Any]) -> float:
+        bid, ask = self.quote_fn(trade["instrument"])
+        units = int(trade["currentUnits"])
+        return self._pl_usd(trade["instrument"], units, float(trade["price"]), bid if units > 0 else ask)
+
+    def list_trades(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(t, unrealizedPL=f"{self._unrealized(t):.4f}", marginUsed=f"{self._margin(t):.4f}")
+                    for t in self.trades.values()]
+
+    def _margin(self, trade: Dict[str, Any]) -> float:
+        instrument = trade["instrument"]
+        rate = max(self.MARGIN_RATE, self.INSTRUMENT_MARGIN_RATES.get(instrument, 0.0))
+        return abs(int(trade["currentUnits"])) * self._usd_rate(instrument.split("_")[0]) * rate
+
+    def _close_trade(self, trade: Dict[str, Any], reason: str) -> Dict[str, Any]:
+        instrument = trade["instrument"]
+        units = int(trade["currentUnits"])
+        bid, ask = self.quote_fn(instrument)
+        exit_price = bid if units > 0 else ask
+        pl = self._pl_usd(instrument, units, float(trade["price"]), exit_price)
+        self.balance += pl
+        del self.trades[trade["id"]]
+        self.closed_trades[trade["id"]] = dict(trade, state="CLOSED", currentUnits="0",
+                                               realizedPL=f"{float(trade.get('realizedPL') or 0) + pl:.4f}")
+        return self._txn("ORDER_FILL", instrument=instrument, units=str(-units), price=_fmt(instrument, exit_price),
+                         reason=reason, pl=f"{pl:.4f}", accountBalance=f"{self.balance:.4f}",
+                         tradesClosed=[{"tradeID": trade["id"], "units": str(-units), "realizedPL": f"{pl:.4f}"}])
+
+    def get_trade(self, trade_id: str) -> Dict[str, Any]:
+        with self._lock:
+            trade = self.trades.get(trade_id)
+            if trade is not None:
+                return dict(trade, unrealizedPL=f"{self._unrealized(trade):.4f}", marginUsed=f"{self._margin(trade):.4f}")
+            if trade_id in self.closed_trades:
+                return dict(self.closed_trades[trade_id])
+            raise StandInError(404, "TRADE_DOESNT_EXIST", f"Trade {trade_id} does not exist")
+
+    def set_trade_orders(self, trade_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            trade = self.trades.get(trade_id)
+            if trade is None:
+                raise StandInError(404, "TRADE_DOESNT_EXIST", f"Trade {trade_id} does not exist")
+            response = {}
+            for key, name in (("takeProfit", "takeProfitOrder"), ("stopLoss", "stopLossOrder")):
+                if key in body:
+                    if body[key] and body[key].get("price"):
+                        trade[name] = self._dependent_order(name, trade_id, body[key]["price"])
+                        response[f"{key}OrderTransaction"] = dict(trade[name])
+                    else:
+                        trade.pop(name, None)
+            response["lastTransactionID"] = self.last_transaction_id
+            return response
+
+    def open_positions(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            positions: Dict[str, Dict[str, Any]] = {}
+            for trade in self.trades.values():
+                pos = positions.setdefault(trade["instrument"], {
+                    "instrument": trade["instrument"],
+                    "long": {"units": 0, "cost": 0.0, "unrealizedPL": 0.0, "tradeIDs": []},
+                    "short": {"units": 0, "cost": 0.0, "unrealizedPL": 0.0, "tradeIDs": []},
+                })
+                units = int(trade["currentUnits"])
+                side = pos["long"] if units > 0 else pos["short"]
+                side["units"] += units
+                side["cost"] += units * float(trade["price"])
+                side["unrealizedPL"] += self._unrealized(trade)
+                side["tradeIDs"].append(trade["id"])
+
+            out = []
+            for instrument, pos in positions.items():
+                total_upl = 0.0
+                for side_name in ("long", "short"):
+                    side = pos[side_name]
+                    units, cost, upl = side.pop("units"), side.pop("cost"), side.pop("unrealizedPL")
+                    total_upl += upl
+                    side["units"] = str(units)
+                    side["unrealizedPL"] = f"{upl:.4f}"
+                    if units:
+                        side["averagePrice"] = _fmt(instrument, cost / units)
+                pos["unrealizedPL"] = f"{total_upl:.4f}"
+                out.append(pos)
+            return out
+
+    def close_position(self, instrument: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            response = {}
+            closed_any = False
+            for key, sign, name in (("longUnits", 1, "longOrderFillTransaction"),
+                                    ("shortUnits", -1, "shortOrderFillTransaction")):
+                if body.get(key, "NONE") != "ALL":
+                    continue
+                targets = [t for t in list(self.trades.values())
+                           if t["instrument"] == instrument and int(t["currentUnits"]) * sign > 0]
+                fills = [self._close_trade(t, "MARKET_ORDER_POSITION_CLOSEOUT") for t in targets]
+                if fills:
+                    closed_any = True
+                    response[name] = fills[-1] if len(fills) == 1 else dict(
+                        fills[-1], tradesClosed=[c for f in fills for c in f["tradesClosed"]])
+            if not closed_any:
+                raise StandInError(400, "CLOSEOUT_POSITION_DOESNT_EXIST",
+                                   f"No position to close for {instrument}")
+            response["lastTransactionID"] = self.last_transaction_id
+            return response
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            upl = 0.0
+            margin = 0.0
+            for trade in self.trades.values():
+                upl += self._unrealized(trade)
+                margin += self._margin(trade)
+            nav = self.balance + upl
+            return {
+                "id": self.account_id, "currency": "USD",
+                "balance": f"{self.balance:.4f}", "NAV": f"{nav:.4f}",
+                "unrealizedPL": f"{upl:.4f}", "marginUsed": f"{margin:.4f}",
+                "marginAvailable": f"{max(0.0, nav - margin):.4f}",
+                "openTradeCount": len(self.trades),
+                "openPositionCount": len({t["instrument"] for t in self.trades.values()}),
+                "pendingOrderCount": len(self.orders),
+                "lastTransactionID": self.last_transaction_id,
+            }
+
+    def details(self) -> Dict[str, Any]:
+        """Full account (GET /v3/accounts/{id}): summary plus trades, orders and positions"""
+        with self._lock:
+            return dict(self.summary(), marginRate=str(self.MARGIN_RATE), trades=self.list_trades(),
+                        orders=self.list_orders(), positions=self.open_positions())
+
+    # --- market events --------------------------------------------------------------------
+    def process(self):
+        """Fill/expire pending LIMIT orders and trigger SL/TP at the current quotes"""
+        now = self.clock.now()
+        with self._lock:
+            for order in list(self.orders.values()):
+                gtd = order.get("gtdTime")
+                if gtd and _parse_time(gtd) <= now:
+                    del self.orders[order["id"]]
+                    order["state"] = "CANCELLED"
+                    self._txn("ORDER_CANCEL", orderID=order["id"], reason="TIME_IN_FORCE_EXPIRED")
+                    continue
+                bid, ask = self.quote_fn(order["instrument"])
+                limit = float(order["price"])
+                if (int(order["units"]) > 0 and ask <= limit) or (int(order["units"]) < 0 and bid >= limit):
+                    del self.orders[order["id"]]
+                    self._fill(order)
+
+            for trade in list(self.trades.values()):
+                bid, ask = self.quote_fn(trade["instrument"])
+                long_side = int(trade["currentUnits"]) > 0
+                exit_price = bid if long_side else ask
+                sl = trade.get("stopLossOrder")
+                tp = trade.get("takeProfitOrder")
+                if sl and ((long_side and exit_price <= float(sl["price"])) or
+                           (not long_side and exit_price >= float(sl["price"]))):
+                    self._close_trade(trade, "STOP_LOSS_ORDER")
+                elif tp and ((long_side and exit_price >= float(tp["price"])) or
+                             (not long_side and exit_price <= float(tp["price"]))):
+                    self._close_trade(trade, "TAKE_PROFIT_ORDER")
+
+
+_ROUTES = [
+    ("GET", r"/v3/instruments/(?P<instrument>[A-Z0-9_]+)/candles", "candles"),
+    ("GET", r"/v3/accounts/(?P<account>[^/]+)/pricing/stream", "stream"),
+    ("GET", r"/v3/accounts/(?P<account>[^/]+)/pricing", "pricing"),
+    ("GET", r"/v3/accounts/(?P<account>[^/]+)/transactions/stream", "transactions_stream"),
+    ("GET", r"/v3/accounts/(?P<account>[^/]+)(?P<summary>/summary)?", "account"),
+    ("GET", r"/v3/accounts/(?P<account>[^/]+)/(pendingOrders|orders)", "orders"),
+    ("POST", r"/v3/accounts/(?P<account>[^/]+)/orders", "order_create"),
+    ("PUT", r"/v3/accounts/(?P<account>[^/]+)/orders/(?P<order_id>[^/]+)/cancel", "order_cancel"),
+    ("GET", r"/v3/accounts/(?P<account>[^/]+)/(openTrades|trades)", "trades"),
+    ("GET", r"/v3/accounts/(?P<account>[^/]+)/trades/(?P<trade_id>[^/]+)", "trade"),
+    ("PUT", r"/v3/accounts/(?P<account>[^/]+)/trades/(?P<trade_id>[^/]+)/orders", "trade_orders"),
+    ("GET", r"/v3/accounts/(?P<account>[^/]+)/(openPositions|positions)", "positions"),
+    ("PUT", r"/v3/accounts/(?P<account>[^/]+)/positions/(?P<instrument>[A-Z0-9_]+)/close", "position_close"),
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients see warm reuse
+    server: "_StandInHTTPServer"
+
+    def log_message(self, fmt, *args):
+        logger.debug("standin %s - " + fmt, self.address_string(), *args)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def _dispatch(self, method: str):
+        standin = self.server.standin
+        parts = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        route, match = None, None
+        for route_method, pattern, name in _ROUTES:
+            if route_method == method:
+                match = re.fullmatch(pattern, parts.path)
+                if match:
+                    route = name
+                    break
+        if route is None:
+            return self._send(404, {"errorMessage": f"No stand-in route for {method} {parts.path}"})
+        if not (self.headers.get("Authorization") or "").startswith("Bearer "):
+            return self._send(401, {"errorMessage": "Insufficient authorization to perform request."})
+
+        standin.count(route)
+        faults = standin.faults
+        if faults.applies(route):
+            delay = faults.delay_s()
+            if delay:
+                time.sleep(delay)
+            outcome = faults.roll()
+            if outcome == "drop":
+                standin.count("dropped")
+                self.close_connection = True
+                self.connection.close()
+                return
+            if outcome == "error":
+                standin.count("injected_errors")
+                return self._send(faults.error_status, {"errorMessage": "Injected stand-in failure"})
+
+        if route == "stream":
+            return self._stream(query)
+        if route == "transactions_stream":
+            return self._transactions_stream()
+        try:
+            body = json.loads(raw) if raw else {}
+            status, payload = standin.handle(route, match.groupdict(), query, body)
+        except StandInError as e:
+            status, payload = e.status, e.body
+        except (ValueError, KeyError) as e:
+            status, payload = 400, {"errorMessage": f"Bad request: {e}"}
+        self._send(status, payload)
+
+    def _send(self, status: int, payload: Dict[str, Any]):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _open_stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self.close_connection = True
+
+    def _write_lines(self, lines: List[str]):
+        if not lines:
+            return
+        chunk = ("\n".join(lines) + "\n").encode()
+        self.wfile.write(f"{len(chunk):X}\r\n".encode() + chunk + b"\r\n")
+        self.wfile.flush()
+
+    def _stream(self, query: Dict[str, str]):
+        standin = self.server.standin
+        instruments = []
+        for instrument in (i for i in query.get("instruments", "").split(",") if i):
+            try:
+                standin.path(instrument)
+                instruments.append(instrument)
+            except StandInError:
+                logger.warning(f"Pricing stream: skipping unknown instrument {instrument}")
+        self._open_stream()
+        last_heartbeat = time.monotonic()
+        try:
+            while not standin.stopping.is_set():
+                lines = [json.dumps(standin.price_message(i)) for i in instruments]
+                if time.monotonic() - last_heartbeat >= standin.heartbeat_s:
+                    lines.append(json.dumps({"type": "HEARTBEAT", "time": _rfc3339(standin.clock.now())}))
+                    last_heartbeat = time.monotonic()
+                self._write_lines(lines)
+                standin.stopping.wait(standin.stream_interval_s)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+
+    def _transactions_stream(self):
+        """Every transaction created after the stream opened, plus HEARTBEATs carrying lastTransactionID"""
+        standin = self.server.standin
+        account = standin.account
+        cursor = int(account.last_transaction_id)
+        self._open_stream()
+        last_heartbeat = time.monotonic()
+        try:
+            while not standin.stopping.is_set():
+                account.process()  # fills, expiries and SL/TP triggers happen without REST traffic
+                txns, last_id = account.transactions_since(cursor)
+                cursor = int(last_id)
+                lines = [json.dumps(txn) for txn in txns]
+                if time.monotonic() - last_heartbeat >= standin.heartbeat_s:
+                    lines.append(json.dumps({"type": "HEARTBEAT", "lastTransactionID": last_id,
+                                             "time": _rfc3339(standin.clock.now())}))
+                    last_heartbeat = time.monotonic()
+                self._write_lines(lines)
+                standin.stopping.wait(standin.stream_interval_s)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    standin: "OandaStandIn"
+
+
+class OandaStandIn:
+    """
+    Local OANDA v20 stand-in.
+
+    Point OandaConnector(api_base=standin.base_url) (or OANDA_API_BASE /
+    OANDA_STREAM_BASE, or the engine's --api-base flag) at it.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 instruments: Optional[List[str]] = None, speed: float = 1.0,
+                 faults: Optional[FaultConfig] = None, paths: Optional[Dict[str, PricePath]] = None,
+                 clock: Optional[SimClock] = None, seed: int = 42, balance: float = 100000.0,
+                 account_id: str = "101-001-0000000-001", stream_interval_s: float = 0.25,
+                 heartbeat_s: float = 5.0):
+        """
+        Args:
+            host, port: Bind address (port 0 picks a free port)
+            instruments: Synthetic instruments built up front (default: DEFAULT_START_PRICES
+                         keys); ignored for instruments present in `paths`; any other
+                         well-formed pair is built on first request
+            speed: Simulated seconds per wall second
+            faults: Latency/error injection (default: none)
+            paths: Pre-built PricePaths, e.g. from load_recorded_paths()
+            clock: Simulated clock (default: starts now at `speed`)
+            seed: Seed for synthetic paths
+            balance: Starting account balance (USD)
+            stream_interval_s: Wall seconds between pricing/transaction stream updates
+            heartbeat_s: Wall seconds between stream heartbeats
+        """
+        self.clock = clock or SimClock(speed)
+        self.faults = faults or FaultConfig()
+        self.seed = seed
+        self.paths: Dict[str, PricePath] = dict(paths or {})
+        self._paths_lock = threading.Lock()
+        for instrument in instruments or list(DEFAULT_START_PRICES):
+            if instrument not in self.paths:
+                self.paths[instrument] = PricePath.synthetic(instrument, self.clock.now(), seed=seed)
+        self.account = SimAccount(account_id, balance, self.quote, self.clock)
+        self.stream_interval_s = stream_interval_s
+        self.heartbeat_s = heartbeat_s
+        self.stopping = threading.Event()
+
+        self._counts: Dict[str, int] = {}
+        self._count_lock = threading.Lock()
+        self._httpd = _StandInHTTPServer((host, port), _Handler)
+        self._httpd.standin = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def path(self, instrument: str) -> PricePath:
+        """Price path of an instrument; a well-formed pair without one gets a synthetic path"""
+        path = self.paths.get(instrument)
+        if path is not None:
+            return path
+        if not _INSTRUMENT.match(instrument):
+            raise StandInError(400, "INVALID_INSTRUMENT", f"Unknown instrument {instrument}")
+        with self._paths_lock:
+            path = self.paths.get(instrument)
+            if path is None:
+                path = PricePath.synthetic(instrument, self.clock.now(), seed=self.seed)
+                self.paths[instrument] = path
+        return path
+
+    def quote(self, instrument: str) -> Tuple[float, float]:
+        """Current bid/ask of an instrument that already has a path"""
+        path = self.paths.get(instrument)
+        if path is None:
+            raise StandInError(400, "INVALID_INSTRUMENT", f"Unknown instrument {instrument}")
+        return path.quote(self.clock.now())
+
+    def price_message(self, instrument: str) -> Dict[str, Any]:
+        bid, ask = self.path(instrument).quote(self.clock.now())
+        bid_s, ask_s = _fmt(instrument, bid), _fmt(instrument, ask)
+        return {
+            "type": "PRICE", "instrument": instrument, "time": _rfc3339(self.clock.now()),
+            "tradeable": True, "status": "tradeable",
+            "bids": [{"price": bid_s, "liquidity": 10000000}],
+            "asks": [{"price": ask_s, "liquidity": 10000000}],
+            "closeoutBid": bid_s, "closeoutAsk": ask_s,
+        }
+
+    def count(self, key: str):
+        with self._count_lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._count_lock:
+            counts = dict(self._counts)
+        return {"requests": counts, "sim_time": _rfc3339(self.clock.now()),
+                "account": self.account.summary()}
+
+    def handle(self, route: str, args: Dict[str, str], query: Dict[str, str],
+               body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Route a parsed request to the simulated broker"""
+        if route == "candles":
+            instrument = args["instrument"]
+            path = self.path(instrument)
+            granularity = query.get("granularity", "S5")
+            if granularity not in GRANULARITY_SECONDS:
+                raise StandInError(400, "INVALID_GRANULARITY", f"Unsupported granularity {granularity}")
+            count = int(query["count"]) if "count" in query else None
+            from_time = _parse_time(query["from"]) if "from" in query else None
+            candles = path.candles(
+                self.clock.now(), granularity, count=count, from_time=from_time,
+                include_first=query.get("includeFirst", "true").lower() != "false",
+            )
+            return 200, {"instrument": instrument, "granularity": granularity, "candles": candles}
+
+        self.account.process()
+        if route == "pricing":
+            instruments = [i for i in query.get("instruments", "").split(",") if i]
+            return 200, {"prices": [self.price_message(i) for i in instruments],
+                         "time": _rfc3339(self.clock.now())}
+        if route == "account":
+            account = self.account.summary() if args.get("summary") else self.account.details()
+            return 200, {"account": account,
+                         "lastTransactionID": self.account.last_transaction_id}
+        if route == "orders":
+            return 200, {"orders": self.account.list_orders(query.get("state", "PENDING")),
+                         "lastTransactionID": self.account.last_transaction_id}
+        if route == "order_create":
+            instrument = (body.get("order") or {}).get("instrument")
+            if instrument:
+                self.path(instrument)
+            return 201, self.account.create_order(body)
+        if route == "order_cancel":
+            return 200, self.account.cancel_order(args["order_id"])
+        if route == "trades":
+            return 200, {"trades": self.account.list_trades(),
+                         "lastTransactionID": self.account.last_transaction_id}
+        if route == "trade":
+            return 200, {"trade": self.account.get_trade(args["trade_id"]),
+                         "lastTransactionID": self.account.last_transaction_id}
+        if route == "trade_orders":
+            return 200, self.account.set_trade_orders(args["trade_id"], body)
+        if route == "positions":
+            return 200, {"positions": self.account.open_positions(),
+                         "lastTransactionID": self.account.last_transaction_id}
+        if route == "position_close":
+            return 200, self.account.close_position(args["instrument"], body)
+        raise StandInError(404, "NOT_FOUND", route)
+
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted"""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self.stopping.set()
+            self._httpd.server_close()
+
+    def start(self) -> "OandaStandIn":
+        """Serve in a background thread"""
+        self.stopping.clear()
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="oanda-standin", daemon=True)
+        self._thread.start()
+        logger.info(f"OANDA v20 stand-in listening on {self.base_url} (speed={self.clock.speed}x)")
+        return self
+
+    def stop(self):
+        self.stopping.set()
+        if self._thread:
+            self._httpd.shutdown()
+            self._thread.join(timeout=2)
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OANDA v20 stand-in for offline load/latency testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--speed", type=float, default=1.0, help="Simulated seconds per wall second")
+    parser.add_argument("--instruments", default=",".join(DEFAULT_START_PRICES),
+                        help="Comma-separated synthetic instruments")
+    parser.add_argument("--replay", help="CSV recording (time,instrument,mid or bid,ask) to replay")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--fault-routes", help="Comma-separated routes to inject faults on (default: all)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    paths, clock = None, None
+    if args.replay:
+        paths, first_time = load_recorded_paths(args.replay)
+        clock = SimClock(args.speed, start=first_time)
+    faults = FaultConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        error_status=args.error_status, drop_rate=args.drop_rate, seed=args.seed,
+        routes=frozenset(args.fault_routes.split(",")) if args.fault_routes else None,
+    )
+    standin = OandaStandIn(
+        host=args.host, port=args.port, speed=args.speed, faults=faults, paths=paths, clock=clock,
+        instruments=None if paths else args.instruments.split(","), seed=args.seed,
+    )
+    print(f"OANDA v20 stand-in on {standin.base_url}  (OANDA_API_BASE={standin.base_url})")
+    try:
+        standin.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import numpy as np
+
+from data.brokers.bar_memo import BarMemo, bar_time_ns
+from data.brokers.candle_cache import CandleCache
+from data.brokers.candle_frame import decode_candles
+from data.oanda.strategies.bullish_wolf import BullishWolf
+from logic.regime_detector import StochasticRegimeDetector
+from logic.smart_logic import SmartLogicFilter
+
+
+def _candles(n, complete_last=True, seed=4):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0005, n))
+    return [{"time": f"2026-01-01T{i // 4:02d}:{i % 4 * 15:02d}:00Z", "volume": 100 + i,
+             "complete": complete_last or i < n - 1,
+             "mid": {"o": str(c), "h": str(c + 0.0002), "l": str(c - 0.0002), "c": str(c)}}
+            for i, c in enumerate(close)]
+
+
+def test_lru_expiry_and_counters():
+    memo = BarMemo(max_entries=2)
+    calls = []
+
+    def compute(value):
+        return lambda: calls.append(value) or value
+
+    assert memo.get_or_compute("regime", "EUR_USD", "M15", "2026-01-01T00:00:00Z", "cfg", compute("a")) == "a"
+    assert memo.get_or_compute("regime", "EUR_USD", "M15", bar_time_ns("2026-01-01T00:00:00Z"), "cfg",
+                               compute("b")) == "a"
+    memo.get_or_compute("regime", "GBP_USD", "M15", "2026-01-01T00:00:00Z", "cfg", compute("c"))
+    memo.get_or_compute("regime", "USD_JPY", "M15", "2026-01-01T00:00:00Z", "cfg", compute("d"))
+    assert memo.stats()["evictions"] == 1 and memo.stats()["entries"] == 2
+
+    # The next closed bar expires the previous bar's results for that series only
+    memo.on_candles("USD_JPY", "M15", [{"time": "2026-01-01T00:15:00Z", "complete": True},
+                                       {"time": "2026-01-01T00:30:00Z", "complete": False}], False)
+    assert memo.stats()["expirations"] == 1
+    assert memo.get_or_compute("regime", "GBP_USD", "M15", "2026-01-01T00:00:00Z", "cfg", compute("e")) == "c"
+    assert calls == ["a", "c", "d"]
+    assert memo.stats()["by_kind"]["regime"] == {"hits": 2, "misses": 3}
+
+
+def test_smart_logic_scores_reused_within_bar():
+    memo = BarMemo()
+    smart_filter = SmartLogicFilter(memo=memo)
+    frame = decode_candles(_candles(60))
+    entry = float(frame.close[-1])
+    signal = {"symbol": "EUR_USD", "direction": "buy", "entry_price": entry, "target_price": entry + 0.01,
+              "stop_loss": entry - 0.003, "swing_high": entry + 0.002, "swing_low": entry - 0.004,
+              "candles": frame}
+
+    first = smart_filter.validate_signal(signal)
+    again = smart_filter.validate_signals([signal, dict(signal, direction="sell", target_price=entry - 0.01,
+                                                        stop_loss=entry + 0.003)])
+    assert memo.stats()["by_kind"]["smart_logic"] == {"hits": 1, "misses": 2}
+    assert again[0].filter_scores == first.filter_scores and again[0].score == first.score
+
+    # A forming last bar is never memoized
+    forming = dict(signal, candles=decode_candles(_candles(60, complete_last=False)))
+    smart_filter.validate_signal(forming)
+    assert memo.stats()["misses"] == 2
+
+
+def test_regime_and_wolf_memoized_per_closed_bar():
+    memo = BarMemo()
+    detector = StochasticRegimeDetector(memo=memo)
+    frame = decode_candles(_candles(80))
+    assert detector.detect_regime(frame, symbol="EUR_USD") is detector.detect_regime(frame, symbol="EUR_USD")
+    detector.detect_regime(frame)  # No symbol: computed, not cached
+    assert memo.stats()["by_kind"]["regime"] == {"hits": 1, "misses": 1}
+
+    wolf = BullishWolf()
+    first = wolf.generate_trade_signal(frame, symbol="EUR_USD")
+    second = wolf.generate_trade_signal(frame, symbol="EUR_USD")
+    assert second == first and second is not first
+    fresh = wolf.generate_trade_signal(frame)
+    assert {k: v for k, v in second.items() if k != "timestamp"} == \
+        {k: v for k, v in fresh.items() if k != "timestamp"}
+
+
+def test_candle_cache_merge_expires_memo():
+    memo, cache = BarMemo(), CandleCache()
+    cache.add_listener(memo.on_candles)
+    candles = _candles(10)
+    cache.merge("EUR_USD", "M15", candles[:9], full=True)
+    memo.get_or_compute("regime", "EUR_USD", "M15", candles[8]["time"], "cfg", lambda: "old")
+    cache.merge("EUR_USD", "M15", candles[9:], full=False)
+    assert memo.stats()["entries"] == 0
+    assert memo.get_or_compute("regime", "EUR_USD", "M15", candles[8]["time"], "cfg", lambda: "stale") == "stale"
+    assert memo.stats()["entries"] == 0
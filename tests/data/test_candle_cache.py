@@ -0,0 +1,63 @@
+from data.brokers.candle_cache import CandleCache
+
+
+def _bar(i, complete=True, close="1.0"):
+    return {"time": f"2025-01-01T00:{i:02d}:00.000000000Z", "complete": complete, "volume": 1,
+            "mid": {"o": close, "h": close, "l": close, "c": close}}
+
+
+def test_incremental_fetch_replaces_forming_bar():
+    cache = CandleCache(capacity=10, min_refresh_s=0.0)
+    calls = []
+
+    def fetch(params):
+        calls.append(params)
+        if "count" in params:
+            return [_bar(i) for i in range(4)] + [_bar(4, complete=False, close="1.1")]
+        assert params["from"] == _bar(3)["time"]
+        return [_bar(4, close="1.2"), _bar(5, complete=False)]
+
+    first = cache.get("EUR_USD", "M15", 5, fetch)
+    assert first[-1]["mid"]["c"] == "1.1"
+
+    second = cache.get("EUR_USD", "M15", 5, fetch)
+    assert [c["time"] for c in second] == [_bar(i)["time"] for i in range(1, 6)]
+    assert second[-2]["mid"]["c"] == "1.2"
+    assert cache.stats()["full_fetches"] == 1
+    assert cache.stats()["incremental_fetches"] == 1
+
+
+def test_recent_refresh_served_from_memory_and_failed_fetch_keeps_window():
+    cache = CandleCache(capacity=10, min_refresh_s=60.0)
+    cache.get("EUR_USD", "M15", 3, lambda p: [_bar(i) for i in range(3)])
+    assert len(cache.get("EUR_USD", "M15", 3, lambda p: None)) == 3
+    assert cache.stats()["memory_hits"] == 1
+
+    cache.min_refresh_s = 0.0
+    assert len(cache.get("EUR_USD", "M15", 3, lambda p: None)) == 3
+
+
+def test_failing_listener_isolated_and_run_outside_series_lock():
+    import threading
+
+    cache = CandleCache(capacity=10, min_refresh_s=0.0)
+    seen, reader_results = [], []
+
+    def broken(instrument, granularity, candles, full):
+        raise RuntimeError("listener bug")
+
+    def reader(instrument, granularity, candles, full):
+        # Another thread reading the same series must not wait on the merge
+        thread = threading.Thread(target=lambda: reader_results.append(len(cache.read(instrument, granularity, 10))))
+        thread.start()
+        thread.join(timeout=2)
+        seen.append(len(candles))
+
+    cache.add_listener(broken)
+    cache.add_listener(reader)
+    window = cache.get("EUR_USD", "M15", 3, lambda p: [_bar(i) for i in range(3)])
+    cache.merge("EUR_USD", "M15", [_bar(3)], full=False)
+
+    assert len(window) == 3
+    assert seen == [3, 1] and reader_results == [3, 4]
+    assert cache.stats()["listener_errors"] == 2
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from data.brokers.candle_cache import CandleCache
+from data.brokers.candle_frame import decode_candles
+
+
+def _oanda_bar(i, close, complete=True):
+    return {"time": f"2025-01-01T00:{i:02d}:00.000000000Z", "complete": complete, "volume": 10 + i,
+            "mid": {"o": "1.0", "h": "1.5", "l": "0.5", "c": close}}
+
+
+def test_decodes_oanda_and_flat_payloads_into_readonly_columns():
+    frame = decode_candles([_oanda_bar(0, "1.1"), _oanda_bar(15, "1.2", complete=False)])
+
+    assert frame.close.dtype == np.float64 and frame.time.dtype == np.int64
+    assert frame.close.flags["C_CONTIGUOUS"]
+    assert frame.close.tolist() == [1.1, 1.2]
+    assert frame.volume.tolist() == [10.0, 25.0]
+    assert frame.time[1] - frame.time[0] == 15 * 60 * 10**9
+    assert len(frame.completed()) == 1
+    with pytest.raises(ValueError):
+        frame.close[0] = 0.0
+
+    flat = decode_candles([{"time": "1700000000", "open": "1", "high": "3", "low": "0.5", "close": "2", "volume": "0.25"}])
+    assert flat.last_close == 2.0 and flat.volume[0] == 0.25
+    assert flat.time[0] == 1_700_000_000 * 10**9
+    assert decode_candles(flat) is flat
+    assert len(decode_candles([])) == 0
+
+
+def test_cache_decodes_each_refresh_once():
+    cache = CandleCache(capacity=10, min_refresh_s=60.0)
+    cache.get("EUR_USD", "M15", 3, lambda params: [_oanda_bar(i, "1.1") for i in range(3)])
+
+    first = cache.read_frame("EUR_USD", "M15", 3)
+    assert cache.read_frame("EUR_USD", "M15", 3) is first
+    assert cache.stats()["frame_decodes"] == 1
+
+    cache.merge("EUR_USD", "M15", [_oanda_bar(3, "1.3")], full=False)
+    refreshed = cache.read_frame("EUR_USD", "M15", 3)
+    assert refreshed is not first and refreshed.last_close == 1.3
+
+
+def test_series_views_share_frame_memory():
+    frame = decode_candles([_oanda_bar(i, str(1 + i / 100)) for i in range(5)])
+    series = frame.as_series()
+
+    assert frame.as_series() is series
+    assert np.shares_memory(series["close"].to_numpy(), frame.close)
+    assert series["close"].iloc[-1] == frame.last_close
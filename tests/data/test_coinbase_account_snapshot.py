@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "data", "coinbase"))
+
+from coinbase_trading_engine import CoinbaseTradingEngine  # noqa: E402
+
+
+class FakeConnector:
+    def __init__(self, positions):
+        self.positions = positions
+        self.position_calls = 0
+        self.closed = []
+        self.placed = []
+
+    def get_open_positions(self):
+        self.position_calls += 1
+        return list(self.positions)
+
+    def get_account_balances(self):
+        return {"USD": 10_000.0}
+
+    def get_historical_candles(self, symbol, granularity=300, count=60):
+        return [{"time": 1_700_000_000 + i * 300, "open": 1, "high": 1, "low": 1, "close": 1, "volume": 1}
+                for i in range(count)]
+
+    def close_position(self, symbol, positions=None):
+        self.closed.append((symbol, positions))
+        return {"success": True, "closed_count": len(positions or [])}
+
+    def place_order(self, **kwargs):
+        self.placed.append(kwargs)
+        return {"success": True}
+
+
+class FakeWolfPack:
+    INSTRUMENTS = {"BTC-USD": {}, "ETH-USD": {}, "SOL-USD": {}}
+
+    def analyze_crypto_perps(self, symbol, candles, price, connector):
+        if symbol != "SOL-USD":
+            return None
+        return {"symbol": symbol, "side": "buy", "units": 1.0, "entry": price,
+                "stop_loss": price * 0.99, "take_profit": price * 1.03}
+
+
+def _engine(positions):
+    engine = CoinbaseTradingEngine.__new__(CoinbaseTradingEngine)
+    engine.logger = logging.getLogger("test-coinbase-snapshot")
+    engine.connector = FakeConnector(positions)
+    engine.wolf_pack = FakeWolfPack()
+    engine.position_open_times = {}
+    engine._snapshot = None
+    engine.snapshot_fetches = 0
+    return engine
+
+
+def test_one_account_fetch_shared_across_cycle():
+    engine = _engine([{"id": "1", "product_id": "BTC-USD", "size": "1", "price": "50000"}])
+    engine.refresh_account_snapshot()
+
+    for symbol in ("BTC-USD", "ETH-USD"):
+        asyncio.run(engine._process_instrument(symbol))
+    engine._position_police()
+
+    assert engine.connector.position_calls == 1
+    assert engine.account_snapshot().balances == {"USD": 10_000.0}
+
+
+def test_own_orders_invalidate_snapshot():
+    engine = _engine([{"id": "1", "product_id": "BTC-USD", "size": "0.001", "price": "50000"}])
+    engine.refresh_account_snapshot()
+
+    engine._position_police()  # $50 notional -> closed from the snapshot's orders
+    assert engine.connector.closed == [("BTC-USD", engine.connector.positions)]
+    assert engine._snapshot is None
+
+    asyncio.run(engine._process_instrument("SOL-USD"))  # refetch, then place
+    assert engine.connector.position_calls == 2
+    assert len(engine.connector.placed) == 1 and engine._snapshot is None
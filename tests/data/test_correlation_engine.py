@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+
+from data.brokers.candle_cache import CandleCache
+from data.brokers.correlation_engine import CorrelationEngine
+from hive.guardian_gates import GuardianGates
+from hive.quant_hedge_rules import QuantHedgeRules
+from ml_ai.rbotzilla_golden_age import AdvancedHedgingSystem
+
+START = pd.Timestamp("2026-01-05T00:00:00Z")
+SYMBOLS = ["EUR_USD", "GBP_USD", "USD_CHF", "AUD_USD"]
+
+
+def _closes(n, seed=5):
+    """Returns driven by one factor: GBP with EUR, CHF against it, AUD mostly independent"""
+    rng = np.random.default_rng(seed)
+    factor = rng.normal(0, 0.001, n)
+    returns = np.stack([
+        factor + rng.normal(0, 0.0002, n),
+        factor + rng.normal(0, 0.0004, n),
+        -factor + rng.normal(0, 0.0003, n),
+        0.1 * factor + rng.normal(0, 0.001, n),
+    ])
+    return np.cumprod(1 + returns, axis=1)
+
+
+def _candles(closes):
+    times = [START + pd.Timedelta(minutes=15 * i) for i in range(len(closes))]
+    return [{"time": t.strftime("%Y-%m-%dT%H:%M:%SZ"), "volume": 100, "complete": True,
+             "mid": {"o": c, "h": c, "l": c, "c": c}} for t, c in zip(times, closes)]
+
+
+def _expected(closes, window):
+    returns = closes[:, 1:] / closes[:, :-1] - 1
+    return np.corrcoef(returns[:, -window:])
+
+
+def test_incremental_matrix_matches_full_recompute():
+    closes = _closes(700)
+    engine = CorrelationEngine(window=100)
+    cache = CandleCache(capacity=200)
+    cache.add_listener(engine.on_candles)
+    for end in range(50, 701, 13):
+        for symbol, series in zip(SYMBOLS, closes):
+            cache.merge(symbol, "M15", _candles(series)[:end], full=False)
+        if end >= 101:
+            symbols, matrix = engine.matrix()
+            assert symbols == SYMBOLS
+            np.testing.assert_allclose(matrix, _expected(closes[:, :end], 100), atol=1e-9)
+    cache.merge("EUR_USD", "H1", _candles(closes[0])[:10], full=True)  # other granularities are ignored
+
+    stats = engine.stats()
+    assert stats["rebuilds"] >= 5 and stats["late_returns"] > 0
+    assert stats["returns_applied"] == 4 * 699
+
+
+def test_late_returns_are_patched_into_their_bar():
+    closes = _closes(300, seed=8)
+    in_order, staggered = CorrelationEngine(window=120), CorrelationEngine(window=120)
+    for i in range(300):
+        for symbol, series in zip(SYMBOLS, closes):
+            in_order.update(symbol, i, series[i])
+    # EUR_USD lags 30 bars behind the others, then catches up
+    for i in range(300):
+        for symbol, series in zip(SYMBOLS[1:], closes[1:]):
+            staggered.update(symbol, i, series[i])
+        if i >= 30:
+            staggered.update("EUR_USD", i - 30, closes[0][i - 30])
+    for i in range(270, 300):
+        staggered.update("EUR_USD", i, closes[0][i])
+
+    for a in SYMBOLS:
+        for b in SYMBOLS:
+            assert abs(staggered.correlation(a, b) - in_order.correlation(a, b)) < 1e-9
+    assert staggered.stats()["late_returns"] > 0
+    assert not staggered.update("EUR_USD", 10, 1.0)
+
+
+def test_gapped_instrument_becomes_ready():
+    closes = _closes(600, seed=11)
+    engine = CorrelationEngine(window=200)
+    for i in range(600):
+        for symbol, series in zip(SYMBOLS, closes):
+            if symbol == "GBP_USD" and i % 97 == 0:
+                continue  # no bar: a tick-less candle omitted by the broker
+            if symbol == "USD_CHF" and i % 96 in range(4):
+                continue  # a daily break
+            engine.update(symbol, i, series[i])
+
+    symbols, _ = engine.matrix()
+    assert sorted(symbols) == sorted(SYMBOLS)
+    assert engine.correlation("EUR_USD", "GBP_USD") > 0.8
+    assert engine.correlation("EUR_USD", "USD_CHF") < -0.5
+    assert engine.stats()["ready"] == 4
+
+
+def test_partners_concentration_and_readiness():
+    closes = _closes(400)
+    engine = CorrelationEngine(window=200)
+    for i in range(400):
+        for symbol, series in zip(SYMBOLS, closes):
+            engine.update(symbol, i, series[i])
+    engine.update("NZD_USD", 399, 0.6)  # one close: not ready, left out of every read
+
+    partners = engine.partners("EUR_USD", top=2)
+    assert partners["correlated"][0][0] == "GBP_USD"
+    assert partners["anti_correlated"][0][0] == "USD_CHF"
+    assert engine.correlation("EUR_USD", "USD_CHF") < -0.9
+    assert engine.correlation("EUR_USD", "NZD_USD") is None
+    assert "NZD_USD" not in engine.correlations_of("EUR_USD")
+
+    concentration = engine.concentration()
+    eigenvalues = np.linalg.eigvalsh(_expected(closes, 200))
+    assert concentration["instruments"] == 4
+    assert abs(concentration["top_eigen_share"] - eigenvalues[-1] / 4) < 1e-9
+    assert 1 < concentration["effective_bets"] < 2
+    assert engine.concentration() is concentration
+
+
+def test_gate_hedge_rules_and_hedge_selection_read_the_engine():
+    closes = _closes(300)
+    engine = CorrelationEngine(window=200)
+    for i in range(300):
+        for symbol, series in zip(SYMBOLS, closes):
+            engine.update(symbol, i, series[i])
+
+    gates = GuardianGates(correlations=engine)
+    long_gbp = [{"symbol": "GBP_USD", "side": "BUY", "units": 1000}]
+    assert gates._gate_correlation({"symbol": "EUR_JPY", "side": "BUY"}, []).passed
+    # A long on a pair moving against an open short is the same bet
+    blocked = gates._gate_correlation({"symbol": "EUR_USD", "side": "buy"},
+                                      [{"symbol": "USD_CHF", "side": "sell", "units": 1000}])
+    assert not blocked.passed and blocked.details["position"] == "USD_CHF"
+    weak = gates._gate_correlation({"symbol": "EUR_USD", "side": "buy"},
+                                   [{"symbol": "AUD_USD", "side": "sell", "units": 1000}])
+    assert weak.passed
+    # The USD bucket rule still applies on its own, whatever the casing of the sides
+    assert not gates._gate_correlation({"symbol": "AUD_USD", "side": "BUY"}, long_gbp).passed
+    assert not gates._gate_correlation({"symbol": "AUD_USD", "side": "buy"}, long_gbp).passed
+
+    # Only the instruments actually held count towards the hedge correlation risk
+    class Mirror:
+        def __init__(self, positions):
+            self.positions = positions
+
+        def gate_positions(self):
+            return self.positions
+
+    def correlation_risk(positions):
+        hedge = QuantHedgeRules(correlations=engine, mirror=Mirror(positions))
+        analysis = hedge.analyze_market_conditions(closes[0][-100:], np.full(100, 100.0), 25000.0, 1000.0, 1,
+                                                   symbol="EUR_USD")
+        return next(c for c in analysis.conditions if c.condition_name == "Correlation")
+
+    assert correlation_risk([]).details["high_correlation_pairs"] == 0
+    held = correlation_risk(long_gbp + [{"symbol": "AUD_USD", "side": "SELL", "units": 1000}])
+    assert held.details["high_correlation_pairs"] == 1 and held.severity == "yellow"
+    assert correlation_risk(long_gbp + [{"symbol": "USD_CHF", "side": "SELL", "units": 1000}]
+                            ).details["high_correlation_pairs"] == 2
+
+    hedging = AdvancedHedgingSystem(correlations=engine)
+    pair, rho = hedging.find_optimal_hedge("EURUSD", None)
+    assert pair == "USD_CHF" and rho < -0.9
+    assert hedging.find_optimal_hedge("USDJPY", None) == ("EURUSD", -0.68)  # no live data: table
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from data.brokers.bar_memo import BarMemo
+from data.brokers.feature_store import FeatureStore, trend_strength, volume_profile
+from hive.quant_hedge_rules import QuantHedgeRules
+from logic.regime_detector import StochasticRegimeDetector
+from logic.smart_logic import SmartLogicFilter
+from risk.dynamic_leverage_clean import DynamicLeverageCalculator
+
+BAR = "2026-01-01T10:00:00Z"
+NEXT_BAR = "2026-01-01T10:15:00Z"
+
+
+def _series(n, seed=2):
+    rng = np.random.default_rng(seed)
+    prices = 1.1 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    volume = rng.integers(100, 1000, n).astype(float)
+    return prices, volume
+
+
+def test_features_match_direct_formulas():
+    prices, volume = _series(80)
+    returns = np.diff(prices) / prices[:-1]
+    store = FeatureStore()
+    assert store.volatility(prices, "EUR_USD", "M15", BAR) == np.std(returns)
+    slope = np.polyfit(np.arange(80), prices, 1)[0]
+    assert store.trend_strength(prices, "EUR_USD", "M15", BAR) == pytest.approx(slope / prices.mean(), rel=1e-9)
+    profile = store.volume_profile(volume, "EUR_USD", "M15", BAR)
+    assert profile["recent_mean"] == np.mean(volume[-5:]) and profile["previous_mean"] == np.mean(volume[-10:-5])
+    np.testing.assert_array_equal(trend_strength(np.vstack([prices, prices])), [trend_strength(prices)] * 2)
+    np.testing.assert_array_equal(volume_profile(np.vstack([volume, volume]))["mean"], [volume.mean()] * 2)
+
+
+def test_consumers_share_one_computation_per_bar():
+    prices, volume = _series(50)
+    store = FeatureStore()
+    hedge = QuantHedgeRules(features=store)
+    hedge.regime_detector = StochasticRegimeDetector(memo=BarMemo(), features=store, deterministic=True)
+    leverage = DynamicLeverageCalculator(features=store)
+
+    analysis = hedge.analyze_market_conditions(prices, volume, 25000.0, 1000.0, 1,
+                                               symbol="EUR_USD", bar_time=BAR)
+    # The regime detector read the 50-bar volatility and trend the hedge rules had just computed
+    assert store.stats()["by_kind"]["volatility"] == {"hits": 1, "misses": 1}
+    assert store.stats()["by_kind"]["trend_strength"] == {"hits": 1, "misses": 1}
+    assert analysis.volatility_value == hedge._calculate_volatility(prices)
+
+    for _ in range(2):
+        leverage.calculate_volatility(list(prices), symbol="EUR_USD", bar_time=BAR)
+    assert store.stats()["by_kind"]["volatility"] == {"hits": 2, "misses": 2}
+
+    signal = {"symbol": "EUR_USD", "bar_time": BAR, "direction": "buy",
+              "recent_volumes": volume, "recent_closes": prices}
+    assert SmartLogicFilter(features=store)._volume_scores([signal])[0] == \
+        SmartLogicFilter(features=FeatureStore())._volume_scores([dict(signal, symbol=None)])[0]
+    assert store.stats()["by_kind"]["volume_profile"] == {"hits": 1, "misses": 1}
+
+    # The next closed bar expires everything from the previous one
+    store.volatility(prices, "EUR_USD", "M15", NEXT_BAR)
+    assert store.stats()["entries"] == 1 and store.stats()["expirations"] == 4
+
+
+def test_store_is_bounded_and_counts_uncached_calls():
+    prices, _ = _series(30)
+    store = FeatureStore(max_entries=3)
+    for symbol in ("EUR_USD", "GBP_USD", "USD_JPY", "AUD_USD"):
+        store.volatility(prices, symbol, "M15", BAR)
+    store.volatility(prices)
+    stats = store.stats()
+    assert stats["entries"] == 3 and stats["evictions"] == 1 and stats["uncached"] == 1
@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from data.brokers.fx_matrix import FxMatrix
+from data.brokers.oanda_price_stream import QuoteBoard
+from foundation.margin_correlation_gate import MarginCorrelationGate, Order
+
+
+def _price(inst, bid, ask):
+    return {"type": "PRICE", "instrument": inst, "time": "t",
+            "bids": [{"price": str(bid)}], "asks": [{"price": str(ask)}]}
+
+
+def test_direct_inverted_and_triangulated_rates():
+    fx = FxMatrix()
+    fx.update("EUR_USD", 1.10)
+    fx.update("USD_JPY", 150.0)
+    fx.update("EUR_SEK", 11.0)
+
+    assert fx.usd_rate("EUR") == 1.10
+    assert fx.usd_rate("JPY") == pytest.approx(1 / 150.0)
+    assert fx.usd_rate("SEK") == pytest.approx(1.10 / 11.0)  # via EUR
+    assert fx.usd_rate("NOK") is None
+    assert fx.usd_notional("EUR_GBP", -20000) == pytest.approx(22000)
+    assert fx.pnl_usd("EUR_JPY", 10000, 160.0, 161.5) == pytest.approx(10000 * 1.5 / 150.0)
+
+
+def test_stale_quotes_are_not_served():
+    fx = FxMatrix(max_age_s=0.05)
+    fx.update("GBP_USD", 1.25)
+    fx.update("EUR_GBP", 0.86)
+    assert fx.usd_rate("EUR") == pytest.approx(0.86 * 1.25)
+    time.sleep(0.06)
+    assert fx.usd_rate("GBP") is None and fx.usd_rate("EUR") is None
+
+
+def test_quote_board_feeds_matrix():
+    fx = FxMatrix()
+    board = QuoteBoard()
+    board.add_listener(fx.on_quote)
+    board.update_from_message(_price("AUD_USD", 0.6500, 0.6502))
+    assert fx.usd_rate("AUD") == pytest.approx(0.6501)
+
+
+def test_margin_gate_prices_non_usd_quote_in_usd():
+    fx = FxMatrix()
+    fx.update("USD_JPY", 150.0)
+    order = Order(symbol="USD_JPY", side="BUY", units=20000, price=150.0, order_id="t")
+    # 20k USD at 2% is $400 - allowed; units * price in yen would read as $60k of margin
+    assert MarginCorrelationGate(account_nav=2000.0, fx=fx).margin_gate(0.0, order).allowed
+    assert not MarginCorrelationGate(account_nav=2000.0).margin_gate(0.0, order).allowed
+
+
+def test_triangulated_rate_kept_until_a_leg_moves():
+    fx = FxMatrix()
+    fx.update("EUR_USD", 1.10)
+    fx.update("EUR_SEK", 11.0)
+    fx.update("USD_JPY", 150.0)
+    assert fx.usd_rate("SEK") == pytest.approx(0.10)
+
+    for i in range(50):  # ticks on instruments the SEK path does not use
+        fx.update("USD_JPY", 150.0 + i * 0.01)
+    assert fx.usd_rate("SEK") == pytest.approx(0.10)
+    assert fx.stats()["derived_hits"] == 1
+
+    fx.update("EUR_USD", 1.21)
+    assert fx.usd_rate("SEK") == pytest.approx(0.11)
+    fx.update("USD_SEK", 8.0)  # a direct quote beats the cached path
+    assert fx.usd_rate("SEK") == pytest.approx(1 / 8.0)
@@ -0,0 +1,135 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from data.brokers.candle_cache import CandleCache
+from data.brokers.candle_frame import decode_candles
+from data.brokers.htf_resampler import WARMUP_PARAMS, HtfResampler
+from data.brokers.oanda_connector import OandaConnector
+from foundation.multi_timeframe import higher_timeframe_trend, htf_trend, wrap_strategy
+
+START = pd.Timestamp("2026-01-05T00:00:00Z")
+
+
+def _m15(n, offset=0, seed=9):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0.00002, 0.0005, n + offset))[offset:]
+    times = [START + pd.Timedelta(minutes=15 * (i + offset)) for i in range(n)]
+    return [{"time": t.strftime("%Y-%m-%dT%H:%M:%SZ"), "volume": 100 + i % 7, "complete": True,
+             "mid": {"o": c - 0.0001, "h": c + 0.0003, "l": c - 0.0003, "c": c}}
+            for i, (t, c) in enumerate(zip(times, close))]
+
+
+def _resampled(candles, rule, offset=None):
+    frame = decode_candles(candles)
+    df = pd.DataFrame({"open": frame.open, "high": frame.high, "low": frame.low, "close": frame.close,
+                       "volume": frame.volume}, index=pd.to_datetime(frame.time, utc=True))
+    return df.resample(rule, offset=offset).agg({"open": "first", "high": "max", "low": "min", "close": "last",
+                                                 "volume": "sum"})
+
+
+def _native(bars):
+    return [{"time": t.strftime("%Y-%m-%dT%H:%M:%SZ"), "volume": r.volume, "complete": True,
+             "mid": {"o": r.open, "h": r.high, "l": r.low, "c": r.close}} for t, r in bars.iterrows()]
+
+
+def test_htf_bars_match_pandas_resample_across_merges():
+    candles = _m15(1000)
+    cache, resampler = CandleCache(capacity=200), HtfResampler()
+    cache.add_listener(resampler.on_candles)
+    cache.merge("EUR_USD", "M15", candles[:200], full=True)
+    for i in range(200, 1000, 7):
+        forming = dict(candles[min(i + 7, 999)], complete=False)
+        cache.merge("EUR_USD", "M15", candles[i:i + 7] + [forming], full=False)
+    cache.merge("EUR_USD", "H1", candles[:10], full=True)  # other granularities are ignored
+
+    for granularity, rule, seconds in (("H1", "1h", 3600), ("H4", "4h", 14400), ("D", "1D", 86400)):
+        expected = _resampled(candles, rule)
+        built = decode_candles(resampler.candles("EUR_USD", granularity, include_forming=True))
+        assert len(built) == len(expected)
+        for column in ("open", "high", "low", "close", "volume"):
+            np.testing.assert_allclose(getattr(built, column), expected[column].to_numpy(), rtol=1e-12)
+        forming = (1000 * 900) % seconds != 0
+        assert list(built.complete) == [True] * (len(expected) - forming) + [False] * forming
+    assert resampler.stats()["base_bars"] == 1000
+
+
+def test_htf_trend_state_and_seeding():
+    candles = _m15(4000)
+    h4 = _resampled(candles, "4h")
+    history = _native(h4.iloc[:-1])
+
+    resampler = HtfResampler()
+    resampler.on_candles("EUR_USD", "M15", candles[-400:], full=True)
+    assert not htf_trend("EUR_USD", resampler=resampler)
+    # The native bars replace the 24 built bars they overlap; the newest built bar is kept
+    assert resampler.seed("EUR_USD", "H4", history) == len(h4) - 1
+
+    closes = decode_candles(resampler.candles("EUR_USD", "H4")).close
+    np.testing.assert_allclose(closes, h4.close.to_numpy(), rtol=1e-12)
+    expected = higher_timeframe_trend({"close": closes}, 200)
+    assert htf_trend("EUR_USD", resampler=resampler) == expected
+    result = wrap_strategy(lambda c, cfg: {"signal": "BUY"}, {}, None,
+                           {"instrument": "EUR_USD", "htf_resampler": resampler})
+    assert result == ({"signal": "BUY"} if expected else {"signal": "WAIT", "reason": "HTF trend not confirmed"})
+
+
+def test_default_aligned_seed_rejected_and_partial_built_bar_replaced():
+    candles = _m15(2000)
+    resampler = HtfResampler()
+    resampler.on_candles("EUR_USD", "M15", candles[-390:], full=True)  # first H4 bar built from 6 of 16
+    built = resampler.candles("EUR_USD", "H4")
+
+    # OANDA's default alignment: H4 and D bars start at 22:00 UTC (17:00 New York in January)
+    assert resampler.seed("EUR_USD", "H4", _native(_resampled(candles, "4h", offset="2h").iloc[1:-1])) == 0
+    assert resampler.seed("EUR_USD", "D", _native(_resampled(candles, "24h", offset="22h").iloc[1:-1])) == 0
+    assert resampler.candles("EUR_USD", "H4") == built
+    assert resampler.stats()["seed_rejected"] > 0
+
+    h4 = _resampled(candles, "4h")
+    assert resampler.seed("EUR_USD", "H4", _native(h4.iloc[:-5])) == len(h4) - 5
+    seeded = decode_candles(resampler.candles("EUR_USD", "H4"))
+    starts = seeded.time // 10 ** 9
+    assert np.all(starts % 14400 == 0) and np.all(np.diff(starts) > 0)
+    np.testing.assert_allclose(seeded.close, h4.close.to_numpy(), rtol=1e-12)
+    np.testing.assert_allclose(seeded.low, h4.low.to_numpy(), rtol=1e-12)
+
+    # The series keeps building from base bars after the seed
+    resampler.on_candles("EUR_USD", "M15", _m15(16, offset=2000), full=False)
+    assert decode_candles(resampler.candles("EUR_USD", "H4")).time[-1] // 10 ** 9 == starts[-1] + 14400
+
+
+def test_connector_warms_htf_series_once_with_utc_alignment():
+    candles = _m15(3000)
+    native = {"H1": _native(_resampled(candles, "1h")), "H4": _native(_resampled(candles, "4h")),
+              "D": _native(_resampled(candles, "1D"))}
+    requests = []
+    fail = {"D"}
+
+    def fetch(instrument, params):
+        requests.append(params)
+        if params["granularity"] in fail:
+            return None
+        return native.get(params["granularity"], candles[-200:])
+
+    connector = OandaConnector.__new__(OandaConnector)
+    connector.logger = logging.getLogger("test-htf-warmup")
+    connector.candle_cache = CandleCache(capacity=200)
+    connector.htf = HtfResampler()
+    connector.candle_cache.add_listener(connector.htf.on_candles)
+    connector._fetch_candles = fetch
+
+    connector.get_historical_data("EUR_USD", 200)
+    warmups = [p for p in requests if p["granularity"] != "M15"]
+    assert [p["granularity"] for p in warmups] == ["H1", "H4", "D"]
+    assert all(p["alignmentTimezone"] == "UTC" and p["dailyAlignment"] == 0 for p in warmups)
+    assert all(p.items() >= WARMUP_PARAMS.items() for p in warmups)
+    assert len(connector.htf.candles("EUR_USD", "H4")) == len(native["H4"])
+    assert len(connector.htf.candles("EUR_USD", "D")) == 2  # built from the base window only
+
+    # The failed D fetch released the claim: the next read retries, later reads do not
+    fail.clear()
+    assert connector.warm_htf("EUR_USD")["D"] == len(native["D"])
+    assert connector.warm_htf("EUR_USD") == {}
+    assert connector.htf.stats()["warmed"] == 1
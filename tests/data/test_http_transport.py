@@ -0,0 +1,62 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from data.brokers.http_transport import PooledTransport, RetryPolicy
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    fail_first = 0
+    calls = 0
+
+    def _reply(self):
+        type(self).calls += 1
+        status = 503 if type(self).calls <= type(self).fail_first else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(fail_first=0):
+    handler = type("Handler", (_Handler,), {"fail_first": fail_first, "calls": 0})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, handler, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_keep_alive_reuses_warm_connection():
+    server, _, base = _serve()
+    try:
+        transport = PooledTransport(base, pool_size=2)
+        for _ in range(3):
+            assert transport.request("GET", f"{base}/v3/ping", timeout=2).status_code == 200
+        stats = transport.stats()
+        assert stats["new_connections"] == 1
+        assert stats["warm_reuses"] == 2
+    finally:
+        server.shutdown()
+
+
+def test_get_retried_but_post_not_replayed():
+    server, handler, base = _serve(fail_first=1)
+    try:
+        transport = PooledTransport(base, retry_policies={"pricing": RetryPolicy(max_retries=2, backoff_base_s=0.001)})
+        resp = transport.request("GET", f"{base}/pricing", endpoint_class="pricing", timeout=2)
+        assert resp.status_code == 200
+        assert transport.stats()["retries"] == 1
+
+        handler.calls = 0
+        resp = transport.request("POST", f"{base}/orders", endpoint_class="pricing", json={}, timeout=2)
+        assert resp.status_code == 503
+        assert handler.calls == 1
+    finally:
+        server.shutdown()
@@ -0,0 +1,97 @@
+import logging
+from collections import deque
+from datetime import datetime, timezone
+
+from data.brokers.ib_connector import IBConnector
+from data.brokers.latency_recorder import LatencyRecorder
+
+
+class FakeContract:
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+
+class FakeTicker:
+    def __init__(self, contract, bid=1.1000, ask=1.1002):
+        self.contract = contract
+        self.bid, self.ask, self.last = bid, ask, float("nan")
+        self.time = datetime(2026, 1, 5, tzinfo=timezone.utc)
+
+
+class FakeIB:
+    def __init__(self, qualify_failures=0):
+        self.qualify_calls = 0
+        self.qualify_failures = qualify_failures
+        self.requests = []  # (symbol, snapshot)
+        self.tickers = {}
+
+    def isConnected(self):
+        return True
+
+    def qualifyContracts(self, contract):
+        self.qualify_calls += 1
+        if self.qualify_failures:
+            self.qualify_failures -= 1
+            raise TimeoutError("gateway busy")
+        return [contract]
+
+    def reqMktData(self, contract, genericTickList="", snapshot=False, regulatorySnapshot=False):
+        self.requests.append((contract.symbol, snapshot))
+        ticker = self.tickers[contract.symbol] = FakeTicker(contract)
+        return ticker
+
+    def cancelMktData(self, contract):
+        pass
+
+    def sleep(self, seconds):
+        pass
+
+    def disconnect(self):
+        pass
+
+
+def _connector(streaming, ib):
+    connector = IBConnector.__new__(IBConnector)
+    connector.logger = logging.getLogger("test-ib-connector")
+    connector.ib = ib
+    connector.environment = "paper"
+    connector.connected = True
+    connector.streaming = streaming
+    connector.quote_timeout = 0.2
+    connector._subscriptions = {}
+    connector._contracts = {}
+    connector.request_times = deque(maxlen=100)
+    connector.latency = LatencyRecorder()
+    connector._create_contract = FakeContract
+    return connector
+
+
+def test_contract_cache_hit_skips_qualification():
+    ib = FakeIB(qualify_failures=1)
+    connector = _connector(streaming=False, ib=ib)
+
+    # A failed qualification is not cached, so the next call retries it
+    assert connector._get_contract("EUR_USD").symbol == "EUR.USD"
+    assert connector._contracts == {}
+    for _ in range(3):
+        assert connector.get_current_bid_ask("EUR_USD")["bid"] == 1.1000
+
+    assert ib.qualify_calls == 2
+    assert ib.requests == [("EUR.USD", True)] * 3
+    assert connector.get_performance_stats()["qualified_contracts"] == 1
+
+
+def test_streamed_quote_served_without_snapshot_request():
+    ib = FakeIB()
+    connector = _connector(streaming=True, ib=ib)
+    assert connector.subscribe_quotes(["EUR_USD", "GBP.USD"]) == {"EUR.USD": True, "GBP.USD": True}
+
+    ib.tickers["EUR.USD"].bid, ib.tickers["EUR.USD"].ask = 1.1010, 1.1012  # tick pushed by the stream
+    quote = connector.get_current_bid_ask("EUR_USD")
+    quotes = connector.get_bid_ask_many(["EUR_USD", "GBP.USD"])
+
+    assert quote["bid"] == 1.1010 and quote["timestamp"].startswith("2026-01-05")
+    assert quotes["GBP.USD"]["ask"] == 1.1002
+    assert ib.requests == [("EUR.USD", False), ("GBP.USD", False)]
+    assert ib.qualify_calls == 2
+    assert len(connector.request_times) == 2
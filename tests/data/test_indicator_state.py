@@ -0,0 +1,101 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.brokers import indicators
+from data.brokers.candle_cache import CandleCache
+from data.brokers.indicator_state import IndicatorState, IndicatorStore
+from data.oanda.strategies.bearish_wolf import BearishWolf
+from data.oanda.strategies.bullish_wolf import BullishWolf
+from data.oanda.strategies.sideways_wolf import SidewaysWolf
+from foundation.multi_timeframe import higher_timeframe_trend
+
+
+def _bars(n, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0005, n))
+    high = close + np.abs(rng.normal(0, 0.0003, n))
+    low = close - np.abs(rng.normal(0, 0.0003, n))
+    volume = rng.integers(50, 500, n).astype(float)
+    return high, low, close, volume
+
+
+def _candles(high, low, close, volume, start=0):
+    return [{"time": f"2026-01-01T{i // 60:02d}:{i % 60:02d}:00Z", "volume": volume[i - start], "complete": True,
+             "mid": {"o": str(close[i - start]), "h": str(high[i - start]), "l": str(low[i - start]),
+                     "c": str(close[i - start])}}
+            for i in range(start, start + len(close))]
+
+
+def _feed(state, high, low, close, volume):
+    for i in range(len(close)):
+        state.update(f"{i:06d}", high[i], low[i], close[i], volume[i])
+
+
+def test_streaming_values_match_kernels_and_survive_restore():
+    high, low, close, volume = _bars(400)
+    state = IndicatorState()
+    _feed(state, high[:250], low[:250], close[:250], volume[:250])
+    state = IndicatorState.restore(json.loads(json.dumps(state.snapshot())))
+    for i in range(250, 400):
+        state.update(f"{i:06d}", high[i], low[i], close[i], volume[i])
+
+    line, signal, _ = indicators.macd(close)
+    upper, middle, _ = indicators.bollinger(close, 20, 2.0)
+    expected = {
+        "rsi": indicators.rsi(close)[-1], "macd": line[-1], "macd_signal": signal[-1],
+        "bb_upper": upper[-1], "bb_middle": middle[-1], "atr": indicators.atr(high, low, close)[-1],
+        "sma_50": indicators.rolling_mean(close, 50)[-1], "volume_ma": indicators.rolling_mean(volume, 20)[-1],
+    }
+    for name, value in expected.items():
+        assert state.value(name) == pytest.approx(value, rel=1e-11), name
+    np.testing.assert_allclose(state.series("rsi"), indicators.rsi(close)[-32:], rtol=1e-11)
+    assert state.update("000000", 1.0, 1.0, 1.0) is False
+
+
+def test_candle_cache_feeds_only_new_closed_bars():
+    high, low, close, volume = _bars(130)
+    candles = _candles(high, low, close, volume)
+    cache, store = CandleCache(), IndicatorStore()
+    cache.add_listener(store.on_candles)
+
+    cache.merge("EUR_USD", "M15", candles[:120], full=True)
+    forming = dict(candles[120], complete=False)
+    cache.merge("EUR_USD", "M15", candles[119:120] + [forming], full=False)
+    cache.merge("EUR_USD", "M15", candles[120:130], full=False)
+
+    state = store.get("EUR_USD", "M15")
+    assert state.bars == 130 and store.stats()["bars_applied"] == 130
+    assert state.value("rsi") == pytest.approx(indicators.rsi(close)[-1], rel=1e-11)
+
+    # A later full window that no longer reaches the last bar rebuilds from that window
+    later = _candles(*_bars(60, seed=3), start=200)
+    cache.merge("EUR_USD", "M15", later, full=True)
+    assert store.get("EUR_USD", "M15").bars == 60 and store.stats()["rebuilds"] == 1
+
+
+@pytest.mark.parametrize("wolf", [BullishWolf, BearishWolf, SidewaysWolf])
+def test_wolves_read_state_with_identical_decisions(wolf):
+    for seed in range(10):
+        high, low, close, volume = _bars(150, seed)
+        state = IndicatorState()
+        _feed(state, high, low, close, volume)
+        data = {"close": pd.Series(close), "high": pd.Series(high), "low": pd.Series(low),
+                "volume": pd.Series(volume)}
+        recomputed = wolf().generate_trade_signal(data)
+        streamed = wolf().generate_trade_signal(data, state=state)
+        for key in ("trade", "direction", "signals"):
+            assert streamed.get(key) == recomputed.get(key)
+        assert streamed["confidence"] == pytest.approx(recomputed["confidence"], abs=1e-9)
+
+
+def test_htf_trend_reads_state():
+    for seed in range(5):
+        high, low, close, volume = _bars(260, seed)
+        state = IndicatorState()
+        _feed(state, high, low, close, volume)
+        assert higher_timeframe_trend({"close": close}, 200, state=state) == \
+            higher_timeframe_trend({"close": close}, 200)
+    assert higher_timeframe_trend({}, 200, state=IndicatorState()) is False
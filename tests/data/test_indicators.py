@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.brokers import indicators
+
+
+def _walk(n, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0005, n))
+    spread = np.abs(rng.normal(0, 0.0004, n))
+    return close + spread, close - spread, close
+
+
+@pytest.mark.parametrize("n", [30, 120, 5000])
+def test_series_kernels_match_pandas(n):
+    high, low, close = _walk(n)
+    s = pd.Series(close)
+
+    for span in (9, 12, 26, 200):
+        np.testing.assert_allclose(indicators.ema(close, span), s.ewm(span=span).mean(), rtol=0, atol=1e-13)
+
+    line, signal, hist = indicators.macd(close)
+    ref_line = s.ewm(span=12).mean() - s.ewm(span=26).mean()
+    np.testing.assert_allclose(line, ref_line, rtol=0, atol=1e-13)
+    np.testing.assert_allclose(signal, ref_line.ewm(span=9).mean(), rtol=0, atol=1e-13)
+
+    delta = s.diff()
+    ref_rsi = 100 - 100 / (1 + delta.where(delta > 0, 0).rolling(14).mean()
+                           / (-delta.where(delta < 0, 0)).rolling(14).mean())
+    np.testing.assert_allclose(indicators.rsi(close), ref_rsi, rtol=1e-10)
+
+    upper, middle, lower = indicators.bollinger(close, 20, 2.0)
+    np.testing.assert_allclose(middle, s.rolling(20).mean(), rtol=1e-14)
+    np.testing.assert_allclose(upper, s.rolling(20).mean() + 2 * s.rolling(20).std(), rtol=1e-12)
+
+    h, l = pd.Series(high), pd.Series(low)
+    prev = s.shift(1)
+    ref_tr = pd.concat([h - l, (h - prev).abs(), (l - prev).abs()], axis=1).max(axis=1)
+    np.testing.assert_allclose(indicators.atr(high, low, close, 14), ref_tr.rolling(14).mean(), rtol=1e-12)
+
+
+def test_rolling_mean_keeps_nan_windows_nan():
+    values = np.array([np.nan, np.nan, 1.0, 2.0, 3.0, np.nan, 5.0, 6.0])
+    np.testing.assert_allclose(indicators.rolling_mean(values, 2), pd.Series(values).rolling(2).mean())
+
+
+def test_last_value_kernels_match_loop_versions():
+    high, low, close = _walk(120)
+
+    changes = np.diff(close[-15:])
+    gain, loss = changes[changes > 0].sum() / 14, -changes[changes <= 0].sum() / 14
+    assert indicators.rsi_last(close, 14) == pytest.approx(100 - 100 / (1 + gain / loss), rel=1e-12)
+    assert indicators.rsi_last(np.arange(20.0), 14) == 100.0
+
+    trs = [max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+           for i in range(len(close) - 14, len(close))]
+    assert indicators.atr_last(high, low, close, 14) == pytest.approx(sum(trs) / 14, rel=1e-12)
+    assert indicators.rate_of_change(close, 10) == pytest.approx((close[-1] - close[-10]) / close[-10])
+
+
+def test_atr_last_short_input_is_last_bar_range():
+    # The engines' previous _calculate_atr: high - low of the last bar until period + 1 bars exist
+    high, low, close = np.array([1.10, 1.12, 1.13]), np.array([1.09, 1.10, 1.12]), np.array([1.095, 1.11, 1.09])
+    assert indicators.atr_last(high, low, close, 14) == pytest.approx(0.01)
+    assert indicators.atr_last(high[:1], low[:1], close[:1], 14) == pytest.approx(0.01)
+    assert indicators.atr_last([], [], [], 14) == 0.0
+    h, l, c = _walk(15)
+    trs = [max(h[i] - l[i], abs(h[i] - c[i - 1]), abs(l[i] - c[i - 1])) for i in range(1, 15)]
+    assert indicators.atr_last(h, l, c, 14) == pytest.approx(sum(trs) / 14, rel=1e-12)
+    assert indicators.atr_last(h[:14], l[:14], c[:14], 14) == pytest.approx(h[13] - l[13])
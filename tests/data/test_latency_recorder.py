@@ -0,0 +1,43 @@
+import json
+
+from data.brokers.latency_recorder import LatencyRecorder, endpoint_template, load_exported_stats
+
+
+def test_endpoint_template_folds_ids():
+    assert endpoint_template("/v3/accounts/001-001-123-001/instruments/EUR_USD/candles?granularity=M5") == \
+        "/v3/accounts/{accountID}/instruments/{instrument}/candles"
+    assert endpoint_template("/v3/accounts/001-001-123-001/trades/42/orders") == \
+        "/v3/accounts/{accountID}/trades/{tradeID}/orders"
+    assert endpoint_template("/products/BTC-USD/candles") == "/products/{productID}/candles"
+    assert endpoint_template("/accounts") == "/accounts"
+
+
+def test_percentiles_errors_and_budget():
+    recorder = LatencyRecorder(budget_ms=300)
+    for i in range(100):
+        recorder.record("OANDA", "get", f"/v3/accounts/A{i}/summary", 10.0 + i)
+    recorder.record("OANDA", "GET", "/v3/accounts/A/summary", 900.0, timeout=True)
+    recorder.record("OANDA", "POST", "/v3/accounts/A/orders", 50.0, error=True)
+    recorder.record("Coinbase", "GET", "/products/ETH-USD/candles", 5.0)
+
+    rows = recorder.snapshot("OANDA")
+    assert [(r["method"], r["endpoint"]) for r in rows] == [
+        ("GET", "/v3/accounts/{accountID}/summary"), ("POST", "/v3/accounts/{accountID}/orders")]
+    summary = rows[0]
+    assert summary["count"] == 101 and summary["max_ms"] == 900.0
+    assert 50 <= summary["p50_ms"] <= 75
+    assert 95 <= summary["p90_ms"] <= 110
+    assert summary["timeouts"] == 1 and summary["errors"] == 1 and summary["over_budget"] == 1
+    assert recorder.broker_summary("OANDA")["count"] == 102
+    assert recorder.broker_summary("Coinbase")["p99_ms"] == 5.0
+
+
+def test_export_round_trip(tmp_path):
+    recorder = LatencyRecorder()
+    recorder.record("IBKR", "API", "reqMktData/snapshot", 120.0)
+    path = tmp_path / "latency.json"
+    recorder.export(str(path))
+
+    assert json.loads(path.read_text())["endpoints"][0]["endpoint"] == "reqMktData/snapshot"
+    assert load_exported_stats(str(path))["endpoints"][0]["p50_ms"] == 120.0
+    assert load_exported_stats(str(tmp_path / "missing.json"))["endpoints"] == []
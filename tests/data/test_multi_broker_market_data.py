@@ -0,0 +1,124 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from data.brokers.ib_connector import IBConnector
+from engine_imports import import_engine
+from test_ib_connector import FakeIB, _connector
+
+engine_module = import_engine("engines.multi_broker_engine")
+MultiBrokerEngine = engine_module.MultiBrokerEngine
+
+
+class LoopBoundIB(FakeIB):
+    """
+    IB client bound to the event loop of the thread that connected it, as
+    ib_insync is: any call from a thread without that loop raises
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)  # what IB.connect() leaves behind on the connecting thread
+        self.threads = set()
+
+    def _on_loop(self):
+        self.threads.add(threading.current_thread().name)
+        if asyncio.get_event_loop() is not self.loop:
+            raise RuntimeError("IB used outside the event loop it connected on")
+
+    def isConnected(self):
+        self._on_loop()
+        return True
+
+    def qualifyContracts(self, contract):
+        self._on_loop()
+        return super().qualifyContracts(contract)
+
+    def reqMktData(self, *args, **kwargs):
+        self._on_loop()
+        return super().reqMktData(*args, **kwargs)
+
+    def sleep(self, seconds):
+        self._on_loop()
+        self.loop.run_until_complete(asyncio.sleep(seconds))
+
+    def close(self):
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+
+def _engine(brokers, fetch=None):
+    engine = MultiBrokerEngine.__new__(MultiBrokerEngine)
+    engine.MARKET_UNIVERSE = {"oanda": ["EUR_USD"], "coinbase": ["BTC-USD"], "ibkr": ["AAPL"]}
+    engine.MARKET_DATA_DEADLINES_S = {"oanda": 0.2, "coinbase": 0.5, "ibkr": 0.5}
+    engine.brokers = brokers
+    engine._data_workers = {broker: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"md-{broker}")
+                            for broker in brokers if broker not in engine.LOOP_BOUND_BROKERS}
+    engine._data_inflight = {}
+    engine.market_data = {}
+    if fetch is not None:
+        engine._fetch_broker_market_data = fetch
+    return engine
+
+
+@pytest.fixture(autouse=True)
+def _quiet(monkeypatch):
+    monkeypatch.setattr(engine_module, "log_narration", lambda **kwargs: None)
+
+
+def test_failed_or_late_broker_drops_last_cycle_data():
+    release = threading.Event()
+    failing = set()
+
+    def fetch(broker, symbols):
+        if broker in failing:
+            raise ConnectionError("gateway down")
+        if broker == "oanda" and failing:
+            release.wait(2)  # misses its 0.2s deadline
+        return {symbol: {"bid": 1.0, "ask": 1.1} for symbol in symbols}
+
+    engine = _engine({broker: object() for broker in ("oanda", "coinbase", "ibkr")}, fetch)
+    assert set(engine.get_market_data()) == {"oanda", "coinbase", "ibkr"}
+
+    failing.add("coinbase")
+    data = engine.get_market_data()
+    release.set()
+
+    # Neither the raised fetch nor the timed-out one leaves last cycle's quotes behind
+    assert set(data) == {"ibkr"}
+    assert data["ibkr"] == {"AAPL": {"bid": 1.0, "ask": 1.1}}
+    for worker in engine._data_workers.values():
+        worker.shutdown(wait=True)
+
+
+def test_ib_quotes_collected_on_the_thread_that_connected():
+    ib = LoopBoundIB()
+    try:
+        connector = _connector(streaming=True, ib=ib)
+        assert isinstance(connector, IBConnector)
+
+        class RestBroker:
+            def __init__(self):
+                self.threads = set()
+
+            def get_live_prices(self, symbols):
+                self.threads.add(threading.current_thread().name)
+                return {symbol: {"bid": 1.0, "ask": 1.1} for symbol in symbols}
+
+        rest = RestBroker()
+        engine = _engine({"oanda": rest, "ibkr": connector})
+        for _ in range(2):  # subscribe, then read the streamed ticker table
+            data = engine.get_market_data()
+            assert data["ibkr"]["AAPL"]["bid"] == 1.1000
+            assert data["oanda"] == {"EUR_USD": {"bid": 1.0, "ask": 1.1}}
+
+        assert ib.threads == {threading.current_thread().name}
+        assert rest.threads == {"md-oanda_0"}
+        assert "ibkr" not in engine._data_workers
+        for worker in engine._data_workers.values():
+            worker.shutdown(wait=True)
+    finally:
+        ib.close()
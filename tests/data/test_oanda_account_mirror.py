@@ -0,0 +1,105 @@
+import time
+
+import pytest
+
+from data.brokers.fx_matrix import FxMatrix
+from data.brokers.oanda_account_mirror import OandaAccountMirror
+from data.brokers.oanda_connector import OandaConnector
+from testing.oanda_v20_standin import OandaStandIn
+
+
+def _wait(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+def test_mirror_follows_transactions_stream():
+    with OandaStandIn(instruments=["EUR_USD"], stream_interval_s=0.05, heartbeat_s=0.5) as standin:
+        oanda = OandaConnector(environment="practice", api_base=standin.base_url)
+        mirror = oanda.start_account_mirror()
+        try:
+            assert _wait(lambda: mirror.healthy)
+            ask = oanda.get_live_prices(["EUR_USD"])["EUR_USD"]["ask"]
+            entry = round(ask + 0.001, 5)
+            assert oanda.place_oco_order("EUR_USD", entry, entry - 0.004, entry + 0.016, 20000)["success"]
+
+            # Fill plus SL/TP creation arrive on the stream; no REST read needed
+            assert _wait(lambda: len(mirror.trades) == 1 and len(mirror.orders) == 2)
+            before = dict(standin.stats()["requests"])
+            assert oanda.get_trades()[0]["currentUnits"] == "20000"
+            assert {o["type"] for o in oanda.get_orders()} == {"STOP_LOSS", "TAKE_PROFIT"}
+            assert mirror.gate_positions() == [{"symbol": "EUR_USD", "side": "BUY", "units": 20000,
+                                                "entry_price": float(mirror.get_trades()[0]["price"])}]
+            assert standin.stats()["requests"].get("trades") == before.get("trades")
+
+            oanda._make_request("PUT", f"/v3/accounts/{oanda.account_id}/positions/EUR_USD/close",
+                                {"longUnits": "ALL"})
+            assert _wait(lambda: not mirror.trades and not mirror.orders)
+            assert mirror.balance == float(standin.account.summary()["balance"])
+            # Realized P/L of the close, from its fill, without a REST read
+            trade_id = next(iter(mirror.closed_pl))
+            assert oanda.get_closed_trade_pl(trade_id) == pytest.approx(mirror.balance - 100000.0)
+            assert mirror.stats()["lag_p50_ms"] is not None
+        finally:
+            oanda.stop_account_mirror()
+
+
+def test_gap_triggers_resync():
+    with OandaStandIn(instruments=["EUR_USD"], stream_interval_s=0.05, heartbeat_s=0.2) as standin:
+        oanda = OandaConnector(environment="practice", api_base=standin.base_url)
+        mirror = oanda.start_account_mirror()
+        try:
+            assert _wait(lambda: mirror.healthy)
+            skipped = {"id": str(mirror.last_transaction_id + 2), "type": "DAILY_FINANCING", "financing": "5.0"}
+            assert mirror.apply(skipped) is False
+            assert not mirror.healthy
+            # Next heartbeat drives the REST resync
+            assert _wait(lambda: mirror.healthy and mirror.stats()["resyncs"] == 2)
+            assert mirror.stats()["gaps"] == 1 and mirror.balance == 100000.0
+        finally:
+            oanda.stop_account_mirror()
+
+
+def test_margin_keeps_the_brokers_per_instrument_rates():
+    fx = FxMatrix()
+    for instrument, mid in (("EUR_USD", 1.10), ("USD_JPY", 150.0), ("GBP_USD", 1.25)):
+        fx.update(instrument, mid)
+    mirror = OandaAccountMirror(None, "http://standin", "acct", {}, fx=fx)
+    mirror.load_snapshot({
+        "balance": "100000", "marginRate": "0.02", "lastTransactionID": "10", "marginUsed": "1725.0000",
+        "trades": [
+            # 5% on a minor cross, 3.33% on a major: both above the 2% account rate
+            {"id": "1", "instrument": "GBP_JPY", "price": "190.000", "currentUnits": "10000", "marginUsed": "625.0000"},
+            {"id": "2", "instrument": "EUR_USD", "price": "1.10000", "currentUnits": "-30000", "marginUsed": "1100.0000"},
+        ],
+    })
+    assert abs(mirror.account_summary()["marginUsed"] - 1725.0) < 1e-6
+
+    # Re-marked by the base currency's move only
+    fx.update("GBP_USD", 1.30)
+    assert abs(mirror.account_summary()["marginUsed"] - (650.0 + 1100.0)) < 1e-6
+
+    # Streamed fills: the fill's own figure, else the rate the instrument's other trades imply
+    mirror.apply({"id": "11", "type": "ORDER_FILL", "instrument": "USD_JPY", "units": "5000", "price": "150.000",
+                  "tradeOpened": {"tradeID": "11", "units": "5000", "initialMarginRequired": "200.0000"}})
+    mirror.apply({"id": "12", "type": "ORDER_FILL", "instrument": "GBP_JPY", "units": "20000", "price": "191.000",
+                  "tradeOpened": {"tradeID": "12", "units": "20000"}})
+    mirror.apply({"id": "13", "type": "ORDER_FILL", "instrument": "GBP_JPY", "units": "-10000", "price": "191.500",
+                  "tradesClosed": [{"tradeID": "1", "units": "-10000"}]})
+    assert abs(mirror.account_summary()["marginUsed"] - (1100.0 + 200.0 + 20000 * 1.30 * 0.05)) < 1e-6
+    assert abs(mirror.instrument_margin_rates["GBP_JPY"] - 0.05) < 1e-12
+    assert mirror.gate_account()["margin_used"] == mirror.account_summary()["marginUsed"]
+
+
+def test_realized_pl_summed_over_partial_closes():
+    mirror = OandaAccountMirror(None, "http://standin", "acct", {}, fx=FxMatrix())
+    mirror.load_snapshot({"balance": "100000", "lastTransactionID": "1", "trades": [
+        {"id": "1", "instrument": "EUR_USD", "price": "1.10000", "currentUnits": "10000", "realizedPL": "0.0000"}]})
+    mirror.apply({"id": "2", "type": "ORDER_FILL", "instrument": "EUR_USD", "units": "-4000",
+                  "tradeReduced": {"tradeID": "1", "units": "-4000", "realizedPL": "12.0000"}})
+    assert mirror.closed_trade_pl("1") is None
+    mirror.apply({"id": "3", "type": "ORDER_FILL", "instrument": "EUR_USD", "units": "-6000",
+                  "tradesClosed": [{"tradeID": "1", "units": "-6000", "realizedPL": "-30.5000"}]})
+    assert mirror.closed_trade_pl("1") == pytest.approx(12.0 - 30.5)
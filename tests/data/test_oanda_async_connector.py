@@ -0,0 +1,55 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from data.brokers.oanda_connector import OandaConnector
+from data.brokers.oanda_async_connector import AsyncOandaConnector
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if "/pricing" in self.path:
+            payload = {"prices": [{"instrument": "EUR_USD", "time": "t",
+                                   "bids": [{"price": "1.1000"}], "asks": [{"price": "1.1002"}]}]}
+        else:
+            payload = {"candles": [{"time": "t", "volume": 1, "mid": {"o": "1", "h": "1", "l": "1", "c": "1"}}]}
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_async_client_matches_sync_surface():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    sync = OandaConnector(environment="practice")
+    sync.api_base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    async def run():
+        async with AsyncOandaConnector(connector=sync) as client:
+            return await asyncio.gather(
+                client.get_live_prices(["EUR_USD"]),
+                client.get_historical_data("EUR_USD", count=1),
+            )
+
+    try:
+        prices, candles = asyncio.run(run())
+    finally:
+        server.shutdown()
+    assert abs(prices["EUR_USD"]["mid"] - 1.1001) < 1e-9
+    assert len(candles) == 1
+
+
+def test_async_oco_enforces_charter_prechecks():
+    client = AsyncOandaConnector(connector=OandaConnector(environment="practice"))
+    result = asyncio.run(client.place_oco_order("EUR_USD", 1.1, None, 1.2, 1000))
+    assert result["success"] is False
+    assert result["error"].startswith("OCO_REQUIRED")
@@ -0,0 +1,65 @@
+import pytest
+
+from engine_imports import import_engine
+
+engine_module = import_engine("engines.oanda_trading_engine")
+OandaTradingEngine = engine_module.OandaTradingEngine
+
+
+class FakeConnector:
+    def __init__(self, realized):
+        self.realized = realized
+
+    def get_closed_trade_pl(self, trade_id):
+        return self.realized.get(trade_id)
+
+
+class FakeDisplay:
+    def __init__(self):
+        self.wins, self.losses, self.warnings = [], [], []
+
+    def trade_win(self, symbol, pnl, message):
+        self.wins.append((symbol, pnl))
+
+    def trade_loss(self, symbol, pnl, message):
+        self.losses.append((symbol, pnl))
+
+    def warning(self, message):
+        self.warnings.append(message)
+
+    def error(self, message):
+        raise AssertionError(message)
+
+
+def _engine(realized):
+    engine = OandaTradingEngine.__new__(OandaTradingEngine)
+    engine.oanda = FakeConnector(realized)
+    engine.display = FakeDisplay()
+    engine.wins = engine.losses = 0
+    engine.total_pnl = 0.0
+    engine._display_stats = lambda: None
+    engine.active_positions = {
+        trade_id: {"symbol": "EUR_USD", "direction": "BUY", "units": 10000, "entry": 1.1,
+                   "take_profit": 1.103, "stop_loss": 1.099}
+        for trade_id in ("1", "2", "3")
+    }
+    return engine
+
+
+@pytest.fixture(autouse=True)
+def _quiet(monkeypatch):
+    monkeypatch.setattr(engine_module, "log_narration", lambda **kwargs: None)
+
+
+def test_closed_positions_booked_at_realized_pl_only():
+    engine = _engine({"1": 42.5, "2": -18.25})
+    for trade_id in ("1", "2", "3"):
+        engine._handle_position_closed(trade_id)
+
+    assert engine.display.wins == [("EUR_USD", 42.5)]
+    assert engine.display.losses == [("EUR_USD", -18.25)]
+    # Trade 3 has no realized P/L: it leaves the book but is not counted
+    assert (engine.wins, engine.losses) == (1, 1)
+    assert engine.total_pnl == pytest.approx(42.5 - 18.25)
+    assert engine.active_positions == {}
+    assert len(engine.display.warnings) == 1
@@ -0,0 +1,112 @@
+import json
+
+from data.brokers.fx_matrix import FxMatrix
+from engine_imports import import_engine
+
+engine_module = import_engine("engines.oanda_trading_engine")
+
+MIDS = {"GBP_USD": 1.2700, "AUD_USD": 0.6600, "USD_CAD": 1.3600}
+
+POSITIONS = [
+    {"instrument": "EUR_USD", "long": {"units": "10000", "averagePrice": "1.1000"}, "short": {"units": "0"}},
+    {"instrument": "GBP_USD", "long": {"units": "0"}, "short": {"units": "-20000"}},
+    {"instrument": "USD_JPY", "long": {"units": "5000", "averagePrice": "150.00"}, "short": {"units": "0"}},
+    {"instrument": "AUD_USD", "long": {"units": "20000"}, "short": {"units": "0"}},
+    {"instrument": "USD_CAD", "long": {"units": "0"}, "short": {"units": "-40000"}},
+    {"instrument": "EUR_GBP", "long": {"units": "10000", "averagePrice": "0.8550"}, "short": {"units": "0"}},
+    {"instrument": "NZD_USD", "long": {"units": "0"}, "short": {"units": "0"}},
+    {"instrument": "XAU_USD", "long": {"units": "2"}, "short": {"units": "0"}},  # never priced
+]
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    def __init__(self):
+        self.pricing_calls = []
+        self.closes = []
+        self.requests = []  # (url, Authorization header)
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        self.requests.append((url, headers["Authorization"]))
+        if url.endswith("/openPositions"):
+            return FakeResponse({"positions": POSITIONS})
+        instruments = params["instruments"].split(",")
+        self.pricing_calls.append(instruments)
+        return FakeResponse({"prices": [{"instrument": i, "closeoutAsk": str(MIDS[i])}
+                                        for i in instruments if i in MIDS]})
+
+    def put(self, url, headers=None, data=None, timeout=None):
+        self.requests.append((url, headers["Authorization"]))
+        self.closes.append((url.split("/positions/")[1].split("/")[0], json.loads(data)))
+        return FakeResponse({}, 200)
+
+
+def _per_position_pass(session, fx, min_notional):
+    """The sweep before batching: one pricing read and one close per position, in order"""
+    for pos in POSITIONS:
+        inst = pos["instrument"]
+        net = float(pos["long"]["units"]) + float(pos["short"]["units"])
+        if net == 0:
+            continue
+        avg = pos["long"].get("averagePrice") or pos["short"].get("averagePrice")
+        price = float(avg) if avg else (engine_module._rbz_fetch_price(session, "acct", inst, "tok") or 0.0)
+        notional = engine_module._rbz_usd_notional(inst, net, price, fx)
+        if 0 < notional < min_notional:
+            engine_module._rbz_close_position(session, "http://standin", "acct", "tok", inst,
+                                              "long" if net > 0 else "short")
+
+
+def _fx():
+    fx = FxMatrix()
+    fx.update("EUR_USD", 1.0850)
+    fx.update("GBP_USD", 1.2700)
+    return fx
+
+
+def test_batched_sweep_makes_the_per_position_decisions(monkeypatch):
+    monkeypatch.setenv("OANDA_PRACTICE_ACCOUNT_ID", "acct")
+    monkeypatch.setenv("OANDA_PRACTICE_TOKEN", "tok")
+    monkeypatch.setattr(engine_module, "log_narration", lambda **kwargs: None)
+    fx = _fx()
+    min_notional = getattr(engine_module.RickCharter, "MIN_NOTIONAL_USD", 15000)
+
+    reference = FakeSession()
+    _per_position_pass(reference, fx, min_notional)
+    batched = FakeSession()
+    summary = engine_module._rbz_force_min_notional_position_police(
+        session=batched, fx=fx, max_workers=3)
+
+    assert sorted(batched.closes) == sorted(reference.closes)
+    assert {inst for inst, _ in reference.closes} == {"EUR_USD", "USD_JPY", "AUD_USD", "EUR_GBP"}
+    assert len(reference.pricing_calls) == 4
+    assert batched.pricing_calls == [["GBP_USD", "AUD_USD", "USD_CAD", "XAU_USD"]]
+    assert summary["positions_checked"] == 7
+    assert summary["violations_found"] == summary["violations_closed"] == 4
+
+
+def test_sweep_uses_the_credentials_of_the_host_it_calls(monkeypatch):
+    monkeypatch.setenv("OANDA_PRACTICE_ACCOUNT_ID", "practice-acct")
+    monkeypatch.setenv("OANDA_PRACTICE_TOKEN", "practice-tok")
+    monkeypatch.setattr(engine_module, "log_narration", lambda **kwargs: None)
+
+    live = FakeSession()
+    summary = engine_module._rbz_force_min_notional_position_police(
+        session=live, api_base="https://api-fxtrade.oanda.com", fx=_fx(),
+        account_id="live-acct", token="live-tok")
+    assert summary["violations_closed"] == 4
+    assert all(url.startswith("https://api-fxtrade.oanda.com/v3/accounts/live-acct/")
+               and auth == "Bearer live-tok" for url, auth in live.requests)
+
+    # A host without its own credentials never receives the practice ones
+    unpaired = FakeSession()
+    assert engine_module._rbz_force_min_notional_position_police(
+        session=unpaired, api_base="https://api-fxtrade.oanda.com", fx=_fx()) is None
+    assert unpaired.requests == []
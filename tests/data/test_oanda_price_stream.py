@@ -0,0 +1,57 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from data.brokers.oanda_price_stream import OandaPriceStream, QuoteBoard
+
+
+def _price(inst, bid, ask):
+    return {"type": "PRICE", "instrument": inst, "time": "t",
+            "bids": [{"price": str(bid)}], "asks": [{"price": str(ask)}]}
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for msg in (_price("EUR_USD", 1.1, 1.1002), {"type": "HEARTBEAT", "time": "hb"}):
+            line = (json.dumps(msg) + "\n").encode()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+            self.wfile.flush()
+        time.sleep(0.5)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+def test_quote_board_staleness():
+    board = QuoteBoard(stale_after_s=0.05)
+    board.update_from_message(_price("EUR_USD", 1.1, 1.1002))
+    assert board.get("EUR_USD").mid == 1.1001
+    time.sleep(0.06)
+    assert board.get("EUR_USD") is None
+    assert board.stats()["stale_misses"] == 1
+
+
+def test_stream_feeds_board_and_heartbeat():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StreamHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stream = OandaPriceStream(f"http://127.0.0.1:{server.server_address[1]}", "acct", {},
+                              ["EUR_USD"], heartbeat_timeout_s=2.0)
+    try:
+        stream.start()
+        deadline = time.time() + 2
+        while stream.last_heartbeat_time is None and time.time() < deadline:
+            time.sleep(0.01)
+        assert stream.board.get("EUR_USD").bid == 1.1
+        assert stream.last_heartbeat_time == "hb"
+        assert stream.healthy
+    finally:
+        stream.stop()
+        server.shutdown()
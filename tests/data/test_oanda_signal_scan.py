@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from engine_imports import import_engine
+
+engine_module = import_engine("engines.oanda_trading_engine")
+OandaTradingEngine = engine_module.OandaTradingEngine
+
+SIGNALS = {
+    "EUR_USD": ("BUY", 0.62),
+    "GBP_USD": ("SELL", 0.81),
+    "USD_JPY": (None, 0.0),
+    "AUD_USD": ("BUY", 0.74),
+}
+
+
+class FakeConnector:
+    def __init__(self, delays):
+        self.delays = delays
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def get_historical_data(self, pair, count, granularity):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delays.get(pair, 0.05))
+            if pair == "NZD_USD":
+                raise RuntimeError("candles unavailable")
+            return [{"pair": pair}]
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class FakeDisplay:
+    def __init__(self):
+        self.errors, self.warnings = [], []
+
+    def error(self, message):
+        self.errors.append(message)
+
+    def warning(self, message):
+        self.warnings.append(message)
+
+
+def _engine(pairs, delays, concurrency=8, deadline=5.0):
+    engine = OandaTradingEngine.__new__(OandaTradingEngine)
+    engine.trading_pairs = pairs
+    engine.async_oanda = None
+    engine.oanda = FakeConnector(delays)
+    engine.display = FakeDisplay()
+    engine.scan_concurrency = concurrency
+    engine.scan_deadline_seconds = deadline
+    engine.last_scan = {}
+    return engine
+
+
+@pytest.fixture(autouse=True)
+def _signals(monkeypatch):
+    monkeypatch.setattr(engine_module, "generate_signal", lambda pair, candles: SIGNALS.get(pair, (None, 0.0)))
+    monkeypatch.setattr(engine_module, "log_narration", lambda **kwargs: None)
+
+
+def test_all_pairs_scanned_concurrently_and_ranked_by_confidence():
+    pairs = list(SIGNALS) + ["NZD_USD"]
+    engine = _engine(pairs, {pair: 0.2 for pair in pairs})
+
+    start = time.perf_counter()
+    candidates = asyncio.run(engine.scan_all_pairs())
+    elapsed = time.perf_counter() - start
+
+    assert [c["pair"] for c in candidates] == ["GBP_USD", "AUD_USD", "EUR_USD"]
+    assert elapsed < 0.2 * len(pairs) / 2  # fetched side by side, not one after another
+    assert set(engine.last_scan["timings_ms"]) == set(pairs)
+    assert engine.last_scan["candidates"][0] == ("GBP_USD", "SELL", 0.81)
+    assert engine.last_scan["timed_out"] == []
+    assert any("NZD_USD" in message for message in engine.display.errors)
+
+
+def test_concurrency_bound_and_deadline_skip_slow_pairs():
+    pairs = list(SIGNALS)
+    engine = _engine(pairs, {"GBP_USD": 2.0}, concurrency=2, deadline=0.5)
+
+    candidates = asyncio.run(engine.scan_all_pairs())
+
+    assert engine.oanda.max_active <= 2
+    assert engine.last_scan["timed_out"] == ["GBP_USD"]
+    assert [c["pair"] for c in candidates] == ["AUD_USD", "EUR_USD"]
+    assert engine.display.warnings
@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+from data.brokers.http_transport import PooledTransport
+from data.brokers.rate_limiter import (PRIORITY_ORDER, PRIORITY_SCAN, RateLimit, RateLimiter,
+                                       RateLimitExceeded, SingleFlight)
+from testing.oanda_v20_standin import FaultConfig, OandaStandIn
+
+
+def test_orders_keep_reserve_and_scans_are_shed():
+    limiter = RateLimiter("test", RateLimit(rate_per_s=1, burst=10), max_wait_s={PRIORITY_SCAN: 0.0})
+
+    admitted_scans = 0
+    with pytest.raises(RateLimitExceeded):
+        while True:
+            limiter.acquire("candles", PRIORITY_SCAN)
+            admitted_scans += 1
+    assert admitted_scans == 8  # 20% of the burst is held back from scans
+
+    for _ in range(2):
+        assert limiter.acquire(priority=PRIORITY_ORDER) == 0.0
+    assert limiter.stats()["shed"]["scan"] == 1
+
+
+def test_class_bucket_refunds_when_host_bucket_refuses():
+    limiter = RateLimiter("test", RateLimit(rate_per_s=1, burst=1), {"candles": RateLimit(1, 5)})
+    assert limiter.delay("candles", PRIORITY_ORDER) == 0.0
+    assert limiter.delay("candles", PRIORITY_ORDER) > 0.0
+    assert limiter.class_buckets["candles"].tokens >= 3.9
+
+
+def test_single_flight_shares_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(2)
+        return {"value": 42}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while flight.stats()["shared"] < 4:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1 and len(results) == 5
+    assert all(result is results[0] for result in results)
+
+
+def test_transport_coalesces_identical_gets():
+    with OandaStandIn(instruments=["EUR_USD"], faults=FaultConfig(latency_ms=200)) as standin:
+        transport = PooledTransport(standin.base_url)
+        url = f"{standin.base_url}/v3/instruments/EUR_USD/candles"
+        responses = []
+
+        def fetch():
+            responses.append(transport.request("GET", url, headers={"Authorization": "Bearer test"},
+                                               params={"granularity": "M1", "count": 5}))
+
+        threads = [threading.Thread(target=fetch) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(responses) == 4 and all(r.status_code == 200 for r in responses)
+        assert standin.stats()["requests"]["candles"] < 4
+        assert transport.stats()["coalesced"] >= 1
+        transport.close()
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.oanda.strategies.bearish_wolf import BearishWolf
+from data.oanda.strategies.bullish_wolf import BullishWolf
+from data.oanda.strategies.sideways_wolf import SidewaysWolf
+
+
+def _panel(symbols, bars, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.002, (symbols, bars)), axis=1)
+    high = close + np.abs(rng.normal(0, 0.001, (symbols, bars)))
+    low = close - np.abs(rng.normal(0, 0.001, (symbols, bars)))
+    volume = rng.integers(1, 1000, (symbols, bars)).astype(float)
+    volume[-1, -1] = 5000
+    return {"close": close, "high": high, "low": low, "volume": volume}
+
+
+def _without_timestamp(signal):
+    return {key: value for key, value in signal.items() if key != "timestamp"}
+
+
+@pytest.mark.parametrize("wolf", [BullishWolf, BearishWolf, SidewaysWolf])
+@pytest.mark.parametrize("bars", [30, 200])
+def test_panel_matches_per_symbol_signals(wolf, bars):
+    panel = _panel(12, bars)
+    symbols = [f"SYM_{i}" for i in range(12)]
+    signals = wolf().generate_panel_signals(panel, symbols)
+    assert list(signals) == symbols
+    for row, symbol in enumerate(symbols):
+        data = {key: pd.Series(matrix[row]) for key, matrix in panel.items()}
+        expected = wolf()._generate_trade_signal(data)
+        assert _without_timestamp(signals[symbol]) == _without_timestamp(expected)
+
+
+def test_panel_rejects_misaligned_input():
+    panel = _panel(3, 60)
+    panel["volume"] = panel["volume"][:, 1:]
+    signals = BullishWolf().generate_panel_signals(panel, ["A", "B", "C"])
+    assert all(signal["trade"] is False and "error" in signal for signal in signals.values())
+    short = BullishWolf().generate_panel_signals(_panel(3, 10), ["A", "B", "C"])
+    assert all(signal["reason"] == "Insufficient data for analysis" for signal in short.values())
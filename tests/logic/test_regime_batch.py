@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from logic.regime_detector import MarketRegime, StochasticRegimeDetector
+
+
+def _history(n, seed=1):
+    rng = np.random.default_rng(seed)
+    return 1.1 * np.exp(np.cumsum(rng.normal(0, 0.003, n)))
+
+
+def test_rolling_regimes_match_detect_regime_per_bar():
+    prices = _history(9000)
+    detector = StochasticRegimeDetector(deterministic=True)
+    batch = detector.rolling_regimes(prices)
+    assert len(batch) == len(prices)
+    for bar in list(range(0, 60)) + list(range(4090, 4150)) + [8999]:
+        expected = detector.detect_regime(prices[:bar + 1])
+        assert batch.regimes[bar] == expected.regime
+        assert batch.confidence[bar] == pytest.approx(expected.confidence, abs=1e-9)
+        assert batch.volatility[bar] == pytest.approx(expected.volatility, rel=1e-9)
+        assert batch.trend_strength[bar] == pytest.approx(expected.trend_strength, rel=1e-6, abs=1e-12)
+    assert batch[5].regime == MarketRegime.TRIAGE and batch[5].regime_probabilities["bull"] == 0.2
+
+
+def test_detect_regimes_panel_matches_rows_and_polyfit():
+    panel = np.vstack([_history(120, seed) for seed in range(8)])
+    detector = StochasticRegimeDetector(deterministic=True)
+    batch = detector.detect_regimes(panel)
+    for row in range(len(panel)):
+        assert batch[row] == detector.detect_regime(panel[row])
+        window = panel[row, -50:]
+        slope = np.polyfit(np.arange(50), window, 1)[0]
+        assert batch.trend_strength[row] == pytest.approx(slope / window.mean(), rel=1e-9)
+
+
+def test_noise_uses_own_seeded_rng():
+    prices = _history(300)
+    state = np.random.get_state()[1].copy()
+    StochasticRegimeDetector().detect_regime(prices)
+    assert (np.random.get_state()[1] == state).all()
+
+    first = StochasticRegimeDetector(seed=7).rolling_regimes(prices).probabilities
+    again = StochasticRegimeDetector(seed=7).rolling_regimes(prices).probabilities
+    assert np.array_equal(first, again)
+    assert not np.array_equal(first, StochasticRegimeDetector(deterministic=True).rolling_regimes(prices).probabilities)
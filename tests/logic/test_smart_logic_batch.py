@@ -0,0 +1,125 @@
+import json
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from logic.smart_logic import SmartLogicFilter
+
+# Decisions and scores of the single-signal filters before batching, for _golden_signals()
+GOLDEN = Path(__file__).with_name("smart_logic_golden.json")
+
+
+def _signal(rng, n, direction="buy"):
+    close = 1.1 + np.cumsum(rng.normal(0, 0.002, n))
+    high = close + np.abs(rng.normal(0, 0.002, n))
+    low = close - np.abs(rng.normal(0, 0.002, n))
+    entry = float(close[-1])
+    side = 1 if direction in ("buy", "long") else -1
+    return {
+        "symbol": "EUR_USD", "direction": direction, "entry_price": entry,
+        "target_price": entry + side * rng.choice([0.005, 0.02]), "stop_loss": entry - side * 0.003,
+        "swing_high": entry * (1 + rng.uniform(0, 0.01)), "swing_low": entry * (1 - rng.uniform(0, 0.01)),
+        "recent_highs": list(high), "recent_lows": list(low), "recent_closes": close,
+        "recent_volumes": list(rng.integers(100, 1000, n).astype(float)),
+    }
+
+
+def _golden_signals(count, seed=19):
+    """Signals drawn with random.Random, whose stream does not change across releases"""
+    rnd = random.Random(seed)
+    signals = []
+    for _ in range(count):
+        n = rnd.choice([2, 12, 40, 100])
+        direction = rnd.choice(["buy", "sell", "short"])
+        price, close, high, low = 1.1, [], [], []
+        for _ in range(n):
+            price += (rnd.random() - 0.5) * 0.007
+            close.append(price)
+            high.append(price + rnd.random() * 0.003)
+            low.append(price - rnd.random() * 0.003)
+        entry = close[-1]
+        side = 1 if direction == "buy" else -1
+        signals.append({
+            "symbol": "EUR_USD", "direction": direction, "entry_price": entry,
+            "target_price": entry + side * rnd.choice([0.005, 0.02]), "stop_loss": entry - side * 0.003,
+            "swing_high": entry * (1 + rnd.random() * 0.01), "swing_low": entry * (1 - rnd.random() * 0.01),
+            "recent_highs": high, "recent_lows": low, "recent_closes": np.array(close),
+            "recent_volumes": [float(rnd.randrange(100, 1000)) for _ in range(n)],
+        })
+    return signals
+
+
+def _record(validation):
+    return {"passed": validation.passed, "score": validation.score, "reject_reason": validation.reject_reason,
+            "confluence_count": validation.confluence_count, "risk_reward_ratio": validation.risk_reward_ratio,
+            "filters": [[fs.filter_name, fs.passed, fs.score, fs.reason, fs.details]
+                        for fs in validation.filter_scores]}
+
+
+def _assert_matches(actual, expected, where):
+    if isinstance(expected, dict):
+        assert sorted(actual) == sorted(expected), where
+        for key in expected:
+            _assert_matches(actual[key], expected[key], f"{where}.{key}")
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected), where
+        for i, (a, e) in enumerate(zip(actual, expected)):
+            _assert_matches(a, e, f"{where}[{i}]")
+    elif isinstance(expected, float):
+        assert float(actual) == pytest.approx(expected, rel=1e-9, abs=1e-12), where
+    else:
+        assert actual == expected, where
+
+
+def test_single_and_batch_paths_match_pre_batch_decisions(capsys):
+    expected = json.loads(GOLDEN.read_text())
+    signals = _golden_signals(len(expected))
+    smart_filter = SmartLogicFilter()
+
+    batch = smart_filter.validate_signals(signals)
+    single = [smart_filter.validate_signal(s) for s in signals]
+
+    for path, results in (("batch", batch), ("single", single)):
+        for i, (validation, golden) in enumerate(zip(results, expected)):
+            _assert_matches(_record(validation), golden, f"{path}[{i}]")
+    assert any(r["passed"] for r in expected) and any(not r["passed"] for r in expected)
+
+
+def test_fvg_zones_match_candle_loop():
+    rng = np.random.default_rng(9)
+    smart_filter = SmartLogicFilter()
+    for _ in range(200):
+        signal = _signal(rng, 30, str(rng.choice(["buy", "sell"])))
+        highs, lows, entry = signal["recent_highs"], signal["recent_lows"], signal["entry_price"]
+        signal["entry_price"] = entry = float(rng.choice(lows))
+        zones = []
+        for i in range(len(highs) - 2):
+            if lows[i] > highs[i + 2]:
+                zones.append(("bullish", lows[i], highs[i + 2]))
+            if highs[i] < lows[i + 2]:
+                zones.append(("bearish", lows[i + 2], highs[i]))
+        wanted = "bullish" if signal["direction"] == "buy" else "bearish"
+        aligned = [(upper - lower) / entry for kind, upper, lower in zones
+                   if kind == wanted and lower <= entry <= upper]
+
+        score = smart_filter._validate_fvg_confluence(signal)
+
+        assert score.passed == bool(aligned)
+        if aligned:
+            assert score.details == {"aligned_zones": len(aligned), "strongest_strength": max(aligned)}
+
+
+def test_malformed_history_only_rejects_itself(capsys):
+    rng = np.random.default_rng(2)
+    good = _signal(rng, 50)
+    good["target_price"] = good["entry_price"] + 0.02
+    broken = _signal(rng, 50)
+    broken["target_price"] = broken["entry_price"] + 0.02
+    broken["recent_lows"] = broken["recent_lows"][:10]
+
+    results = SmartLogicFilter().validate_signals([good, broken])
+
+    assert results[0].filter_scores and results[0].risk_reward_ratio == pytest.approx(0.02 / 0.003)
+    assert results[1].reject_reason.startswith("Validation system error")
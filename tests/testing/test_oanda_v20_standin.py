@@ -0,0 +1,122 @@
+import time
+
+from data.brokers.oanda_connector import OandaConnector
+from testing.oanda_v20_standin import DEFAULT_START_PRICES, FaultConfig, OandaStandIn, PricePath, SimClock
+
+
+def test_connector_trades_against_standin():
+    with OandaStandIn(instruments=["EUR_USD", "USD_JPY"], speed=600) as standin:
+        oanda = OandaConnector(environment="practice", api_base=standin.base_url)
+
+        candles = oanda.get_historical_data("EUR_USD", count=50, granularity="M1")
+        assert len(candles) == 50 and not candles[-1]["complete"]
+        time.sleep(0.25)  # ~2.5 simulated minutes
+        oanda.candle_cache.min_refresh_s = 0.0
+        assert oanda.get_historical_data("EUR_USD", count=50, granularity="M1")[-1]["time"] > candles[-1]["time"]
+        assert oanda.candle_cache.stats()["incremental_fetches"] == 1
+
+        ask = oanda.get_live_prices(["EUR_USD"])["EUR_USD"]["ask"]
+        entry = round(ask + 0.001, 5)  # marketable buy limit fills on the next price check
+        placed = oanda.place_oco_order("EUR_USD", entry, entry - 0.004, entry + 0.016, 20000)
+        assert placed["success"], placed
+
+        trades = oanda.get_trades()
+        assert len(trades) == 1 and trades[0]["currentUnits"] == "20000"
+        assert trades[0]["stopLossOrder"]["price"] == str(entry - 0.004)
+        assert oanda.set_trade_stop(trades[0]["id"], entry - 0.003)["success"]
+        assert oanda.get_trades()[0]["stopLossOrder"]["price"] == str(entry - 0.003)
+
+        positions = oanda._make_request("GET", f"/v3/accounts/{oanda.account_id}/openPositions")["data"]["positions"]
+        assert positions[0]["long"]["units"] == "20000"
+        closed = oanda._make_request("PUT", f"/v3/accounts/{oanda.account_id}/positions/EUR_USD/close",
+                                     {"longUnits": "ALL"})
+        assert closed["success"] and "longOrderFillTransaction" in closed["data"]
+        assert oanda.get_trades() == []
+
+
+def test_injected_errors_and_latency():
+    faults = FaultConfig(latency_ms=30, error_rate=1.0, routes=frozenset({"pricing"}))
+    with OandaStandIn(instruments=["EUR_USD"], faults=faults) as standin:
+        oanda = OandaConnector(environment="practice", api_base=standin.base_url)
+
+        started = time.monotonic()
+        assert oanda.get_live_prices(["EUR_USD"]) == {}
+        assert time.monotonic() - started >= 0.03
+        assert oanda.transport.stats()["retries"] >= 1
+        assert standin.stats()["requests"]["injected_errors"] >= 2
+        assert oanda.get_historical_data("EUR_USD", count=5, granularity="M5", use_cache=False)
+
+
+def test_recorded_path_replays_on_sim_clock():
+    path = PricePath("EUR_USD", [1.10, 1.11, 1.12], origin=1_699_999_980, tick_s=60)
+    clock = SimClock(speed=1.0, start=1_699_999_980 + 150)
+    standin = OandaStandIn(paths={"EUR_USD": path}, instruments=[], clock=clock)
+    try:
+        assert abs(sum(standin.quote("EUR_USD")) / 2 - 1.12) < 1e-9
+        bars = path.candles(clock.now(), "M1", count=3)
+        assert [b["mid"]["c"] for b in bars] == ["1.10000", "1.11000", "1.12000"]
+        assert [b["complete"] for b in bars] == [True, True, False]
+    finally:
+        standin.stop()
+
+
+def test_account_info_reports_margin():
+    with OandaStandIn(instruments=["EUR_USD"], speed=600) as standin:
+        oanda = OandaConnector(environment="practice", api_base=standin.base_url)
+        assert float(oanda.get_account_info()["marginUsed"]) == 0.0
+
+        ask = oanda.get_live_prices(["EUR_USD"])["EUR_USD"]["ask"]
+        entry = round(ask + 0.001, 5)
+        placed = oanda.place_oco_order("EUR_USD", entry, entry - 0.004, entry + 0.016, 20000,
+                                       narration={"pretrade_saved_ms": 12.5})
+        assert placed["success"], placed
+        oanda.get_trades()  # fill happens on the next price check
+        assert float(oanda.get_account_info()["marginUsed"]) > 0.0
+
+
+def test_closed_trade_pl_read_from_rest_without_a_mirror():
+    with OandaStandIn(instruments=["EUR_USD"], speed=600) as standin:
+        oanda = OandaConnector(environment="practice", api_base=standin.base_url)
+        ask = oanda.get_live_prices(["EUR_USD"])["EUR_USD"]["ask"]
+        entry = round(ask + 0.001, 5)
+        assert oanda.place_oco_order("EUR_USD", entry, entry - 0.004, entry + 0.016, 20000)["success"]
+        trade_id = oanda.get_trades()[0]["id"]
+        assert oanda.get_closed_trade_pl(trade_id) is None  # still open
+
+        closed = oanda._make_request("PUT", f"/v3/accounts/{oanda.account_id}/positions/EUR_USD/close",
+                                     {"longUnits": "ALL"})
+        fill = closed["data"]["longOrderFillTransaction"]
+        assert oanda.get_closed_trade_pl(trade_id) == float(fill["tradesClosed"][0]["realizedPL"])
+        assert oanda.get_closed_trade_pl("999") is None
+
+
+# OandaTradingEngine.trading_pairs
+ENGINE_PAIRS = [
+    "EUR_USD", "GBP_USD", "USD_JPY", "USD_CHF", "AUD_USD", "USD_CAD", "NZD_USD",
+    "EUR_GBP", "EUR_JPY", "GBP_JPY", "AUD_JPY", "CHF_JPY",
+    "EUR_CHF", "GBP_CHF",
+    "AUD_CHF", "NZD_CHF", "EUR_AUD", "GBP_AUD",
+]
+
+
+def test_engine_pairs_batch_priced_and_streamed():
+    assert set(ENGINE_PAIRS) <= set(DEFAULT_START_PRICES)
+    with OandaStandIn(instruments=["EUR_USD", "USD_CHF", "USD_JPY"], speed=60, stream_interval_s=0.05) as standin:
+        oanda = OandaConnector(environment="practice", api_base=standin.base_url)
+
+        # Pairs not configured up front get a synthetic path on first request
+        prices = oanda.get_live_prices(ENGINE_PAIRS)
+        assert set(prices) == set(ENGINE_PAIRS)
+        eur_chf = (prices["EUR_CHF"]["bid"] + prices["EUR_CHF"]["ask"]) / 2
+        assert abs(eur_chf - DEFAULT_START_PRICES["EUR_CHF"]) < 0.05
+        assert oanda.get_historical_data("GBP_AUD", count=20, granularity="M5", use_cache=False)
+
+        # A malformed name is skipped by the stream instead of ending it
+        stream = oanda.start_price_stream(ENGINE_PAIRS + ["NOT_A_PAIR"])
+        deadline = time.monotonic() + 5
+        while len(stream.board.snapshot()) < len(ENGINE_PAIRS) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        oanda.stop_price_stream()
+        assert set(stream.board.snapshot()) == set(ENGINE_PAIRS)
+        assert oanda._make_request("GET", f"/v3/accounts/{oanda.account_id}/pricing",
+                                   params={"instruments": "NOT_A_PAIR"})["success"] is False